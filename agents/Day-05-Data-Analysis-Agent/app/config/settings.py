@@ -27,6 +27,13 @@ AGENT_MAX_EXECUTION_TIME = int(os.getenv("AGENT_MAX_EXECUTION_TIME", "30"))
 AGENT_EARLY_STOPPING_METHOD = os.getenv("AGENT_EARLY_STOPPING_METHOD", "force")
 AGENT_ALLOW_DANGEROUS_CODE = os.getenv("AGENT_ALLOW_DANGEROUS_CODE", "true").lower() == "true"
 
+# Visualization Sandbox Settings
+VIZ_WORKER_COUNT = int(os.getenv("VIZ_WORKER_COUNT", "2"))
+VIZ_CPU_TIME_LIMIT = int(os.getenv("VIZ_CPU_TIME_LIMIT", "10"))
+VIZ_MEMORY_LIMIT_MB = int(os.getenv("VIZ_MEMORY_LIMIT_MB", "1024"))
+VIZ_TIMEOUT = float(os.getenv("VIZ_TIMEOUT", "20"))
+VIZ_OUTPUT_FORMAT = os.getenv("VIZ_OUTPUT_FORMAT", "png")
+
 # Database Settings
 DEFAULT_SQLITE_PATH = os.getenv("DEFAULT_SQLITE_PATH", "test_data.db")
 DEFAULT_DB_TYPE = os.getenv("DEFAULT_DB_TYPE", "sqlite")
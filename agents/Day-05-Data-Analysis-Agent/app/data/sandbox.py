@@ -0,0 +1,403 @@
+"""
+Data Analysis Agent - Visualization Sandbox Module
+
+This module provides a pool of pre-started worker processes that execute
+LLM-generated visualization code in isolation from the Streamlit process.
+
+Each worker runs with a CPU-time limit and an address-space limit, and every
+job is bounded by a wall-clock timeout. DataFrames are exported once to shared
+memory in Arrow IPC format and read by the workers without pickling. The
+rendered figure is returned as PNG or SVG bytes.
+"""
+
+import atexit
+import io
+import os
+import queue
+import signal
+import sys
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - resource limits are POSIX only
+    resource = None
+
+# Add the parent directory to the Python path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from config import settings
+
+
+SUPPORTED_FORMATS = ('png', 'svg')
+
+# Maximum number of exported DataFrames kept in shared memory at once
+MAX_SHARED_FRAMES = 4
+
+
+def _current_address_space() -> int:
+    """Return the current virtual memory size of this process in bytes (Linux only)."""
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[0])
+        return pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _apply_memory_limit(memory_bytes: int) -> None:
+    """Cap the worker's address space at its current size plus the memory budget."""
+    if resource is None or memory_bytes <= 0:
+        return
+    limit = _current_address_space() + memory_bytes
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _apply_cpu_limit(cpu_seconds: int) -> None:
+    """Allow the next job at most `cpu_seconds` of additional CPU time."""
+    if resource is None or cpu_seconds <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _attach_shared_table(name: str, size: int):
+    """
+    Attach to a shared memory segment and open the Arrow table stored in it.
+
+    Returns:
+        tuple: (SharedMemory, pyarrow.Table); the table references the segment without copying
+    """
+    import pyarrow as pa
+
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        # The parent process owns the segment; stop this process's resource
+        # tracker from unlinking it when the worker exits.
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    except Exception:
+        pass
+
+    table = pa.ipc.open_stream(pa.py_buffer(shm.buf)[:size]).read_all()
+    return shm, table
+
+
+def _release_shared_table(shm) -> None:
+    """Detach from a shared memory segment, ignoring buffers still referenced."""
+    try:
+        shm.close()
+    except BufferError:
+        pass
+
+
+def _worker_main(conn, cpu_seconds: int, memory_bytes: int) -> None:
+    """
+    Worker process loop.
+
+    Receives jobs of the form (code, segment_name, segment_size, fmt) and replies
+    with (status, payload, message) where payload is the rendered image bytes.
+    """
+    # Keep numerical libraries single-threaded so the memory limit stays predictable
+    os.environ.setdefault('OPENBLAS_NUM_THREADS', '1')
+    os.environ.setdefault('OMP_NUM_THREADS', '1')
+    os.environ['MPLBACKEND'] = 'Agg'
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import numpy as np
+    import seaborn as sns
+
+    _apply_memory_limit(memory_bytes)
+
+    attached_name = None
+    attached_shm = None
+    attached_table = None
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if job is None:
+            break
+
+        code, segment_name, segment_size, fmt = job
+        try:
+            if segment_name != attached_name:
+                attached_table = None
+                if attached_shm is not None:
+                    _release_shared_table(attached_shm)
+                attached_shm, attached_table = _attach_shared_table(segment_name, segment_size)
+                attached_name = segment_name
+
+            df = attached_table.to_pandas()
+            local_namespace = {'df': df, 'pd': pd, 'plt': plt, 'sns': sns, 'np': np}
+
+            _apply_cpu_limit(cpu_seconds)
+            exec(code, {}, local_namespace)
+
+            fig = None
+            fig_nums = plt.get_fignums()
+            if fig_nums:
+                fig = plt.figure(fig_nums[-1])
+            else:
+                for value in local_namespace.values():
+                    if isinstance(value, plt.Figure):
+                        fig = value
+                    elif hasattr(value, 'figure') and isinstance(getattr(value, 'figure'), plt.Figure):
+                        fig = value.figure
+
+            if fig is None:
+                conn.send(('error', None, "No figure was created by the code"))
+            else:
+                buffer = io.BytesIO()
+                fig.savefig(buffer, format=fmt, bbox_inches='tight')
+                conn.send(('ok', buffer.getvalue(), "Visualization created successfully"))
+        except MemoryError:
+            conn.send(('error', None, "Visualization code exceeded the memory limit"))
+        except Exception as e:
+            conn.send(('error', None, f"Error executing visualization code: {str(e)}"))
+        finally:
+            # Never let figure or style state leak into the next job
+            plt.close('all')
+            matplotlib.rcdefaults()
+            matplotlib.use('Agg')
+            local_namespace = None
+            df = None
+
+    if attached_shm is not None:
+        attached_table = None
+        _release_shared_table(attached_shm)
+
+
+class _Worker:
+    """Handle on a single sandbox worker process."""
+
+    def __init__(self, ctx, cpu_seconds: int, memory_bytes: int):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, cpu_seconds, memory_bytes),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        """Terminate the worker process immediately."""
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+
+
+class _SharedFrame:
+    """A DataFrame exported to a shared memory segment in Arrow IPC format."""
+
+    def __init__(self, df: pd.DataFrame):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=True)
+
+        sink = pa.MockOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        self.size = sink.size()
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(self.size, 1))
+        target = pa.py_buffer(self.shm.buf)
+        stream = pa.FixedSizeBufferWriter(target)
+        with pa.ipc.new_stream(stream, table.schema) as writer:
+            writer.write_table(table)
+        stream.close()
+        del stream, target
+
+        self.name = self.shm.name
+        self.shape = df.shape
+        self.columns = tuple(df.columns)
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """Check that a DataFrame still has the structure this export was made from."""
+        return df.shape == self.shape and tuple(df.columns) == self.columns
+
+    def unlink(self) -> None:
+        """Release and remove the shared memory segment."""
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+
+
+class VisualizationWorkerPool:
+    """
+    Pool of pre-started sandbox processes for executing visualization code.
+
+    Workers are started when the pool is created and replaced whenever one is
+    killed for exceeding its wall-clock timeout or dies from a resource limit.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.VIZ_WORKER_COUNT,
+        cpu_seconds: int = settings.VIZ_CPU_TIME_LIMIT,
+        memory_mb: int = settings.VIZ_MEMORY_LIMIT_MB,
+        timeout: float = settings.VIZ_TIMEOUT
+    ):
+        start_method = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
+        self._ctx = mp.get_context(start_method)
+        self._cpu_seconds = cpu_seconds
+        self._memory_bytes = memory_mb * 1024 * 1024
+        self.timeout = timeout
+
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._frames: Dict[int, Tuple[Any, _SharedFrame]] = {}
+        self._frames_lock = threading.RLock()
+        self._closed = False
+
+        for _ in range(max(1, workers)):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._ctx, self._cpu_seconds, self._memory_bytes)
+
+    def _share(self, df: pd.DataFrame) -> _SharedFrame:
+        """Export a DataFrame to shared memory, reusing an existing export of the same object."""
+        import weakref
+
+        key = id(df)
+        with self._frames_lock:
+            entry = self._frames.get(key)
+            if entry is not None:
+                ref, frame = entry
+                if ref() is df and frame.matches(df):
+                    return frame
+                frame.unlink()
+                del self._frames[key]
+
+            frame = _SharedFrame(df)
+
+            def _drop(ref, key=key):
+                # Release the export as soon as the DataFrame is garbage collected
+                with self._frames_lock:
+                    stale = self._frames.get(key)
+                    if stale is not None and stale[0] is ref:
+                        del self._frames[key]
+                        stale[1].unlink()
+
+            self._frames[key] = (weakref.ref(df, _drop), frame)
+
+            while len(self._frames) > MAX_SHARED_FRAMES:
+                oldest = next(iter(self._frames))
+                self._frames.pop(oldest)[1].unlink()
+
+            return frame
+
+    def run(self, code: str, df: pd.DataFrame, fmt: str = 'png') -> Tuple[Optional[bytes], str]:
+        """
+        Execute visualization code in a sandbox worker.
+
+        Args:
+            code: The Python code to execute
+            df: The DataFrame exposed to the code as `df`
+            fmt: Output image format ('png' or 'svg')
+
+        Returns:
+            Tuple[Optional[bytes], str]: The rendered image bytes and a status message
+        """
+        if self._closed:
+            return None, "Visualization sandbox has been shut down"
+        if fmt not in SUPPORTED_FORMATS:
+            return None, f"Unsupported image format: {fmt}"
+
+        try:
+            frame = self._share(df)
+        except Exception as e:
+            return None, f"Failed to share data with the visualization sandbox: {str(e)}"
+
+        try:
+            worker = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            return None, "All visualization workers are busy, please try again"
+
+        healthy = False
+        try:
+            worker.conn.send((code, frame.name, frame.size, fmt))
+            if not worker.conn.poll(self.timeout):
+                return None, f"Visualization code timed out after {self.timeout} seconds"
+
+            status, payload, message = worker.conn.recv()
+            healthy = True
+            return (payload if status == 'ok' else None), message
+        except (EOFError, OSError, BrokenPipeError):
+            worker.process.join(timeout=1)
+            if resource is not None and worker.process.exitcode == -signal.SIGXCPU:
+                return None, f"Visualization code exceeded the CPU time limit of {self._cpu_seconds} seconds"
+            return None, "Visualization worker crashed while executing the code"
+        finally:
+            if healthy:
+                self._idle.put(worker)
+            else:
+                worker.kill()
+                if not self._closed:
+                    self._idle.put(self._spawn())
+
+    def shutdown(self) -> None:
+        """Stop all workers and release shared memory."""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                worker.conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            worker.kill()
+
+        with self._frames_lock:
+            for _, frame in self._frames.values():
+                frame.unlink()
+            self._frames.clear()
+
+
+_pool: Optional[VisualizationWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_visualization_pool() -> VisualizationWorkerPool:
+    """
+    Get the process-wide visualization worker pool, starting it on first use.
+
+    Returns:
+        VisualizationWorkerPool: The shared worker pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = VisualizationWorkerPool()
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -11,7 +11,16 @@ import streamlit as st
 import re
 import ast
 import inspect
-from typing import Optional, Tuple, Dict, Any, List
+from typing import Optional, Tuple, Dict, Any, List, Union
+
+import sys
+import os
+
+# Add the parent directory to the Python path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from config import settings
+from data.sandbox import get_visualization_pool
 
 
 def create_visualization(df: pd.DataFrame, viz_type: str, **kwargs) -> Optional[plt.Figure]:
@@ -103,14 +112,19 @@ def create_visualization(df: pd.DataFrame, viz_type: str, **kwargs) -> Optional[
         return None
 
 
-def display_visualization(fig: plt.Figure) -> None:
+def display_visualization(fig: Union[plt.Figure, bytes]) -> None:
     """
-    Display a matplotlib figure in the Streamlit UI.
+    Display a matplotlib figure or a rendered image in the Streamlit UI.
 
     Args:
-        fig: The matplotlib figure to display
+        fig: The matplotlib figure, or PNG/SVG bytes returned by the sandbox
     """
-    if fig is not None:
+    if isinstance(fig, bytes):
+        if fig.lstrip().startswith(b'<'):
+            st.image(fig.decode('utf-8'))
+        else:
+            st.image(fig)
+    elif fig is not None:
         st.pyplot(fig)
     else:
         st.error("No visualization to display")
@@ -289,16 +303,19 @@ def is_safe_code(code: str) -> bool:
         return False
 
 
-def execute_visualization_code(code: str, df: pd.DataFrame) -> Tuple[Optional[plt.Figure], str]:
+def execute_visualization_code(code: str, df: pd.DataFrame) -> Tuple[Optional[bytes], str]:
     """
-    Execute visualization code and return the resulting figure.
+    Execute visualization code in the sandbox worker pool and return the rendered image.
+
+    The code runs in a separate process with CPU-time, memory and wall-clock
+    limits, so a slow or runaway snippet cannot freeze the Streamlit UI.
 
     Args:
         code: The Python code to execute
         df: The DataFrame to use in the code
 
     Returns:
-        Tuple[Optional[plt.Figure], str]: The resulting figure and any output/error message
+        Tuple[Optional[bytes], str]: The rendered image bytes and any output/error message
     """
     if not code:
         return None, "No code to execute"
@@ -306,38 +323,7 @@ def execute_visualization_code(code: str, df: pd.DataFrame) -> Tuple[Optional[pl
     if not is_safe_code(code):
         return None, "The generated code contains potentially unsafe operations and cannot be executed"
 
-    # Create a local namespace with the DataFrame and necessary imports
-    local_namespace = {
-        'df': df,
-        'pd': pd,
-        'plt': plt,
-        'sns': sns,
-        'np': __import__('numpy')
-    }
-
-    try:
-        # Capture the current figure before execution
-        old_figs = plt.get_fignums()
-
-        # Execute the code
-        exec(code, {}, local_namespace)
-
-        # Get the new figure(s) created by the code
-        new_figs = plt.get_fignums()
-        new_fig_nums = [fig for fig in new_figs if fig not in old_figs]
-
-        if new_fig_nums:
-            # Return the last created figure
-            return plt.figure(new_fig_nums[-1]), "Visualization created successfully"
-        else:
-            # Check if the code returned a figure directly
-            for var_name, var_value in local_namespace.items():
-                if isinstance(var_value, plt.Figure):
-                    return var_value, "Visualization created successfully"
-
-            return None, "No figure was created by the code"
-    except Exception as e:
-        return None, f"Error executing visualization code: {str(e)}"
+    return get_visualization_pool().run(code, df, fmt=settings.VIZ_OUTPUT_FORMAT)
 
 
 def generate_visualization_prompt(query: str, df: pd.DataFrame) -> str:
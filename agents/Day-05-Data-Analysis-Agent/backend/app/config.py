@@ -29,6 +29,9 @@ class Settings(BaseSettings):
     AGENT_EARLY_STOPPING_METHOD: str = "force"
     AGENT_ALLOW_DANGEROUS_CODE: bool = True
 
+    # Query Cache Settings
+    QUERY_CACHE_MAX_ENTRIES: int = 256  # Cached queries kept per dataset
+
     # Database Settings
     DEFAULT_SQLITE_PATH: str = "test_data.db"
     DEFAULT_DB_TYPE: str = "sqlite"
@@ -56,6 +56,7 @@ class QueryResponse(BaseModel):
     """Model for query response."""
     success: bool = Field(..., description="Whether the query was successful")
     result: Optional[AnalysisResult] = Field(None, description="Analysis result")
+    cache_status: Optional[str] = Field(None, description="Query cache outcome (hit, miss)")
     error: Optional[str] = Field(None, description="Error message if query failed")
 
 
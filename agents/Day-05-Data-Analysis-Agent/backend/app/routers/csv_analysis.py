@@ -14,6 +14,7 @@ from app.models.schemas import QueryRequest, CSVUploadResponse, QueryResponse, A
 from app.services.llm_service import initialize_llm
 from app.services.csv_service import load_csv_file, get_dataframe_info, get_dataframe_preview, initialize_dataframe_agent, process_dataframe_query
 from app.services.visualization_service import create_plotly_visualization, create_fallback_visualization, generate_visualization_prompt
+from app.services.query_cache import query_cache
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -61,8 +62,10 @@ async def upload_csv(file: UploadFile = File(...)):
         # In a production app, use a more robust ID generation method
         csv_id = file.filename
 
-        # Store the DataFrame in memory
+        # Store the DataFrame in memory and drop results cached for a previous upload
         csv_data_store[csv_id] = df
+        agent_store.pop(csv_id, None)
+        query_cache.invalidate(csv_id)
 
         # Get DataFrame info and preview
         info = get_dataframe_info(df)
@@ -109,7 +112,11 @@ async def query_csv(query: str = Form(...), csv_id: str = Form(...)):
             content={"success": False, "error": "CSV file not found. Please upload a file first."}
         )
 
-    if csv_id not in agent_store:
+    # Serve repeated questions from the cache, without needing an LLM
+    version = query_cache.version(csv_id)
+    cached = query_cache.lookup(csv_id, query)
+
+    if not cached and csv_id not in agent_store:
         # Initialize LLM and agent if not already done
         llm = initialize_llm()
         if not llm:
@@ -129,33 +136,42 @@ async def query_csv(query: str = Form(...), csv_id: str = Form(...)):
         agent_store[csv_id] = agent
 
     try:
-        # Get the agent and DataFrame
-        agent = agent_store[csv_id]
+        # Get the DataFrame
         df = csv_data_store[csv_id]
 
-        # Process the query
-        response = process_dataframe_query(agent, query)
-
-        if not response["success"]:
-            return JSONResponse(
-                status_code=500,
-                content={"success": False, "error": response["error"]}
-            )
-
-        # Extract the result
-        result = response["result"]
-
-        # Check if there's any tabular data in the result
-        # This is a simplified approach - in a real app, you'd need more sophisticated parsing
-        data = None
-        if isinstance(result.get("output"), str) and "dataframe" in result.get("output", "").lower():
-            # Try to extract a DataFrame from the agent's intermediate steps
-            for step in result.get("intermediate_steps", []):
-                if isinstance(step, tuple) and len(step) > 1:
-                    action, action_result = step
-                    if isinstance(action_result, pd.DataFrame):
-                        data = action_result.to_dict(orient='records')
-                        break
+        if cached:
+            logger.info(f"Query cache {cached['cache_status']} for query: {query}")
+            text = cached["text"]
+            data = cached["data"]
+            cache_status = cached["cache_status"]
+        else:
+            # Process the query
+            response = process_dataframe_query(agent_store[csv_id], query)
+
+            if not response["success"]:
+                return JSONResponse(
+                    status_code=500,
+                    content={"success": False, "error": response["error"]}
+                )
+
+            # Extract the result
+            result = response["result"]
+
+            # Check if there's any tabular data in the result
+            # This is a simplified approach - in a real app, you'd need more sophisticated parsing
+            data = None
+            if isinstance(result.get("output"), str) and "dataframe" in result.get("output", "").lower():
+                # Try to extract a DataFrame from the agent's intermediate steps
+                for step in result.get("intermediate_steps", []):
+                    if isinstance(step, tuple) and len(step) > 1:
+                        action, action_result = step
+                        if isinstance(action_result, pd.DataFrame):
+                            data = action_result.to_dict(orient='records')
+                            break
+
+            text = result.get("output", "No output generated")
+            cache_status = "miss"
+            query_cache.store(csv_id, version, query, result, data)
 
         # Create a visualization if appropriate
         visualization = None
@@ -207,13 +223,13 @@ async def query_csv(query: str = Form(...), csv_id: str = Form(...)):
 
         # Create the analysis result
         analysis_result = AnalysisResult(
-            text=result.get("output", "No output generated"),
+            text=text,
             data=data,
             visualization=visualization if visualization else None,
             code=None  # We're not exposing code in this version
         )
 
-        return {"success": True, "result": analysis_result}
+        return {"success": True, "result": analysis_result, "cache_status": cache_status}
 
     except Exception as e:
         logger.error(f"Error processing query: {str(e)}")
@@ -221,3 +237,14 @@ async def query_csv(query: str = Form(...), csv_id: str = Form(...)):
             status_code=500,
             content={"success": False, "error": f"Error processing query: {str(e)}"}
         )
+
+
+@router.get("/cache/stats")
+async def get_query_cache_stats():
+    """
+    Get query cache metrics.
+
+    Returns:
+        dict: Hit/miss counters, hit rate and cached entries per dataset
+    """
+    return {"success": True, "stats": query_cache.get_stats()}
@@ -183,7 +183,9 @@ Always execute Python code that operates on the ENTIRE DataFrame, not just what
             # Explicitly include Python execution in the prompt
             include_df_in_prompt=True,
             # Ensure the agent has all the tools it needs
-            extra_tools=[]  # This ensures default tools are used
+            extra_tools=[],  # This ensures default tools are used
+            # Keep the executed steps so tabular results can be returned
+            return_intermediate_steps=True
         )
 
         # Log that we've explicitly enabled code execution
@@ -0,0 +1,206 @@
+"""
+Data Analysis Agent - Query Cache Service
+
+This module provides a per-dataset cache for natural language query results.
+
+Results are keyed by the normalised query and the version of the dataset they
+were computed on. A question that only differs from a cached one in filler words,
+punctuation or plurals is answered from the cache as well; anything that changes a
+number, a sign, a comparison, a connective such as "and"/"or"/"not", the case of a
+column name or the order of the words goes to the LLM agent.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Words that do not change the meaning of an analysis question. Connectives such as
+# "and", "or" and "not" do, and single letters may be column names, so neither is here
+STOPWORDS = {
+    "an", "the", "of", "in", "on", "for", "to", "by", "with",
+    "is", "are", "was", "were", "be", "me", "my", "please", "can", "could", "you",
+    "would", "show", "tell", "give", "what", "whats", "which", "how", "do", "does",
+    "we", "there", "this", "that", "data", "dataset", "dataframe",
+}
+
+# Comparison and arithmetic operators, signed numbers and words; other punctuation is dropped
+TOKEN_PATTERN = re.compile(r"[<>!=]=|[<>=+*/%^]|-?\d+(?:\.\d+)?|\w+|-")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalise a natural language query for cache lookups.
+
+    Splits the query into words, numbers (with their sign and decimals) and
+    operators, dropping other punctuation. Case is kept because column names
+    are case-sensitive.
+
+    Args:
+        query: The natural language query
+
+    Returns:
+        str: The normalised query
+    """
+    return " ".join(TOKEN_PATTERN.findall(query))
+
+
+def query_key(normalized_query: str) -> Tuple[str, ...]:
+    """
+    Get the meaningful words of a normalised query, in order.
+
+    Two questions with the same key ask the same thing: every number, operator,
+    column name and other content word is kept, so "sales in 2023" and
+    "sales in 2024" differ, and so do "price > 100" and "price < 100".
+
+    Args:
+        normalized_query: Query returned by normalize_query
+
+    Returns:
+        Tuple[str, ...]: Tokens with stopwords removed and simple plurals folded
+    """
+    tokens = []
+    for token in normalized_query.split():
+        if token.lower() in STOPWORDS:
+            continue
+        if len(token) > 3 and token.isalpha() and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tuple(tokens)
+
+
+@dataclass
+class CachedQuery:
+    """A cached query result for one dataset version."""
+    query: str
+    key: Tuple[str, ...]
+    text: str
+    data: Optional[List[Dict[str, Any]]]
+    created_at: float = field(default_factory=time.time)
+
+
+class QueryCache:
+    """
+    Per-dataset cache of query results.
+
+    Each dataset has its own LRU of entries; uploading a new version of a
+    dataset drops all of its entries.
+    """
+
+    def __init__(self, max_entries: int = settings.QUERY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: Dict[str, "OrderedDict[Tuple[str, ...], CachedQuery]"] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def version(self, dataset_id: str) -> int:
+        """Get the current version of a dataset."""
+        return self._versions.get(dataset_id, 0)
+
+    def invalidate(self, dataset_id: str) -> int:
+        """
+        Drop all cached results for a dataset and bump its version.
+
+        Args:
+            dataset_id: ID of the dataset that changed
+
+        Returns:
+            int: The new dataset version
+        """
+        with self._lock:
+            self._entries.pop(dataset_id, None)
+            self._versions[dataset_id] = self._versions.get(dataset_id, 0) + 1
+            self._stats["invalidations"] += 1
+            return self._versions[dataset_id]
+
+    def lookup(self, dataset_id: str, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cached answer to a query.
+
+        Args:
+            dataset_id: ID of the dataset being queried
+            query: The natural language query
+
+        Returns:
+            Optional[Dict[str, Any]]: {"text", "data", "cache_status"} or None on a miss
+        """
+        key = query_key(normalize_query(query))
+        with self._lock:
+            entries = self._entries.get(dataset_id)
+            entry = entries.get(key) if entries and key else None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return {"text": entry.text, "data": entry.data, "cache_status": "hit"}
+
+    def store(
+        self,
+        dataset_id: str,
+        version: int,
+        query: str,
+        result: Dict[str, Any],
+        data: Optional[List[Dict[str, Any]]],
+    ) -> None:
+        """
+        Store an agent result.
+
+        Args:
+            dataset_id: ID of the dataset that was queried
+            version: Dataset version the result was computed on
+            query: The natural language query
+            result: The agent response
+            data: Tabular data extracted from the response, if any
+        """
+        normalized = normalize_query(query)
+        key = query_key(normalized)
+        if not key:
+            return
+
+        entry = CachedQuery(
+            query=normalized,
+            key=key,
+            text=result.get("output", "No output generated"),
+            data=data,
+        )
+
+        with self._lock:
+            if version != self._versions.get(dataset_id, 0):
+                # The dataset was re-uploaded while the agent was running
+                return
+            entries = self._entries.setdefault(dataset_id, OrderedDict())
+            entries[key] = entry
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit/miss metrics.
+
+        Returns:
+            Dict[str, Any]: Counters, hit rate and number of cached entries per dataset
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            stats["datasets"] = {
+                dataset_id: {"version": self._versions.get(dataset_id, 0), "entries": len(entries)}
+                for dataset_id, entries in self._entries.items()
+            }
+            return stats
+
+
+# Shared cache instance used by the CSV analysis routes
+query_cache = QueryCache()
@@ -0,0 +1,57 @@
+"""
+Tests for the query cache service.
+"""
+
+import pytest
+
+from app.services.query_cache import QueryCache, normalize_query, query_key
+
+
+def key(query):
+    return query_key(normalize_query(query))
+
+
+def test_rewordings_share_a_key():
+    """Filler words, punctuation and plurals do not change the key."""
+    assert key("What is the total of sales?") == key("total sales")
+    assert key("Show me the average price, please") == key("average prices")
+
+
+@pytest.mark.parametrize("first, second", [
+    ("price > 100", "price < 100"),
+    ("price >= 100", "price > 100"),
+    ("rows where price != 100", "rows where price = 100"),
+    ("sales in 2023 or 2024", "sales in 2023 and 2024"),
+    ("customers not in Europe", "customers in Europe"),
+    ("values below -5", "values below 5"),
+    ("average of 1.5", "average of 15"),
+    ("sum of column A", "sum of column a"),
+    ("mean of column x", "mean of column"),
+])
+def test_different_questions_have_different_keys(first, second):
+    """Operators, signs, connectives and short or case-sensitive column names are kept."""
+    assert key(first) != key(second)
+
+
+def test_lookup_only_hits_the_same_question():
+    """A cached answer is not served for a question that differs in meaning."""
+    cache = QueryCache(max_entries=10)
+    cache.store("sales.csv", 0, "How many orders have price > 100?", {"output": "42"}, None)
+
+    assert cache.lookup("sales.csv", "how many orders have price > 100")["text"] == "42"
+    assert cache.lookup("sales.csv", "How many orders have price < 100?") is None
+    assert cache.lookup("sales.csv", "How many orders have price > -100?") is None
+    assert cache.lookup("other.csv", "How many orders have price > 100?") is None
+
+
+def test_invalidate_drops_results_of_the_old_version():
+    """Results stored for an outdated dataset version are neither kept nor served."""
+    cache = QueryCache(max_entries=10)
+    cache.store("sales.csv", 0, "total sales", {"output": "100"}, None)
+    version = cache.invalidate("sales.csv")
+
+    assert cache.lookup("sales.csv", "total sales") is None
+    cache.store("sales.csv", 0, "total sales", {"output": "stale"}, None)
+    assert cache.lookup("sales.csv", "total sales") is None
+    cache.store("sales.csv", version, "total sales", {"output": "200"}, None)
+    assert cache.lookup("sales.csv", "total sales")["text"] == "200"
@@ -2,9 +2,11 @@
 Agent endpoints for the Learning Coach Agent.
 """
 
-from typing import Dict, Any, Optional
+import json
+from typing import AsyncIterator, Dict, Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.services.agent_service import AgentService
@@ -20,6 +22,7 @@ class AgentRequest(BaseModel):
     user_input: str
     user_id: Optional[int] = None
     context: Optional[Dict[str, Any]] = None
+    stream: bool = False
 
 
 class AgentResponse(BaseModel):
@@ -28,11 +31,28 @@ class AgentResponse(BaseModel):
     response: str
     response_type: str
     context: Dict[str, Any]
+    metadata: Optional[Dict[str, Any]] = None
+
+
+async def _stream_events(request: AgentRequest) -> AsyncIterator[str]:
+    """Serialise agent progress events as newline-delimited JSON."""
+    async for event in agent_service.stream_user_input(
+        request.user_input, request.user_id, request.context
+    ):
+        yield json.dumps(event, default=str) + "\n"
 
 
 @router.post("/chat", response_model=AgentResponse)
-async def chat_with_agent(request: AgentRequest) -> Dict[str, Any]:
-    """Chat with the Learning Coach Agent."""
+async def chat_with_agent(request: AgentRequest) -> Any:
+    """Chat with the Learning Coach Agent.
+
+    With `stream` set, the response is newline-delimited JSON: progress events
+    (plan, per-node latency, response tokens and sections) followed by a
+    "final" event carrying the full response.
+    """
+    if request.stream:
+        return StreamingResponse(_stream_events(request), media_type="application/x-ndjson")
+
     try:
         response = await agent_service.process_user_input(
             request.user_input, request.user_id, request.context
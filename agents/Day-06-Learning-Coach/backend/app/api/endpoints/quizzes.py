@@ -3,7 +3,6 @@ Quizzes endpoints for the Learning Coach Agent.
 """
 
 from typing import List, Optional, Dict, Any
-import uuid
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -239,13 +238,17 @@ class QuizSubmitRequest(BaseModel):
     user_id: Optional[str] = None
 
 @router.post("/{quiz_id}/submit", response_model=Dict[str, Any])
-def submit_quiz_attempt(
+async def submit_quiz_attempt(
     quiz_id: str,
     request: QuizSubmitRequest,
     db: Session = Depends(get_db)
 ):
     """
     Submit a quiz attempt and get the results.
+
+    The score is returned immediately and the attempt is stored. Detailed
+    feedback is generated in the background; while `feedback_status` is
+    "pending", poll `/quizzes/results/{id}` for it.
     """
     try:
         # First check if the quiz exists in the database
@@ -271,43 +274,34 @@ def submit_quiz_attempt(
             # Add the quiz to the quiz generator's in-memory storage
             quiz_generator.quizzes[quiz_id] = quiz
 
-        # Get the result from the quiz generator
-        result = quiz_generator.submit_quiz_attempt(
+        # Grade the attempt; the quiz generator stores it in the database
+        result = await quiz_generator.evaluate_quiz(
             quiz_id=quiz_id,
-            user_id=request.user_id or "anonymous",
-            answers=request.answers
+            answers=request.answers,
+            user_id=request.user_id or "anonymous"
         )
 
-        # Save the attempt to the database
-        try:
-            # Create a new quiz attempt record
-            db_quiz_attempt = QuizAttemptModel(
-                id=str(uuid.uuid4()),
-                quiz_id=quiz_id,
-                user_id=int(request.user_id) if request.user_id and request.user_id.isdigit() else None,
-                answers=request.answers,
-                score=result.get("score", 0),
-                correct_answers=result.get("correct_answers", 0),
-                total_questions=result.get("total_questions", 0),
-                feedback=result.get("feedback", {}),
-                completed_at=datetime.now(timezone.utc)
-            )
-
-            # Add to database and commit
-            db.add(db_quiz_attempt)
-            db.commit()
-
-            # Add the database ID to the result
-            result["db_id"] = db_quiz_attempt.id
-        except Exception as db_error:
-            # Log the error but continue with the in-memory result
-            print(f"Error saving quiz attempt to database: {str(db_error)}")
+        # Keep the database ID available under the previous key
+        result["db_id"] = result.get("id")
 
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error submitting quiz attempt: {str(e)}")
 
 
+@router.get("/results/{result_id}", response_model=Dict[str, Any])
+def get_quiz_result(result_id: str):
+    """
+    Get a stored quiz result, including its detailed feedback once generated.
+    """
+    try:
+        return quiz_generator.get_quiz_result(result_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"Quiz result with ID {result_id} not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving quiz result: {str(e)}")
+
+
 @router.get("/{quiz_id}/attempts", response_model=List[QuizAttempt])
 def get_quiz_attempts(
     quiz_id: str,
@@ -117,6 +117,9 @@ def search_resources(
 ):
     """
     Search for resources based on a query string.
+
+    Results are ranked by relevance. Whole words are matched, and the last word of the
+    query also matches the start of a word.
     """
     try:
         resources = resource_manager.search_resources(
@@ -2,10 +2,13 @@
 Core agent implementation for the Learning Coach.
 """
 
+import asyncio
+import contextvars
 import logging
+import time
 import uuid
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional, TypedDict, Union, Callable
+from typing import AsyncIterator, Awaitable, Dict, List, Any, Optional, TypedDict, Union, Callable
 from typing_extensions import Annotated
 
 from langchain.chains import LLMChain
@@ -19,6 +22,8 @@ from app.core.learning_path_manager import LearningPathManager
 from app.core.content_discovery import ContentDiscovery
 from app.core.quiz_generator import QuizGenerator
 
+logger = logging.getLogger(__name__)
+
 
 # Define the state schema as a TypedDict
 class AgentState(TypedDict):
@@ -30,6 +35,28 @@ class AgentState(TypedDict):
     learning_path: Optional[Dict[str, Any]]
     resources: Optional[Dict[str, Any]]
     quiz: Optional[Dict[str, Any]]
+    response_type: Optional[str]
+    metadata: Dict[str, Any]
+
+
+# Sub-tasks a request can fan out to, mapped to the sub-tasks whose output they reuse.
+# Keys are in execution order so a plan can be sorted by this mapping.
+TASK_DEPENDENCIES: Dict[str, List[str]] = {
+    "create_learning_path": [],
+    "discover_resources": [],
+    "generate_quiz": ["create_learning_path"],
+}
+
+# Response sections in the order they appear in a combined response
+RESPONSE_SECTIONS = ["learning_path", "resources", "quiz"]
+
+# Queue receiving progress events while a request is streamed
+_event_queue: contextvars.ContextVar[Optional[asyncio.Queue]] = contextvars.ContextVar(
+    "learning_coach_event_queue", default=None
+)
+
+# Marks the end of a streamed request
+_STREAM_END = object()
 
 
 class LearningCoachAgent:
@@ -220,32 +247,18 @@ class LearningCoachAgent:
         # Create the state graph with the TypedDict schema
         graph = StateGraph(AgentState)
 
-        # Add nodes to the graph
-        graph.add_node("recognize_intent", self._recognize_intent)
-        graph.add_node("create_learning_path", self._create_learning_path)
-        graph.add_node("discover_resources", self._discover_resources)
-        graph.add_node("generate_quiz", self._generate_quiz)
-        graph.add_node("generate_response", self._generate_response)
+        # Add nodes to the graph. The sub-task nodes (learning path, resources,
+        # quiz) are run by execute_plan so independent ones can run concurrently.
+        graph.add_node("recognize_intent", self._timed_node("recognize_intent", self._recognize_intent))
+        graph.add_node("execute_plan", self._execute_plan)
+        graph.add_node("generate_response", self._timed_node("generate_response", self._generate_response))
 
         # Define the entry point
         graph.set_entry_point("recognize_intent")
 
-        # Define conditional edges
-        graph.add_conditional_edges(
-            "recognize_intent",
-            self._route_by_intent,
-            {
-                "create_learning_path": "create_learning_path",
-                "discover_resources": "discover_resources",
-                "generate_quiz": "generate_quiz",
-                "default": "generate_response"
-            }
-        )
-
-        # Connect other nodes to response generation
-        graph.add_edge("create_learning_path", "generate_response")
-        graph.add_edge("discover_resources", "generate_response")
-        graph.add_edge("generate_quiz", "generate_response")
+        # Connect the nodes
+        graph.add_edge("recognize_intent", "execute_plan")
+        graph.add_edge("execute_plan", "generate_response")
 
         # Define the exit point
         graph.add_edge("generate_response", END)
@@ -253,6 +266,53 @@ class LearningCoachAgent:
         # Compile the graph
         return graph.compile()
 
+    def _emit(self, event: Dict[str, Any]) -> None:
+        """Send a progress event to the client if the request is being streamed.
+
+        Args:
+            event: The event to send
+        """
+        queue = _event_queue.get()
+        if queue is not None:
+            queue.put_nowait(event)
+
+    def _record_latency(self, state: AgentState, node: str, started: float) -> float:
+        """Record how long a node took in the state metadata.
+
+        Args:
+            state: The current state
+            node: Name of the node
+            started: perf_counter() value when the node started
+
+        Returns:
+            The latency in milliseconds
+        """
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        state["metadata"].setdefault("node_latency_ms", {})[node] = latency_ms
+        self._emit({"event": "node", "node": node, "latency_ms": latency_ms})
+        return latency_ms
+
+    def _timed_node(
+        self, node: str, func: Callable[[AgentState], Awaitable[AgentState]]
+    ) -> Callable[[AgentState], Awaitable[AgentState]]:
+        """Wrap a graph node so its latency is recorded.
+
+        Args:
+            node: Name of the node
+            func: The node function
+
+        Returns:
+            The wrapped node function
+        """
+        async def run(state: AgentState) -> AgentState:
+            started = time.perf_counter()
+            try:
+                return await func(state)
+            finally:
+                self._record_latency(state, node, started)
+
+        return run
+
     async def _recognize_intent(self, state: AgentState) -> AgentState:
         """Recognize the user's intent.
 
@@ -321,10 +381,8 @@ class LearningCoachAgent:
                 logger.info("Multi-step query detected: Learning path exists, routing to generate_quiz")
                 return "generate_quiz"
             else:
-                # Otherwise, create the learning path first
+                # Otherwise, create the learning path first; _plan_tasks adds the quiz
                 logger.info("Multi-step query detected: No learning path yet, routing to create_learning_path")
-                # Store the fact that we need to generate a quiz after the learning path
-                state["context"]["generate_quiz_after_path"] = True
                 return "create_learning_path"
 
         # Check for update requests on existing learning paths
@@ -352,6 +410,86 @@ class LearningCoachAgent:
             logger.info(f"Unknown intent: {intent}, using default route")
             return "default"
 
+    def _plan_tasks(self, state: AgentState) -> List[str]:
+        """Work out which sub-tasks a request needs.
+
+        The recognized intent picks the primary sub-task; requests that
+        explicitly ask for more (e.g. "a learning path and a quiz", "a path
+        with some resources") add further sub-tasks.
+
+        Args:
+            state: The current state
+
+        Returns:
+            Names of the sub-task nodes to run, in dependency order
+        """
+        primary = self._route_by_intent(state)
+        if primary == "default":
+            return []
+
+        plan = {primary}
+        user_input = state["user_input"].lower()
+        has_learning_path_request = "learning path" in user_input or "path" in user_input
+        has_quiz_request = "quiz" in user_input or "test" in user_input
+        has_resources_request = "resources" in user_input or "materials" in user_input
+
+        if primary == "create_learning_path" and has_quiz_request:
+            plan.add("generate_quiz")
+        if has_resources_request:
+            plan.add("discover_resources")
+        if primary == "discover_resources" and has_learning_path_request and "learning_path_id" not in state["context"]:
+            plan.add("create_learning_path")
+
+        ordered = [task for task in TASK_DEPENDENCIES if task in plan]
+        logger.info(f"Planned sub-tasks: {ordered}")
+        return ordered
+
+    async def _execute_plan(self, state: AgentState) -> AgentState:
+        """Run the planned sub-tasks, starting each one as soon as its dependencies finish.
+
+        Independent sub-tasks (e.g. creating a learning path and discovering
+        resources) run concurrently. A failing sub-task is logged and recorded in
+        the metadata; the others still complete.
+
+        Args:
+            state: The current state
+
+        Returns:
+            Updated state with the outputs of every sub-task
+        """
+        plan = self._plan_tasks(state)
+        state["metadata"]["plan"] = plan
+        self._emit({"event": "plan", "tasks": plan})
+
+        nodes = {
+            "create_learning_path": self._create_learning_path,
+            "discover_resources": self._discover_resources,
+            "generate_quiz": self._generate_quiz,
+        }
+        running: Dict[str, asyncio.Task] = {}
+
+        async def run(task: str) -> None:
+            for dependency in TASK_DEPENDENCIES[task]:
+                if dependency in running:
+                    await asyncio.gather(running[dependency], return_exceptions=True)
+
+            started = time.perf_counter()
+            try:
+                await nodes[task](state)
+            except Exception as e:
+                logger.error(f"Error running sub-task {task}: {str(e)}")
+                state["metadata"].setdefault("failed_tasks", []).append(task)
+            finally:
+                self._record_latency(state, task, started)
+
+        started = time.perf_counter()
+        for task in plan:
+            running[task] = asyncio.create_task(run(task))
+        await asyncio.gather(*running.values())
+        self._record_latency(state, "execute_plan", started)
+
+        return state
+
     async def _create_learning_path(self, state: AgentState) -> AgentState:
         """Create or update a learning path based on the user's request.
 
@@ -632,18 +770,22 @@ class LearningCoachAgent:
         user_input = state["user_input"].lower()
         mentions_learning_path = "learning path" in user_input or "path" in user_input
 
+        quiz = None
+
         # Generate quiz from learning path if:
-        # 1. We have a learning path ID in context, and
+        # 1. We have a learning path (created in this request or referenced in context), and
         # 2. Either no topic is specified or the user explicitly mentioned the learning path
-        if learning_path_id and (not topic or mentions_learning_path):
+        if (state.get("learning_path") or learning_path_id) and (not topic or mentions_learning_path):
             logger.info(f"Generating quiz from learning path: {learning_path_id}")
 
-            # In a real implementation, we would retrieve the learning path from the database
-            # For now, we'll just use the learning path manager
-            if hasattr(self.learning_path_manager, "get_learning_path"):
-                try:
+            try:
+                # Reuse the learning path created earlier in this request if there is one;
+                # otherwise look it up through the learning path manager
+                learning_path = state.get("learning_path")
+                if not learning_path and hasattr(self.learning_path_manager, "get_learning_path"):
                     learning_path = self.learning_path_manager.get_learning_path(learning_path_id)
 
+                if learning_path:
                     # Extract difficulty from entities or use the learning path difficulty
                     if "difficulty" in entities:
                         difficulty = entities.get("difficulty")
@@ -658,44 +800,44 @@ class LearningCoachAgent:
                         num_questions_per_topic=num_questions_per_topic,
                         difficulty=difficulty
                     )
-                    state["quiz"] = quiz
                     logger.info(f"Generated quiz from learning path with ID: {quiz.get('id', 'unknown')}")
-                    return state
-                except Exception as e:
-                    logger.error(f"Error generating quiz from learning path: {str(e)}")
-                    # Fall back to regular quiz generation
-
-        if not topic:
-            # Try to extract topic from user input or context
-            topic = state["context"].get("last_topic", state["user_input"])
-            logger.info(f"No topic found in entities, using: {topic}")
-
-        # Extract entities with defaults
-        difficulty = entities.get("difficulty", "beginner")
-        num_questions = int(entities.get("num_questions", 5))
-        question_types = entities.get("question_types", ["multiple_choice"])
-        if isinstance(question_types, str):
-            question_types = [question_types]
-
-        # Get learning objectives if available
-        learning_objectives = entities.get("learning_objectives", [f"Understand the basics of {topic}"])
-        if isinstance(learning_objectives, str):
-            learning_objectives = [learning_objectives]
+            except Exception as e:
+                logger.error(f"Error generating quiz from learning path: {str(e)}")
+                # Fall back to regular quiz generation
+                quiz = None
 
         # Get user ID from context if available
         user_id = state["context"].get("user_id")
 
-        logger.info(f"Generating quiz on topic: {topic}, difficulty: {difficulty}, num_questions: {num_questions}")
+        if quiz is None:
+            if not topic:
+                # Try to extract topic from user input or context
+                topic = state["context"].get("last_topic", state["user_input"])
+                logger.info(f"No topic found in entities, using: {topic}")
 
-        # Generate the quiz with additional parameters
-        quiz = await self.quiz_generator.generate_quiz(
-            topic=topic,
-            difficulty=difficulty,
-            num_questions=num_questions,
-            question_types=question_types,
-            learning_objectives=learning_objectives,
-            user_id=user_id
-        )
+            # Extract entities with defaults
+            difficulty = entities.get("difficulty", "beginner")
+            num_questions = int(entities.get("num_questions", 5))
+            question_types = entities.get("question_types", ["multiple_choice"])
+            if isinstance(question_types, str):
+                question_types = [question_types]
+
+            # Get learning objectives if available
+            learning_objectives = entities.get("learning_objectives", [f"Understand the basics of {topic}"])
+            if isinstance(learning_objectives, str):
+                learning_objectives = [learning_objectives]
+
+            logger.info(f"Generating quiz on topic: {topic}, difficulty: {difficulty}, num_questions: {num_questions}")
+
+            # Generate the quiz with additional parameters
+            quiz = await self.quiz_generator.generate_quiz(
+                topic=topic,
+                difficulty=difficulty,
+                num_questions=num_questions,
+                question_types=question_types,
+                learning_objectives=learning_objectives,
+                user_id=user_id
+            )
 
         state["quiz"] = quiz
 
@@ -727,13 +869,13 @@ class LearningCoachAgent:
                 title=quiz["title"],
                 description=quiz["description"],
                 topic=quiz["topic"],
-                difficulty=quiz["difficulty"],
+                difficulty=quiz.get("difficulty", "beginner"),
                 questions=quiz["questions"],
-                estimated_time_minutes=quiz["estimated_time_minutes"],
+                estimated_time_minutes=quiz.get("estimated_time_minutes", 10),
                 created_at=datetime.now(timezone.utc),
                 learning_objectives=quiz.get("learning_objectives", []),
                 tags=quiz.get("tags", []),
-                user_id=int(user_id) if user_id and user_id.isdigit() else None
+                user_id=int(user_id) if user_id and str(user_id).isdigit() else None
             )
 
             # Add to database and commit
@@ -750,9 +892,45 @@ class LearningCoachAgent:
 
         return state
 
+    async def _generate_response_section(
+        self, template_key: str, template_inputs: Dict[str, Any], index: int
+    ) -> str:
+        """Generate one section of the response.
+
+        When the request is streamed, tokens are forwarded to the client as they
+        arrive and a section event is sent once the section is complete.
+
+        Args:
+            template_key: The response template to use
+            template_inputs: Inputs for the template
+            index: Position of the section in the combined response
+
+        Returns:
+            The generated section text
+        """
+        chain = self.response_templates[template_key] | self.llm
+
+        if _event_queue.get() is None:
+            response = await chain.ainvoke(template_inputs)
+            return response.content
+
+        parts = []
+        async for chunk in chain.astream(template_inputs):
+            if chunk.content:
+                parts.append(chunk.content)
+                self._emit({"event": "token", "section": template_key, "index": index, "content": chunk.content})
+
+        content = "".join(parts)
+        self._emit({"event": "section", "section": template_key, "index": index, "content": content})
+        return content
+
     async def _generate_response(self, state: AgentState) -> AgentState:
         """Generate a response based on the current state.
 
+        Every sub-task output in the state (learning path, resources, quiz) gets
+        its own section; the sections are generated concurrently and joined in a
+        fixed order.
+
         Args:
             state: The current state
 
@@ -762,24 +940,13 @@ class LearningCoachAgent:
         import logging
         logger = logging.getLogger(__name__)
 
-        # Determine which template to use
-        template_key = "general"
-
-        # Check for specific content types in the state
-        if state.get("learning_path"):
-            template_key = "learning_path"
-            logger.info("Using learning_path response template")
-        elif state.get("resources"):
-            template_key = "resources"
-            logger.info("Using resources response template")
-        elif state.get("quiz"):
-            template_key = "quiz"
-            logger.info("Using quiz response template")
-        elif state["intent"].get("intent") in ["explain_concept", "summarize_topic"]:
-            template_key = "explanation"
-            logger.info("Using explanation response template")
-        else:
-            logger.info("Using general response template")
+        # Determine which templates to use from the content types in the state
+        template_keys = [key for key in RESPONSE_SECTIONS if state.get(key)]
+        if not template_keys:
+            if state["intent"] and state["intent"].get("intent") in ["explain_concept", "summarize_topic"]:
+                template_keys = ["explanation"]
+            else:
+                template_keys = ["general"]
 
         # Prepare inputs for the template
         template_inputs = {
@@ -788,124 +955,29 @@ class LearningCoachAgent:
             "context": state["context"]
         }
 
-        if state.get("learning_path"):
-            template_inputs["learning_path"] = state["learning_path"]
+        for key in RESPONSE_SECTIONS:
+            if state.get(key):
+                template_inputs[key] = state[key]
 
-        if state.get("resources"):
-            template_inputs["resources"] = state["resources"]
-
-        if state.get("quiz"):
-            template_inputs["quiz"] = state["quiz"]
-
-        if template_key == "explanation":
+        if template_keys == ["explanation"]:
             # Extract the topic from entities or use the user input
             topic = state["intent"].get("entities", {}).get("topic", state["user_input"])
             template_inputs["topic"] = topic
 
-        logger.info(f"Generating response using template: {template_key}")
-
-        # Create and run the chain
-        prompt = self.response_templates[template_key]
-        chain = prompt | self.llm
+        logger.info(f"Generating response using templates: {template_keys}")
 
         try:
-            # Check if we need to generate a quiz after creating a learning path
-            generate_quiz_after_path = state["context"].get("generate_quiz_after_path", False)
-
-            if generate_quiz_after_path and template_key == "learning_path" and "learning_path_id" in state["context"]:
-                logger.info("Detected generate_quiz_after_path flag, will generate quiz after learning path")
-
-                # First, generate the learning path response
-                response = await chain.ainvoke(template_inputs)
-                learning_path_response = response.content
-
-                # Now generate a quiz based on the learning path
-                try:
-                    # Get the learning path from the state
-                    learning_path = state["learning_path"]
-
-                    # Generate a quiz from the learning path
-                    quiz = self.quiz_generator.generate_quiz_from_learning_path(
-                        learning_path=learning_path,
-                        num_questions_per_topic=2
-                    )
-
-                    # Store the quiz in the state
-                    state["quiz"] = quiz
-
-                    # Add the quiz ID to the context
-                    if "id" in quiz:
-                        state["context"]["quiz_id"] = quiz["id"]
-
-                    # Save the quiz to the database
-                    try:
-                        from sqlalchemy.orm import Session
-                        from app.db.base import get_db
-                        from app.models.quiz import Quiz as QuizModel
-
-                        # Get user ID from context if available
-                        user_id = state["context"].get("user_id")
-
-                        # Get a database session
-                        db = next(get_db())
-
-                        # Create a new quiz record
-                        db_quiz = QuizModel(
-                            id=quiz["id"],
-                            title=quiz["title"],
-                            description=quiz["description"],
-                            topic=quiz["topic"],
-                            difficulty=quiz.get("difficulty", "beginner"),
-                            questions=quiz["questions"],
-                            estimated_time_minutes=quiz.get("estimated_time_minutes", 10),
-                            created_at=datetime.now(timezone.utc),
-                            learning_objectives=quiz.get("learning_objectives", []),
-                            tags=quiz.get("tags", []),
-                            user_id=int(user_id) if user_id and user_id.isdigit() else None
-                        )
-
-                        # Add to database and commit
-                        db.add(db_quiz)
-                        db.commit()
-                        db.refresh(db_quiz)
-
-                        # Update the quiz ID in the context with the database ID
-                        state["context"]["quiz_id"] = db_quiz.id
-                        logger.info(f"Saved quiz from learning path to database with ID: {db_quiz.id}")
-                    except Exception as e:
-                        logger.error(f"Error saving quiz from learning path to database: {str(e)}")
-                        # Continue with the in-memory quiz if database save fails
-
-                    # Get the quiz template
-                    quiz_template = self.response_templates["quiz"]
-                    quiz_inputs = {
-                        "user_input": "Generate a quiz based on the learning path",
-                        "quiz": quiz,
-                        "intent": state["intent"],
-                        "context": state["context"]
-                    }
-
-                    # Generate the quiz response
-                    quiz_response = await (quiz_template | self.llm).ainvoke(quiz_inputs)
-
-                    # Combine the responses
-                    state["response"] = f"{learning_path_response}\n\n---\n\n{quiz_response.content}"
-                    state["response_type"] = "learning_path_with_quiz"
-
-                    # Clear the flag
-                    state["context"]["generate_quiz_after_path"] = False
-
-                    logger.info("Successfully generated quiz after learning path")
-                except Exception as e:
-                    logger.error(f"Error generating quiz after learning path: {str(e)}")
-                    # Just use the learning path response if quiz generation fails
-                    state["response"] = learning_path_response
-                    state["response_type"] = template_key
+            sections = await asyncio.gather(*[
+                self._generate_response_section(key, template_inputs, index)
+                for index, key in enumerate(template_keys)
+            ])
+
+            # Combine the sections, e.g. "learning_path_with_quiz"
+            state["response"] = "\n\n---\n\n".join(sections)
+            if len(template_keys) == 1:
+                state["response_type"] = template_keys[0]
             else:
-                # Normal response generation
-                response = await chain.ainvoke(template_inputs)
-                state["response"] = response.content
-                state["response_type"] = template_key
+                state["response_type"] = f"{template_keys[0]}_with_{'_and_'.join(template_keys[1:])}"
 
             # Update the context with the last response type
             state["context"]["last_response_type"] = state["response_type"]
@@ -946,7 +1018,8 @@ class LearningCoachAgent:
             context: Optional context information
 
         Returns:
-            Dict containing the agent's response and any additional information
+            Dict containing the agent's response, response type, context and
+            metadata (planned sub-tasks and per-node latency)
         """
         # Initialize context if not provided
         if context is None:
@@ -960,18 +1033,25 @@ class LearningCoachAgent:
             "response": None,
             "learning_path": None,
             "resources": None,
-            "quiz": None
+            "quiz": None,
+            "response_type": None,
+            "metadata": {"node_latency_ms": {}}
         }
 
         # Run the state graph with the initial state
+        started = time.perf_counter()
         try:
             final_state = await self.state_graph.ainvoke(initial_state)
 
-            # Return the response, response type, and context
+            metadata = final_state.get("metadata") or {}
+            metadata["total_latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+            # Return the response, response type, context and metadata
             return {
                 "response": final_state["response"] or "I'm not sure how to respond to that.",
-                "response_type": final_state.get("response_type", "general"),
+                "response_type": final_state.get("response_type") or "general",
                 "context": final_state["context"],
+                "metadata": metadata,
             }
         except Exception as e:
             # Handle any errors
@@ -982,4 +1062,47 @@ class LearningCoachAgent:
                 "response": f"I encountered an error while processing your request. Please try again with a different query.",
                 "response_type": "error",
                 "context": context,
+                "metadata": initial_state["metadata"],
             }
+
+    async def process_input_stream(
+        self, user_input: str, context: Dict[str, Any] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Process user input, yielding progress events while the response is built.
+
+        Events are dicts with an "event" key:
+        - "plan": the sub-tasks that will run
+        - "node": a node or sub-task finished, with its latency
+        - "token": a chunk of a response section
+        - "section": a complete response section
+        - "final": the same payload process_input returns
+
+        Args:
+            user_input: The user's input text
+            context: Optional context information
+
+        Yields:
+            Progress events, ending with the final response
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        token = _event_queue.set(queue)
+        try:
+            # The task copies the current context, so the graph nodes see the queue
+            task = asyncio.create_task(self.process_input(user_input, context))
+        finally:
+            _event_queue.reset(token)
+        task.add_done_callback(lambda _: queue.put_nowait(_STREAM_END))
+
+        try:
+            while True:
+                event = await queue.get()
+                if event is _STREAM_END:
+                    break
+                yield event
+
+            result = task.result()
+            yield {"event": "final", **result}
+        finally:
+            if not task.done():
+                # The client went away; stop working on the request
+                task.cancel()
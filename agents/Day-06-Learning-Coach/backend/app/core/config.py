@@ -22,6 +22,16 @@ class Settings(BaseModel):
     # Database settings
     DATABASE_URL: str = "sqlite:///./learning_coach.db"
     
+    # Content discovery cache settings
+    DISCOVERY_CACHE_PATH: str = "./discovery_cache.db"
+    DISCOVERY_CACHE_TTL_SECONDS: int = 86400
+    DISCOVERY_CACHE_MAX_ENTRIES: int = 1000
+
+    # Quiz feedback settings
+    QUIZ_FEEDBACK_BATCH_SIZE: int = 8
+    QUIZ_FEEDBACK_BATCH_WAIT_SECONDS: float = 0.05
+    QUIZ_FEEDBACK_CACHE_SIZE: int = 1024
+
     # LangChain settings
     LANGCHAIN_API_KEY: Optional[str] = None
     
@@ -14,6 +14,9 @@ from langchain_core.output_parsers import JsonOutputParser
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field, field_validator
 
+from app.core.config import settings
+from app.core.discovery_cache import DiscoveryCache, make_cache_key
+
 
 logger = logging.getLogger(__name__)
 
@@ -119,8 +122,12 @@ class ContentDiscovery:
         self.llm = ChatOpenAI(model=model_name, temperature=0.2, api_key=api_key)
         self.output_parser = JsonOutputParser(pydantic_object=ResourcesOutput)
 
-        # In-memory cache for discovered resources
-        self.resource_cache = {}
+        # Persistent cache for discovered resources, shared by all workers
+        self.resource_cache = DiscoveryCache(
+            path=settings.DISCOVERY_CACHE_PATH,
+            ttl_seconds=int(settings.DISCOVERY_CACHE_TTL_SECONDS),
+            max_entries=int(settings.DISCOVERY_CACHE_MAX_ENTRIES)
+        )
 
         # Create the prompt template for resource discovery
         template = """
@@ -251,15 +258,7 @@ class ContentDiscovery:
         """
         logger.info(f"Discovering resources for topic: {topic}")
 
-        # Create a cache key
-        cache_key = f"{topic}_{difficulty}_{resource_type}_{learning_style}"
-
-        # Check cache if enabled
-        if use_cache and cache_key in self.resource_cache:
-            logger.info(f"Using cached resources for topic: {topic}")
-            return self.resource_cache[cache_key]
-
-        try:
+        async def discover() -> Dict[str, Any]:
             result = await self.chain.ainvoke({
                 "topic": topic,
                 "difficulty": difficulty,
@@ -269,11 +268,21 @@ class ContentDiscovery:
             })
 
             # Validate and clean up the results
-            result = self._validate_resources(result, topic)
+            return self._validate_resources(result, topic)
 
-            # Cache the results
+        try:
             if use_cache:
-                self.resource_cache[cache_key] = result
+                cache_key = make_cache_key(
+                    "discover",
+                    topic=topic,
+                    difficulty=difficulty,
+                    resource_type=resource_type,
+                    learning_style=learning_style,
+                    additional_requirements=additional_requirements
+                )
+                result = await self.resource_cache.get_or_compute(cache_key, discover)
+            else:
+                result = await discover()
 
             logger.info(f"Discovered {result['total_count']} resources for topic: {topic}")
             return result
@@ -380,16 +389,22 @@ class ContentDiscovery:
         if previous_resources is None:
             previous_resources = []
 
+        inputs = {
+            "learning_style": learning_style,
+            "current_knowledge": current_knowledge,
+            "time_availability": time_availability,
+            "preferred_resource_types": ", ".join(preferred_resource_types),
+            "learning_goals": learning_goals,
+            "available_resources": json.dumps(available_resources, sort_keys=True),
+            "previous_resources": json.dumps(previous_resources, sort_keys=True)
+        }
+
         try:
-            result = await self.recommend_chain.ainvoke({
-                "learning_style": learning_style,
-                "current_knowledge": current_knowledge,
-                "time_availability": time_availability,
-                "preferred_resource_types": ", ".join(preferred_resource_types),
-                "learning_goals": learning_goals,
-                "available_resources": json.dumps(available_resources),
-                "previous_resources": json.dumps(previous_resources)
-            })
+            cache_key = make_cache_key("recommend", **inputs)
+            result = await self.resource_cache.get_or_compute(
+                cache_key,
+                lambda: self.recommend_chain.ainvoke(inputs)
+            )
 
             logger.info(f"Generated {len(result.get('resources', []))} resource recommendations")
             return result
@@ -0,0 +1,289 @@
+"""
+Persistent cache for content discovery results.
+
+This module provides a SQLite-backed cache that is shared by every worker process
+on the host. Entries expire after a TTL, the cache is bounded to a maximum number
+of entries (least recently used entries are evicted first), and concurrent
+requests for the same key are collapsed so an expensive LLM call is only paid once.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class _ComputeCancelled(Exception):
+    """Set on an in-flight result whose leading request was cancelled."""
+
+
+def normalize_value(value: Any) -> Any:
+    """Normalise a key component: trim, collapse whitespace and lower-case strings."""
+    if isinstance(value, str):
+        return " ".join(value.split()).lower()
+    if isinstance(value, (list, tuple)):
+        return [normalize_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): normalize_value(v) for k, v in value.items()}
+    return value
+
+
+def make_cache_key(namespace: str, **params: Any) -> str:
+    """Build a stable cache key from normalised parameters.
+
+    Args:
+        namespace: The kind of cached result (e.g. "discover")
+        **params: The parameters that determine the result
+
+    Returns:
+        A key of the form "<namespace>:<sha256 of the normalised parameters>"
+    """
+    payload = json.dumps(normalize_value(params), sort_keys=True, default=str)
+    return f"{namespace}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+class DiscoveryCache:
+    """SQLite-backed TTL/LRU cache shared across worker processes.
+
+    Stampede protection works at two levels: within a process, concurrent callers
+    for the same key await a single in-flight computation; across processes, the
+    first worker takes a short-lived lease row and the others wait for its result.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int = 86400,
+        max_entries: int = 1000,
+        lease_seconds: int = 120,
+        poll_interval: float = 0.25
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: Path of the SQLite database file
+            ttl_seconds: Default time-to-live of entries
+            max_entries: Maximum number of entries kept before LRU eviction
+            lease_seconds: How long a worker may hold the compute lease for a key
+            poll_interval: How often waiting workers check for a result
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._local = threading.local()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "waits": 0, "evictions": 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._init_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection to the cache database."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        """Create the cache tables if they do not exist."""
+        conn = self._connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_last_access ON cache_entries (last_access)")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_leases (
+                key TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None if it is missing or expired.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value or None
+        """
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, expires_at = row
+        if expires_at <= now:
+            conn.execute("DELETE FROM cache_entries WHERE key = ? AND expires_at <= ?", (key, now))
+            return None
+
+        conn.execute("UPDATE cache_entries SET last_access = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        """Store a value and evict least recently used entries beyond the size bound.
+
+        Args:
+            key: The cache key
+            value: A JSON-serialisable value
+            ttl_seconds: Time-to-live override for this entry
+        """
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now + ttl, now)
+        )
+        self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries and trim the cache to max_entries."""
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        count = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_entries ORDER BY last_access ASC LIMIT ?)",
+                (excess,)
+            )
+            self.stats["evictions"] += excess
+
+    def delete(self, key: str) -> None:
+        """Remove an entry.
+
+        Args:
+            key: The cache key
+        """
+        self._connection().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def _acquire_lease(self, key: str) -> bool:
+        """Try to become the worker that computes a key."""
+        now = time.time()
+        conn = self._connection()
+        conn.execute("DELETE FROM cache_leases WHERE key = ? AND expires_at <= ?", (key, now))
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO cache_leases (key, owner, expires_at) VALUES (?, ?, ?)",
+            (key, self.owner, now + self.lease_seconds)
+        )
+        return cursor.rowcount == 1
+
+    def _release_lease(self, key: str) -> None:
+        """Release a compute lease held by this worker."""
+        self._connection().execute(
+            "DELETE FROM cache_leases WHERE key = ? AND owner = ?", (key, self.owner)
+        )
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl_seconds: Optional[int] = None
+    ) -> Any:
+        """Return a cached value, computing and storing it once on a miss.
+
+        If `compute` raises, nothing is cached and the exception propagates to
+        every caller waiting on the key. If the request computing the value is
+        cancelled, the callers waiting on it compute the value themselves.
+
+        Args:
+            key: The cache key
+            compute: Coroutine function producing the value
+            ttl_seconds: Time-to-live override for this entry
+
+        Returns:
+            The cached or freshly computed value
+        """
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            self.stats["hits"] += 1
+            return cached
+
+        # Collapse concurrent requests within this process
+        while (inflight := self._inflight.get(key)) is not None:
+            self.stats["waits"] += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _ComputeCancelled:
+                # The leading request went away; the first waiter to wake up takes over
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._compute_once(key, compute, ttl_seconds)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.set_exception(_ComputeCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _compute_once(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl_seconds: Optional[int]
+    ) -> Any:
+        """Compute a value while holding the cross-process lease for the key."""
+        while not await asyncio.to_thread(self._acquire_lease, key):
+            # Another worker is computing this key; wait for its result. If that
+            # worker fails, its lease is released (or expires) and we take over.
+            self.stats["waits"] += 1
+            await asyncio.sleep(self.poll_interval)
+            cached = await asyncio.to_thread(self.get, key)
+            if cached is not None:
+                self.stats["hits"] += 1
+                return cached
+
+        try:
+            # The previous lease holder may have finished just before we took over
+            cached = await asyncio.to_thread(self.get, key)
+            if cached is not None:
+                self.stats["hits"] += 1
+                return cached
+
+            self.stats["misses"] += 1
+            value = await compute()
+            await asyncio.to_thread(self.set, key, value, ttl_seconds)
+            return value
+        finally:
+            await asyncio.to_thread(self._release_lease, key)
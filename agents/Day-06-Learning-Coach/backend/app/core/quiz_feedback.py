@@ -0,0 +1,235 @@
+"""
+Batched feedback generation for quiz attempts.
+
+Grading a quiz is deterministic and happens immediately; the detailed feedback
+written by the LLM is produced here in the background. Attempts submitted at
+about the same time are grouped into one LLM call, attempts with the same
+wrong answers on the same quiz share a single result, and results are cached
+by (quiz_id, wrong-answer pattern) so repeat mistakes never reach the LLM.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# (quiz_id, ((question_index, chosen_answer), ...)) for the questions answered wrongly
+FeedbackKey = Tuple[str, Tuple[Tuple[int, int], ...]]
+
+
+def wrong_answer_pattern(quiz: Dict[str, Any], answers: List[int]) -> Tuple[Tuple[int, int], ...]:
+    """Get the wrong answers of an attempt as (question_index, chosen_answer) pairs.
+
+    Args:
+        quiz: The quiz data
+        answers: The user's answers
+
+    Returns:
+        The wrongly answered questions and the option chosen for each
+    """
+    return tuple(
+        (i, answer)
+        for i, (question, answer) in enumerate(zip(quiz["questions"], answers))
+        if answer != question["correct_answer"]
+    )
+
+
+def feedback_key(quiz_id: str, quiz: Dict[str, Any], answers: List[int]) -> FeedbackKey:
+    """Build the cache key for the feedback on an attempt.
+
+    Args:
+        quiz_id: The ID of the quiz
+        quiz: The quiz data
+        answers: The user's answers
+
+    Returns:
+        The feedback cache key
+    """
+    return (quiz_id, wrong_answer_pattern(quiz, answers))
+
+
+@dataclass
+class FeedbackJob:
+    """Feedback requested for one quiz and wrong-answer pattern."""
+    key: FeedbackKey
+    quiz: Dict[str, Any]
+    answers: List[int]
+    future: asyncio.Future
+    attempt_ids: List[str] = field(default_factory=list)
+
+
+class FeedbackBatcher:
+    """Collects feedback requests and generates them in batches.
+
+    `generate` receives a list of jobs and returns one feedback dict per job (or
+    None where generation failed). `persist` receives (attempt_ids, feedback)
+    pairs for a finished batch and is run in a worker thread so it can write to
+    the database.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[List[FeedbackJob]], Awaitable[List[Optional[Dict[str, Any]]]]],
+        persist: Optional[Callable[[List[Tuple[List[str], Dict[str, Any]]]], None]] = None,
+        fallback: Optional[Dict[str, Any]] = None,
+        max_batch_size: int = 8,
+        max_wait_seconds: float = 0.05,
+        cache_size: int = 1024
+    ):
+        """Initialize the batcher.
+
+        Args:
+            generate: Coroutine function generating feedback for a batch of jobs
+            persist: Function storing finished feedback for the waiting attempts
+            fallback: Feedback used (but not cached) when generation fails
+            max_batch_size: Maximum number of jobs per LLM call
+            max_wait_seconds: How long to wait for more jobs before sending a batch
+            cache_size: Maximum number of cached feedback results
+        """
+        self.generate = generate
+        self.persist = persist
+        self.fallback = fallback or {}
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.cache_size = cache_size
+
+        self._cache: "OrderedDict[FeedbackKey, Dict[str, Any]]" = OrderedDict()
+        self._pending: Dict[FeedbackKey, FeedbackJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.stats = {"hits": 0, "shared": 0, "generated": 0, "batches": 0, "failures": 0}
+
+    def get_cached(self, key: FeedbackKey) -> Optional[Dict[str, Any]]:
+        """Get cached feedback for a key.
+
+        Args:
+            key: The feedback cache key
+
+        Returns:
+            The cached feedback or None
+        """
+        feedback = self._cache.get(key)
+        if feedback is not None:
+            self._cache.move_to_end(key)
+        return feedback
+
+    def _store(self, key: FeedbackKey, feedback: Dict[str, Any]) -> None:
+        """Cache feedback, evicting the least recently used entries."""
+        self._cache[key] = feedback
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def submit(
+        self,
+        key: FeedbackKey,
+        quiz: Dict[str, Any],
+        answers: List[int],
+        attempt_id: Optional[str] = None
+    ) -> asyncio.Future:
+        """Request feedback for an attempt.
+
+        Must be called from a running event loop. Cached feedback is returned as
+        an already completed future and is not persisted by the batcher; the
+        caller stores it with the attempt. The future is shared by every attempt
+        with the same key, so callers should await it through asyncio.shield.
+
+        Args:
+            key: The feedback cache key
+            quiz: The quiz data
+            answers: The user's answers
+            attempt_id: ID of the stored attempt waiting for the feedback
+
+        Returns:
+            A future resolving to the feedback dict
+        """
+        loop = asyncio.get_running_loop()
+
+        cached = self.get_cached(key)
+        if cached is not None:
+            self.stats["hits"] += 1
+            future = loop.create_future()
+            future.set_result(cached)
+            return future
+
+        job = self._pending.get(key)
+        if job is not None:
+            # Same quiz, same mistakes: share the feedback being generated
+            self.stats["shared"] += 1
+        else:
+            job = FeedbackJob(key=key, quiz=quiz, answers=answers, future=loop.create_future())
+            self._pending[key] = job
+            self._ensure_worker()
+            self._queue.put_nowait(job)
+
+        if attempt_id is not None:
+            job.attempt_ids.append(attempt_id)
+        return job.future
+
+    def _ensure_worker(self) -> None:
+        """Start the background worker on the running loop if needed."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _next_batch(self) -> List[FeedbackJob]:
+        """Wait for a job, then collect more until the batch is full or the wait expires."""
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        """Generate feedback for queued jobs, one batch at a time."""
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._process(batch)
+            except Exception as e:
+                logger.error(f"Error processing feedback batch: {str(e)}")
+                for job in batch:
+                    self._pending.pop(job.key, None)
+                    if not job.future.done():
+                        job.future.set_result(self.fallback)
+
+    async def _process(self, batch: List[FeedbackJob]) -> None:
+        """Generate, cache and persist the feedback for one batch."""
+        self.stats["batches"] += 1
+        try:
+            results = await self.generate(batch)
+        except Exception as e:
+            logger.error(f"Error generating feedback batch: {str(e)}")
+            results = [None] * len(batch)
+
+        updates = []
+        for job, feedback in zip(batch, results):
+            if feedback is None:
+                self.stats["failures"] += 1
+                feedback = self.fallback
+            else:
+                self.stats["generated"] += 1
+                self._store(job.key, feedback)
+            # Later submissions with this key now hit the cache
+            self._pending.pop(job.key, None)
+            if job.attempt_ids:
+                updates.append((job.attempt_ids, feedback))
+            # Waiters use asyncio.shield, but never let a cancelled future stop the batch from persisting
+            if not job.future.done():
+                job.future.set_result(feedback)
+
+        if updates and self.persist is not None:
+            try:
+                await asyncio.to_thread(self.persist, updates)
+            except Exception as e:
+                logger.error(f"Error persisting quiz feedback: {str(e)}")
@@ -5,16 +5,22 @@ This module provides functionality for generating educational quizzes on various
 with different difficulty levels and question types.
 """
 
+import asyncio
+import json
 import logging
+import re
 import uuid
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field, field_validator
 
+from app.core.config import settings
+from app.core.quiz_feedback import FeedbackBatcher, FeedbackJob, feedback_key
+
 
 logger = logging.getLogger(__name__)
 
@@ -113,9 +119,8 @@ class QuizGenerator:
         self.llm = ChatOpenAI(model=model_name, temperature=0.2, api_key=api_key)
         self.output_parser = JsonOutputParser(pydantic_object=QuizOutput)
 
-        # In-memory storage for quizzes and results
+        # In-memory storage for quizzes; attempts are stored in the QuizAttempt table
         self.quizzes = {}
-        self.quiz_results = {}
 
         # Add sample quizzes for development
         self._add_sample_quizzes()
@@ -168,34 +173,46 @@ class QuizGenerator:
         # Create the chain
         self.chain = self.prompt | self.llm | self.output_parser
 
-        # Create the prompt template for quiz evaluation
-        evaluate_template = """
-        You are a Learning Coach that evaluates quiz responses.
-
-        Evaluate the user's answers to the following quiz:
+        # Create the prompt template for feedback on a batch of quiz attempts
+        feedback_template = """
+        You are a Learning Coach that gives feedback on quiz attempts.
 
-        Quiz: {quiz}
+        Below are {num_attempts} quiz attempts, each with the quiz topic and the
+        questions the user answered incorrectly (with the option they chose and the
+        correct option).
 
-        User's answers: {answers}
+        {attempts}
 
-        For each question, determine if the user's answer is correct and provide feedback.
-        Calculate the overall score as a percentage.
-        Identify areas of strength and weakness based on the answers.
-        Provide suggestions for further learning based on the results.
+        For each attempt, identify areas of strength and weakness based on the answers
+        and provide suggestions for further learning.
 
         {format_instructions}
         """
 
-        self.evaluate_prompt = PromptTemplate(
-            template=evaluate_template,
-            input_variables=["quiz", "answers"],
+        self.feedback_prompt = PromptTemplate(
+            template=feedback_template,
+            input_variables=["num_attempts", "attempts"],
             partial_variables={
-                "format_instructions": "Return a JSON object with the following structure: { 'score': float, 'correct_answers': int, 'total_questions': int, 'feedback': { 'strengths': [string], 'weaknesses': [string], 'suggestions': [string] }, 'question_feedback': [{ 'question_index': int, 'correct': boolean, 'feedback': string }] }"
+                "format_instructions": "Return a JSON array with one object per attempt, in order, with the following structure: [{ 'attempt': int, 'strengths': [string], 'weaknesses': [string], 'suggestions': [string] }]"
             }
         )
 
-        # Create the evaluation chain
-        self.evaluate_chain = self.evaluate_prompt | self.llm
+        # Create the feedback chain
+        self.feedback_chain = self.feedback_prompt | self.llm
+
+        # Feedback is generated in the background, batched across submissions
+        self.feedback_batcher = FeedbackBatcher(
+            generate=self._generate_feedback_batch,
+            persist=self._store_feedback,
+            fallback={
+                "strengths": ["You attempted the quiz"],
+                "weaknesses": ["Some areas need improvement"],
+                "suggestions": ["Review the topic and try again"]
+            },
+            max_batch_size=int(settings.QUIZ_FEEDBACK_BATCH_SIZE),
+            max_wait_seconds=float(settings.QUIZ_FEEDBACK_BATCH_WAIT_SECONDS),
+            cache_size=int(settings.QUIZ_FEEDBACK_CACHE_SIZE)
+        )
 
         logger.info(f"Quiz generator initialized with model: {model_name}")
 
@@ -437,24 +454,51 @@ class QuizGenerator:
             logger.info(f"Generated fallback quiz with ID: {quiz_id}")
             return fallback_quiz
 
-    async def evaluate_quiz(
-        self,
-        quiz_id: str,
-        answers: List[int],
-        user_id: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """Evaluate a quiz attempt.
+    def _grade_answers(self, quiz: Dict[str, Any], answers: List[int]) -> Dict[str, Any]:
+        """Grade answers against the quiz's answer key.
 
         Args:
-            quiz_id: The ID of the quiz to evaluate
+            quiz: The quiz data
             answers: The user's answers (indices)
-            user_id: Optional user ID to associate with the result
 
         Returns:
-            Dict containing the evaluation results
+            Dict with the score, number of correct answers and per-question feedback
         """
-        logger.info(f"Evaluating quiz with ID: {quiz_id}")
+        correct_answers = 0
+        question_feedback = []
+
+        for i, (question, answer) in enumerate(zip(quiz["questions"], answers)):
+            is_correct = answer == question["correct_answer"]
+            if is_correct:
+                correct_answers += 1
+
+            feedback = question["explanation"] if is_correct else f"The correct answer is: {question['options'][question['correct_answer']]}. {question['explanation']}"
+            question_feedback.append({
+                "question_index": i,
+                "correct": is_correct,
+                "feedback": feedback
+            })
+
+        total_questions = len(quiz["questions"])
+        score = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
+
+        return {
+            "score": score,
+            "correct_answers": correct_answers,
+            "total_questions": total_questions,
+            "question_feedback": question_feedback
+        }
+
+    def _validate_attempt(self, quiz_id: str, answers: List[int]) -> Dict[str, Any]:
+        """Look up a quiz and check the number of answers.
+
+        Args:
+            quiz_id: The ID of the quiz
+            answers: The user's answers
 
+        Returns:
+            The quiz data
+        """
         # Check if the quiz exists
         if quiz_id not in self.quizzes:
             logger.error(f"Quiz with ID {quiz_id} not found")
@@ -467,134 +511,202 @@ class QuizGenerator:
             logger.error(f"Number of answers ({len(answers)}) does not match number of questions ({len(quiz['questions'])})")
             raise ValueError(f"Number of answers ({len(answers)}) does not match number of questions ({len(quiz['questions'])})")
 
-        try:
-            # Simple evaluation logic
-            correct_answers = 0
-            question_feedback = []
-
-            for i, (question, answer) in enumerate(zip(quiz["questions"], answers)):
-                is_correct = answer == question["correct_answer"]
-                if is_correct:
-                    correct_answers += 1
-
-                feedback = question["explanation"] if is_correct else f"The correct answer is: {question['options'][question['correct_answer']]}. {question['explanation']}"
-                question_feedback.append({
-                    "question_index": i,
-                    "correct": is_correct,
-                    "feedback": feedback
-                })
-
-            total_questions = len(quiz["questions"])
-            score = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
-
-            # For more detailed feedback, use the LLM
-            detailed_feedback = await self._generate_detailed_feedback(quiz, answers)
-
-            # Combine basic and detailed feedback
-            result = {
-                "quiz_id": quiz_id,
-                "user_id": user_id,
-                "score": score,
-                "correct_answers": correct_answers,
-                "total_questions": total_questions,
-                "answers": answers,
-                "feedback": detailed_feedback,
-                "question_feedback": question_feedback,
-                "completed_at": datetime.utcnow().isoformat()
-            }
+        return quiz
 
-            # Store the result
-            result_id = str(uuid.uuid4())
-            self.quiz_results[result_id] = result
+    def _save_attempt(self, result: Dict[str, Any]) -> Optional[str]:
+        """Store a graded attempt in the QuizAttempt table.
 
-            logger.info(f"Evaluated quiz with score: {score:.1f}%")
-            return result
+        Args:
+            result: The graded attempt
+
+        Returns:
+            The ID of the stored attempt, or None if it could not be saved
+        """
+        from app.db.base import SessionLocal
+        from app.models.quiz import QuizAttempt as QuizAttemptModel
+
+        user_id = result.get("user_id")
+        db = SessionLocal()
+        try:
+            attempt = QuizAttemptModel(
+                id=str(uuid.uuid4()),
+                quiz_id=result["quiz_id"],
+                user_id=int(user_id) if user_id and str(user_id).isdigit() else None,
+                answers=result["answers"],
+                score=result["score"],
+                correct_answers=result["correct_answers"],
+                total_questions=result["total_questions"],
+                feedback=result.get("feedback") or {},
+                completed_at=datetime.fromisoformat(result["completed_at"])
+            )
+            db.add(attempt)
+            db.commit()
+            return attempt.id
         except Exception as e:
-            logger.error(f"Error evaluating quiz: {str(e)}")
-            # Return a simplified result if evaluation fails
-            return {
-                "quiz_id": quiz_id,
-                "user_id": user_id,
-                "score": 0,
-                "correct_answers": 0,
-                "total_questions": len(quiz["questions"]),
-                "answers": answers,
-                "feedback": {
-                    "strengths": [],
-                    "weaknesses": [f"Unable to evaluate quiz: {str(e)}"],
-                    "suggestions": ["Try taking the quiz again"]
-                },
-                "completed_at": datetime.utcnow().isoformat()
-            }
+            db.rollback()
+            logger.error(f"Error saving quiz attempt to database: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+    def _store_feedback(self, updates: List[Tuple[List[str], Dict[str, Any]]]) -> None:
+        """Write generated feedback to the waiting attempts in one transaction.
+
+        Args:
+            updates: (attempt IDs, feedback) pairs
+        """
+        from app.db.base import SessionLocal
+        from app.models.quiz import QuizAttempt as QuizAttemptModel
+
+        feedback_by_attempt = {
+            attempt_id: feedback
+            for attempt_ids, feedback in updates
+            for attempt_id in attempt_ids
+        }
+
+        db = SessionLocal()
+        try:
+            attempts = db.query(QuizAttemptModel).filter(
+                QuizAttemptModel.id.in_(list(feedback_by_attempt))
+            ).all()
+            for attempt in attempts:
+                attempt.feedback = feedback_by_attempt[attempt.id]
+            db.commit()
+            logger.info(f"Stored feedback for {len(attempts)} quiz attempts")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
 
-    async def _generate_detailed_feedback(
+    async def evaluate_quiz(
         self,
-        quiz: Dict[str, Any],
-        answers: List[int]
+        quiz_id: str,
+        answers: List[int],
+        user_id: Optional[str] = None,
+        wait_for_feedback: bool = False
     ) -> Dict[str, Any]:
-        """Generate detailed feedback for a quiz attempt.
+        """Evaluate a quiz attempt.
+
+        The attempt is graded against the answer key and stored straight away.
+        Detailed feedback is generated in the background and written to the
+        stored attempt; until then the result has `feedback_status` "pending".
 
         Args:
-            quiz: The quiz data
-            answers: The user's answers
+            quiz_id: The ID of the quiz to evaluate
+            answers: The user's answers (indices)
+            user_id: Optional user ID to associate with the result
+            wait_for_feedback: Wait for the detailed feedback before returning
 
         Returns:
-            Dict containing detailed feedback
+            Dict containing the evaluation results
         """
-        try:
-            # Convert answers to a format that includes the selected option text
-            formatted_answers = []
-            for i, (question, answer_idx) in enumerate(zip(quiz["questions"], answers)):
+        logger.info(f"Evaluating quiz with ID: {quiz_id}")
+
+        quiz = self._validate_attempt(quiz_id, answers)
+
+        result = {
+            "quiz_id": quiz_id,
+            "user_id": user_id,
+            "answers": answers,
+            **self._grade_answers(quiz, answers),
+            "completed_at": datetime.utcnow().isoformat()
+        }
+
+        # Attempts with the same wrong answers on this quiz share their feedback
+        key = feedback_key(quiz_id, quiz, answers)
+        cached = self.feedback_batcher.get_cached(key)
+        result["feedback"] = cached or {}
+        result["feedback_status"] = "ready" if cached else "pending"
+
+        # Store the result
+        result["id"] = await asyncio.to_thread(self._save_attempt, result)
+
+        if cached is None:
+            future = self.feedback_batcher.submit(key, quiz, answers, attempt_id=result["id"])
+            if wait_for_feedback:
+                # Shared with other attempts: a cancelled request must not cancel their feedback
+                result["feedback"] = await asyncio.shield(future)
+                result["feedback_status"] = "ready"
+
+        logger.info(f"Evaluated quiz with score: {result['score']:.1f}%")
+        return result
+
+    async def _generate_feedback_batch(self, jobs: List[FeedbackJob]) -> List[Optional[Dict[str, Any]]]:
+        """Generate detailed feedback for a batch of quiz attempts with one LLM call.
+
+        Args:
+            jobs: The attempts to give feedback on
+
+        Returns:
+            One feedback dict per job, or None where the response had no usable feedback
+        """
+        attempts = []
+        for i, job in enumerate(jobs):
+            quiz = job.quiz
+            mistakes = []
+            for question_index, answer_idx in job.key[1]:
+                question = quiz["questions"][question_index]
                 if 0 <= answer_idx < len(question["options"]):
                     selected_option = question["options"][answer_idx]
-                    formatted_answers.append(f"Q{i+1}: {selected_option}")
                 else:
-                    formatted_answers.append(f"Q{i+1}: Invalid answer")
-
-            # Get detailed feedback from the LLM
-            response = await self.evaluate_chain.ainvoke({
-                "quiz": quiz,
-                "answers": formatted_answers
-            })
+                    selected_option = "Invalid answer"
+                correct_option = question["options"][question["correct_answer"]]
+                mistakes.append(
+                    f"  - Q{question_index + 1}: {question['question']} | chose: {selected_option} | correct: {correct_option}"
+                )
+
+            attempts.append(
+                f"Attempt {i}: quiz \"{quiz.get('title', '')}\" on {quiz.get('topic', '')} "
+                f"({quiz.get('difficulty', 'beginner')}), "
+                f"{len(quiz['questions']) - len(mistakes)}/{len(quiz['questions'])} correct\n"
+                + ("\n".join(mistakes) if mistakes else "  - No incorrect answers")
+            )
+
+        logger.info(f"Generating feedback for {len(jobs)} quiz attempts")
+        response = await self.feedback_chain.ainvoke({
+            "num_attempts": len(jobs),
+            "attempts": "\n\n".join(attempts)
+        })
+
+        parsed = self._parse_feedback_json(response.content)
+        if isinstance(parsed, dict):
+            parsed = [parsed]
+        if not isinstance(parsed, list):
+            return [None] * len(jobs)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        for position, item in enumerate(parsed):
+            if not isinstance(item, dict):
+                continue
+            index = item.get("attempt", position)
+            if isinstance(index, int) and 0 <= index < len(jobs):
+                results[index] = {
+                    "strengths": item.get("strengths", []),
+                    "weaknesses": item.get("weaknesses", []),
+                    "suggestions": item.get("suggestions", [])
+                }
+        return results
 
-            # Extract the JSON from the response
-            import json
-            import re
-
-            # Try to find JSON in the response
-            json_match = re.search(r'```json\n([\s\S]*?)\n```', response.content)
-            if json_match:
-                feedback_json = json.loads(json_match.group(1))
-            else:
-                # Try to find JSON without markdown code blocks
-                try:
-                    feedback_json = json.loads(response.content)
-                except:
-                    # If all else fails, extract just the feedback part
-                    feedback_json = {
-                        "strengths": ["You attempted the quiz"],
-                        "weaknesses": ["Some areas need improvement"],
-                        "suggestions": ["Review the topic and try again"]
-                    }
+    def _parse_feedback_json(self, content: str) -> Any:
+        """Extract the JSON payload from an LLM response.
 
-            # Ensure the feedback has the expected structure
-            if not isinstance(feedback_json, dict):
-                feedback_json = {}
+        Args:
+            content: The response text
 
-            feedback = {
-                "strengths": feedback_json.get("strengths", []),
-                "weaknesses": feedback_json.get("weaknesses", []),
-                "suggestions": feedback_json.get("suggestions", [])
-            }
+        Returns:
+            The parsed JSON, or None if the response contains no valid JSON
+        """
+        # Try to find JSON in the response
+        json_match = re.search(r'```(?:json)?\n([\s\S]*?)\n```', content)
+        if json_match:
+            content = json_match.group(1)
 
-            return feedback
-        except Exception as e:
-            logger.error(f"Error generating detailed feedback: {str(e)}")
-            return {
-                "strengths": ["You attempted the quiz"],
-                "weaknesses": ["Some areas need improvement"],
-                "suggestions": ["Review the topic and try again"]
-            }
+        try:
+            return json.loads(content)
+        except ValueError:
+            logger.error("Could not parse feedback JSON from the LLM response")
+            return None
 
     def get_quiz(self, quiz_id: str) -> Dict[str, Any]:
         """Get a quiz by ID.
@@ -681,6 +793,64 @@ class QuizGenerator:
         # Apply pagination
         return filtered_quizzes[skip:skip + limit]
 
+    def _attempt_to_result(self, attempt: Any) -> Dict[str, Any]:
+        """Convert a stored QuizAttempt into a result dict.
+
+        Args:
+            attempt: The QuizAttempt record
+
+        Returns:
+            Dict containing the quiz result
+        """
+        result = {
+            "id": attempt.id,
+            "quiz_id": attempt.quiz_id,
+            "user_id": str(attempt.user_id) if attempt.user_id else None,
+            "score": attempt.score,
+            "correct_answers": attempt.correct_answers,
+            "total_questions": attempt.total_questions,
+            "answers": attempt.answers or [],
+            "feedback": attempt.feedback or {},
+            "feedback_status": "ready" if attempt.feedback else "pending",
+            "completed_at": attempt.completed_at.isoformat() if attempt.completed_at else None
+        }
+
+        # Per-question feedback is deterministic, so it is recomputed rather than stored
+        quiz = self.quizzes.get(attempt.quiz_id)
+        if quiz and len(result["answers"]) == len(quiz["questions"]):
+            result["question_feedback"] = self._grade_answers(quiz, result["answers"])["question_feedback"]
+
+        return result
+
+    def _query_attempts(self, quiz_id: Optional[str] = None, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Load stored attempts, optionally filtered by quiz and user.
+
+        Args:
+            quiz_id: Optional quiz ID to filter by
+            user_id: Optional user ID to filter by
+
+        Returns:
+            List of quiz results, oldest first
+        """
+        from app.db.base import SessionLocal
+        from app.models.quiz import QuizAttempt as QuizAttemptModel
+
+        db = SessionLocal()
+        try:
+            query = db.query(QuizAttemptModel)
+            if quiz_id:
+                query = query.filter(QuizAttemptModel.quiz_id == quiz_id)
+            if user_id:
+                if not str(user_id).isdigit():
+                    return []
+                query = query.filter(QuizAttemptModel.user_id == int(user_id))
+            return [
+                self._attempt_to_result(attempt)
+                for attempt in query.order_by(QuizAttemptModel.completed_at).all()
+            ]
+        finally:
+            db.close()
+
     def get_quiz_result(self, result_id: str) -> Dict[str, Any]:
         """Get a quiz result by ID.
 
@@ -690,13 +860,20 @@ class QuizGenerator:
         Returns:
             Dict containing the quiz result
         """
-        logger.info(f"Retrieving quiz result with ID: {result_id}")
+        from app.db.base import SessionLocal
+        from app.models.quiz import QuizAttempt as QuizAttemptModel
 
-        if result_id not in self.quiz_results:
-            logger.error(f"Quiz result with ID {result_id} not found")
-            raise ValueError(f"Quiz result with ID {result_id} not found")
+        logger.info(f"Retrieving quiz result with ID: {result_id}")
 
-        return self.quiz_results[result_id]
+        db = SessionLocal()
+        try:
+            attempt = db.query(QuizAttemptModel).filter(QuizAttemptModel.id == result_id).first()
+            if attempt is None:
+                logger.error(f"Quiz result with ID {result_id} not found")
+                raise ValueError(f"Quiz result with ID {result_id} not found")
+            return self._attempt_to_result(attempt)
+        finally:
+            db.close()
 
     def get_user_quiz_results(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all quiz results for a user.
@@ -708,7 +885,7 @@ class QuizGenerator:
             List of quiz results
         """
         logger.info(f"Retrieving all quiz results for user: {user_id}")
-        return [result for result in self.quiz_results.values() if result.get("user_id") == user_id]
+        return self._query_attempts(user_id=user_id)
 
     def get_quiz_attempts(self, quiz_id: str, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all attempts for a specific quiz.
@@ -727,22 +904,9 @@ class QuizGenerator:
             logger.error(f"Quiz with ID {quiz_id} not found")
             raise ValueError(f"Quiz with ID {quiz_id} not found")
 
-        # Filter results by quiz ID
-        results = [
-            result for result in self.quiz_results.values()
-            if result.get("quiz_id") == quiz_id
-        ]
-
-        # Further filter by user ID if provided
-        if user_id:
-            results = [
-                result for result in results
-                if result.get("user_id") == user_id
-            ]
-
         # Convert to the expected format
         attempts = []
-        for result in results:
+        for result in self._query_attempts(quiz_id=quiz_id, user_id=user_id):
             attempts.append({
                 "quiz_id": result.get("quiz_id"),
                 "user_id": result.get("user_id"),
@@ -762,6 +926,9 @@ class QuizGenerator:
     ) -> Dict[str, Any]:
         """Submit a quiz attempt and get the results.
 
+        Synchronous variant of evaluate_quiz with generic feedback instead of
+        LLM-generated feedback.
+
         Args:
             quiz_id: The ID of the quiz
             user_id: The ID of the user
@@ -772,57 +939,27 @@ class QuizGenerator:
         """
         logger.info(f"Submitting quiz attempt for quiz ID: {quiz_id}")
 
-        # Check if the quiz exists
-        if quiz_id not in self.quizzes:
-            logger.error(f"Quiz with ID {quiz_id} not found")
-            raise ValueError(f"Quiz with ID {quiz_id} not found")
-
-        quiz = self.quizzes[quiz_id]
-
-        # Basic validation
-        if len(answers) != len(quiz["questions"]):
-            logger.error(f"Number of answers ({len(answers)}) does not match number of questions ({len(quiz['questions'])})")
-            raise ValueError(f"Number of answers ({len(answers)}) does not match number of questions ({len(quiz['questions'])})")
-
-        # Simple evaluation logic
-        correct_answers = 0
-        question_feedback = []
-
-        for i, (question, answer) in enumerate(zip(quiz["questions"], answers)):
-            is_correct = answer == question["correct_answer"]
-            if is_correct:
-                correct_answers += 1
-
-            feedback = question["explanation"] if is_correct else f"The correct answer is: {question['options'][question['correct_answer']]}. {question['explanation']}"
-            question_feedback.append({
-                "question_index": i,
-                "correct": is_correct,
-                "feedback": feedback
-            })
-
-        total_questions = len(quiz["questions"])
-        score = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
+        quiz = self._validate_attempt(quiz_id, answers)
+        graded = self._grade_answers(quiz, answers)
+        score = graded["score"]
 
         # Create the result
         result = {
             "quiz_id": quiz_id,
             "user_id": user_id,
-            "score": score,
-            "correct_answers": correct_answers,
-            "total_questions": total_questions,
             "answers": answers,
+            **graded,
             "feedback": {
                 "strengths": ["Good attempt!"] if score >= 50 else [],
                 "weaknesses": ["Need more practice"] if score < 50 else [],
                 "suggestions": ["Review the material and try again"]
             },
-            "question_feedback": question_feedback,
+            "feedback_status": "ready",
             "completed_at": datetime.utcnow().isoformat()
         }
 
         # Store the result
-        result_id = str(uuid.uuid4())
-        self.quiz_results[result_id] = result
+        result["id"] = self._save_attempt(result)
 
         logger.info(f"Evaluated quiz with score: {score:.1f}%")
         return result
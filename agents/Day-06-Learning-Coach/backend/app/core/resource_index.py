@@ -0,0 +1,464 @@
+"""
+Indexed resource catalogue for the Learning Coach Agent.
+
+This module keeps an inverted index over resource titles, descriptions and topics
+(scored with BM25), hash indexes on type, difficulty and topic, title-ordered
+listings for every combination of filters and precomputed popularity scores. All
+structures are updated incrementally as resources are added or rated, so lookups
+never scan the whole catalogue; `add_many` builds them with one sort per list when
+a catalogue is loaded.
+"""
+
+import bisect
+import itertools
+import math
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Field weights used when counting term frequencies (BM25F-style)
+FIELD_WEIGHTS = {"title": 3.0, "topics": 2.0, "description": 1.0}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Shortest trailing query token that is also matched as a prefix
+MIN_PREFIX_LENGTH = 3
+
+# Most vocabulary terms a partially typed word expands to (the most common ones)
+MAX_PREFIX_EXPANSIONS = 8
+
+# How far the catalogue size may drift before the average document length used
+# for scoring is recomputed (which re-sorts the impact-ordered postings)
+STATISTICS_REFRESH_RATIO = 0.1
+
+# Prior used for the Bayesian average rating (as if every resource had
+# POPULARITY_PRIOR_COUNT ratings of POPULARITY_PRIOR_MEAN)
+POPULARITY_PRIOR_MEAN = 3.0
+POPULARITY_PRIOR_COUNT = 2
+
+# (topic, type, difficulty) filter combination of a listing; None matches anything
+ListingKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lower-cased word tokens.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens
+    """
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class ResourceIndex:
+    """In-memory indexes over learning resources."""
+
+    def __init__(self):
+        """Initialize empty indexes."""
+        # Inverted index: token -> {resource_id: weighted term frequency}
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.doc_lengths: Dict[str, float] = {}
+        self.total_length = 0.0
+        self.vocabulary: List[str] = []
+
+        # Postings ordered by their BM25 term-frequency component, best first, as
+        # (-component, resource_id); built on first use and then kept up to date
+        self.impacts: Dict[str, List[Tuple[float, str]]] = {}
+        self._scoring_count = 0
+        self._scoring_average = 0.0
+
+        # Hash indexes on exact (lower-cased) field values
+        self.by_type: Dict[str, Set[str]] = defaultdict(set)
+        self.by_difficulty: Dict[str, Set[str]] = defaultdict(set)
+        self.by_topic: Dict[str, Set[str]] = defaultdict(set)
+
+        # Resources ordered by (title, id) for every filter combination
+        self.listings: Dict[ListingKey, List[Tuple[str, str]]] = defaultdict(list)
+
+        # Popularity: resource_id -> (rating count, rating sum, score), plus
+        # per-topic lists ordered by (-score, title, id) for recommendations
+        self.popularity: Dict[str, Tuple[int, int, float]] = {}
+        self.topic_popularity: Dict[str, List[Tuple[float, str, str]]] = defaultdict(list)
+
+        self._indexed: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def _field_terms(self, resource: Dict[str, Any]) -> Dict[str, float]:
+        """Get weighted term frequencies for a resource."""
+        terms: Dict[str, float] = defaultdict(float)
+        for token in tokenize(resource.get("title", "")):
+            terms[token] += FIELD_WEIGHTS["title"]
+        for topic in resource.get("topics", []):
+            for token in tokenize(topic):
+                terms[token] += FIELD_WEIGHTS["topics"]
+        for token in tokenize(resource.get("description", "")):
+            terms[token] += FIELD_WEIGHTS["description"]
+        return terms
+
+    def add(self, resource: Dict[str, Any]) -> None:
+        """
+        Index a resource, replacing any previous version with the same ID.
+
+        Args:
+            resource: Resource data to index
+        """
+        self._add(resource, keep_sorted=True)
+
+    def add_many(self, resources: Iterable[Dict[str, Any]]) -> None:
+        """
+        Index many resources at once, sorting each affected list only once.
+
+        Args:
+            resources: Resource data to index
+        """
+        for resource in resources:
+            self._add(resource, keep_sorted=False)
+
+        self.vocabulary = sorted(self.postings)
+        for entries in self.listings.values():
+            entries.sort()
+        for entries in self.topic_popularity.values():
+            entries.sort()
+        self._refresh_statistics()
+
+    def _add(self, resource: Dict[str, Any], keep_sorted: bool) -> None:
+        """Index a resource, either keeping every list sorted or appending for a later sort."""
+        resource_id = resource["id"]
+        if resource_id in self._indexed:
+            self.remove(resource_id)
+
+        # The indexed snapshot is what remove() uses to undo this entry, even if
+        # the caller later mutates the resource dict
+        snapshot = {
+            "title": resource.get("title", ""),
+            "description": resource.get("description", ""),
+            "type": resource.get("type", ""),
+            "difficulty": resource.get("difficulty", ""),
+            "topics": list(resource.get("topics", [])),
+        }
+        self._indexed[resource_id] = snapshot
+
+        terms = self._field_terms(snapshot)
+        length = sum(terms.values())
+        self.doc_lengths[resource_id] = length
+        self.total_length += length
+        postings = self.postings
+        for token, frequency in terms.items():
+            if keep_sorted and token not in postings:
+                bisect.insort(self.vocabulary, token)
+            postings[token][resource_id] = frequency
+        if self.impacts:
+            for token, frequency in terms.items():
+                impacts = self.impacts.get(token)
+                if impacts is not None:
+                    bisect.insort(impacts, self._impact_entry(resource_id, frequency))
+
+        insert = bisect.insort if keep_sorted else list.append
+
+        self.popularity.setdefault(resource_id, (0, 0, self._popularity_score(0, 0)))
+        popularity_entry = self._popularity_entry(resource_id)
+        for field, key in self._bucket_keys(snapshot):
+            self._bucket_index(field)[key].add(resource_id)
+            if field == "topic":
+                insert(self.topic_popularity[key], popularity_entry)
+
+        title_entry = (snapshot["title"], resource_id)
+        for listing_key in self._listing_keys(snapshot):
+            insert(self.listings[listing_key], title_entry)
+
+    def remove(self, resource_id: str) -> None:
+        """
+        Remove a resource from all indexes.
+
+        Args:
+            resource_id: ID of the resource to remove
+        """
+        snapshot = self._indexed.pop(resource_id, None)
+        if snapshot is None:
+            return
+
+        for token in self._field_terms(snapshot):
+            postings = self.postings.get(token)
+            if postings is None:
+                continue
+            frequency = postings.pop(resource_id, None)
+            if token in self.impacts and frequency is not None:
+                self._remove_sorted(self.impacts, token, self._impact_entry(resource_id, frequency))
+            if not postings:
+                del self.postings[token]
+                self.impacts.pop(token, None)
+                position = bisect.bisect_left(self.vocabulary, token)
+                if position < len(self.vocabulary) and self.vocabulary[position] == token:
+                    del self.vocabulary[position]
+        self.total_length -= self.doc_lengths.pop(resource_id, 0.0)
+
+        popularity_entry = (-self.popularity_score(resource_id), snapshot["title"], resource_id)
+        for field, key in self._bucket_keys(snapshot):
+            index = self._bucket_index(field)
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.discard(resource_id)
+                if not bucket:
+                    del index[key]
+            if field == "topic":
+                self._remove_sorted(self.topic_popularity, key, popularity_entry)
+
+        title_entry = (snapshot["title"], resource_id)
+        for listing_key in self._listing_keys(snapshot):
+            self._remove_sorted(self.listings, listing_key, title_entry)
+
+    @staticmethod
+    def _bucket_keys(snapshot: Dict[str, Any]) -> Set[Tuple[str, str]]:
+        """Get the (field, key) hash index buckets a resource belongs to."""
+        keys = {("type", snapshot["type"].lower()), ("difficulty", snapshot["difficulty"].lower())}
+        keys.update(("topic", topic.lower()) for topic in snapshot["topics"])
+        return keys
+
+    @staticmethod
+    def _listing_keys(snapshot: Dict[str, Any]) -> Set[ListingKey]:
+        """Get every filter combination whose listing includes a resource."""
+        topics = [None] + sorted({topic.lower() for topic in snapshot["topics"]})
+        types = [None, snapshot["type"].lower()]
+        difficulties = [None, snapshot["difficulty"].lower()]
+        return set(itertools.product(topics, types, difficulties))
+
+    def _bucket_index(self, field: str) -> Dict[str, Set[str]]:
+        """Get the hash index for a field."""
+        return {"type": self.by_type, "difficulty": self.by_difficulty, "topic": self.by_topic}[field]
+
+    @staticmethod
+    def _remove_sorted(lists: Dict[Any, List[Any]], key: Any, entry: Any) -> None:
+        """Remove an entry from one of a dict of sorted lists, dropping empty lists."""
+        entries = lists.get(key)
+        if entries is None:
+            return
+        position = bisect.bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+        if not entries:
+            del lists[key]
+
+    def _popularity_entry(self, resource_id: str) -> Tuple[float, str, str]:
+        """Sort key of a resource in the per-topic popularity lists."""
+        return (-self.popularity_score(resource_id), self._indexed[resource_id]["title"], resource_id)
+
+    @staticmethod
+    def _popularity_score(count: int, total: int) -> float:
+        """Bayesian average rating, so a single 5-star rating does not dominate."""
+        return (POPULARITY_PRIOR_MEAN * POPULARITY_PRIOR_COUNT + total) / (POPULARITY_PRIOR_COUNT + count)
+
+    def update_rating(self, resource_id: str, rating: int, previous_rating: Optional[int] = None) -> None:
+        """
+        Update the popularity score of a resource for a new or changed rating.
+
+        Args:
+            resource_id: ID of the rated resource
+            rating: The new rating value
+            previous_rating: The user's previous rating of this resource, if any
+        """
+        snapshot = self._indexed.get(resource_id)
+        if snapshot is None:
+            return
+
+        old_entry = self._popularity_entry(resource_id)
+        count, total, _ = self.popularity.get(resource_id, (0, 0, 0.0))
+        if previous_rating is None:
+            count += 1
+            total += rating
+        else:
+            total += rating - previous_rating
+        self.popularity[resource_id] = (count, total, self._popularity_score(count, total))
+
+        new_entry = self._popularity_entry(resource_id)
+        for topic in {topic.lower() for topic in snapshot["topics"]}:
+            self._remove_sorted(self.topic_popularity, topic, old_entry)
+            bisect.insort(self.topic_popularity[topic], new_entry)
+
+    def popularity_score(self, resource_id: str) -> float:
+        """Get the precomputed popularity score of a resource."""
+        entry = self.popularity.get(resource_id)
+        return entry[2] if entry else self._popularity_score(0, 0)
+
+    def list_by_title(
+        self,
+        topic: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[str]:
+        """
+        Get a page of resource IDs matching the filters, ordered by title.
+
+        Every filter combination has its own title-ordered listing, so a page at
+        any offset is a slice.
+
+        Args:
+            topic: Optional topic to filter by
+            resource_type: Optional resource type to filter by
+            difficulty: Optional difficulty level to filter by
+            skip: Number of resources to skip
+            limit: Maximum number of resources to return
+
+        Returns:
+            List of resource IDs
+        """
+        key = (
+            topic.lower() if topic else None,
+            resource_type.lower() if resource_type else None,
+            difficulty.lower() if difficulty else None,
+        )
+        listing = self.listings.get(key, [])
+        return [resource_id for _, resource_id in listing[skip:skip + limit]]
+
+    def _refresh_statistics(self) -> None:
+        """Recompute the average document length once the catalogue size has drifted."""
+        count = len(self._indexed)
+        if count == self._scoring_count:
+            return
+        if self._scoring_count and abs(count - self._scoring_count) <= STATISTICS_REFRESH_RATIO * self._scoring_count:
+            return
+        self._scoring_count = count
+        self._scoring_average = self.total_length / count if count else 0.0
+        # Impact order depends on the average length; lists are rebuilt when next needed
+        self.impacts = {}
+
+    def _term_component(self, resource_id: str, frequency: float) -> float:
+        """BM25 term-frequency component of one posting, before multiplying by the IDF."""
+        average_length = self._scoring_average or 1.0
+        length_norm = 1 - BM25_B + BM25_B * self.doc_lengths[resource_id] / average_length
+        return frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * length_norm)
+
+    def _impact_entry(self, resource_id: str, frequency: float) -> Tuple[float, str]:
+        return (-self._term_component(resource_id, frequency), resource_id)
+
+    def _impact_list(self, term: str) -> List[Tuple[float, str]]:
+        """Get the postings of a term ordered by their score component, best first."""
+        impacts = self.impacts.get(term)
+        if impacts is None:
+            impacts = sorted(
+                self._impact_entry(resource_id, frequency)
+                for resource_id, frequency in self.postings[term].items()
+            )
+            self.impacts[term] = impacts
+        return impacts
+
+    def _expand_prefix(self, token: str) -> List[str]:
+        """Get the most common vocabulary terms starting with a token (for partially typed words)."""
+        start = bisect.bisect_left(self.vocabulary, token)
+        end = bisect.bisect_left(self.vocabulary, token + "\uffff", start)
+        matches = self.vocabulary[start:end]
+        if len(matches) > MAX_PREFIX_EXPANSIONS:
+            matches = sorted(matches, key=lambda term: len(self.postings[term]), reverse=True)
+            matches = matches[:MAX_PREFIX_EXPANSIONS]
+        return matches
+
+    def search(self, query: str, limit: int) -> List[Tuple[float, str]]:
+        """
+        Rank resources for a query with BM25.
+
+        The last query token is also matched as a prefix so that partially typed
+        words still find results. Postings are read in impact order (the threshold
+        algorithm): reading stops as soon as no unseen resource can score higher
+        than the current top `limit`, so common terms cost about as much as rare
+        ones. Scores use the average document length as of the last time the
+        catalogue size drifted by more than STATISTICS_REFRESH_RATIO.
+
+        Args:
+            query: Search query
+            limit: Number of top results to return
+
+        Returns:
+            List of (score, resource_id), best first; equal scores are ordered by ID
+        """
+        tokens = tokenize(query)
+        if not tokens or not self._indexed or limit <= 0:
+            return []
+        self._refresh_statistics()
+
+        query_terms = set(tokens)
+        if len(tokens[-1]) >= MIN_PREFIX_LENGTH:
+            query_terms.update(self._expand_prefix(tokens[-1]))
+
+        document_count = len(self._indexed)
+        terms = []
+        for term in query_terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            terms.append((idf, postings, self._impact_list(term)))
+        if not terms:
+            return []
+
+        def score(resource_id: str) -> float:
+            total = 0.0
+            for idf, postings, _ in terms:
+                frequency = postings.get(resource_id)
+                if frequency is not None:
+                    total += idf * self._term_component(resource_id, frequency)
+            return total
+
+        # Best results so far as (-score, resource_id), kept sorted
+        top: List[Tuple[float, str]] = []
+        seen: Set[str] = set()
+        position = 0
+        while True:
+            # Highest score a resource not yet read from any list could still reach
+            bound = 0.0
+            exhausted = True
+            for idf, _, impacts in terms:
+                if position < len(impacts):
+                    bound -= idf * impacts[position][0]
+                    exhausted = False
+            if exhausted or (len(top) >= limit and -top[-1][0] >= bound):
+                break
+
+            for _, _, impacts in terms:
+                if position >= len(impacts):
+                    continue
+                resource_id = impacts[position][1]
+                if resource_id in seen:
+                    continue
+                seen.add(resource_id)
+                entry = (-score(resource_id), resource_id)
+                if len(top) < limit or entry < top[-1]:
+                    bisect.insort(top, entry)
+                    if len(top) > limit:
+                        top.pop()
+            position += 1
+
+        return [(-negative_score, resource_id) for negative_score, resource_id in top]
+
+    def top_by_popularity(self, topic: str, difficulty: Optional[str] = None, limit: int = 5) -> List[str]:
+        """
+        Get the most popular resources for a topic.
+
+        Args:
+            topic: Topic to get resources for
+            difficulty: Optional difficulty level to filter by
+            limit: Maximum number of IDs to return
+
+        Returns:
+            List of resource IDs, most popular first
+        """
+        allowed = self.by_difficulty.get(difficulty.lower(), set()) if difficulty else None
+
+        ranked = []
+        for _, _, resource_id in self.topic_popularity.get(topic.lower(), []):
+            if allowed is not None and resource_id not in allowed:
+                continue
+            ranked.append(resource_id)
+            if len(ranked) >= limit:
+                break
+        return ranked
@@ -8,6 +8,8 @@ from typing import Dict, List, Optional, Any
 
 import logging
 
+from app.core.resource_index import ResourceIndex
+
 logger = logging.getLogger(__name__)
 
 class ResourceManager:
@@ -17,6 +19,7 @@ class ResourceManager:
         """Initialize the resource manager."""
         self.resources = {}
         self.ratings = {}
+        self.index = ResourceIndex()
 
         # Add some sample resources
         self._add_sample_resources()
@@ -139,6 +142,7 @@ class ResourceManager:
 
         for resource in sample_resources:
             self.resources[resource["id"]] = resource
+        self.index.add_many(sample_resources)
 
     def add_resource(self, resource: Dict[str, Any]) -> str:
         """
@@ -158,8 +162,9 @@ class ResourceManager:
         if "created_at" not in resource:
             resource["created_at"] = datetime.now(timezone.utc).isoformat()
 
-        # Store the resource
+        # Store and index the resource
         self.resources[resource["id"]] = resource
+        self.index.add(resource)
 
         logger.info(f"Added resource: {resource['title']} with ID: {resource['id']}")
         return resource["id"]
@@ -212,31 +217,15 @@ class ResourceManager:
         Returns:
             List of resources
         """
-        filtered_resources = list(self.resources.values())
-
-        if topic:
-            filtered_resources = [
-                r for r in filtered_resources
-                if any(t.lower() == topic.lower() for t in r["topics"])
-            ]
-
-        if resource_type:
-            filtered_resources = [
-                r for r in filtered_resources
-                if r["type"].lower() == resource_type.lower()
-            ]
-
-        if difficulty:
-            filtered_resources = [
-                r for r in filtered_resources
-                if r["difficulty"].lower() == difficulty.lower()
-            ]
-
-        # Sort by title
-        filtered_resources.sort(key=lambda r: r["title"])
-
-        # Apply pagination
-        return filtered_resources[skip:skip + limit]
+        # Sorted by title and paginated by the index
+        ids = self.index.list_by_title(
+            topic=topic,
+            resource_type=resource_type,
+            difficulty=difficulty,
+            skip=skip,
+            limit=limit
+        )
+        return [self.resources[resource_id] for resource_id in ids]
 
     def get_resource(self, resource_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -259,6 +248,10 @@ class ResourceManager:
         """
         Search for resources based on a query string.
 
+        Matches whole words in titles, descriptions and topics, with the last word
+        of the query also matched as the start of a word ("pyth" finds "Python").
+        Text inside a word is not matched: "script" does not find "JavaScript".
+
         Args:
             query: Search query
             skip: Number of resources to skip
@@ -267,25 +260,10 @@ class ResourceManager:
         Returns:
             List of matching resources
         """
-        query = query.lower()
+        # Ranked by BM25 relevance over titles, descriptions and topics
+        ranked = self.index.search(query, limit=skip + limit)
 
-        matching_resources = [
-            r for r in self.resources.values()
-            if query in r["title"].lower() or
-               query in r["description"].lower() or
-               any(query in topic.lower() for topic in r["topics"])
-        ]
-
-        # Sort by relevance (simple implementation)
-        matching_resources.sort(
-            key=lambda r: (
-                1 if query in r["title"].lower() else 0,
-                1 if query in r["description"].lower() else 0
-            ),
-            reverse=True
-        )
-
-        return matching_resources[skip:skip + limit]
+        return [self.resources[resource_id] for _, resource_id in ranked[skip:skip + limit]]
 
     def recommend_resources(
         self,
@@ -306,22 +284,21 @@ class ResourceManager:
         Returns:
             List of recommended resources
         """
-        # Simple implementation for now
-        filtered_resources = [
-            r for r in self.resources.values()
-            if any(t.lower() == topic.lower() for t in r["topics"])
-        ]
-
-        if difficulty:
-            filtered_resources = [
-                r for r in filtered_resources
-                if r["difficulty"].lower() == difficulty.lower()
-            ]
-
-        # Sort by type to provide a mix of resource types
-        filtered_resources.sort(key=lambda r: r["type"])
-
-        return filtered_resources[:limit]
+        # Rank by popularity, then take the best resource of each type first to
+        # provide a mix of resource types
+        ranked = self.index.top_by_popularity(topic, difficulty=difficulty, limit=limit * 4)
+        recommended = []
+        seen_types = set()
+        for resource_id in ranked:
+            resource_type = self.resources[resource_id]["type"].lower()
+            if resource_type not in seen_types:
+                seen_types.add(resource_type)
+                recommended.append(resource_id)
+        for resource_id in ranked:
+            if resource_id not in recommended:
+                recommended.append(resource_id)
+
+        return [self.resources[resource_id] for resource_id in recommended[:limit]]
 
     def rate_resource(
         self,
@@ -349,6 +326,9 @@ class ResourceManager:
         if resource_id not in self.ratings:
             self.ratings[resource_id] = {}
 
+        previous = self.ratings[resource_id].get(user_id)
+        self.index.update_rating(resource_id, rating, previous["rating"] if previous else None)
+
         self.ratings[resource_id][user_id] = {
             "rating": rating,
             "feedback": feedback,
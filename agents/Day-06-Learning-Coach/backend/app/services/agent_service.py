@@ -4,7 +4,7 @@ Agent service for the Learning Coach Agent.
 
 import logging
 import os
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional
 
 from app.core.agent import LearningCoachAgent
 
@@ -125,3 +125,45 @@ class AgentService:
                 "response_type": "error",
                 "context": context
             }
+
+    async def stream_user_input(
+        self, user_input: str, user_id: Optional[int] = None, context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Process user input, yielding progress events and partial responses.
+
+        Args:
+            user_input: The user's input text
+            user_id: Optional user ID for personalized responses
+            context: Optional context information
+
+        Yields:
+            Progress events from the agent, ending with a "final" event that
+            carries the same payload as process_user_input
+        """
+        # The mock implementation has nothing to stream
+        if self.use_mock:
+            response = await self.process_user_input(user_input, user_id, context)
+            yield {"event": "final", **response}
+            return
+
+        # Initialize context if not provided
+        if context is None:
+            context = {}
+
+        # Add user ID to context if provided
+        if user_id is not None:
+            context["user_id"] = user_id
+
+        logger.info(f"Streaming response for user input: {user_input[:50]}..." if len(user_input) > 50 else f"Streaming response for user input: {user_input}")
+
+        try:
+            async for event in self.agent.process_input_stream(user_input, context):
+                yield event
+        except Exception as e:
+            logger.error(f"Error streaming user input: {str(e)}")
+            yield {
+                "event": "final",
+                "response": "I'm sorry, I encountered an error while processing your request. Please try again with a different query.",
+                "response_type": "error",
+                "context": context
+            }
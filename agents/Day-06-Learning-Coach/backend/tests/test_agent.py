@@ -0,0 +1,145 @@
+"""
+Tests for sub-task planning, concurrent plan execution and streamed agent responses.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.agent import LearningCoachAgent
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    """An agent whose LLM clients are never called."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    return LearningCoachAgent()
+
+
+def make_state(user_input, intent, context=None, confidence=0.9):
+    """Build an agent state for a recognized intent."""
+    return {
+        "user_input": user_input,
+        "intent": {"intent": intent, "confidence": confidence, "entities": {"subject": "Python"}},
+        "context": context or {},
+        "response": None,
+        "learning_path": None,
+        "resources": None,
+        "quiz": None,
+        "response_type": None,
+        "metadata": {"node_latency_ms": {}},
+    }
+
+
+def test_plan_adds_requested_sub_tasks_in_dependency_order(agent):
+    """A request for several things plans every sub-task, dependencies first."""
+    state = make_state("Create a learning path for Python with a quiz and some resources", "create_learning_path")
+    assert agent._plan_tasks(state) == ["create_learning_path", "discover_resources", "generate_quiz"]
+
+    state = make_state("Find resources for Python", "discover_resources")
+    assert agent._plan_tasks(state) == ["discover_resources"]
+
+    state = make_state("Tell me about Python", "create_learning_path", confidence=0.2)
+    assert agent._plan_tasks(state) == []
+
+
+def record_node(events, name, delay=0.05, fail=False, output=None):
+    """Fake graph node that records when it starts and finishes."""
+    async def node(state):
+        events.append(("start", name, state.get("learning_path")))
+        await asyncio.sleep(delay)
+        if fail:
+            events.append(("fail", name, None))
+            raise RuntimeError(f"{name} failed")
+        if output:
+            state.update(output)
+        events.append(("end", name, None))
+        return state
+    return node
+
+
+def test_execute_plan_runs_independent_tasks_concurrently(agent, monkeypatch):
+    """Resources are discovered alongside the learning path; the quiz waits for the path and reuses it."""
+    events = []
+    monkeypatch.setattr(agent, "_create_learning_path",
+                        record_node(events, "path", output={"learning_path": {"id": "path-1"}}))
+    monkeypatch.setattr(agent, "_discover_resources", record_node(events, "resources"))
+    monkeypatch.setattr(agent, "_generate_quiz", record_node(events, "quiz", delay=0))
+
+    state = make_state("Create a learning path for Python with a quiz and some resources", "create_learning_path")
+    state = asyncio.run(agent._execute_plan(state))
+
+    order = [(kind, name) for kind, name, _ in events]
+    assert order.index(("start", "resources")) < order.index(("end", "path"))
+    assert order.index(("end", "path")) < order.index(("start", "quiz"))
+    quiz_start = next(entry for entry in events if entry[:2] == ("start", "quiz"))
+    assert quiz_start[2] == {"id": "path-1"}
+
+    assert state["metadata"]["plan"] == ["create_learning_path", "discover_resources", "generate_quiz"]
+    assert set(state["metadata"]["node_latency_ms"]) >= {
+        "create_learning_path", "discover_resources", "generate_quiz", "execute_plan"
+    }
+    assert "failed_tasks" not in state["metadata"]
+
+
+def test_execute_plan_isolates_failed_sub_tasks(agent, monkeypatch):
+    """A failing sub-task is recorded; independent and dependent sub-tasks still run."""
+    events = []
+    monkeypatch.setattr(agent, "_create_learning_path", record_node(events, "path", fail=True))
+    monkeypatch.setattr(agent, "_discover_resources", record_node(events, "resources"))
+    monkeypatch.setattr(agent, "_generate_quiz", record_node(events, "quiz", delay=0))
+
+    state = make_state("Create a learning path for Python with a quiz and some resources", "create_learning_path")
+    state = asyncio.run(agent._execute_plan(state))
+
+    order = [(kind, name) for kind, name, _ in events]
+    assert ("end", "resources") in order
+    # The quiz only starts once the path has settled, and then has no path to reuse
+    assert order.index(("fail", "path")) < order.index(("start", "quiz"))
+    assert ("end", "quiz") in order
+    assert state["learning_path"] is None
+    assert state["metadata"]["failed_tasks"] == ["create_learning_path"]
+    assert "create_learning_path" in state["metadata"]["node_latency_ms"]
+
+
+def test_process_input_stream_yields_progress_then_final(agent, monkeypatch):
+    """Events emitted while the request runs are streamed before the final payload."""
+    async def process_input(user_input, context=None):
+        agent._emit({"event": "plan", "tasks": ["discover_resources"]})
+        await asyncio.sleep(0)
+        agent._emit({"event": "node", "node": "discover_resources", "latency_ms": 1.0})
+        return {"response": "Here you go", "response_type": "resources", "context": {}, "metadata": {}}
+
+    monkeypatch.setattr(agent, "process_input", process_input)
+
+    async def collect():
+        return [event async for event in agent.process_input_stream("Find resources for Python")]
+
+    events = asyncio.run(collect())
+    assert [event["event"] for event in events] == ["plan", "node", "final"]
+    assert events[-1]["response"] == "Here you go"
+
+
+def test_process_input_stream_cancels_work_when_client_leaves(agent, monkeypatch):
+    """Closing the stream early cancels the request instead of finishing it in the background."""
+    async def process_input(user_input, context=None):
+        agent._emit({"event": "plan", "tasks": ["create_learning_path"]})
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        return {}
+
+    state = {"cancelled": False}
+    monkeypatch.setattr(agent, "process_input", process_input)
+
+    async def read_first_event():
+        stream = agent.process_input_stream("Create a learning path for Python")
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0)
+        return first
+
+    assert asyncio.run(read_first_event())["event"] == "plan"
+    assert state["cancelled"] is True
@@ -0,0 +1,98 @@
+"""
+Tests for the persistent content discovery cache.
+"""
+
+import asyncio
+
+from app.core.discovery_cache import DiscoveryCache, make_cache_key
+
+
+def test_cache_keys_are_normalised():
+    """Whitespace and case differences map to the same key."""
+    assert make_cache_key("discover", topic="  Machine   Learning ") == make_cache_key("discover", topic="machine learning")
+    assert make_cache_key("discover", topic="python") != make_cache_key("recommend", topic="python")
+
+
+def test_concurrent_requests_compute_once(tmp_path):
+    """Concurrent identical requests share one computation and later hits come from disk."""
+    cache = DiscoveryCache(str(tmp_path / "cache.db"))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"resources": ["a"], "total_count": 1}
+
+    async def run():
+        return await asyncio.gather(*[cache.get_or_compute("k", compute) for _ in range(5)])
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result == {"resources": ["a"], "total_count": 1} for result in results)
+
+    # A new instance (e.g. another worker) reads the persisted entry
+    other = DiscoveryCache(str(tmp_path / "cache.db"))
+    assert other.get("k") == {"resources": ["a"], "total_count": 1}
+
+
+def test_ttl_and_lru_bounds(tmp_path):
+    """Expired entries are not returned and the least recently used entry is evicted."""
+    cache = DiscoveryCache(str(tmp_path / "cache.db"), max_entries=2)
+
+    cache.set("expired", 1, ttl_seconds=-1)
+    assert cache.get("expired") is None
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_failed_compute_is_not_cached(tmp_path):
+    """Errors propagate and leave no entry or lease behind."""
+    cache = DiscoveryCache(str(tmp_path / "cache.db"))
+
+    async def failing():
+        raise RuntimeError("llm unavailable")
+
+    async def succeeding():
+        return {"ok": True}
+
+    async def run():
+        try:
+            await cache.get_or_compute("k", failing)
+        except RuntimeError:
+            pass
+        return await cache.get_or_compute("k", succeeding)
+
+    assert asyncio.run(run()) == {"ok": True}
+
+
+def test_waiters_take_over_when_the_leader_is_cancelled(tmp_path):
+    """Cancelling the request that computes a key does not fail the requests waiting on it."""
+    cache = DiscoveryCache(str(tmp_path / "cache.db"), poll_interval=0.01)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return {"attempt": len(calls)}
+
+    async def run():
+        leader = asyncio.create_task(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0.02)
+        waiters = [asyncio.create_task(cache.get_or_compute("k", compute)) for _ in range(2)]
+        await asyncio.sleep(0.02)
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+        return leader.cancelled(), results
+
+    leader_cancelled, results = asyncio.run(run())
+    assert leader_cancelled
+    assert results == [{"attempt": 2}, {"attempt": 2}]
+    assert len(calls) == 2
+    assert cache.get("k") == {"attempt": 2}
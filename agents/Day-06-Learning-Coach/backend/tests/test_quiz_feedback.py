@@ -0,0 +1,122 @@
+"""
+Tests for batched quiz feedback generation.
+"""
+
+import asyncio
+
+from app.core.quiz_feedback import FeedbackBatcher, feedback_key
+
+
+QUIZ = {
+    "questions": [
+        {"question": "Q1", "options": ["a", "b"], "correct_answer": 0, "explanation": ""},
+        {"question": "Q2", "options": ["a", "b"], "correct_answer": 1, "explanation": ""},
+    ]
+}
+
+
+def test_feedback_key_uses_wrong_answers_only():
+    """Attempts with the same mistakes share a key regardless of the correct answers."""
+    assert feedback_key("quiz", QUIZ, [1, 1]) == ("quiz", ((0, 1),))
+    assert feedback_key("quiz", QUIZ, [0, 1]) == ("quiz", ())
+    assert feedback_key("quiz", QUIZ, [1, 0]) != feedback_key("other", QUIZ, [1, 0])
+
+
+def test_concurrent_submissions_are_batched_and_deduplicated():
+    """Concurrent attempts go out in one batch, one job per distinct wrong-answer pattern."""
+    batches = []
+    persisted = []
+
+    async def generate(jobs):
+        batches.append([job.key for job in jobs])
+        await asyncio.sleep(0.01)
+        return [{"weaknesses": [str(job.key[1])]} for job in jobs]
+
+    batcher = FeedbackBatcher(generate, persist=persisted.extend, max_wait_seconds=0.02)
+
+    async def run():
+        answer_sets = [[1, 1], [1, 1], [0, 0], [0, 1]]
+        futures = [
+            batcher.submit(feedback_key("quiz", QUIZ, answers), QUIZ, answers, attempt_id=f"attempt-{i}")
+            for i, answers in enumerate(answer_sets)
+        ]
+        results = await asyncio.gather(*futures)
+        # Give the worker a moment to persist the batch
+        await asyncio.sleep(0.05)
+        return results
+
+    results = asyncio.run(run())
+
+    assert len(batches) == 1
+    assert len(batches[0]) == 3
+    assert results[0] is results[1]
+    assert sorted(attempt for ids, _ in persisted for attempt in ids) == [f"attempt-{i}" for i in range(4)]
+
+    # Later identical mistakes are served from the cache
+    assert batcher.get_cached(feedback_key("quiz", QUIZ, [1, 1])) == {"weaknesses": ["((0, 1),)"]}
+
+
+def test_failed_generation_uses_fallback_without_caching():
+    """A failed batch resolves with the fallback feedback and is retried next time."""
+    calls = []
+
+    async def generate(jobs):
+        calls.append(len(jobs))
+        if len(calls) == 1:
+            raise RuntimeError("llm unavailable")
+        return [{"strengths": ["ok"]} for _ in jobs]
+
+    batcher = FeedbackBatcher(generate, fallback={"strengths": []}, max_wait_seconds=0)
+    key = feedback_key("quiz", QUIZ, [1, 0])
+
+    async def run():
+        first = await batcher.submit(key, QUIZ, [1, 0])
+        second = await batcher.submit(key, QUIZ, [1, 0])
+        return first, second
+
+    assert asyncio.run(run()) == ({"strengths": []}, {"strengths": ["ok"]})
+    assert calls == [1, 1]
+
+
+def test_cancelled_waiter_does_not_affect_shared_feedback():
+    """One request going away leaves the shared job running, resolved and persisted for the others."""
+    persisted = []
+
+    async def generate(jobs):
+        await asyncio.sleep(0.02)
+        return [{"weaknesses": ["q1"]} for _ in jobs]
+
+    batcher = FeedbackBatcher(generate, persist=persisted.extend, max_wait_seconds=0)
+    key = feedback_key("quiz", QUIZ, [1, 1])
+
+    async def run():
+        first = asyncio.ensure_future(asyncio.shield(batcher.submit(key, QUIZ, [1, 1], attempt_id="a")))
+        second = asyncio.shield(batcher.submit(key, QUIZ, [1, 1], attempt_id="b"))
+        await asyncio.sleep(0)
+        first.cancel()
+        result = await second
+        await asyncio.sleep(0.05)
+        return result
+
+    assert asyncio.run(run()) == {"weaknesses": ["q1"]}
+    assert persisted == [(["a", "b"], {"weaknesses": ["q1"]})]
+
+
+def test_cancelled_job_future_still_persists_batch():
+    """Even if a job's future was cancelled directly, the batch is cached and persisted."""
+    persisted = []
+
+    async def generate(jobs):
+        await asyncio.sleep(0.02)
+        return [{"weaknesses": ["q2"]} for _ in jobs]
+
+    batcher = FeedbackBatcher(generate, persist=persisted.extend, max_wait_seconds=0)
+    key = feedback_key("quiz", QUIZ, [0, 0])
+
+    async def run():
+        batcher.submit(key, QUIZ, [0, 0], attempt_id="c").cancel()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    assert persisted == [(["c"], {"weaknesses": ["q2"]})]
+    assert batcher.get_cached(key) == {"weaknesses": ["q2"]}
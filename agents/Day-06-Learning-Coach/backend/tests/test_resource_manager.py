@@ -0,0 +1,169 @@
+"""
+Tests for the resource manager and its indexed catalogue.
+"""
+
+import math
+import random
+
+import pytest
+
+from app.core.resource_index import ResourceIndex, tokenize
+from app.core.resource_manager import ResourceManager
+
+
+def make_resource(title, topics, resource_type="article", difficulty="beginner", description=""):
+    """Build a resource dict for tests."""
+    return {
+        "title": title,
+        "url": f"https://example.com/{title.lower().replace(' ', '-')}",
+        "type": resource_type,
+        "description": description or f"About {title}",
+        "difficulty": difficulty,
+        "estimated_time": "1 hour",
+        "topics": topics,
+        "source": "example.com",
+    }
+
+
+def test_get_resources_filters_and_sorts_by_title():
+    """Filtering uses the hash indexes and results stay sorted by title."""
+    manager = ResourceManager()
+    resources = manager.get_resources(topic="web development", difficulty="beginner")
+
+    titles = [r["title"] for r in resources]
+    assert titles == sorted(titles)
+    assert titles
+    assert all(r["difficulty"] == "beginner" for r in resources)
+    assert all("Web Development" in r["topics"] for r in resources)
+
+    page = manager.get_resources(topic="web development", skip=1, limit=2)
+    assert [r["title"] for r in page] == [r["title"] for r in manager.get_resources(topic="web development")][1:3]
+
+
+def test_search_ranks_title_matches_first():
+    """BM25 search prefers title matches and supports partially typed words."""
+    manager = ResourceManager()
+    manager.add_resource(make_resource("Rust Ownership", ["Rust"], description="Borrowing in Rust"))
+    manager.add_resource(make_resource("Systems Programming", ["C"], description="Mentions rust once"))
+
+    results = manager.search_resources("rust")
+    assert [r["title"] for r in results][:2] == ["Rust Ownership", "Systems Programming"]
+
+    assert manager.search_resources("owner")[0]["title"] == "Rust Ownership"
+    assert manager.search_resources("nonexistentterm") == []
+
+
+def test_add_resource_replaces_index_entry():
+    """Re-adding a resource with the same ID updates the indexes incrementally."""
+    manager = ResourceManager()
+    resource_id = manager.add_resource(make_resource("Go Basics", ["Go"]))
+
+    updated = make_resource("Elixir Basics", ["Elixir"])
+    updated["id"] = resource_id
+    manager.add_resource(updated)
+
+    assert manager.get_resources(topic="go") == []
+    assert [r["id"] for r in manager.get_resources(topic="elixir")] == [resource_id]
+    assert manager.search_resources("elixir")[0]["id"] == resource_id
+    assert resource_id not in [r["id"] for r in manager.search_resources("go")]
+
+
+def test_recommendations_use_popularity():
+    """Ratings update popularity scores used to rank recommendations."""
+    manager = ResourceManager()
+    low = manager.add_resource(make_resource("Haskell Intro", ["Haskell"]))
+    high = manager.add_resource(make_resource("Learn You a Haskell", ["Haskell"]))
+
+    manager.rate_resource(low, user_id=1, rating=1)
+    manager.rate_resource(high, user_id=1, rating=5)
+    manager.rate_resource(high, user_id=2, rating=5)
+
+    recommended = manager.recommend_resources("haskell", limit=2)
+    assert [r["id"] for r in recommended] == [high, low]
+
+    # Changing a rating replaces the user's previous one instead of adding to it
+    manager.rate_resource(high, user_id=1, rating=1)
+    manager.rate_resource(high, user_id=2, rating=1)
+    manager.rate_resource(low, user_id=1, rating=5)
+    recommended = manager.recommend_resources("haskell", limit=2)
+    assert [r["id"] for r in recommended] == [low, high]
+
+
+def make_catalogue(count, seed=7):
+    """Build a reproducible synthetic catalogue for index tests."""
+    rng = random.Random(seed)
+    words = [f"word{i}" for i in range(40)] + ["python", "pytest", "pydantic", "rust"]
+    topics = ["Python", "Rust", "Web Development", "Databases"]
+    resources = []
+    for i in range(count):
+        resource = make_resource(
+            " ".join(rng.choices(words, k=3)),
+            rng.sample(topics, 2),
+            resource_type=rng.choice(["article", "video", "course"]),
+            difficulty=rng.choice(["beginner", "advanced"]),
+            description=" ".join(rng.choices(words, k=rng.randint(3, 12))),
+        )
+        resource["id"] = f"r{i:04d}"
+        resources.append(resource)
+    return resources
+
+
+def exhaustive_scores(index, query):
+    """Score every posting of every query term, as search did before pruning."""
+    index._refresh_statistics()
+    tokens = tokenize(query)
+    terms = set(tokens) | set(index._expand_prefix(tokens[-1]))
+    document_count = len(index)
+    scores = {}
+    for term in terms:
+        postings = index.postings.get(term, {})
+        if not postings:
+            continue
+        idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+        for resource_id, frequency in postings.items():
+            scores[resource_id] = scores.get(resource_id, 0.0) + idf * index._term_component(resource_id, frequency)
+    return sorted(scores.values(), reverse=True)
+
+
+def test_search_pruning_returns_exact_top_scores():
+    """Reading postings in impact order finds the same top scores as scoring everything."""
+    resources = make_catalogue(600)
+    index = ResourceIndex()
+    index.add_many(resources[:400])
+    for resource in resources[400:]:
+        index.add(resource)
+    for resource in resources[:60:3]:
+        index.remove(resource["id"])
+
+    for query in ["python", "python word3", "word1 word2 rust", "pyt", "word7 databases"]:
+        for limit in (1, 5, 50):
+            found = [score for score, _ in index.search(query, limit)]
+            assert found == pytest.approx(exhaustive_scores(index, query)[:limit])
+
+
+def test_listings_match_filters_at_any_offset():
+    """Every filter combination is served from its own title-ordered listing."""
+    resources = make_catalogue(300)
+    index = ResourceIndex()
+    index.add_many(resources)
+
+    expected = sorted(
+        (r["title"], r["id"]) for r in resources
+        if "rust" in [t.lower() for t in r["topics"]] and r["type"] == "video" and r["difficulty"] == "advanced"
+    )
+    page = index.list_by_title(topic="Rust", resource_type="video", difficulty="advanced", skip=5, limit=10)
+    assert page == [resource_id for _, resource_id in expected[5:15]]
+
+
+def test_add_many_matches_incremental_adds():
+    """Bulk loading sorts once but builds the same indexes as adding one at a time."""
+    resources = make_catalogue(200)
+    bulk, incremental = ResourceIndex(), ResourceIndex()
+    bulk.add_many(resources)
+    for resource in resources:
+        incremental.add(resource)
+
+    assert bulk.vocabulary == incremental.vocabulary
+    assert bulk.listings == incremental.listings
+    assert bulk.topic_popularity == incremental.topic_popularity
+    assert bulk.search("python word1", 10) == incremental.search("python word1", 10)
@@ -49,6 +49,13 @@ interface GReaderStreamContents {
   continuation?: string;
 }
 
+interface GReaderItemRefs {
+  itemRefs?: {
+    id: string;
+  }[];
+  continuation?: string;
+}
+
 interface GReaderSubscription {
   id: string;
   title: string;
@@ -86,6 +93,13 @@ interface GReaderUnreadCount {
 }
 */
 
+// Paging options for stream requests
+interface StreamOptions {
+  limit?: number;
+  since?: number;
+  continuation?: string;
+}
+
 // FreshRSS Google Reader API client class
 class FreshRSSGReaderClient {
   private apiUrl: string;
@@ -197,19 +211,63 @@ class FreshRSSGReaderClient {
     return this.request<GReaderTagList>('/reader/api/0/tag/list');
   }
 
+  // Build stream query parameters; with `since`, items come oldest first so a client can page forward
+  private streamParams(options: StreamOptions): Record<string, any> {
+    const params: Record<string, any> = {
+      n: Math.min(options.limit ?? 50, 1000) // Limit to 50 items by default
+    };
+    if (options.since !== undefined) {
+      params.ot = Math.floor(options.since); // Only items added after this Unix timestamp
+      params.r = 'o'; // Oldest first
+    }
+    if (options.continuation) {
+      params.c = options.continuation;
+    }
+    return params;
+  }
+
   // Get unread items
-  async getUnreadItems() {
+  async getUnreadItems(options: StreamOptions = {}) {
     // Get unread items using the reading-list with unread filter
     return this.request<GReaderStreamContents>(
       '/reader/api/0/stream/contents/user/-/state/com.google/reading-list',
       'GET',
       {
-        xt: 'user/-/state/com.google/read', // Exclude read items
-        n: 50 // Limit to 50 items
+        ...this.streamParams(options),
+        xt: 'user/-/state/com.google/read' // Exclude read items
       }
     );
   }
 
+  // Get starred items
+  async getStarredItems(options: StreamOptions = {}) {
+    return this.request<GReaderStreamContents>(
+      '/reader/api/0/stream/contents/user/-/state/com.google/starred',
+      'GET',
+      this.streamParams(options)
+    );
+  }
+
+  // Get the IDs of every unread or starred item, in the same form as the `id` of full items
+  async getItemIds(state: 'unread' | 'starred', continuation?: string) {
+    const params: Record<string, any> = {
+      s: state === 'starred' ? 'user/-/state/com.google/starred' : 'user/-/state/com.google/reading-list',
+      n: 10000
+    };
+    if (state === 'unread') {
+      params.xt = 'user/-/state/com.google/read';
+    }
+    if (continuation) {
+      params.c = continuation;
+    }
+    const response = await this.request<GReaderItemRefs>('/reader/api/0/stream/items/ids', 'GET', params);
+    // Item references carry the short decimal ID; full items use the long hexadecimal form
+    const ids = (response.itemRefs ?? []).map(
+      (ref) => `tag:google.com,2005:reader/item/${BigInt(ref.id).toString(16).padStart(16, '0')}`
+    );
+    return { ids, continuation: response.continuation };
+  }
+
   // Get feed items
   async getFeedItems(feedId: string) {
     // In Google Reader API, feed IDs are prefixed with "feed/"
@@ -334,7 +392,60 @@ server.setRequestHandler(ListToolsRequestSchema, async () => ({
       description: "Get unread items",
       inputSchema: {
         type: "object",
-        properties: {},
+        properties: {
+          limit: {
+            type: "number",
+            description: "Maximum number of items to return (default 50)",
+          },
+          since: {
+            type: "number",
+            description: "Only return items added after this Unix timestamp, oldest first",
+          },
+          continuation: {
+            type: "string",
+            description: "Continuation token from a previous response, to get the next page",
+          },
+        },
+      },
+    },
+    {
+      name: "get_starred",
+      description: "Get starred items",
+      inputSchema: {
+        type: "object",
+        properties: {
+          limit: {
+            type: "number",
+            description: "Maximum number of items to return (default 50)",
+          },
+          since: {
+            type: "number",
+            description: "Only return items added after this Unix timestamp, oldest first",
+          },
+          continuation: {
+            type: "string",
+            description: "Continuation token from a previous response, to get the next page",
+          },
+        },
+      },
+    },
+    {
+      name: "get_item_ids",
+      description: "Get the IDs of all unread or starred items",
+      inputSchema: {
+        type: "object",
+        properties: {
+          state: {
+            type: "string",
+            enum: ["unread", "starred"],
+            description: "Which items to list",
+          },
+          continuation: {
+            type: "string",
+            description: "Continuation token from a previous response, to get the next page",
+          },
+        },
+        required: ["state"],
       },
     },
     {
@@ -438,7 +549,31 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
       }
 
       case "get_unread": {
-        const response = await client.getUnreadItems();
+        const response = await client.getUnreadItems((request.params.arguments ?? {}) as StreamOptions);
+        return {
+          content: [{
+            type: "text",
+            text: JSON.stringify(response, null, 2),
+          }],
+        };
+      }
+
+      case "get_starred": {
+        const response = await client.getStarredItems((request.params.arguments ?? {}) as StreamOptions);
+        return {
+          content: [{
+            type: "text",
+            text: JSON.stringify(response, null, 2),
+          }],
+        };
+      }
+
+      case "get_item_ids": {
+        const { state, continuation } = request.params.arguments as {
+          state: 'unread' | 'starred';
+          continuation?: string;
+        };
+        const response = await client.getItemIds(state, continuation);
         return {
           content: [{
             type: "text",
@@ -5,12 +5,12 @@ This module provides the main NewsCuratorAgent class that integrates all compone
 """
 
 import asyncio
-import json
 import logging
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 from httpx import AsyncClient
 from pydantic_ai import Agent
@@ -18,13 +18,23 @@ from pydantic_ai.mcp import MCPServerStdio
 from pydantic_ai.models.openai import OpenAIModel
 from pydantic_ai.providers.openai import OpenAIProvider
 
+from .article_store import ArticleStore, article_from_item, parse_item
 from .config import Config, load_config
 from .logging import loggers
-from .models import NewsArticle, NewsBriefing, UserPreferences
+from .mcp_pool import MCPSessionPool, tool_result_json
+from .models import NewsArticle, NewsBriefing, SearchUpdate, UserPreferences
+from .search import match_score, merge_results, parse_published_date
 
 # Get logger for this module
 logger = loggers["agent"]
 
+# Pages requested per stream in one sync; a larger backlog is picked up by the next sync
+MAX_SYNC_PAGES = 10
+# Pages of item IDs read when reconciling the unread and starred flags
+MAX_STATE_PAGES = 100
+# How old the store may get before a read syncs first, when background sync is off
+DEFAULT_SYNC_INTERVAL = 300.0
+
 
 class NewsCuratorAgent:
     """Agent for curating news from FreshRSS feeds."""
@@ -41,11 +51,13 @@ class NewsCuratorAgent:
 
         # Initialize MCP servers
         self.mcp_servers = []
+        pooled_servers = {}
 
         # Initialize FreshRSS MCP server
         logger.info("Initializing FreshRSS MCP server")
         self.freshrss_server = self._initialize_freshrss_server()
         self.mcp_servers.append(self.freshrss_server)
+        pooled_servers["freshrss"] = self.freshrss_server
 
         # Initialize Google News MCP server if configured
         self.google_news_server = None
@@ -54,6 +66,7 @@ class NewsCuratorAgent:
             self.google_news_server = self._initialize_google_news_server()
             if self.google_news_server:
                 self.mcp_servers.append(self.google_news_server)
+                pooled_servers["google_news"] = self.google_news_server
 
         # Initialize Brave Search MCP server if configured
         self.brave_search_server = None
@@ -62,6 +75,24 @@ class NewsCuratorAgent:
             self.brave_search_server = self._initialize_brave_search_server()
             if self.brave_search_server:
                 self.mcp_servers.append(self.brave_search_server)
+                pooled_servers["brave_search"] = self.brave_search_server
+
+        # Local article store, synced from FreshRSS
+        self.article_store = None
+        if self.config.article_store.enabled:
+            self.article_store = ArticleStore(Path(self.config.article_store.db_path))
+        self._sync_task: Optional[asyncio.Task] = None
+        self._pending_sync: Optional[asyncio.Task] = None
+        self._sync_lock: Optional[asyncio.Lock] = None
+
+        # The servers are started once, on first use or by start(), and kept running
+        self.mcp_pool = MCPSessionPool(
+            pooled_servers,
+            max_concurrent_calls=self.config.mcp.max_concurrent_calls,
+            health_check_interval=self.config.mcp.health_check_interval,
+            start_timeout=self.config.mcp.start_timeout,
+            call_timeout=self.config.mcp.call_timeout,
+        )
 
         # Initialize model
         logger.info("Initializing LLM model")
@@ -154,6 +185,158 @@ class NewsCuratorAgent:
 
         logger.info("NewsCuratorAgent initialization complete")
 
+    async def start(self):
+        """Start the MCP servers and wait until they are available.
+
+        The agent's tools are listed from every server on each run, so call this before
+        `self.agent.run`. Tool calls made through `self.mcp_pool` start the pool themselves.
+        """
+        await self.mcp_pool.wait_ready()
+
+    async def close(self):
+        """Stop background syncing and the MCP servers."""
+        if self._sync_task:
+            self._sync_task.cancel()
+            self._sync_task = None
+        if self._pending_sync:
+            self._pending_sync.cancel()
+            self._pending_sync = None
+        await self.mcp_pool.close()
+
+    async def sync_articles(self) -> Dict[str, int]:
+        """Pull new unread and starred items from FreshRSS into the local article store.
+
+        Each stream is synced from where the previous sync stopped, so only new items
+        are downloaded. The unread and starred flags of stored articles are then updated
+        from FreshRSS, and read, unstarred articles past the retention period are pruned.
+
+        Returns:
+            Number of items stored per stream, how many stored articles changed state
+            and how many old articles were pruned
+        """
+        if not self.article_store:
+            return {}
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+
+        async with self._sync_lock:
+            started = time.monotonic()
+            counts = {}
+            for stream, tool_name in (("unread", "get_unread"), ("starred", "get_starred")):
+                try:
+                    counts[stream] = await self._sync_stream(stream, tool_name)
+                except Exception as e:
+                    # One stream failing (e.g. an older MCP server without get_starred) should not stop the other
+                    logger.error(f"Error syncing {stream} articles: {e}", exc_info=True)
+                    counts[stream] = 0
+            counts["updated"] = 0
+            for stream in ("unread", "starred"):
+                try:
+                    counts["updated"] += await self._sync_state(stream)
+                except Exception as e:
+                    logger.error(f"Error updating {stream} state of stored articles: {e}", exc_info=True)
+            retention = timedelta(days=self.config.article_store.retention_days)
+            counts["pruned"] = self.article_store.prune(datetime.now() - retention)
+            logger.info(f"Synced articles in {time.monotonic() - started:.2f}s: {counts}")
+            return counts
+
+    async def _sync_stream(self, stream: str, tool_name: str) -> int:
+        since = self.article_store.sync_since(stream)
+        newest = since
+        continuation = None
+        stored = 0
+
+        for _ in range(MAX_SYNC_PAGES):
+            # With `since`, even 0, FreshRSS pages oldest first, so the watermark never skips older items
+            arguments = {"limit": self.config.article_store.page_size, "since": int(since)}
+            if continuation:
+                arguments["continuation"] = continuation
+            data = tool_result_json(await self.mcp_pool.call_tool("freshrss", tool_name, arguments))
+
+            items = data.get("items", [])
+            stored += self.article_store.add_items(items, starred=True if stream == "starred" else None)
+            for item in items:
+                try:
+                    newest = max(newest, parse_item(item)["added"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+            # Saved per page, so an interrupted sync resumes where it stopped
+            self.article_store.set_sync_since(stream, newest)
+            continuation = data.get("continuation")
+            if not items or not continuation:
+                break
+        else:
+            logger.warning(f"Stopped syncing {stream} items after {MAX_SYNC_PAGES} pages; the next sync continues")
+
+        return stored
+
+    async def _sync_state(self, stream: str) -> int:
+        item_ids: List[str] = []
+        continuation = None
+        for _ in range(MAX_STATE_PAGES):
+            arguments = {"state": stream}
+            if continuation:
+                arguments["continuation"] = continuation
+            data = tool_result_json(await self.mcp_pool.call_tool("freshrss", "get_item_ids", arguments))
+            item_ids.extend(data.get("ids", []))
+            continuation = data.get("continuation")
+            if not continuation:
+                break
+        else:
+            # A partial list would clear the flag of every article missing from it
+            logger.warning(f"Too many {stream} items to list; their stored state is left as it is")
+            return 0
+        return self.article_store.set_state(stream, item_ids)
+
+    async def _ensure_synced(self):
+        """Sync before reading the store if it was never synced, or is stale without a background sync."""
+        last_synced = self.article_store.last_synced()
+        background = self._sync_task is not None and not self._sync_task.done()
+        interval = self.config.article_store.sync_interval or DEFAULT_SYNC_INTERVAL
+        if last_synced is not None and (background or time.time() - last_synced < interval):
+            return
+        if self._pending_sync is None or self._pending_sync.done():
+            self._pending_sync = asyncio.create_task(self.sync_articles())
+        try:
+            # A caller's deadline only stops the wait; the sync itself runs to the end
+            await asyncio.shield(self._pending_sync)
+        except Exception as e:
+            # Serve what is stored rather than failing the request
+            logger.warning(f"Article sync failed, using stored articles: {e}", exc_info=True)
+
+    def start_background_sync(self):
+        """Keep the article store fresh by syncing every `sync_interval` seconds."""
+        if not self.article_store or self.config.article_store.sync_interval <= 0:
+            return
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def _sync_loop(self):
+        while True:
+            try:
+                await self.sync_articles()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Background article sync failed: {e}", exc_info=True)
+            await asyncio.sleep(self.config.article_store.sync_interval)
+
+    async def mark_article_read(self, article_id: str, read: bool = True):
+        """Mark an article read (or unread) in FreshRSS and in the local store.
+
+        Args:
+            article_id: ID of the article
+            read: Whether to mark it read or unread
+
+        Returns:
+            The result of the FreshRSS tool call
+        """
+        tool_name = "mark_item_read" if read else "mark_item_unread"
+        result = await self.mcp_pool.call_tool("freshrss", tool_name, {"item_id": article_id})
+        if self.article_store:
+            self.article_store.mark_read(article_id, read)
+        return result
+
     async def fetch_articles(self, preferences: Optional[UserPreferences] = None) -> List[NewsArticle]:
         """Fetch articles from FreshRSS.
 
@@ -168,44 +351,34 @@ class NewsCuratorAgent:
         logger.debug(f"Using preferences: {prefs.model_dump_json(indent=2)}")
 
         try:
-            # Start MCP servers
-            logger.debug("Starting MCP servers")
-            async with self.agent.run_mcp_servers():
-                logger.debug("MCP servers started successfully")
+            # Get unread items
+            logger.info("Fetching unread items from FreshRSS")
+            try:
+                # Call the get_unread tool directly
+                result = await self.mcp_pool.call_tool("freshrss", "get_unread", {"limit": prefs.max_articles})
+                # Parse the JSON result
+                unread_data = tool_result_json(result)
+                logger.debug(f"Received {len(unread_data.get('items', []))} unread items")
+            except Exception as e:
+                logger.error(f"Error fetching unread items: {e}", exc_info=True)
+                raise
 
-                # Get unread items
-                logger.info("Fetching unread items from FreshRSS")
-                try:
-                    # Call the get_unread tool directly
-                    result = await self.freshrss_server.call_tool("get_unread", {"limit": prefs.max_articles})
-                    # Parse the JSON result
-                    unread_data = json.loads(result)
-                    logger.debug(f"Received {len(unread_data.get('items', []))} unread items")
-                except Exception as e:
-                    logger.error(f"Error fetching unread items: {e}", exc_info=True)
-                    raise
-
-                # Parse response and convert to NewsArticle objects
-                logger.info("Converting FreshRSS items to NewsArticle objects")
-                articles = []
-                if "items" in unread_data:
-                    for item in unread_data["items"]:
-                        try:
-                            article = NewsArticle(
-                                id=str(item["id"]),
-                                title=item["title"],
-                                url=item["url"],
-                                source=item.get("feed_title", "Unknown"),
-                                published_date=datetime.fromtimestamp(item["created_on_time"]),
-                                content=item.get("html", ""),
-                            )
-                            articles.append(article)
-                        except Exception as e:
-                            logger.warning(f"Error creating NewsArticle from item {item.get('id')}: {e}")
-                            continue
-
-                logger.info(f"Created {len(articles)} NewsArticle objects")
-                return articles
+            # Parse response and convert to NewsArticle objects
+            logger.info("Converting FreshRSS items to NewsArticle objects")
+            articles = []
+            if "items" in unread_data:
+                for item in unread_data["items"]:
+                    try:
+                        articles.append(article_from_item(item))
+                    except Exception as e:
+                        logger.warning(f"Error creating NewsArticle from item {item.get('id')}: {e}")
+                        continue
+                # Keep what was downloaded anyway
+                if self.article_store:
+                    self.article_store.add_items(unread_data["items"])
+
+            logger.info(f"Created {len(articles)} NewsArticle objects")
+            return articles
         except Exception as e:
             logger.error(f"Error in fetch_articles: {e}", exc_info=True)
             raise
@@ -224,8 +397,13 @@ class NewsCuratorAgent:
         """
         prefs = preferences or self.config.default_preferences
 
-        # Fetch articles
-        articles = await self.fetch_articles(prefs)
+        if self.article_store:
+            # Newest unread articles from the local store
+            await self._ensure_synced()
+            articles = self.article_store.recent(prefs.max_articles, unread_only=True, sources=prefs.sources)
+        else:
+            # Fetch articles
+            articles = await self.fetch_articles(prefs)
 
         if not articles:
             # Return empty briefing if no articles found
@@ -240,6 +418,15 @@ class NewsCuratorAgent:
             articles=articles,
         )
 
+    def available_sources(self) -> List[str]:
+        """Names of the sources that can be searched."""
+        sources = ["freshrss"]
+        if self.google_news_server:
+            sources.append("google")
+        if self.brave_search_server:
+            sources.append("brave")
+        return sources
+
     async def search_news(
         self, query: str, preferences: Optional[UserPreferences] = None,
         source: str = "all"
@@ -254,34 +441,84 @@ class NewsCuratorAgent:
         Returns:
             List of articles
         """
-        if source == "freshrss" or (source == "all" and not self.google_news_server and not self.brave_search_server):
-            return await self._search_freshrss(query, preferences)
-        elif source == "google" and self.google_news_server:
+        if source == "google" and self.google_news_server:
             return await self._search_google_news(query)
         elif source == "brave" and self.brave_search_server:
             return await self._search_brave_news(query)
         elif source == "all":
-            # Combine results from all available sources
-            results = []
+            # Search every source at once and keep the final merged result
+            articles: List[NewsArticle] = []
+            async for update in self.search_news_stream(query, preferences):
+                articles = update.articles
+            return articles
+        else:
+            # Default to FreshRSS search
+            return await self._search_freshrss(query, preferences)
 
-            # Get FreshRSS results
-            freshrss_results = await self._search_freshrss(query, preferences)
-            results.extend(freshrss_results)
+    async def search_news_stream(
+        self, query: str, preferences: Optional[UserPreferences] = None,
+        sources: Optional[List[str]] = None
+    ) -> AsyncIterator[SearchUpdate]:
+        """Search several sources concurrently, yielding merged results as each source answers.
 
-            # Get Google News results if available
-            if self.google_news_server:
-                google_results = await self._search_google_news(query)
-                results.extend(google_results)
+        Every source gets its own deadline from the search configuration; a source that
+        misses it is reported with status "timeout" and left out. Each update carries all
+        results so far, deduplicated across sources and ranked by recency and source weight.
 
-            # Get Brave Search results if available
-            if self.brave_search_server:
-                brave_results = await self._search_brave_news(query)
-                results.extend(brave_results)
+        Args:
+            query: Search query
+            preferences: User preferences to apply. If None, uses default preferences.
+            sources: Sources to search (defaults to every available source)
 
-            return results
-        else:
-            # Default to FreshRSS search
-            return await self._search_freshrss(query, preferences)
+        Yields:
+            One SearchUpdate per source, in the order the sources answer
+        """
+        search_config = self.config.search
+        sources = [name for name in (sources or self.available_sources()) if name in self.available_sources()]
+        searches = {
+            "freshrss": lambda: self._search_freshrss(query, preferences),
+            "google": lambda: self._search_google_news(query),
+            "brave": lambda: self._search_brave_news(query),
+        }
+        started = time.monotonic()
+
+        async def run(name: str):
+            try:
+                articles = await asyncio.wait_for(searches[name](), timeout=search_config.source_timeouts.get(name, 10.0))
+                return name, "ok", articles
+            except asyncio.TimeoutError:
+                logger.warning(f"Search on {name} timed out")
+                return name, "timeout", []
+            except Exception as e:
+                logger.error(f"Error searching {name}: {e}", exc_info=True)
+                return name, "error", []
+
+        tasks = [asyncio.create_task(run(name)) for name in sources]
+        results: Dict[str, List[NewsArticle]] = {}
+        pending = set(sources)
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                name, status, articles = await next_result
+                pending.discard(name)
+                results[name] = articles
+                logger.debug(f"{name} answered with {len(articles)} articles ({status})")
+                yield SearchUpdate(
+                    source=name,
+                    status=status,
+                    new_articles=len(articles),
+                    articles=merge_results(
+                        results,
+                        search_config.source_weights,
+                        half_life_hours=search_config.recency_half_life_hours,
+                        threshold=search_config.duplicate_threshold,
+                    ),
+                    pending_sources=[source for source in sources if source in pending],
+                    elapsed_seconds=round(time.monotonic() - started, 3),
+                )
+        finally:
+            # The caller may stop reading early
+            for task in tasks:
+                task.cancel()
 
     async def _search_freshrss(
         self, query: str, preferences: Optional[UserPreferences] = None
@@ -293,8 +530,16 @@ class NewsCuratorAgent:
             preferences: User preferences to apply. If None, uses default preferences.
 
         Returns:
-            List of articles
+            List of articles, best matches first
         """
+        if self.article_store:
+            # Full-text search over every stored article, read or not
+            prefs = preferences or self.config.default_preferences
+            await self._ensure_synced()
+            if not query:
+                return self.article_store.recent(prefs.max_articles, unread_only=True, sources=prefs.sources)
+            return self.article_store.search(query, limit=prefs.max_articles, sources=prefs.sources)
+
         # Fetch all articles
         articles = await self.fetch_articles(preferences)
 
@@ -302,13 +547,11 @@ class NewsCuratorAgent:
         if not query:
             return articles
 
-        # Filter articles that contain the query in title or content
-        query = query.lower()
-        return [
-            article for article in articles
-            if query in article.title.lower() or
-               (article.content and query in article.content.lower())
-        ]
+        # Keep articles containing every query word in their title or text
+        scored = [(match_score(query, article), article) for article in articles]
+        scored = [entry for entry in scored if entry[0] > 0]
+        scored.sort(key=lambda entry: (entry[0], entry[1].published_date), reverse=True)
+        return [article for _, article in scored]
 
     async def _search_google_news(self, query: str, count: int = 10) -> List[NewsArticle]:
         """Search for news articles using Google News.
@@ -325,46 +568,37 @@ class NewsCuratorAgent:
             return []
 
         try:
-            # Start MCP servers
-            async with self.agent.run_mcp_servers():
-                # Call the Google News search tool
-                result = await self.google_news_server.call_tool(
-                    "google_news_search",
-                    {"q": query, "gl": "us", "hl": "en"}
-                )
+            # Call the Google News search tool
+            result = await self.mcp_pool.call_tool(
+                "google_news", "google_news_search",
+                {"q": query, "gl": "us", "hl": "en"}
+            )
 
-                # Parse the result
-                news_data = json.loads(result)
-
-                articles = []
-                if "news_results" in news_data:
-                    for item in news_data["news_results"][:count]:
-                        try:
-                            # Convert to our NewsArticle model
-                            published_date = datetime.now()
-                            if "date" in item:
-                                # Try to parse the date
-                                try:
-                                    # Google News dates are often in format like "2 hours ago" or "3 days ago"
-                                    # For now, just use current date
-                                    published_date = datetime.now()
-                                except:
-                                    pass
-
-                            article = NewsArticle(
-                                id=f"google-{item.get('position', 0)}",
-                                title=item.get("title", "Untitled"),
-                                url=item.get("link", ""),
-                                source=item.get("source", "Google News"),
-                                published_date=published_date,
-                                content=item.get("snippet", ""),
-                            )
-                            articles.append(article)
-                        except Exception as e:
-                            logger.warning(f"Error creating NewsArticle from Google News item: {e}")
-                            continue
-
-                return articles
+            # Parse the result
+            news_data = tool_result_json(result)
+
+            articles = []
+            if "news_results" in news_data:
+                for item in news_data["news_results"][:count]:
+                    try:
+                        # Convert to our NewsArticle model
+                        # Google News dates are like "2 hours ago" or "05/14/2025, 07:00 AM, +0000 UTC"
+                        published_date = parse_published_date(item.get("date")) or datetime.now()
+
+                        article = NewsArticle(
+                            id=f"google-{item.get('position', 0)}",
+                            title=item.get("title", "Untitled"),
+                            url=item.get("link", ""),
+                            source=item.get("source", "Google News"),
+                            published_date=published_date,
+                            content=item.get("snippet", ""),
+                        )
+                        articles.append(article)
+                    except Exception as e:
+                        logger.warning(f"Error creating NewsArticle from Google News item: {e}")
+                        continue
+
+            return articles
 
         except Exception as e:
             logger.error(f"Error searching Google News: {e}", exc_info=True)
@@ -385,46 +619,41 @@ class NewsCuratorAgent:
             return []
 
         try:
-            # Start MCP servers
-            async with self.agent.run_mcp_servers():
-                # Call the Brave News search tool
-                result = await self.brave_search_server.call_tool(
-                    "brave_news_search",
-                    {"query": query, "count": count}
-                )
+            # Call the Brave News search tool
+            result = await self.mcp_pool.call_tool(
+                "brave_search", "brave_news_search",
+                {"query": query, "count": count}
+            )
 
-                # Parse the result
-                news_data = json.loads(result)
-
-                articles = []
-                if "results" in news_data:
-                    for item in news_data["results"]:
-                        try:
-                            # Convert to our NewsArticle model
-                            published_date = datetime.now()
-                            if "age" in item:
-                                # Try to parse the date
-                                try:
-                                    # Brave Search dates are often in format like "2 hours ago" or "3 days ago"
-                                    # For now, just use current date
-                                    published_date = datetime.now()
-                                except:
-                                    pass
-
-                            article = NewsArticle(
-                                id=f"brave-{item.get('index', 0)}",
-                                title=item.get("title", "Untitled"),
-                                url=item.get("url", ""),
-                                source=item.get("source", "Brave Search"),
-                                published_date=published_date,
-                                content=item.get("description", ""),
-                            )
-                            articles.append(article)
-                        except Exception as e:
-                            logger.warning(f"Error creating NewsArticle from Brave Search item: {e}")
-                            continue
-
-                return articles
+            # Parse the result
+            news_data = tool_result_json(result)
+
+            articles = []
+            if "results" in news_data:
+                for item in news_data["results"]:
+                    try:
+                        # Convert to our NewsArticle model
+                        # Brave gives an ISO "page_age" and a relative "age" like "2 hours ago"
+                        published_date = (
+                            parse_published_date(item.get("page_age"))
+                            or parse_published_date(item.get("age"))
+                            or datetime.now()
+                        )
+
+                        article = NewsArticle(
+                            id=f"brave-{item.get('index', 0)}",
+                            title=item.get("title", "Untitled"),
+                            url=item.get("url", ""),
+                            source=item.get("source", "Brave Search"),
+                            published_date=published_date,
+                            content=item.get("description", ""),
+                        )
+                        articles.append(article)
+                    except Exception as e:
+                        logger.warning(f"Error creating NewsArticle from Brave Search item: {e}")
+                        continue
+
+            return articles
 
         except Exception as e:
             logger.error(f"Error searching Brave News: {e}", exc_info=True)
@@ -626,23 +855,17 @@ class NewsCuratorAgent:
         Returns:
             The article
         """
-        # Start MCP servers
-        async with self.agent.run_mcp_servers():
-            # Get the article
-            result = await self.freshrss_server.call_tool("get_items", {"item_ids": [article_id]})
-            article_data = json.loads(result)
-
-            if "items" not in article_data or not article_data["items"]:
-                raise ValueError(f"Article with ID {article_id} not found")
-
-            item = article_data["items"][0]
-            article = NewsArticle(
-                id=str(item["id"]),
-                title=item["title"],
-                url=item["url"],
-                source=item.get("feed_title", "Unknown"),
-                published_date=datetime.fromtimestamp(item["created_on_time"]),
-                content=item.get("html", ""),
-            )
-
+        if self.article_store and (article := self.article_store.get(article_id)):
             return article
+
+        # Get the article
+        result = await self.mcp_pool.call_tool("freshrss", "get_items", {"item_ids": [article_id]})
+        article_data = tool_result_json(result)
+
+        if "items" not in article_data or not article_data["items"]:
+            raise ValueError(f"Article with ID {article_id} not found")
+
+        item = article_data["items"][0]
+        if self.article_store:
+            self.article_store.add_items([item])
+        return article_from_item(item)
@@ -0,0 +1,389 @@
+"""
+Local article store for the news curator agent.
+
+This module keeps FreshRSS articles in SQLite, with the text stripped of HTML and
+compressed, and a full-text index over titles and text for local search.
+"""
+
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .logging import loggers
+from .models import NewsArticle
+from .search import canonical_url, strip_html
+
+# Get logger for this module
+logger = loggers["article_store"]
+
+READ_TAG = "user/-/state/com.google/read"
+STARRED_TAG = "user/-/state/com.google/starred"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    item_id TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    canonical_url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    published REAL NOT NULL,
+    added REAL NOT NULL,
+    unread INTEGER NOT NULL DEFAULT 1,
+    starred INTEGER NOT NULL DEFAULT 0,
+    content BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published);
+CREATE INDEX IF NOT EXISTS idx_articles_unread_published ON articles (unread, published);
+CREATE INDEX IF NOT EXISTS idx_articles_canonical_url ON articles (canonical_url);
+CREATE TABLE IF NOT EXISTS sync_state (
+    stream TEXT PRIMARY KEY,
+    since REAL NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+# Contentless: the index keeps no copy of the text, which is stored compressed in articles
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS article_text USING fts5(
+    title, content, content=''
+);
+"""
+
+
+def _compress(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def _decompress(data: Optional[bytes]) -> str:
+    return zlib.decompress(data).decode("utf-8") if data else ""
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching every word as a prefix."""
+    words = [word for word in "".join(c if c.isalnum() else " " for c in query).split()]
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def parse_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalise a FreshRSS item from the Google Reader API (or the older Fever API).
+
+    Returns a dict with item_id, title, url, source, published and added (Unix
+    timestamps), html, unread and starred.
+    """
+    if "origin" in item or "alternate" in item or "canonical" in item:
+        links = item.get("canonical") or item.get("alternate") or [{}]
+        body = item.get("content") or item.get("summary") or {}
+        categories = item.get("categories", [])
+        published = float(item.get("published") or 0)
+        # timestampUsec is when FreshRSS added the item, which is what `since` filters on
+        added = int(item.get("timestampUsec") or 0) / 1_000_000 or published
+        return {
+            "item_id": str(item["id"]),
+            "title": item.get("title") or "Untitled",
+            "url": links[0].get("href", ""),
+            "source": (item.get("origin") or {}).get("title", "Unknown"),
+            "published": published or added,
+            "added": added,
+            "html": body.get("content", ""),
+            "unread": READ_TAG not in categories,
+            "starred": STARRED_TAG in categories,
+        }
+
+    created = float(item.get("created_on_time") or 0)
+    return {
+        "item_id": str(item["id"]),
+        "title": item.get("title") or "Untitled",
+        "url": item.get("url", ""),
+        "source": item.get("feed_title", "Unknown"),
+        "published": created,
+        "added": created,
+        "html": item.get("html", ""),
+        "unread": not item.get("is_read", 0),
+        "starred": bool(item.get("is_saved", 0)),
+    }
+
+
+def article_from_item(item: Dict[str, Any]) -> NewsArticle:
+    """Create a NewsArticle from a FreshRSS item."""
+    fields = parse_item(item)
+    return NewsArticle(
+        id=fields["item_id"],
+        title=fields["title"],
+        url=fields["url"],
+        source=fields["source"],
+        published_date=datetime.fromtimestamp(fields["published"]),
+        content=fields["html"],
+    )
+
+
+class ArticleStore:
+    """FreshRSS articles kept in SQLite, with full-text search on titles and text.
+
+    HTML is stripped once when an item is stored and the text is kept zlib-compressed;
+    the FTS5 index is contentless, so the text is not stored twice. When SQLite is built
+    without FTS5, search falls back to matching titles with LIKE.
+    """
+
+    def __init__(self, db_path: Path):
+        """Open (and create if needed) the store.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+            self.fts_enabled = True
+        except sqlite3.OperationalError:
+            logger.warning("SQLite has no FTS5 support, article search falls back to title matching")
+            self.fts_enabled = False
+        self._conn.commit()
+
+    def add_items(self, items: Iterable[Dict[str, Any]], starred: Optional[bool] = None) -> int:
+        """Insert or update FreshRSS items; returns how many were stored.
+
+        Args:
+            items: Items as returned by the FreshRSS MCP server
+            starred: Force the starred flag (items from the starred stream)
+        """
+        stored = 0
+        with self._lock, self._conn:
+            for item in items:
+                try:
+                    fields = parse_item(item)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning(f"Skipping malformed FreshRSS item {item.get('id')}: {e}")
+                    continue
+                if not fields["url"]:
+                    continue
+                if starred is not None:
+                    fields["starred"] = starred
+                self._upsert(fields)
+                stored += 1
+        return stored
+
+    def _upsert(self, fields: Dict[str, Any]):
+        text = strip_html(fields["html"])
+        existing = self._conn.execute(
+            "SELECT id, title, content FROM articles WHERE item_id = ?", (fields["item_id"],)
+        ).fetchone()
+
+        if existing is None:
+            cursor = self._conn.execute(
+                "INSERT INTO articles (item_id, title, url, canonical_url, source, published, added, "
+                "unread, starred, content) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    fields["item_id"], fields["title"], fields["url"], canonical_url(fields["url"]),
+                    fields["source"], fields["published"], fields["added"],
+                    int(fields["unread"]), int(fields["starred"]), _compress(text),
+                ),
+            )
+            if self.fts_enabled:
+                self._conn.execute(
+                    "INSERT INTO article_text (rowid, title, content) VALUES (?, ?, ?)",
+                    (cursor.lastrowid, fields["title"], text),
+                )
+            return
+
+        article_id, old_title, old_content = existing
+        self._conn.execute(
+            "UPDATE articles SET title = ?, url = ?, canonical_url = ?, source = ?, published = ?, "
+            "unread = ?, starred = MAX(starred, ?), content = ? WHERE id = ?",
+            (
+                fields["title"], fields["url"], canonical_url(fields["url"]), fields["source"],
+                fields["published"], int(fields["unread"]), int(fields["starred"]), _compress(text),
+                article_id,
+            ),
+        )
+        if self.fts_enabled:
+            # A contentless index is updated by deleting the exact old values and inserting the new ones
+            self._conn.execute(
+                "INSERT INTO article_text (article_text, rowid, title, content) VALUES ('delete', ?, ?, ?)",
+                (article_id, old_title, _decompress(old_content)),
+            )
+            self._conn.execute(
+                "INSERT INTO article_text (rowid, title, content) VALUES (?, ?, ?)",
+                (article_id, fields["title"], text),
+            )
+
+    def _articles(self, sql: str, params: Iterable[Any]) -> List[NewsArticle]:
+        with self._lock:
+            rows = self._conn.execute(sql, tuple(params)).fetchall()
+        articles = []
+        for item_id, title, url, source, published, content in rows:
+            try:
+                articles.append(NewsArticle(
+                    id=item_id,
+                    title=title,
+                    url=url,
+                    source=source,
+                    published_date=datetime.fromtimestamp(published),
+                    content=_decompress(content),
+                ))
+            except Exception as e:
+                logger.warning(f"Skipping stored article {item_id}: {e}")
+        return articles
+
+    @staticmethod
+    def _source_filter(sources: Optional[List[str]]) -> tuple:
+        if not sources:
+            return "", []
+        placeholders = ", ".join("?" * len(sources))
+        return f" AND lower(a.source) IN ({placeholders})", [source.lower() for source in sources]
+
+    def search(self, query: str, limit: int = 20, sources: Optional[List[str]] = None) -> List[NewsArticle]:
+        """Articles matching every word of the query, best matches first.
+
+        Args:
+            query: Search query
+            limit: Maximum number of articles to return
+            sources: Only include articles from these feeds (by title, case-insensitive)
+
+        Returns:
+            List of articles
+        """
+        source_sql, source_params = self._source_filter(sources)
+        columns = "a.item_id, a.title, a.url, a.source, a.published, a.content"
+
+        if self.fts_enabled:
+            fts_query = _fts_query(query)
+            if not fts_query:
+                return self.recent(limit, sources=sources)
+            # Title matches weigh more than matches in the text
+            return self._articles(
+                f"SELECT {columns} FROM article_text JOIN articles a ON a.id = article_text.rowid "
+                f"WHERE article_text MATCH ?{source_sql} "
+                "ORDER BY bm25(article_text, 5.0, 1.0), a.published DESC LIMIT ?",
+                [fts_query, *source_params, limit],
+            )
+
+        pattern = f"%{query.lower()}%"
+        return self._articles(
+            f"SELECT {columns} FROM articles a WHERE lower(a.title) LIKE ?{source_sql} "
+            "ORDER BY a.published DESC LIMIT ?",
+            [pattern, *source_params, limit],
+        )
+
+    def recent(
+        self, limit: int = 20, unread_only: bool = False, sources: Optional[List[str]] = None
+    ) -> List[NewsArticle]:
+        """Most recently published articles first.
+
+        Args:
+            limit: Maximum number of articles to return
+            unread_only: Only include articles that are unread in FreshRSS
+            sources: Only include articles from these feeds (by title, case-insensitive)
+
+        Returns:
+            List of articles
+        """
+        source_sql, source_params = self._source_filter(sources)
+        unread_sql = " AND a.unread = 1" if unread_only else ""
+        return self._articles(
+            "SELECT a.item_id, a.title, a.url, a.source, a.published, a.content FROM articles a "
+            f"WHERE 1 = 1{unread_sql}{source_sql} ORDER BY a.published DESC LIMIT ?",
+            [*source_params, limit],
+        )
+
+    def get(self, item_id: str) -> Optional[NewsArticle]:
+        """A stored article by its FreshRSS item ID."""
+        articles = self._articles(
+            "SELECT item_id, title, url, source, published, content FROM articles WHERE item_id = ?",
+            [item_id],
+        )
+        return articles[0] if articles else None
+
+    def mark_read(self, item_id: str, read: bool = True):
+        """Record that an article was marked read (or unread) in FreshRSS."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE articles SET unread = ? WHERE item_id = ?", (int(not read), item_id))
+
+    def set_state(self, stream: str, item_ids: Iterable[str]) -> int:
+        """Bring the unread or starred flag of every stored article in line with FreshRSS.
+
+        Args:
+            stream: "unread" or "starred"
+            item_ids: IDs of all items currently in that state in FreshRSS
+
+        Returns:
+            Number of articles whose flag changed
+        """
+        column = {"unread": "unread", "starred": "starred"}[stream]
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS state_ids (item_id TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM state_ids")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO state_ids (item_id) VALUES (?)", [(item_id,) for item_id in item_ids]
+            )
+            cursor = self._conn.execute(
+                f"UPDATE articles SET {column} = (item_id IN (SELECT item_id FROM state_ids)) "
+                f"WHERE {column} != (item_id IN (SELECT item_id FROM state_ids))"
+            )
+            self._conn.execute("DELETE FROM state_ids")
+        return cursor.rowcount
+
+    def sync_since(self, stream: str) -> float:
+        """Unix timestamp up to which a stream has been synced (0 if never)."""
+        with self._lock:
+            row = self._conn.execute("SELECT since FROM sync_state WHERE stream = ?", (stream,)).fetchone()
+        return row[0] if row else 0.0
+
+    def last_synced(self) -> Optional[float]:
+        """When any stream was last synced, as a Unix timestamp."""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(synced_at) FROM sync_state").fetchone()
+        return row[0] if row else None
+
+    def set_sync_since(self, stream: str, since: float):
+        """Record how far a stream has been synced."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_state (stream, since, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (stream) DO UPDATE SET since = MAX(since, excluded.since), synced_at = excluded.synced_at",
+                (stream, since, time.time()),
+            )
+
+    def prune(self, older_than: datetime) -> int:
+        """Delete read, unstarred articles published before a date; returns how many were deleted."""
+        cutoff = older_than.timestamp()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id, title, content FROM articles WHERE unread = 0 AND starred = 0 AND published < ?",
+                (cutoff,),
+            ).fetchall()
+            if self.fts_enabled:
+                self._conn.executemany(
+                    "INSERT INTO article_text (article_text, rowid, title, content) VALUES ('delete', ?, ?, ?)",
+                    [(article_id, title, _decompress(content)) for article_id, title, content in rows],
+                )
+            self._conn.executemany("DELETE FROM articles WHERE id = ?", [(row[0],) for row in rows])
+        return len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """Number of stored articles and size of the database."""
+        with self._lock:
+            total, unread, starred = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(unread), 0), COALESCE(SUM(starred), 0) FROM articles"
+            ).fetchone()
+        return {
+            "articles": total,
+            "unread": unread,
+            "starred": starred,
+            "size_bytes": self.db_path.stat().st_size if self.db_path.exists() else 0,
+            "last_synced": self.last_synced(),
+        }
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -14,6 +14,7 @@ from typing import List, Optional
 
 from .agent import NewsCuratorAgent
 from .config import Config, load_config
+from .mcp_pool import tool_result_json
 from .models import UserPreferences
 
 
@@ -51,6 +52,9 @@ def parse_args():
     unread_parser = subparsers.add_parser("list-unread", help="List unread articles")
     unread_parser.add_argument("--limit", type=int, default=50, help="Maximum number of articles to return")
 
+    # Sync command
+    subparsers.add_parser("sync", help="Sync new FreshRSS articles into the local article store")
+
     # Mark as read command
     mark_read_parser = subparsers.add_parser("mark-read", help="Mark an article as read")
     mark_read_parser.add_argument("article_id", help="ID of the article to mark as read")
@@ -115,7 +119,14 @@ async def run_search_command(agent: NewsCuratorAgent, args):
     preferences = create_user_preferences(args)
 
     print(f"Searching for: {args.query} (source: {args.search_source})")
-    articles = await agent.search_news(args.query, preferences, args.search_source)
+    if args.search_source == "all":
+        # Report each source as it answers
+        articles = []
+        async for update in agent.search_news_stream(args.query, preferences):
+            print(f"  {update.source}: {update.status}, {update.new_articles} articles ({update.elapsed_seconds:.1f}s)")
+            articles = update.articles
+    else:
+        articles = await agent.search_news(args.query, preferences, args.search_source)
 
     # Print results
     print("\n" + "=" * 50)
@@ -126,6 +137,8 @@ async def run_search_command(agent: NewsCuratorAgent, args):
     for i, article in enumerate(articles, 1):
         print(f"{i}. {article.title}")
         print(f"   Source: {article.source}")
+        if article.other_sources:
+            print(f"   Also in: {', '.join(article.other_sources)}")
         print(f"   Date: {article.published_date.date()}")
         print(f"   ID: {article.id}")
         print(f"   URL: {article.url}")
@@ -169,55 +182,68 @@ async def run_list_feeds_command(agent: NewsCuratorAgent, args):
     """Run the list-feeds command."""
     print("Listing feed subscriptions...")
 
-    async with agent.agent.run_mcp_servers():
-        result = await agent.freshrss_server.call_tool("list_feeds", {})
-        feeds_data = json.loads(result)
-
-        if "feeds" in feeds_data:
-            print("\n" + "=" * 50)
-            print("FEED SUBSCRIPTIONS")
-            print("=" * 50)
-
-            for feed in feeds_data["feeds"]:
-                print(f"ID: {feed['id']}")
-                print(f"Title: {feed['title']}")
-                print(f"URL: {feed.get('url', 'N/A')}")
-                print(f"Site URL: {feed.get('site_url', 'N/A')}")
-                print()
-        else:
-            print("No feeds found or error in response")
+    result = await agent.mcp_pool.call_tool("freshrss", "list_feeds", {})
+    feeds_data = tool_result_json(result)
+
+    if "feeds" in feeds_data:
+        print("\n" + "=" * 50)
+        print("FEED SUBSCRIPTIONS")
+        print("=" * 50)
+
+        for feed in feeds_data["feeds"]:
+            print(f"ID: {feed['id']}")
+            print(f"Title: {feed['title']}")
+            print(f"URL: {feed.get('url', 'N/A')}")
+            print(f"Site URL: {feed.get('site_url', 'N/A')}")
+            print()
+    else:
+        print("No feeds found or error in response")
 
 
 async def run_list_unread_command(agent: NewsCuratorAgent, args):
     """Run the list-unread command."""
     print(f"Listing unread articles (limit: {args.limit})...")
 
-    async with agent.agent.run_mcp_servers():
-        result = await agent.freshrss_server.call_tool("get_unread", {"limit": args.limit})
-        unread_data = json.loads(result)
-
-        if "items" in unread_data:
-            print("\n" + "=" * 50)
-            print("UNREAD ARTICLES")
-            print("=" * 50)
-
-            for item in unread_data["items"]:
-                print(f"ID: {item['id']}")
-                print(f"Title: {item['title']}")
-                print(f"Source: {item.get('feed_title', 'Unknown')}")
-                print(f"Date: {datetime.fromtimestamp(item['created_on_time']).date()}")
-                print()
-        else:
-            print("No unread articles found or error in response")
+    result = await agent.mcp_pool.call_tool("freshrss", "get_unread", {"limit": args.limit})
+    unread_data = tool_result_json(result)
+
+    if "items" in unread_data:
+        print("\n" + "=" * 50)
+        print("UNREAD ARTICLES")
+        print("=" * 50)
+
+        for item in unread_data["items"]:
+            print(f"ID: {item['id']}")
+            print(f"Title: {item['title']}")
+            print(f"Source: {item.get('feed_title', 'Unknown')}")
+            print(f"Date: {datetime.fromtimestamp(item['created_on_time']).date()}")
+            print()
+    else:
+        print("No unread articles found or error in response")
 
 
 async def run_mark_read_command(agent: NewsCuratorAgent, args):
     """Run the mark-read command."""
     print(f"Marking article as read: {args.article_id}")
 
-    async with agent.agent.run_mcp_servers():
-        result = await agent.freshrss_server.call_tool("mark_item_read", {"item_id": args.article_id})
-        print(result)
+    result = await agent.mark_article_read(args.article_id)
+    print(result)
+
+
+async def run_sync_command(agent: NewsCuratorAgent, args):
+    """Run the sync command."""
+    if not agent.article_store:
+        print("The local article store is disabled (ARTICLE_STORE_ENABLED)")
+        return
+
+    print("Syncing articles from FreshRSS...")
+    counts = await agent.sync_articles()
+    stats = agent.article_store.stats()
+
+    print(f"Stored {counts.get('unread', 0)} unread and {counts.get('starred', 0)} starred items, "
+          f"updated {counts.get('updated', 0)} read or starred flags, pruned {counts.get('pruned', 0)} old articles")
+    print(f"The store holds {stats['articles']} articles ({stats['unread']} unread, {stats['starred']} starred), "
+          f"{stats['size_bytes'] / 1024 / 1024:.1f} MB")
 
 
 async def main():
@@ -232,18 +258,24 @@ async def main():
     agent = NewsCuratorAgent()
 
     # Run the appropriate command
-    if args.command == "briefing":
-        await run_briefing_command(agent, args)
-    elif args.command == "search":
-        await run_search_command(agent, args)
-    elif args.command == "get-article":
-        await run_get_article_command(agent, args)
-    elif args.command == "list-feeds":
-        await run_list_feeds_command(agent, args)
-    elif args.command == "list-unread":
-        await run_list_unread_command(agent, args)
-    elif args.command == "mark-read":
-        await run_mark_read_command(agent, args)
+    try:
+        if args.command == "briefing":
+            await run_briefing_command(agent, args)
+        elif args.command == "search":
+            await run_search_command(agent, args)
+        elif args.command == "get-article":
+            await run_get_article_command(agent, args)
+        elif args.command == "list-feeds":
+            await run_list_feeds_command(agent, args)
+        elif args.command == "list-unread":
+            await run_list_unread_command(agent, args)
+        elif args.command == "mark-read":
+            await run_mark_read_command(agent, args)
+        elif args.command == "sync":
+            await run_sync_command(agent, args)
+    finally:
+        # Stop the MCP servers started for the command
+        await agent.close()
 
 
 def cli_main():
@@ -68,6 +68,40 @@ class BraveSearchConfig(BaseModel):
     server_path: Optional[str] = Field(None, description="Path to the Brave Search MCP server executable")
 
 
+class MCPConfig(BaseModel):
+    """Configuration for the pool of long-lived MCP server sessions."""
+
+    max_concurrent_calls: int = Field(8, description="Maximum tool calls in flight per MCP server")
+    health_check_interval: float = Field(30.0, description="Seconds between MCP server health checks (0 disables them)")
+    start_timeout: float = Field(60.0, description="Seconds to wait for an MCP server to start")
+    call_timeout: float = Field(60.0, description="Seconds before an MCP tool call is abandoned")
+
+
+class SearchConfig(BaseModel):
+    """Configuration for searches across several news sources."""
+
+    source_timeouts: Dict[str, float] = Field(
+        default_factory=lambda: {"freshrss": 10.0, "google": 8.0, "brave": 8.0},
+        description="Seconds each source gets to answer before it is left out",
+    )
+    source_weights: Dict[str, float] = Field(
+        default_factory=lambda: {"freshrss": 1.0, "google": 0.8, "brave": 0.7},
+        description="Ranking weight of each source",
+    )
+    recency_half_life_hours: float = Field(24.0, description="Age at which an article's recency score halves")
+    duplicate_threshold: float = Field(0.6, description="Title similarity above which articles are the same story")
+
+
+class ArticleStoreConfig(BaseModel):
+    """Configuration for the local store of FreshRSS articles."""
+
+    enabled: bool = Field(True, description="Whether searches and briefings use the local article store")
+    db_path: str = Field("data/articles.db", description="Path to the SQLite article database")
+    sync_interval: float = Field(300.0, description="Seconds between background syncs (0 disables them)")
+    page_size: int = Field(200, description="Items requested from FreshRSS per page while syncing")
+    retention_days: int = Field(30, description="Days to keep read, unstarred articles")
+
+
 class AgentConfig(BaseModel):
     """Configuration for the PydanticAI agent."""
 
@@ -85,10 +119,23 @@ class Config(BaseModel):
     freshrss: FreshRSSConfig
     google_news: GoogleNewsConfig = Field(default_factory=GoogleNewsConfig)
     brave_search: BraveSearchConfig = Field(default_factory=BraveSearchConfig)
+    mcp: MCPConfig = Field(default_factory=MCPConfig)
+    search: SearchConfig = Field(default_factory=SearchConfig)
+    article_store: ArticleStoreConfig = Field(default_factory=ArticleStoreConfig)
     agent: AgentConfig = Field(default_factory=AgentConfig)
     default_preferences: UserPreferences = Field(default_factory=UserPreferences)
 
 
+def _parse_source_values(value: str) -> Dict[str, float]:
+    """Parse "freshrss=10,google=8" into a mapping of source name to number."""
+    values = {}
+    for pair in value.split(","):
+        if "=" in pair:
+            name, number = pair.split("=", 1)
+            values[name.strip()] = float(number)
+    return values
+
+
 def load_config(config_file: Optional[str] = None) -> Config:
     """Load configuration from environment variables or config file.
 
@@ -118,6 +165,34 @@ def load_config(config_file: Optional[str] = None) -> Config:
         server_path=os.environ.get("BRAVE_SEARCH_SERVER_PATH"),
     )
 
+    # Load MCP session pool configuration
+    mcp_config = MCPConfig(
+        max_concurrent_calls=int(os.environ.get("MCP_MAX_CONCURRENT_CALLS", "8")),
+        health_check_interval=float(os.environ.get("MCP_HEALTH_CHECK_INTERVAL", "30")),
+        start_timeout=float(os.environ.get("MCP_START_TIMEOUT", "60")),
+        call_timeout=float(os.environ.get("MCP_CALL_TIMEOUT", "60")),
+    )
+
+    # Load search configuration
+    search_config = SearchConfig()
+    if timeouts_str := os.environ.get("SEARCH_SOURCE_TIMEOUTS"):
+        search_config.source_timeouts.update(_parse_source_values(timeouts_str))
+    if weights_str := os.environ.get("SEARCH_SOURCE_WEIGHTS"):
+        search_config.source_weights.update(_parse_source_values(weights_str))
+    if half_life := os.environ.get("SEARCH_RECENCY_HALF_LIFE_HOURS"):
+        search_config.recency_half_life_hours = float(half_life)
+    if threshold := os.environ.get("SEARCH_DUPLICATE_THRESHOLD"):
+        search_config.duplicate_threshold = float(threshold)
+
+    # Load article store configuration
+    article_store_config = ArticleStoreConfig(
+        enabled=os.environ.get("ARTICLE_STORE_ENABLED", "true").lower() in ("true", "1", "yes"),
+        db_path=os.environ.get("ARTICLE_STORE_PATH", "data/articles.db"),
+        sync_interval=float(os.environ.get("ARTICLE_SYNC_INTERVAL", "300")),
+        page_size=int(os.environ.get("ARTICLE_SYNC_PAGE_SIZE", "200")),
+        retention_days=int(os.environ.get("ARTICLE_STORE_RETENTION_DAYS", "30")),
+    )
+
     # Check if OpenRouter API key is available
     openrouter_api_key = os.environ.get("OPENROUTER_API_KEY")
     use_openrouter = bool(openrouter_api_key) or os.environ.get("USE_OPENROUTER", "").lower() in ("true", "1", "yes")
@@ -175,6 +250,9 @@ def load_config(config_file: Optional[str] = None) -> Config:
         freshrss=freshrss_config,
         google_news=google_news_config,
         brave_search=brave_search_config,
+        mcp=mcp_config,
+        search=search_config,
+        article_store=article_store_config,
         agent=agent_config,
         default_preferences=UserPreferences(**user_prefs),
     )
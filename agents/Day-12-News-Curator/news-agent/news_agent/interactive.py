@@ -4,25 +4,59 @@ Interactive web interface for the news curator agent.
 This module provides a FastAPI-based web interface for interacting with the news curator agent.
 """
 
-import asyncio
 import json
 import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
 
 import fastapi
 from fastapi import Depends, Request
 from fastapi.responses import FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
+from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    FunctionToolCallEvent,
+    FunctionToolResultEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+    ToolReturnPart,
+)
 
 from .agent import NewsCuratorAgent
 from .config import Config, load_config
-from .models import NewsArticle, UserPreferences
+from .logging import loggers
+from .models import NewsArticle, NewsBriefing, UserPreferences
+
+# Get logger for this module
+logger = loggers["interactive"]
+
+SEARCH_KEYWORDS = ["search", "find", "look for", "articles about", "news about"]
+BRIEFING_KEYWORDS = ["briefing", "update me", "what's new", "latest news"]
+
+# Chat requests kept for the latency summary in /health
+CHAT_LATENCY_WINDOW = 200
+chat_latencies: Deque[Dict[str, Any]] = deque(maxlen=CHAT_LATENCY_WINDOW)
+
+
+@asynccontextmanager
+async def lifespan(app: fastapi.FastAPI):
+    """Start the MCP servers with the app and keep them running until shutdown."""
+    # Servers that fail to start are retried in the background; requests wait for them
+    await news_agent.mcp_pool.start()
+    news_agent.start_background_sync()
+    yield
+    await news_agent.close()
+
 
 # Create the FastAPI app
-app = fastapi.FastAPI(title="News Curator Agent")
+app = fastapi.FastAPI(title="News Curator Agent", lifespan=lifespan)
 
 # Get the directory of this file
 THIS_DIR = Path(__file__).parent
@@ -146,12 +180,22 @@ async def index() -> FileResponse:
                         const decoder = new TextDecoder();
                         let assistantMessage = '';
                         let assistantDiv = null;
+                        let buffer = '';
 
                         while (true) {
                             const { done, value } = await reader.read();
                             if (done) break;
 
-                            const text = decoder.decode(value);
+                            // Each line of the response is one JSON event; only text is shown here
+                            buffer += decoder.decode(value, { stream: true });
+                            const lines = buffer.split('\\n');
+                            buffer = lines.pop();
+                            const events = lines.filter(line => line.trim()).map(line => JSON.parse(line));
+                            if (events.some(event => event.type === 'error')) {
+                                errorElement.classList.remove('hidden');
+                            }
+                            const text = events.filter(event => event.type === 'text').map(event => event.content).join('');
+                            if (!text) continue;
                             assistantMessage += text;
 
                             if (!assistantDiv) {
@@ -187,9 +231,37 @@ async def index() -> FileResponse:
     return FileResponse(html_path, media_type="text/html")
 
 
+@app.get("/health")
+async def health() -> Dict[str, Any]:
+    """Report the state of the MCP server sessions, the article store and chat latency."""
+    health = news_agent.mcp_pool.stats()
+    if news_agent.article_store:
+        health["article_store"] = news_agent.article_store.stats()
+    health["chat"] = chat_latency_stats()
+    return health
+
+
+@app.get("/search")
+async def search(q: str, source: str = "all") -> StreamingResponse:
+    """Search news and stream one JSON line per source as each source answers."""
+    sources = None if source == "all" else [source]
+
+    async def stream_updates():
+        async for update in news_agent.search_news_stream(q, sources=sources):
+            yield update.model_dump_json() + "\n"
+
+    return StreamingResponse(stream_updates(), media_type="application/x-ndjson")
+
+
 @app.post("/chat")
 async def chat(request: Request) -> StreamingResponse:
-    """Handle chat requests and stream responses."""
+    """Handle chat requests and stream the reply as one JSON event per line.
+
+    Events are {"type": "text", "content": ...} for each piece of the reply,
+    {"type": "tool_call", "tool": ..., "args": ...} and {"type": "tool_result", "tool": ...,
+    "status": ...} while tools run, {"type": "error", "message": ...} if the request fails,
+    and a final {"type": "done", "ttft_seconds": ..., "total_seconds": ...}.
+    """
     # Parse the request body
     body = await request.json()
     prompt = body.get("prompt", "")
@@ -198,20 +270,146 @@ async def chat(request: Request) -> StreamingResponse:
         return Response("Prompt is required", status_code=400)
 
     async def stream_response():
-        """Stream the agent's response."""
+        """Stream the agent's events and time the first piece of text."""
+        started = time.monotonic()
+        ttft = None
+        tool_calls = 0
         try:
-            # Process the user's message
-            response_text = await process_user_message(prompt)
+            async for event in stream_user_message(prompt):
+                if event["type"] == "text" and ttft is None:
+                    ttft = time.monotonic() - started
+                elif event["type"] == "tool_call":
+                    tool_calls += 1
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            logger.error(f"Error processing chat message: {e}", exc_info=True)
+            yield json.dumps({"type": "error", "message": str(e)}) + "\n"
 
-            # Stream the response
-            for chunk in response_text.split(" "):
-                yield f"{chunk} "
-                await asyncio.sleep(0.01)  # Small delay for streaming effect
+        total = time.monotonic() - started
+        record_chat_latency(ttft, total, tool_calls)
+        yield json.dumps({
+            "type": "done",
+            "ttft_seconds": round(ttft, 3) if ttft is not None else None,
+            "total_seconds": round(total, 3),
+        }) + "\n"
+
+    return StreamingResponse(stream_response(), media_type="application/x-ndjson")
+
+
+def record_chat_latency(ttft: Optional[float], total: float, tool_calls: int):
+    """Log one chat request's latency and keep it for the summary in /health."""
+    if ttft is None:
+        logger.info(f"Chat request produced no text in {total:.3f}s ({tool_calls} tool calls)")
+    else:
+        logger.info(f"Chat request TTFT {ttft:.3f}s, total {total:.3f}s ({tool_calls} tool calls)")
+    chat_latencies.append({"ttft": ttft, "total": total, "tool_calls": tool_calls})
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(int(fraction * len(ordered)), len(ordered) - 1)], 3)
+
+
+def chat_latency_stats() -> Dict[str, Any]:
+    """Time to first token and total time over the most recent chat requests."""
+    ttfts = [entry["ttft"] for entry in chat_latencies if entry["ttft"] is not None]
+    totals = [entry["total"] for entry in chat_latencies]
+    return {
+        "requests": len(chat_latencies),
+        "ttft_p50_seconds": _percentile(ttfts, 0.5),
+        "ttft_p95_seconds": _percentile(ttfts, 0.95),
+        "total_p50_seconds": _percentile(totals, 0.5),
+        "total_p95_seconds": _percentile(totals, 0.95),
+    }
 
-        except Exception as e:
-            yield f"Error: {str(e)}"
 
-    return StreamingResponse(stream_response(), media_type="text/plain")
+async def stream_user_message(message: str) -> AsyncIterator[Dict[str, Any]]:
+    """Process a user message, yielding the reply as it is produced.
+
+    Search and briefing requests are answered from the agent's own search and briefing
+    methods; everything else goes to the LLM, whose text is passed on token by token
+    together with the tool calls it makes.
+
+    Args:
+        message: The user's message
+
+    Yields:
+        Chat events, as described in `chat`
+    """
+    # The MCP servers stay running between messages; this only waits if one is restarting
+    await news_agent.start()
+
+    lowered = message.lower()
+
+    # If the message seems like a search query
+    if any(keyword in lowered for keyword in SEARCH_KEYWORDS):
+        # Extract the search query
+        search_terms = lowered
+        for prefix in SEARCH_KEYWORDS:
+            search_terms = search_terms.replace(prefix, "").strip()
+
+        # Determine which source to use
+        source = "all"
+        if "google" in lowered:
+            source = "google"
+        elif "brave" in lowered:
+            source = "brave"
+        elif "freshrss" in lowered or "feed" in lowered:
+            source = "freshrss"
+
+        # Search every source at once and report each one as it answers
+        sources = None if source == "all" else [source]
+        yield {"type": "tool_call", "tool": "search_news", "args": {"query": search_terms, "source": source}}
+        articles: List[NewsArticle] = []
+        async for update in news_agent.search_news_stream(search_terms, sources=sources):
+            articles = update.articles
+            yield {"type": "tool_result", "tool": update.source, "status": update.status}
+
+        yield {"type": "text", "content": format_search_reply(search_terms, source, articles)}
+        return
+
+    # If the message seems like a briefing request
+    if any(keyword in lowered for keyword in BRIEFING_KEYWORDS):
+        yield {"type": "tool_call", "tool": "create_briefing", "args": {}}
+        briefing = await news_agent.create_briefing()
+        yield {"type": "tool_result", "tool": "create_briefing", "status": "ok"}
+        yield {"type": "text", "content": format_briefing_reply(briefing)}
+        return
+
+    # For other queries, stream the agent's response
+    prompt = f"""
+        You are a helpful news assistant. The user has sent the following message:
+
+        {message}
+
+        Based on this message, determine what the user wants:
+        1. If they're asking for news on a specific topic, use search_news to find relevant articles
+        2. If they want a briefing, use create_briefing to get recent news
+        3. For any other query, respond helpfully
+
+        Respond in a conversational manner.
+        """
+    async with news_agent.agent.iter(prompt) as run:
+        async for node in run:
+            if Agent.is_model_request_node(node):
+                async with node.stream(run.ctx) as request_stream:
+                    async for event in request_stream:
+                        if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+                            if event.part.content:
+                                yield {"type": "text", "content": event.part.content}
+                        elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+                            if event.delta.content_delta:
+                                yield {"type": "text", "content": event.delta.content_delta}
+            elif Agent.is_call_tools_node(node):
+                async with node.stream(run.ctx) as handle_stream:
+                    async for event in handle_stream:
+                        if isinstance(event, FunctionToolCallEvent):
+                            yield {"type": "tool_call", "tool": event.part.tool_name, "args": event.part.args}
+                        elif isinstance(event, FunctionToolResultEvent):
+                            status = "ok" if isinstance(event.result, ToolReturnPart) else "retry"
+                            yield {"type": "tool_result", "tool": event.result.tool_name, "status": status}
 
 
 async def process_user_message(message: str) -> str:
@@ -223,84 +421,51 @@ async def process_user_message(message: str) -> str:
     Returns:
         The agent's response
     """
-    # Start MCP servers
-    async with news_agent.agent.run_mcp_servers():
-        # Use the agent to process the message
-        result = await news_agent.agent.run(
-            f"""
-            You are a helpful news assistant. The user has sent the following message:
-
-            {message}
-
-            Based on this message, determine what the user wants:
-            1. If they're asking for news on a specific topic, use search_news to find relevant articles
-            2. If they want a briefing, use create_briefing to get recent news
-            3. For any other query, respond helpfully
-
-            Respond in a conversational manner.
-            """
-        )
-
-        # If the message seems like a search query
-        if any(keyword in message.lower() for keyword in ["search", "find", "look for", "articles about", "news about"]):
-            # Extract the search query
-            search_terms = message.lower()
-            for prefix in ["search", "find", "look for", "articles about", "news about"]:
-                search_terms = search_terms.replace(prefix, "").strip()
-
-            # Determine which source to use
-            source = "all"
-            if "google" in message.lower():
-                source = "google"
-            elif "brave" in message.lower():
-                source = "brave"
-            elif "freshrss" in message.lower() or "feed" in message.lower():
-                source = "freshrss"
-
-            # Search for news
-            articles = await news_agent.search_news(search_terms, source=source)
-
-            if articles:
-                response = f"I found {len(articles)} articles about '{search_terms}'"
-                if source != "all":
-                    response += f" from {source}"
-                response += ":\n\n"
-
-                for i, article in enumerate(articles[:5], 1):
-                    response += f"{i}. **{article.title}** ({article.source}, {article.published_date.date()})\n"
-                    response += f"   {article.url}\n\n"
-
-                if len(articles) > 5:
-                    response += f"\nAnd {len(articles) - 5} more articles."
-            else:
-                response = f"I couldn't find any articles about '{search_terms}'"
-                if source != "all":
-                    response += f" from {source}"
-                response += ". Would you like to try a different search term or source?"
-
-            return response
-
-        # If the message seems like a briefing request
-        elif any(keyword in message.lower() for keyword in ["briefing", "update me", "what's new", "latest news"]):
-            # Create a briefing
-            briefing = await news_agent.create_briefing()
-
-            if briefing.articles:
-                response = f"**News Briefing**\n\nHere are the latest articles:\n\n"
-
-                # Add articles
-                for i, article in enumerate(briefing.articles[:5], 1):
-                    response += f"{i}. **{article.title}** ({article.source}, {article.published_date.date()})\n"
-
-                if len(briefing.articles) > 5:
-                    response += f"\nAnd {len(briefing.articles) - 5} more articles."
-            else:
-                response = "I couldn't find any recent news articles. Would you like to try a specific search instead?"
-
-            return response
-
-        # For other queries, return the agent's response
-        return result.output
+    parts = []
+    async for event in stream_user_message(message):
+        if event["type"] == "text":
+            parts.append(event["content"])
+    return "".join(parts)
+
+
+def format_search_reply(search_terms: str, source: str, articles: List[NewsArticle]) -> str:
+    """Markdown reply listing the top search results."""
+    if articles:
+        response = f"I found {len(articles)} articles about '{search_terms}'"
+        if source != "all":
+            response += f" from {source}"
+        response += ":\n\n"
+
+        for i, article in enumerate(articles[:5], 1):
+            response += f"{i}. **{article.title}** ({article.source}, {article.published_date.date()})\n"
+            response += f"   {article.url}\n\n"
+
+        if len(articles) > 5:
+            response += f"\nAnd {len(articles) - 5} more articles."
+    else:
+        response = f"I couldn't find any articles about '{search_terms}'"
+        if source != "all":
+            response += f" from {source}"
+        response += ". Would you like to try a different search term or source?"
+
+    return response
+
+
+def format_briefing_reply(briefing: NewsBriefing) -> str:
+    """Markdown reply listing the top articles of a briefing."""
+    if briefing.articles:
+        response = f"**News Briefing**\n\nHere are the latest articles:\n\n"
+
+        # Add articles
+        for i, article in enumerate(briefing.articles[:5], 1):
+            response += f"{i}. **{article.title}** ({article.source}, {article.published_date.date()})\n"
+
+        if len(briefing.articles) > 5:
+            response += f"\nAnd {len(briefing.articles) - 5} more articles."
+    else:
+        response = "I couldn't find any recent news articles. Would you like to try a specific search instead?"
+
+    return response
 
 
 def run_server(host: str = "127.0.0.1", port: int = 8000):
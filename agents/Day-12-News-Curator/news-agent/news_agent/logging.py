@@ -142,6 +142,8 @@ def configure_app_loggers():
     agent_logger = get_logger("news_agent.agent", level=LOG_LEVEL, format_string=DETAILED_FORMAT, file_output=True)
     freshrss_logger = get_logger("news_agent.freshrss", level=LOG_LEVEL, format_string=DETAILED_FORMAT, file_output=True)
     interactive_logger = get_logger("news_agent.interactive", level=LOG_LEVEL, format_string=DETAILED_FORMAT, file_output=True)
+    mcp_pool_logger = get_logger("news_agent.mcp_pool", level=LOG_LEVEL, format_string=DETAILED_FORMAT, file_output=True)
+    article_store_logger = get_logger("news_agent.article_store", level=LOG_LEVEL, format_string=DETAILED_FORMAT, file_output=True)
     
     # Tools loggers
     tools_logger = get_logger("news_agent.tools", level=LOG_LEVEL, format_string=DETAILED_FORMAT, file_output=True)
@@ -151,6 +153,8 @@ def configure_app_loggers():
         "agent": agent_logger,
         "freshrss": freshrss_logger,
         "interactive": interactive_logger,
+        "mcp_pool": mcp_pool_logger,
+        "article_store": article_store_logger,
         "tools": tools_logger,
     }
 
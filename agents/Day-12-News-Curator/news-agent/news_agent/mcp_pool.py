@@ -0,0 +1,270 @@
+"""
+Long-lived MCP server sessions for the news curator agent.
+
+This module provides a pool that starts the MCP servers once and keeps their sessions
+open, so tool calls no longer pay for spawning a subprocess and the MCP handshake.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, Optional, Set
+
+from pydantic_ai.exceptions import ModelRetry
+from pydantic_ai.mcp import MCPServer
+
+from .logging import loggers
+
+# Get logger for this module
+logger = loggers["mcp_pool"]
+
+# Wait before the first restart of a failed server; doubled on every further failure
+RESTART_DELAY = 1.0
+# Longest wait between attempts to start a server that keeps failing
+MAX_RESTART_DELAY = 30.0
+
+
+def tool_result_json(result: Any) -> Any:
+    """JSON data of a tool result, which pydantic-ai may already have parsed from the tool's text."""
+    if isinstance(result, (dict, list)):
+        return result
+    return json.loads(result)
+
+
+class _ServerSession:
+    """State of one pooled MCP server."""
+
+    def __init__(self, name: str, server: MCPServer, max_concurrent_calls: int):
+        self.name = name
+        self.server = server
+        self.ready = asyncio.Event()
+        self.attempted = asyncio.Event()
+        self.stop = asyncio.Event()
+        self.calls = asyncio.Semaphore(max_concurrent_calls)
+        self.task: Optional[asyncio.Task] = None
+        self.error: Optional[BaseException] = None
+        self.started_at: Optional[float] = None
+        self.starts = 0
+        self.in_flight = 0
+
+
+class MCPSessionPool:
+    """Keeps MCP server sessions open for the lifetime of the application.
+
+    Each server runs in its own task, which enters the server's context once and stays
+    there until the pool is closed, so the anyio task groups behind the stdio transport
+    are entered and exited in the same task. Concurrent tool calls share the live session
+    (MCP requests are multiplexed by id), bounded per server. A background task pings
+    every server with `list_tools` and restarts the ones that stop answering; a failed
+    call triggers the same check right away. The pool belongs to the event loop it is
+    started in.
+    """
+
+    def __init__(
+        self,
+        servers: Dict[str, MCPServer],
+        max_concurrent_calls: int = 8,
+        health_check_interval: float = 30.0,
+        start_timeout: float = 60.0,
+        call_timeout: float = 60.0,
+    ):
+        """Initialize the pool.
+
+        Args:
+            servers: MCP servers to manage, by name
+            max_concurrent_calls: Maximum tool calls in flight per server
+            health_check_interval: Seconds between health checks (0 disables them)
+            start_timeout: Seconds to wait for a server to become available
+            call_timeout: Seconds before a tool call is abandoned
+        """
+        self.servers = servers
+        self.max_concurrent_calls = max_concurrent_calls
+        self.health_check_interval = health_check_interval
+        self.start_timeout = start_timeout
+        self.call_timeout = call_timeout
+        self.restarts = 0
+        self._sessions: Dict[str, _ServerSession] = {}
+        self._health_task: Optional[asyncio.Task] = None
+        self._checks: Set[asyncio.Task] = set()
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._closing = False
+
+    @property
+    def is_started(self) -> bool:
+        """Whether the server tasks have been started."""
+        return bool(self._sessions) and not self._closing
+
+    async def start(self):
+        """Start every server and wait until each one is up or has failed its first attempt."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+
+        async with self._start_lock:
+            if self.is_started:
+                return
+            self._closing = False
+            logger.info(f"Starting MCP servers: {', '.join(self.servers)}")
+            for name, server in self.servers.items():
+                session = _ServerSession(name, server, self.max_concurrent_calls)
+                session.task = asyncio.create_task(self._run(session), name=f"mcp-{name}")
+                self._sessions[name] = session
+            if self.health_check_interval > 0:
+                self._health_task = asyncio.create_task(self._health_loop(), name="mcp-health")
+
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(session.attempted.wait() for session in self._sessions.values())),
+                    timeout=self.start_timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Timed out waiting for MCP servers to start")
+            for session in self._sessions.values():
+                if not session.ready.is_set():
+                    logger.error(f"MCP server '{session.name}' is not available: {session.error}")
+
+    async def _run(self, session: _ServerSession):
+        """Own one server's session: start it, hold it open and restart it when asked."""
+        delay = RESTART_DELAY
+        while not self._closing:
+            session.stop.clear()
+            try:
+                async with session.server:
+                    session.error = None
+                    session.starts += 1
+                    session.started_at = time.monotonic()
+                    session.ready.set()
+                    session.attempted.set()
+                    delay = RESTART_DELAY
+                    logger.info(f"MCP server '{session.name}' started")
+                    await session.stop.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                session.error = e
+                logger.error(f"MCP server '{session.name}' failed: {e}", exc_info=True)
+            finally:
+                session.ready.clear()
+                session.attempted.set()
+
+            if self._closing:
+                break
+            if session.error is not None:
+                # Back off, but wake up straight away if the pool is closed meanwhile
+                try:
+                    await asyncio.wait_for(session.stop.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                delay = min(delay * 2, MAX_RESTART_DELAY)
+                if self._closing:
+                    break
+            logger.info(f"Restarting MCP server '{session.name}'")
+
+    async def _health_loop(self):
+        """Periodically check every running server."""
+        while not self._closing:
+            await asyncio.sleep(self.health_check_interval)
+            await asyncio.gather(
+                *(self._check(session) for session in self._sessions.values() if session.ready.is_set())
+            )
+
+    async def _check(self, session: _ServerSession) -> bool:
+        """Ping a server and restart it if it does not answer."""
+        try:
+            await asyncio.wait_for(session.server.list_tools(), timeout=self.call_timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"MCP server '{session.name}' failed its health check: {e}")
+            self._restart(session)
+            return False
+
+    def _restart(self, session: _ServerSession):
+        if not session.ready.is_set() or self._closing:
+            return
+        self.restarts += 1
+        # New callers wait for the replacement instead of using the dying session
+        session.ready.clear()
+        session.stop.set()
+
+    async def _wait_ready(self, name: str) -> _ServerSession:
+        await self.start()
+        session = self._sessions.get(name)
+        if session is None:
+            raise ValueError(f"Unknown MCP server: {name}")
+        if not session.ready.is_set():
+            try:
+                await asyncio.wait_for(session.ready.wait(), timeout=self.start_timeout)
+            except asyncio.TimeoutError:
+                raise RuntimeError(f"MCP server '{name}' is not available: {session.error}") from None
+        return session
+
+    async def wait_ready(self):
+        """Start the pool if needed and wait until every server is available."""
+        await asyncio.gather(*(self._wait_ready(name) for name in self.servers))
+
+    async def call_tool(self, name: str, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Call a tool on one of the pooled servers.
+
+        Args:
+            name: Name of the server in the pool
+            tool_name: Name of the tool to call
+            arguments: Arguments for the tool
+
+        Returns:
+            The tool result, as returned by the MCP server
+        """
+        session = await self._wait_ready(name)
+        async with session.calls:
+            session.in_flight += 1
+            try:
+                return await asyncio.wait_for(
+                    session.server.call_tool(tool_name, arguments), timeout=self.call_timeout
+                )
+            except ModelRetry:
+                # The tool reported an error; the session itself is fine
+                raise
+            except Exception:
+                if session.ready.is_set():
+                    check = asyncio.create_task(self._check(session))
+                    self._checks.add(check)
+                    check.add_done_callback(self._checks.discard)
+                raise
+            finally:
+                session.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Current state of every server in the pool."""
+        now = time.monotonic()
+        return {
+            "restarts": self.restarts,
+            "servers": {
+                name: {
+                    "running": session.ready.is_set(),
+                    "starts": session.starts,
+                    "in_flight": session.in_flight,
+                    "uptime_seconds": round(now - session.started_at, 1)
+                    if session.ready.is_set() and session.started_at else None,
+                    "last_error": str(session.error) if session.error else None,
+                }
+                for name, session in self._sessions.items()
+            },
+        }
+
+    async def close(self):
+        """Stop every server."""
+        if not self._sessions:
+            return
+        self._closing = True
+        if self._health_task:
+            self._health_task.cancel()
+        for session in self._sessions.values():
+            session.stop.set()
+
+        tasks = [session.task for session in self._sessions.values() if session.task]
+        _, pending = await asyncio.wait(tasks, timeout=10)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+        self._sessions = {}
+        self._health_task = None
+        logger.info("MCP servers stopped")
@@ -5,7 +5,7 @@ This module defines the Pydantic models used throughout the news curator agent.
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field, HttpUrl
 
@@ -35,6 +35,7 @@ class NewsArticle(BaseModel):
     source: str
     published_date: datetime
     content: Optional[str] = None
+    other_sources: List[str] = Field(default_factory=list, description="Other sources that carried the same story")
 
 
 class NewsBriefing(BaseModel):
@@ -43,3 +44,14 @@ class NewsBriefing(BaseModel):
     title: str
     timestamp: datetime = Field(default_factory=datetime.now)
     articles: List[NewsArticle] = Field(default_factory=list)
+
+
+class SearchUpdate(BaseModel):
+    """Model representing progress of a search across several sources."""
+
+    source: str = Field(..., description="Source that just answered")
+    status: Literal["ok", "timeout", "error"] = Field(..., description="How the source answered")
+    new_articles: int = Field(0, description="Number of articles the source returned")
+    articles: List[NewsArticle] = Field(default_factory=list, description="Merged, ranked results so far")
+    pending_sources: List[str] = Field(default_factory=list, description="Sources still being searched")
+    elapsed_seconds: float = Field(0.0, description="Time since the search started")
@@ -0,0 +1,248 @@
+"""
+Merging and ranking of news search results from several sources.
+
+This module provides URL canonicalisation, near-duplicate clustering on article titles
+and the ranking used by the federated search in NewsCuratorAgent.
+"""
+
+import html
+import math
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .models import NewsArticle
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "ocid",
+    "ref", "ref_src", "cmpid", "ncid", "smid", "taid", "guccounter", "_ga",
+}
+TRACKING_PREFIXES = ("utm_", "at_", "itm_")
+
+RELATIVE_DATE = re.compile(r"(\d+|an?|one)\s+(second|minute|min|hour|day|week|month|year)s?\s+ago", re.IGNORECASE)
+RELATIVE_UNITS = {
+    "second": timedelta(seconds=1),
+    "minute": timedelta(minutes=1),
+    "min": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+# Absolute formats used by SerpAPI's Google News results
+DATE_FORMATS = ("%m/%d/%Y, %I:%M %p, %z UTC", "%m/%d/%Y, %I:%M %p", "%b %d, %Y", "%d %b %Y")
+
+# " - Reuters", " | The Verge": outlet names appended to headlines
+TITLE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,40}$")
+TAG = re.compile(r"<[^>]+>")
+
+
+def canonical_url(url: str) -> str:
+    """Normalise an article URL so the same page reached through different links compares equal.
+
+    Lowercases the scheme and host, drops "www.", fragments, trailing slashes and
+    tracking parameters, and sorts the remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.endswith(":80") or host.endswith(":443"):
+        host = host.rsplit(":", 1)[0]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme, host, path, urlencode(query), ""))
+
+
+def parse_published_date(value: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
+    """Parse dates like "3 hours ago", ISO timestamps or SerpAPI's "05/14/2025, 07:00 AM, +0000 UTC".
+
+    Returns a naive local datetime, like the ones built from FreshRSS timestamps, or
+    None when the value cannot be parsed.
+    """
+    if not value:
+        return None
+    now = now or datetime.now()
+    value = value.strip()
+
+    match = RELATIVE_DATE.search(value)
+    if match:
+        amount = match.group(1).lower()
+        count = 1 if amount in ("a", "an", "one") else int(amount)
+        return now - count * RELATIVE_UNITS[match.group(2).lower()]
+    if value.lower() == "yesterday":
+        return now - timedelta(days=1)
+
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        parsed = None
+        for date_format in DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(value, date_format)
+                break
+            except ValueError:
+                continue
+    if parsed is None:
+        return None
+    return _naive_local(parsed)
+
+
+def _naive_local(value: datetime) -> datetime:
+    """Aware datetimes converted to naive local time, which is what the rest of the agent uses."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def strip_html(text: Optional[str]) -> str:
+    """Plain text of an HTML fragment, with whitespace collapsed."""
+    if not text:
+        return ""
+    return " ".join(html.unescape(TAG.sub(" ", text)).split())
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def _normalize_title(title: str) -> str:
+    return _normalize_text(TITLE_SUFFIX.sub("", html.unescape(title)))
+
+
+def title_shingles(title: str, size: int = 2) -> Set[str]:
+    """Word n-grams of a normalised title; titles shorter than `size` words are one shingle."""
+    words = _normalize_title(title).split()
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def match_score(query: str, article: NewsArticle) -> int:
+    """How many of the query's words appear in the article's title or text; 0 means no match.
+
+    Every word has to start a word somewhere, in any order, so "regulat" matches
+    "regulation" but "ai" does not match "said"; words found in the title count twice.
+    """
+    words = _normalize_text(query).split()
+    if not words:
+        return 1
+    title = set(_normalize_text(html.unescape(article.title)).split())
+    text = title | set(_normalize_text(strip_html(article.content)).split())
+
+    def found(word: str, tokens: Set[str]) -> bool:
+        return any(token.startswith(word) for token in tokens)
+
+    if not all(found(word, text) for word in words):
+        return 0
+    return len(words) + sum(found(word, title) for word in words)
+
+
+class _Cluster:
+    """Articles about the same story, compared by the title of the first one."""
+
+    def __init__(self, article: NewsArticle, source: str, shingles: Set[str]):
+        self.articles = [(source, article)]
+        self.shingles = shingles
+
+
+def cluster_articles(
+    results: Dict[str, List[NewsArticle]], threshold: float = 0.6
+) -> List[List[Tuple[str, NewsArticle]]]:
+    """Group articles from all sources that point at the same page or carry near-identical titles.
+
+    Args:
+        results: Articles per source name
+        threshold: Jaccard similarity of title shingles above which two titles are the same story
+
+    Returns:
+        Clusters as lists of (source, article), in order of first appearance
+    """
+    clusters: List[_Cluster] = []
+    by_url: Dict[str, _Cluster] = {}
+    by_shingle: Dict[str, List[_Cluster]] = {}
+
+    for source, articles in results.items():
+        for article in articles:
+            url = canonical_url(str(article.url))
+            shingles = title_shingles(article.title)
+            cluster = by_url.get(url)
+
+            if cluster is None and shingles:
+                # Only clusters sharing at least one shingle can be similar enough
+                candidates = {id(c): c for shingle in shingles for c in by_shingle.get(shingle, [])}
+                best = 0.0
+                for candidate in candidates.values():
+                    similarity = len(shingles & candidate.shingles) / len(shingles | candidate.shingles)
+                    if similarity >= threshold and similarity > best:
+                        cluster, best = candidate, similarity
+
+            if cluster is None:
+                cluster = _Cluster(article, source, shingles)
+                clusters.append(cluster)
+                for shingle in shingles:
+                    by_shingle.setdefault(shingle, []).append(cluster)
+            else:
+                cluster.articles.append((source, article))
+            by_url.setdefault(url, cluster)
+
+    return [cluster.articles for cluster in clusters]
+
+
+def _recency(published: datetime, now: datetime, half_life_hours: float) -> float:
+    age_hours = max((now - published).total_seconds() / 3600, 0.0)
+    return math.pow(0.5, age_hours / half_life_hours)
+
+
+def merge_results(
+    results: Dict[str, List[NewsArticle]],
+    source_weights: Dict[str, float],
+    half_life_hours: float = 24.0,
+    threshold: float = 0.6,
+    now: Optional[datetime] = None,
+) -> List[NewsArticle]:
+    """Deduplicate articles across sources and rank them by recency and source weight.
+
+    Each story is represented by the article from the highest-weighted source (the one
+    with the most text on ties); the other sources that carried it are listed in
+    `other_sources`. Stories reported by several sources get a small boost.
+
+    Args:
+        results: Articles per source name
+        source_weights: Weight per source name (missing sources weigh 1.0)
+        half_life_hours: Age at which an article's recency score halves
+        threshold: Title similarity above which two articles are the same story
+        now: Reference time for recency (defaults to the current time)
+
+    Returns:
+        One article per story, best first
+    """
+    now = _naive_local(now or datetime.now())
+    ranked = []
+    for cluster in cluster_articles(results, threshold):
+        source, best = max(
+            cluster,
+            key=lambda entry: (source_weights.get(entry[0], 1.0), len(entry[1].content or "")),
+        )
+        other_sources = _unique(article.source for _, article in cluster if article.source != best.source)
+        newest = max(_naive_local(article.published_date) for _, article in cluster)
+        score = (
+            source_weights.get(source, 1.0)
+            * _recency(newest, now, half_life_hours)
+            * (1 + 0.25 * (len({s for s, _ in cluster}) - 1))
+        )
+        ranked.append((score, best.model_copy(update={"other_sources": other_sources})))
+
+    ranked.sort(key=lambda entry: entry[0], reverse=True)
+    return [article for _, article in ranked]
+
+
+def _unique(values: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(values))
+
@@ -0,0 +1,27 @@
+"""
+Shared fixtures for the news agent tests.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from news_agent.agent import NewsCuratorAgent
+from news_agent.config import AgentConfig, ArticleStoreConfig, Config, FreshRSSConfig
+
+
+@pytest.fixture
+def agent(tmp_path):
+    """An agent with a throwaway article store and the offline test model; no MCP server is started."""
+    config = Config(
+        freshrss=FreshRSSConfig(
+            api_url="http://freshrss.test",
+            username="reader",
+            password="secret",
+            # Only checked for existence; tests replace the calls that would start it
+            server_path=str(Path(__file__).parent / "fake_mcp_server.py"),
+        ),
+        article_store=ArticleStoreConfig(db_path=str(tmp_path / "articles.db"), sync_interval=0),
+        agent=AgentConfig(model_name="test"),
+    )
+    return NewsCuratorAgent(config)
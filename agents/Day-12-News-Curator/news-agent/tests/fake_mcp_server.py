@@ -0,0 +1,19 @@
+"""
+Minimal stdio MCP server used by the session pool tests.
+"""
+
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP("fake")
+
+
+@server.tool()
+def pid() -> dict:
+    """Process ID of this server."""
+    return {"pid": os.getpid()}
+
+
+if __name__ == "__main__":
+    server.run()
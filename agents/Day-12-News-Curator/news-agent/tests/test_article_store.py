@@ -0,0 +1,122 @@
+"""
+Tests for the local SQLite store of FreshRSS articles.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from news_agent.article_store import READ_TAG, STARRED_TAG, ArticleStore, parse_item
+
+
+def reader_item(number, title, added, read=False, starred=False, text="", source="Example Feed"):
+    """An item as returned by the Google Reader API of FreshRSS."""
+    categories = ["user/-/state/com.google/reading-list"]
+    if read:
+        categories.append(READ_TAG)
+    if starred:
+        categories.append(STARRED_TAG)
+    return {
+        "id": f"tag:google.com,2005:reader/item/{number:016x}",
+        "title": title,
+        "published": int(added),
+        "timestampUsec": str(int(added * 1_000_000)),
+        "canonical": [{"href": f"https://example.com/articles/{number}"}],
+        "summary": {"content": text},
+        "categories": categories,
+        "origin": {"title": source},
+    }
+
+
+def item_id(number):
+    return f"tag:google.com,2005:reader/item/{number:016x}"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArticleStore(tmp_path / "articles.db")
+    yield store
+    store.close()
+
+
+def test_parse_item_reads_google_reader_items():
+    fields = parse_item(reader_item(1, "Title", 1_700_000_000.5, read=True, starred=True, text="<p>Body</p>"))
+
+    assert fields["item_id"] == item_id(1)
+    assert fields["url"] == "https://example.com/articles/1"
+    assert fields["source"] == "Example Feed"
+    assert fields["added"] == 1_700_000_000.5
+    assert fields["unread"] is False
+    assert fields["starred"] is True
+
+
+def test_search_matches_titles_and_text(store):
+    now = datetime.now().timestamp()
+    store.add_items([
+        reader_item(1, "Solar power record", now - 60, text="<p>Panels produced more than <b>coal</b></p>"),
+        reader_item(2, "Coal plant closes", now - 30),
+        reader_item(3, "Football results", now),
+    ])
+
+    # A title match ranks above a match in the text
+    assert [a.id for a in store.search("coal")] == [item_id(2), item_id(1)]
+    # Words are matched as prefixes, in any order
+    assert [a.id for a in store.search("pan sola")] == [item_id(1)]
+    assert store.get(item_id(1)).content == "Panels produced more than coal"
+
+
+def test_updating_an_item_replaces_its_indexed_text(store):
+    now = datetime.now().timestamp()
+    store.add_items([reader_item(1, "Draft headline", now, text="first version")])
+    store.add_items([reader_item(1, "Final headline", now, text="second version")])
+
+    assert store.search("draft") == []
+    assert store.search("first") == []
+    assert [a.title for a in store.search("final second")] == ["Final headline"]
+    assert store.stats()["articles"] == 1
+
+
+def test_set_state_follows_freshrss(store):
+    now = datetime.now().timestamp()
+    store.add_items([
+        reader_item(1, "One", now - 3),
+        reader_item(2, "Two", now - 2, starred=True),
+        reader_item(3, "Three", now - 1, read=True),
+    ])
+
+    # Read elsewhere: 1; marked unread again: 3
+    assert store.set_state("unread", [item_id(2), item_id(3), item_id(99)]) == 2
+    assert [a.id for a in store.recent(unread_only=True)] == [item_id(3), item_id(2)]
+
+    assert store.set_state("starred", []) == 1
+    assert store.stats()["starred"] == 0
+    # Nothing left to change
+    assert store.set_state("unread", [item_id(2), item_id(3)]) == 0
+
+
+def test_prune_drops_only_old_read_unstarred_articles(store):
+    old = (datetime.now() - timedelta(days=40)).timestamp()
+    new = datetime.now().timestamp()
+    store.add_items([
+        reader_item(1, "Old read", old, read=True),
+        reader_item(2, "Old unread", old),
+        reader_item(3, "Old starred", old, read=True, starred=True),
+        reader_item(4, "New read", new, read=True),
+    ])
+
+    assert store.prune(datetime.now() - timedelta(days=30)) == 1
+    assert store.get(item_id(1)) is None
+    assert store.search("old read") == []
+    assert {a.id for a in store.recent()} == {item_id(2), item_id(3), item_id(4)}
+
+
+def test_sync_since_only_moves_forward(store):
+    assert store.sync_since("unread") == 0.0
+    assert store.last_synced() is None
+
+    store.set_sync_since("unread", 200.0)
+    store.set_sync_since("unread", 100.0)
+
+    assert store.sync_since("unread") == 200.0
+    assert store.sync_since("starred") == 0.0
+    assert store.last_synced() is not None
@@ -0,0 +1,109 @@
+"""
+Tests for the pooled MCP server sessions.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from pydantic_ai.mcp import MCPServerStdio
+
+from news_agent import mcp_pool
+from news_agent.mcp_pool import MCPSessionPool, tool_result_json
+
+FAKE_SERVER = Path(__file__).parent / "fake_mcp_server.py"
+
+
+class FlakyServer:
+    """Stand-in MCP server that fails to start a given number of times."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.attempts = []
+
+    async def __aenter__(self):
+        self.attempts.append(time.monotonic())
+        if len(self.attempts) <= self.failures:
+            raise ConnectionError("server exited during startup")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def list_tools(self):
+        return []
+
+    async def call_tool(self, tool_name, arguments):
+        return {"tool": tool_name}
+
+
+def test_killed_server_is_restarted():
+    """A server process that dies is noticed by the health check and replaced."""
+    pool = MCPSessionPool(
+        {"fake": MCPServerStdio(sys.executable, args=[str(FAKE_SERVER)])},
+        health_check_interval=0.2,
+        call_timeout=1,
+    )
+
+    async def run():
+        try:
+            first = tool_result_json(await pool.call_tool("fake", "pid", {}))["pid"]
+            os.kill(first, signal.SIGKILL)
+
+            for _ in range(100):
+                server_stats = pool.stats()["servers"]["fake"]
+                if server_stats["starts"] == 2 and server_stats["running"]:
+                    break
+                await asyncio.sleep(0.1)
+            second = tool_result_json(await pool.call_tool("fake", "pid", {}))["pid"]
+            return first, second, pool.stats()
+        finally:
+            await pool.close()
+
+    first, second, stats = asyncio.run(run())
+    assert second != first
+    assert stats["restarts"] == 1
+    assert stats["servers"]["fake"]["starts"] == 2
+    assert stats["servers"]["fake"]["last_error"] is None
+
+
+def test_failed_starts_back_off_exponentially(monkeypatch):
+    """Restarts of a server that keeps failing are spaced out, doubling up to the maximum."""
+    monkeypatch.setattr(mcp_pool, "RESTART_DELAY", 0.1)
+    monkeypatch.setattr(mcp_pool, "MAX_RESTART_DELAY", 0.4)
+    server = FlakyServer(failures=5)
+    pool = MCPSessionPool({"flaky": server}, health_check_interval=0, start_timeout=5)
+
+    async def run():
+        try:
+            return await pool.call_tool("flaky", "search", {}), pool.stats()
+        finally:
+            await pool.close()
+
+    result, stats = asyncio.run(run())
+    assert result == {"tool": "search"}
+    assert stats["servers"]["flaky"]["starts"] == 1
+
+    gaps = [later - earlier for earlier, later in zip(server.attempts, server.attempts[1:])]
+    assert len(gaps) == 5
+    for gap, expected in zip(gaps, [0.1, 0.2, 0.4, 0.4, 0.4]):
+        assert expected <= gap < expected + 0.2
+
+
+def test_unavailable_server_reports_its_error(monkeypatch):
+    """Calls to a server that never comes up fail with the startup error once the wait times out."""
+    monkeypatch.setattr(mcp_pool, "RESTART_DELAY", 0.05)
+    pool = MCPSessionPool({"down": FlakyServer(failures=1000)}, health_check_interval=0, start_timeout=0.3)
+
+    async def run():
+        try:
+            await pool.call_tool("down", "search", {})
+        finally:
+            await pool.close()
+
+    with pytest.raises(RuntimeError, match="server exited during startup"):
+        asyncio.run(run())
@@ -0,0 +1,177 @@
+"""
+Tests for merging and ranking search results across sources.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from news_agent.models import NewsArticle
+from news_agent.search import canonical_url, cluster_articles, merge_results
+
+NOW = datetime(2025, 5, 14, 12, 0)
+
+
+def article(id, title, url, source, hours_old=1.0, content=""):
+    return NewsArticle(
+        id=id, title=title, url=url, source=source,
+        published_date=NOW - timedelta(hours=hours_old), content=content,
+    )
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("http://www.Example.com/news/story/", "https://example.com/news/story"),
+    ("https://example.com:443/story#comments", "https://example.com/story"),
+    ("https://example.com/story?utm_source=rss&utm_medium=feed&fbclid=abc", "https://example.com/story"),
+    ("https://example.com/story?page=2&id=7&ref=home", "https://example.com/story?id=7&page=2"),
+    ("https://example.com", "https://example.com/"),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_canonical_url_keeps_distinct_pages_apart():
+    assert canonical_url("https://example.com/story?id=7") != canonical_url("https://example.com/story?id=8")
+    assert canonical_url("https://example.com/Story") != canonical_url("https://example.com/story")
+
+
+def test_cluster_articles_groups_same_page_and_similar_titles():
+    results = {
+        "freshrss": [
+            article("1", "EU agrees landmark rules for artificial intelligence", "https://news.example/eu-ai?utm_source=rss", "Example News"),
+            article("2", "Local team wins the cup", "https://sport.example/cup", "Sport Daily"),
+        ],
+        "google": [
+            # Same page, reached through a tracking link
+            article("g1", "EU AI rules agreed", "http://www.news.example/eu-ai/", "Example News"),
+            # Same story from another outlet, with the outlet appended to the headline
+            article("g2", "EU agrees landmark rules for artificial intelligence - Reuters", "https://reuters.example/eu", "Reuters"),
+        ],
+        "brave": [
+            article("b1", "EU agrees rules for artificial intelligence", "https://other.example/eu", "Other"),
+        ],
+    }
+
+    clusters = cluster_articles(results)
+
+    assert [[a.id for _, a in cluster] for cluster in clusters] == [["1", "g1", "g2"], ["2"], ["b1"]]
+    assert [source for source, _ in clusters[0]] == ["freshrss", "google", "google"]
+
+    # A looser threshold also takes in the shortened headline
+    clusters = cluster_articles(results, threshold=0.4)
+    assert [[a.id for _, a in cluster] for cluster in clusters] == [["1", "g1", "g2", "b1"], ["2"]]
+
+
+def test_merge_results_prefers_weighted_sources():
+    results = {
+        "google": [article("g1", "Central bank raises interest rates", "https://a.example/rates", "Outlet A", content="short")],
+        "freshrss": [article("f1", "Central bank raises interest rates", "https://b.example/rates", "Outlet B", content="much longer text")],
+        "brave": [article("b1", "New phone released today", "https://c.example/phone", "Outlet C")],
+    }
+    weights = {"freshrss": 1.0, "google": 0.8, "brave": 0.7}
+
+    merged = merge_results(results, weights, now=NOW)
+
+    # The story is represented by the highest-weighted source and names the other outlet
+    assert [a.id for a in merged] == ["f1", "b1"]
+    assert merged[0].other_sources == ["Outlet A"]
+
+    # With the weights turned around, the other copy represents the story
+    merged = merge_results(results, {"freshrss": 0.5, "google": 1.0, "brave": 3.0}, now=NOW)
+    assert [a.id for a in merged] == ["b1", "g1"]
+
+
+def test_merge_results_ranks_by_recency_and_weight():
+    results = {
+        "freshrss": [
+            article("old", "Old story about a bridge", "https://a.example/bridge", "A", hours_old=48),
+            article("new", "New story about a tunnel", "https://a.example/tunnel", "A", hours_old=1),
+        ],
+        "brave": [article("mid", "Story about a harbour", "https://b.example/harbour", "B", hours_old=2)],
+    }
+
+    merged = merge_results(results, {"freshrss": 1.0, "brave": 0.2}, now=NOW)
+    assert [a.id for a in merged] == ["new", "old", "mid"]
+
+    # Missing sources weigh 1.0
+    merged = merge_results(results, {}, now=NOW)
+    assert [a.id for a in merged] == ["new", "mid", "old"]
+
+
+def test_merge_results_boosts_stories_from_several_sources():
+    results = {
+        "freshrss": [article("solo", "Solo story about rivers", "https://a.example/rivers", "A", hours_old=1)],
+        "google": [article("g", "Shared story about mountains", "https://b.example/mountains", "B", hours_old=3)],
+        "brave": [article("b", "Shared story about mountains", "https://c.example/mountains", "C", hours_old=3)],
+    }
+
+    merged = merge_results(results, {}, half_life_hours=24, now=NOW)
+
+    # Two hours older, but carried by two sources
+    assert [a.id for a in merged] == ["g", "solo"]
+    assert merged[0].other_sources == ["C"]
+
+
+def search_sources(agent, **searches):
+    """Make every named source available and replace its search with the given coroutine function."""
+    agent.google_news_server = agent.freshrss_server
+    agent.brave_search_server = agent.freshrss_server
+    methods = {"freshrss": "_search_freshrss", "google": "_search_google_news", "brave": "_search_brave_news"}
+    for name, search in searches.items():
+        setattr(agent, methods[name], search)
+
+
+def test_search_news_stream_reports_each_source(agent):
+    agent.config.search.source_timeouts = {"freshrss": 2.0, "google": 0.2, "brave": 2.0}
+    story = "Parliament passes the climate bill"
+
+    async def freshrss(query, preferences=None):
+        await asyncio.sleep(0.1)
+        return [article("f1", story, "https://a.example/climate", "A", hours_old=0)]
+
+    async def google(query):
+        await asyncio.sleep(5)
+        return [article("g1", "Never returned", "https://b.example/late", "B")]
+
+    async def brave(query):
+        raise ConnectionError("brave is down")
+
+    search_sources(agent, freshrss=freshrss, google=google, brave=brave)
+
+    async def run():
+        return [update async for update in agent.search_news_stream("climate")]
+
+    updates = asyncio.run(run())
+
+    assert [(u.source, u.status, u.new_articles) for u in updates] == [
+        ("brave", "error", 0), ("freshrss", "ok", 1), ("google", "timeout", 0),
+    ]
+    assert [u.pending_sources for u in updates] == [["freshrss", "google"], ["google"], []]
+    assert updates[0].articles == []
+    assert [a.title for a in updates[-1].articles] == [story]
+    # The slow source is abandoned at its own deadline
+    assert 0.2 <= updates[-1].elapsed_seconds < 1
+
+
+def test_search_news_stream_merges_as_sources_answer(agent):
+    agent.config.search.source_weights = {"freshrss": 1.0, "google": 2.0}
+
+    async def freshrss(query, preferences=None):
+        return [article("f1", "Storm hits the coast", "https://a.example/storm", "A", hours_old=0)]
+
+    async def google(query):
+        await asyncio.sleep(0.1)
+        return [article("g1", "Storm hits the coast - Outlet B", "https://b.example/storm", "B", hours_old=0)]
+
+    search_sources(agent, freshrss=freshrss, google=google)
+
+    async def run():
+        return [update async for update in agent.search_news_stream("storm", sources=["freshrss", "google"])]
+
+    first, second = asyncio.run(run())
+
+    assert [a.id for a in first.articles] == ["f1"]
+    # The duplicate from the heavier source takes over the story
+    assert [a.id for a in second.articles] == ["g1"]
+    assert second.articles[0].other_sources == ["A"]
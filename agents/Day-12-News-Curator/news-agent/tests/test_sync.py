@@ -0,0 +1,170 @@
+"""
+Tests for syncing FreshRSS into the local article store.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from news_agent import agent as agent_module
+
+from .test_article_store import item_id, reader_item
+
+
+class FakeFreshRSS:
+    """Answers the FreshRSS MCP tools the sync uses, paging like the Google Reader API."""
+
+    def __init__(self, items, delay=0.0, fail_on_call=None):
+        self.items = {item["id"]: item for item in items}
+        self.read = {item["id"] for item in items if "user/-/state/com.google/read" in item["categories"]}
+        self.starred = {item["id"] for item in items if "user/-/state/com.google/starred" in item["categories"]}
+        self.delay = delay
+        self.fail_on_call = fail_on_call
+        self.calls = []
+
+    def add(self, item):
+        self.items[item["id"]] = item
+
+    def _page(self, items, arguments):
+        items = sorted(items, key=lambda item: int(item["timestampUsec"]))
+        if "since" in arguments:
+            # Oldest first, and only items added after `since`
+            items = [item for item in items if int(item["timestampUsec"]) / 1_000_000 > arguments["since"]]
+        else:
+            items.reverse()
+        start = int(arguments.get("continuation") or 0)
+        end = start + arguments.get("limit", 50)
+        page = {"items": items[start:end]}
+        if end < len(items):
+            page["continuation"] = str(end)
+        return page
+
+    def _with_state(self, item):
+        categories = [c for c in item["categories"] if not c.endswith(("/read", "/starred"))]
+        if item["id"] in self.read:
+            categories.append("user/-/state/com.google/read")
+        if item["id"] in self.starred:
+            categories.append("user/-/state/com.google/starred")
+        return {**item, "categories": categories}
+
+    async def call_tool(self, name, tool_name, arguments):
+        self.calls.append((tool_name, dict(arguments)))
+        if self.fail_on_call == len(self.calls):
+            raise ConnectionError("FreshRSS went away")
+        await asyncio.sleep(self.delay)
+
+        items = [self._with_state(item) for item in self.items.values()]
+        if tool_name == "get_unread":
+            return self._page([item for item in items if item["id"] not in self.read], arguments)
+        if tool_name == "get_starred":
+            return self._page([item for item in items if item["id"] in self.starred], arguments)
+        if tool_name == "get_item_ids":
+            ids = sorted(self.starred if arguments["state"] == "starred" else set(self.items) - self.read)
+            start = int(arguments.get("continuation") or 0)
+            page = {"ids": ids[start:start + 3]}
+            if start + 3 < len(ids):
+                page["continuation"] = str(start + 3)
+            return page
+        raise ValueError(f"Unknown tool: {tool_name}")
+
+    async def close(self):
+        pass
+
+
+NOW = datetime.now().replace(microsecond=0)
+
+
+def timestamp(days_ago):
+    return int((NOW - timedelta(days=days_ago)).timestamp())
+
+
+@pytest.fixture
+def freshrss(agent):
+    """Route the agent's FreshRSS calls to a fake with a backlog of seven unread items."""
+    agent.config.article_store.page_size = 2
+    fake = FakeFreshRSS([reader_item(n, f"Article {n}", timestamp(days_ago=10 - n)) for n in range(1, 8)])
+    agent.mcp_pool = fake
+    return fake
+
+
+def stored_ids(agent):
+    return sorted(article.id for article in agent.article_store.recent(limit=100))
+
+
+def test_first_sync_pages_oldest_first_and_resumes(agent, freshrss, monkeypatch):
+    monkeypatch.setattr(agent_module, "MAX_SYNC_PAGES", 2)
+
+    counts = asyncio.run(agent.sync_articles())
+
+    # The first sync stops after two pages of the oldest items...
+    assert counts["unread"] == 4
+    assert freshrss.calls[0] == ("get_unread", {"limit": 2, "since": 0})
+    assert stored_ids(agent) == [item_id(n) for n in range(1, 5)]
+    assert agent.article_store.sync_since("unread") == timestamp(days_ago=6)
+
+    # ...and the next one picks up the rest of the backlog
+    counts = asyncio.run(agent.sync_articles())
+    assert counts["unread"] == 3
+    assert stored_ids(agent) == [item_id(n) for n in range(1, 8)]
+
+    freshrss.add(reader_item(8, "Article 8", timestamp(days_ago=0)))
+    assert asyncio.run(agent.sync_articles())["unread"] == 1
+
+
+def test_sync_saves_progress_per_page(agent, freshrss):
+    # The third page fails
+    freshrss.fail_on_call = 3
+
+    counts = asyncio.run(agent.sync_articles())
+
+    assert counts["unread"] == 0
+    assert len(stored_ids(agent)) == 4
+    assert agent.article_store.sync_since("unread") == timestamp(days_ago=6)
+
+    freshrss.fail_on_call = None
+    freshrss.calls.clear()
+    asyncio.run(agent.sync_articles())
+    assert freshrss.calls[0] == ("get_unread", {"limit": 2, "since": timestamp(days_ago=6)})
+    assert len(stored_ids(agent)) == 7
+
+
+def test_sync_follows_read_and_starred_state(agent, freshrss):
+    agent.config.article_store.retention_days = 5
+    freshrss.starred.add(item_id(2))
+    asyncio.run(agent.sync_articles())
+    assert agent.article_store.stats()["unread"] == 7
+
+    # Read in another client; article 2 is still starred, article 7 too new to prune
+    freshrss.read.update({item_id(1), item_id(2), item_id(7)})
+    counts = asyncio.run(agent.sync_articles())
+
+    assert counts["updated"] == 3
+    assert counts["pruned"] == 1
+    assert item_id(1) not in stored_ids(agent)
+    briefing = asyncio.run(agent.create_briefing())
+    assert sorted(a.id for a in briefing.articles) == [item_id(n) for n in range(3, 7)]
+
+    # Unstarred in another client
+    freshrss.starred.clear()
+    counts = asyncio.run(agent.sync_articles())
+    assert counts["pruned"] == 1
+    assert stored_ids(agent) == [item_id(n) for n in range(3, 8)]
+
+
+def test_search_deadline_does_not_cancel_the_sync(agent, freshrss):
+    freshrss.delay = 0.1
+    agent.config.search.source_timeouts["freshrss"] = 0.25
+
+    async def run():
+        updates = [update async for update in agent.search_news_stream("article", sources=["freshrss"])]
+        # The first sync (four pages and two ID listings) outlives the search
+        await agent._pending_sync
+        return updates
+
+    updates = asyncio.run(run())
+
+    assert [update.status for update in updates] == ["timeout"]
+    assert len(stored_ids(agent)) == 7
+    assert agent.article_store.sync_since("unread") == timestamp(days_ago=3)
+    assert [a.id for a in agent.article_store.search("article 5")] == [item_id(5)]
@@ -4,17 +4,15 @@ Content Suggestions API Endpoints Module
 This module provides API endpoints for content suggestions.
 """
 
-from typing import Dict, List, Optional, Any
-from uuid import uuid4
-
 from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.core.personas.manager import get_persona_manager
 from app.core.ai.generator import get_content_generator
+from app.core.ai.suggestions import SUGGESTION_CATEGORIES, get_suggestion_service
 from app.schemas.content import (ContentSuggestionRequest, ContentSuggestionResponse,
-                                 ApplySuggestionRequest, ApplySuggestionResponse, Suggestion)
+                                 ApplySuggestionRequest, ApplySuggestionResponse)
 
 router = APIRouter()
 
@@ -115,7 +113,7 @@ async def apply_suggestion(
         """
 
         # Generate improved content using the AI
-        improved_content = content_generator.openai_client.generate_text(
+        improved_content = await content_generator.openai_client.agenerate_text(
             prompt=prompt,
             temperature=0.7,
             max_tokens=1000
@@ -146,6 +144,9 @@ async def get_content_suggestions(
     """
     Get AI-powered suggestions for content improvement.
 
+    A suggestion_type of "all" returns the suggestions of every category,
+    generated concurrently.
+
     Args:
         request: The suggestion request containing content and parameters.
         db: Database session.
@@ -159,7 +160,7 @@ async def get_content_suggestions(
     try:
         # Get managers
         persona_manager = get_persona_manager(db)
-        content_generator = get_content_generator()
+        suggestion_service = get_suggestion_service()
 
         # Get persona if ID is provided
         persona = None
@@ -169,39 +170,16 @@ async def get_content_suggestions(
                 raise HTTPException(status_code=404, detail=f"Persona with ID {request.persona_id} not found")
 
         # Generate suggestions based on the type
-        suggestions = []
-
-        if request.suggestion_type == "improve":
-            # Generate content improvement suggestions
-            suggestions = generate_improvement_suggestions(
-                content_generator,
-                request.content,
-                persona,
-                request.content_type,
-                request.platform
-            )
-        elif request.suggestion_type == "tone":
-            # Generate tone adjustment suggestions
-            suggestions = generate_tone_suggestions(
-                content_generator,
-                request.content,
-                persona,
-                request.content_type,
-                request.platform
-            )
-        elif request.suggestion_type == "hashtags":
-            # Generate hashtag suggestions
-            suggestions = generate_hashtag_suggestions(
-                content_generator,
+        if request.suggestion_type == "all":
+            suggestions = await suggestion_service.generate_all(
                 request.content,
                 persona,
                 request.content_type,
                 request.platform
             )
-        elif request.suggestion_type == "engagement":
-            # Generate engagement improvement suggestions
-            suggestions = generate_engagement_suggestions(
-                content_generator,
+        elif request.suggestion_type in SUGGESTION_CATEGORIES:
+            suggestions = await suggestion_service.generate(
+                request.suggestion_type,
                 request.content,
                 persona,
                 request.content_type,
@@ -216,442 +194,3 @@ async def get_content_suggestions(
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(status_code=500, detail=f"Error generating suggestions: {str(e)}")
-
-
-def generate_improvement_suggestions(
-    content_generator,
-    content: str,
-    persona: Any,
-    content_type: Optional[str],
-    platform: Optional[str]
-) -> List[Suggestion]:
-    """Generate content improvement suggestions using AI."""
-    # Create a prompt for the AI to generate improvement suggestions
-    prompt = f"""
-    You are an expert content strategist. Review the following content and provide 3 specific suggestions
-    to improve its structure, clarity, and impact. Focus on making the content more compelling and effective.
-
-    CONTENT TO REVIEW:
-    """
-
-    if persona:
-        prompt += f"""
-        This content is written in the persona of {persona.name}, who has the following characteristics:
-        - Background: {persona.background}
-        - Tone: {persona.tone}
-        - Purpose: {persona.purpose}
-        """
-
-    if content_type:
-        prompt += f"\nContent type: {content_type}"
-
-    if platform:
-        prompt += f"\nPlatform: {platform}"
-
-    prompt += f"""
-
-    {content}
-
-    Provide exactly 3 specific, actionable suggestions to improve this content. Each suggestion should:
-    1. Identify a specific aspect to improve
-    2. Explain why it would make the content better
-    3. Be concise and clear
-
-    Format each suggestion as a JSON object with 'text' (the suggestion) and 'description' (why it helps) fields.
-    Return only a JSON array of these 3 objects, nothing else.
-
-    IMPORTANT: In the 'text' field, do NOT wrap the suggestions in quotes. Write them as direct statements.
-    """
-
-    try:
-        # Generate suggestions using the AI
-        response = content_generator.openai_client.generate_text(
-            prompt=prompt,
-            temperature=0.7,
-            max_tokens=1000
-        )
-
-        # Parse the response as JSON
-        import json
-        import re
-
-        # Extract JSON array from response if needed
-        json_match = re.search(r'\[\s*\{.*\}\s*\]', response, re.DOTALL)
-        if json_match:
-            response = json_match.group(0)
-
-        suggestions_data = json.loads(response)
-
-        # Process suggestions to remove any quotes
-        processed_suggestions = []
-        for item in suggestions_data:
-            text = item.get("text", "")
-            # Remove surrounding quotes if present
-            if (text.startswith('"') and text.endswith('"')) or \
-               (text.startswith('\'') and text.endswith('\'')):
-                text = text[1:-1].strip()
-
-            processed_suggestions.append(
-                Suggestion(
-                    id=str(uuid4()),
-                    text=text,
-                    type="improve",
-                    description=item.get("description", "")
-                )
-            )
-
-        suggestions = processed_suggestions
-
-        return suggestions
-    except Exception as e:
-        # Fall back to mock data if AI generation fails
-        print(f"Error generating improvement suggestions: {str(e)}")
-        return [
-            Suggestion(
-                id=str(uuid4()),
-                text="Consider adding more specific examples to strengthen your point.",
-                type="improve",
-                description="Adding concrete examples makes your content more relatable and convincing."
-            ),
-            Suggestion(
-                id=str(uuid4()),
-                text="Your introduction could be more attention-grabbing. Try starting with a question or surprising fact.",
-                type="improve",
-                description="A strong hook increases engagement and readership."
-            ),
-            Suggestion(
-                id=str(uuid4()),
-                text="The conclusion could be stronger. Consider summarizing key points and adding a clear call-to-action.",
-                type="improve",
-                description="A strong conclusion helps readers remember your message."
-            )
-        ]
-
-
-def generate_tone_suggestions(
-    content_generator,
-    content: str,
-    persona: Any,
-    content_type: Optional[str],
-    platform: Optional[str]
-) -> List[Suggestion]:
-    """Generate tone adjustment suggestions using AI."""
-    # Create a prompt for the AI to generate tone suggestions
-    prompt = f"""
-    You are an expert content tone analyst. Review the following content and provide 3 specific suggestions
-    to improve its tone, voice, and emotional impact. Focus on making the content more engaging and appropriate for its audience.
-
-    CONTENT TO REVIEW:
-    """
-
-    if persona:
-        prompt += f"""
-        This content is written in the persona of {persona.name}, who has the following characteristics:
-        - Background: {persona.background}
-        - Tone: {persona.tone}
-        - Purpose: {persona.purpose}
-        """
-
-    if content_type:
-        prompt += f"\nContent type: {content_type}"
-
-    if platform:
-        prompt += f"\nPlatform: {platform}"
-
-    prompt += f"""
-
-    {content}
-
-    Provide exactly 3 specific, actionable suggestions to improve the tone of this content. Each suggestion should:
-    1. Identify a specific tone aspect to improve
-    2. Explain why it would make the content more engaging or effective
-    3. Be concise and clear
-
-    Format each suggestion as a JSON object with 'text' (the suggestion) and 'description' (why it helps) fields.
-    Return only a JSON array of these 3 objects, nothing else.
-
-    IMPORTANT: In the 'text' field, do NOT wrap the suggestions in quotes. Write them as direct statements.
-    """
-
-    try:
-        # Generate suggestions using the AI
-        response = content_generator.openai_client.generate_text(
-            prompt=prompt,
-            temperature=0.7,
-            max_tokens=1000
-        )
-
-        # Parse the response as JSON
-        import json
-        import re
-
-        # Extract JSON array from response if needed
-        json_match = re.search(r'\[\s*\{.*\}\s*\]', response, re.DOTALL)
-        if json_match:
-            response = json_match.group(0)
-
-        suggestions_data = json.loads(response)
-
-        # Process suggestions to remove any quotes
-        processed_suggestions = []
-        for item in suggestions_data:
-            text = item.get("text", "")
-            # Remove surrounding quotes if present
-            if (text.startswith('"') and text.endswith('"')) or \
-               (text.startswith('\'') and text.endswith('\'')):
-                text = text[1:-1].strip()
-
-            processed_suggestions.append(
-                Suggestion(
-                    id=str(uuid4()),
-                    text=text,
-                    type="tone",
-                    description=item.get("description", "")
-                )
-            )
-
-        suggestions = processed_suggestions
-
-        return suggestions
-    except Exception as e:
-        # Fall back to mock data if AI generation fails
-        print(f"Error generating tone suggestions: {str(e)}")
-        return [
-            Suggestion(
-                id=str(uuid4()),
-                text="Your content could benefit from a more conversational tone to connect with readers.",
-                type="tone",
-                description="A conversational tone builds rapport with your audience."
-            ),
-            Suggestion(
-                id=str(uuid4()),
-                text="Consider using more authoritative language to establish expertise.",
-                type="tone",
-                description="Authoritative language builds credibility with your audience."
-            ),
-            Suggestion(
-                id=str(uuid4()),
-                text="Try using more enthusiastic language to convey excitement about the topic.",
-                type="tone",
-                description="Enthusiasm is contagious and can increase reader engagement."
-            )
-        ]
-
-
-def generate_hashtag_suggestions(
-    content_generator,
-    content: str,
-    persona: Any,
-    content_type: Optional[str],
-    platform: Optional[str]
-) -> List[Suggestion]:
-    """Generate hashtag suggestions using AI."""
-    # Create a prompt for the AI to generate hashtag suggestions
-    prompt = f"""
-    You are an expert social media strategist. Review the following content and suggest 3 sets of relevant hashtags
-    that would increase its visibility and engagement on social media. Each set should contain 3-5 related hashtags.
-
-    CONTENT TO REVIEW:
-    """
-
-    if persona:
-        prompt += f"""
-        This content is written in the persona of {persona.name}, who has the following characteristics:
-        - Background: {persona.background}
-        - Interests: {', '.join(persona.interests) if persona.interests else 'None'}
-        - Expertise: {', '.join(persona.expertise) if persona.expertise else 'None'}
-        """
-
-    if content_type:
-        prompt += f"\nContent type: {content_type}"
-
-    if platform:
-        prompt += f"\nPlatform: {platform}"
-
-    prompt += f"""
-
-    {content}
-
-    Provide exactly 3 sets of hashtags. Each set should:
-    1. Be relevant to the content and audience
-    2. Include a mix of popular and niche hashtags
-    3. Be formatted as a single string with hashtags separated by spaces
-
-    Format each suggestion as a JSON object with 'text' (the hashtags) and 'description' (why these hashtags are effective) fields.
-    Return only a JSON array of these 3 objects, nothing else.
-
-    IMPORTANT: In the 'text' field, provide the hashtags directly without any surrounding quotes.
-    """
-
-    try:
-        # Generate suggestions using the AI
-        response = content_generator.openai_client.generate_text(
-            prompt=prompt,
-            temperature=0.7,
-            max_tokens=1000
-        )
-
-        # Parse the response as JSON
-        import json
-        import re
-
-        # Extract JSON array from response if needed
-        json_match = re.search(r'\[\s*\{.*\}\s*\]', response, re.DOTALL)
-        if json_match:
-            response = json_match.group(0)
-
-        suggestions_data = json.loads(response)
-
-        # Process suggestions to remove any quotes
-        processed_suggestions = []
-        for item in suggestions_data:
-            text = item.get("text", "")
-            # Remove surrounding quotes if present
-            if (text.startswith('"') and text.endswith('"')) or \
-               (text.startswith('\'') and text.endswith('\'')):
-                text = text[1:-1].strip()
-
-            processed_suggestions.append(
-                Suggestion(
-                    id=str(uuid4()),
-                    text=text,
-                    type="hashtags",
-                    description=item.get("description", "")
-                )
-            )
-
-        suggestions = processed_suggestions
-
-        return suggestions
-    except Exception as e:
-        # Fall back to mock data if AI generation fails
-        print(f"Error generating hashtag suggestions: {str(e)}")
-        return [
-            Suggestion(
-                id=str(uuid4()),
-                text="#AITrends #TechInnovation #FutureTech",
-                type="hashtags",
-                description="Popular hashtags in the tech industry"
-            ),
-            Suggestion(
-                id=str(uuid4()),
-                text="#MachineLearning #DataScience #ArtificialIntelligence",
-                type="hashtags",
-                description="Specific AI-related hashtags"
-            ),
-            Suggestion(
-                id=str(uuid4()),
-                text="#TechNews #Innovation #DigitalTransformation",
-                type="hashtags",
-                description="Trending technology hashtags"
-            )
-        ]
-
-
-def generate_engagement_suggestions(
-    content_generator,
-    content: str,
-    persona: Any,
-    content_type: Optional[str],
-    platform: Optional[str]
-) -> List[Suggestion]:
-    """Generate engagement improvement suggestions using AI."""
-    # Create a prompt for the AI to generate engagement suggestions
-    prompt = f"""
-    You are an expert in social media engagement and audience interaction. Review the following content and provide 3 specific suggestions
-    to increase audience engagement, interaction, and response rates. Focus on making the content more likely to generate comments, shares, and actions.
-
-    CONTENT TO REVIEW:
-    """
-
-    if persona:
-        prompt += f"""
-        This content is written in the persona of {persona.name}, who has the following characteristics:
-        - Purpose: {persona.purpose}
-        - Audience: {persona.audience if hasattr(persona, 'audience') else 'General'}
-        """
-
-    if content_type:
-        prompt += f"\nContent type: {content_type}"
-
-    if platform:
-        prompt += f"\nPlatform: {platform}"
-
-    prompt += f"""
-
-    {content}
-
-    Provide exactly 3 specific, actionable suggestions to improve engagement with this content. Each suggestion should:
-    1. Identify a specific way to increase audience interaction
-    2. Explain why it would make the content more engaging
-    3. Be concise and clear
-
-    Format each suggestion as a JSON object with 'text' (the suggestion) and 'description' (why it helps) fields.
-    Return only a JSON array of these 3 objects, nothing else.
-
-    IMPORTANT: In the 'text' field, do NOT wrap the suggestions in quotes. Write them as direct statements.
-    """
-
-    try:
-        # Generate suggestions using the AI
-        response = content_generator.openai_client.generate_text(
-            prompt=prompt,
-            temperature=0.7,
-            max_tokens=1000
-        )
-
-        # Parse the response as JSON
-        import json
-        import re
-
-        # Extract JSON array from response if needed
-        json_match = re.search(r'\[\s*\{.*\}\s*\]', response, re.DOTALL)
-        if json_match:
-            response = json_match.group(0)
-
-        suggestions_data = json.loads(response)
-
-        # Process suggestions to remove any quotes
-        processed_suggestions = []
-        for item in suggestions_data:
-            text = item.get("text", "")
-            # Remove surrounding quotes if present
-            if (text.startswith('"') and text.endswith('"')) or \
-               (text.startswith('\'') and text.endswith('\'')):
-                text = text[1:-1].strip()
-
-            processed_suggestions.append(
-                Suggestion(
-                    id=str(uuid4()),
-                    text=text,
-                    type="engagement",
-                    description=item.get("description", "")
-                )
-            )
-
-        suggestions = processed_suggestions
-
-        return suggestions
-    except Exception as e:
-        # Fall back to mock data if AI generation fails
-        print(f"Error generating engagement suggestions: {str(e)}")
-        return [
-            Suggestion(
-                id=str(uuid4()),
-                text="End with a question to encourage comments and discussion.",
-                type="engagement",
-                description="Questions prompt readers to engage with your content."
-            ),
-            Suggestion(
-                id=str(uuid4()),
-                text="Include a call-to-action to guide readers on what to do next.",
-                type="engagement",
-                description="Clear CTAs improve conversion rates."
-            ),
-            Suggestion(
-                id=str(uuid4()),
-                text="Add a poll or survey to encourage direct participation.",
-                type="engagement",
-                description="Interactive elements increase engagement significantly."
-            )
-        ]
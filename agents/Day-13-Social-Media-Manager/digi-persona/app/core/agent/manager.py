@@ -72,8 +72,15 @@ class PersonaAgentManager:
         # Get persona details from database
         persona = self._get_persona(persona_id)
         
-        # Create memory
-        memory = PersonaConversationMemory(persona_id=persona_id)
+        # Create memory (bounded window plus rolling summary, persisted per persona)
+        memory = PersonaConversationMemory(
+            persona_id=persona_id,
+            persona_name=persona.name,
+            memory_key="chat_history",
+            input_key="input",
+            output_key="output",
+            return_messages=True,
+        )
         
         # Get tools for persona
         tools = get_persona_tools(persona)
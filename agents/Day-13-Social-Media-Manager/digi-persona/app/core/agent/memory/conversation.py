@@ -2,23 +2,43 @@
 Persona Conversation Memory
 
 This module provides a conversation memory implementation for persona agents.
+Recent turns are kept verbatim up to a token budget; older turns are folded
+into a rolling summary, so the history sent to the agent stays the same size
+however long the persona has been running. The window and summary are stored
+per persona in the database and loaded the first time the memory is used.
 """
-from typing import Dict, List, Optional, Any
-from langchain.memory import ConversationBufferMemory
+from typing import Any, Callable, Dict, Optional
 
+from langchain.memory import ConversationSummaryBufferMemory
+from langchain.schema import messages_from_dict, messages_to_dict
+from langchain_openai import ChatOpenAI
 
-class PersonaConversationMemory(ConversationBufferMemory):
+from app.core.config import settings
+from app.db.models.conversation import PersonaConversation
+from app.db.session import SessionLocal
+
+
+class PersonaConversationMemory(ConversationSummaryBufferMemory):
     """
-    Memory implementation for persona agents that extends ConversationBufferMemory.
-    
-    This class adds persona-specific context to the conversation memory.
+    Memory implementation for persona agents that extends ConversationSummaryBufferMemory.
+
+    This class adds persona-specific context to the conversation memory and
+    persists the summary and message window for the persona.
     """
-    
+
+    persona_id: int
+    persona_name: Optional[str] = None
+    persona_context: Optional[str] = None
+    session_factory: Callable[[], Any] = SessionLocal
+    loaded: bool = False
+
     def __init__(
         self,
         persona_id: int,
-        persona_name: str,
+        persona_name: Optional[str] = None,
         persona_context: Optional[str] = None,
+        llm: Any = None,
+        max_token_limit: int = settings.AGENT_MEMORY_MAX_TOKENS,
         memory_key: str = "history",
         input_key: Optional[str] = None,
         output_key: Optional[str] = None,
@@ -27,28 +47,80 @@ class PersonaConversationMemory(ConversationBufferMemory):
         ai_prefix: str = "AI",
         **kwargs: Any,
     ):
-        """Initialize with persona information."""
+        """
+        Initialize with persona information.
+
+        Args:
+            persona_id: The ID of the persona the memory belongs to.
+            persona_name: Optional persona name, used as the AI prefix.
+            persona_context: Optional persona context added to the memory variables.
+            llm: The model used to summarise older turns. Defaults to
+                settings.AGENT_MEMORY_SUMMARY_MODEL.
+            max_token_limit: Token budget for the verbatim message window.
+            memory_key: The key to use for the memory in the agent's state.
+            input_key: The key to use for the input in the agent's state.
+            output_key: The key to use for the output in the agent's state.
+            return_messages: Whether to return the history as a list of messages.
+            human_prefix: The prefix to use for human messages.
+            ai_prefix: The prefix to use for AI messages (overridden by persona_name).
+            **kwargs: Additional memory fields, e.g. session_factory.
+        """
         super().__init__(
+            llm=llm or ChatOpenAI(temperature=0, model=settings.AGENT_MEMORY_SUMMARY_MODEL),
+            max_token_limit=max_token_limit,
             memory_key=memory_key,
             input_key=input_key,
             output_key=output_key,
             return_messages=return_messages,
             human_prefix=human_prefix,
-            ai_prefix=ai_prefix,
+            # Override AI prefix with persona name if provided
+            ai_prefix=persona_name or ai_prefix,
+            persona_id=persona_id,
+            persona_name=persona_name,
+            persona_context=persona_context,
             **kwargs,
         )
-        self.persona_id = persona_id
-        self.persona_name = persona_name
-        self.persona_context = persona_context
-        
-        # Override AI prefix with persona name if provided
-        if persona_name:
-            self.ai_prefix = persona_name
-    
+
+    def _ensure_loaded(self) -> None:
+        """Load the persisted summary and message window on first use."""
+        if self.loaded:
+            return
+        self.loaded = True
+
+        db = self.session_factory()
+        try:
+            record = db.query(PersonaConversation).filter(
+                PersonaConversation.persona_id == self.persona_id
+            ).first()
+            if record is None:
+                return
+            self.moving_summary_buffer = record.summary or ""
+            for message in messages_from_dict(record.messages or []):
+                self.chat_memory.add_message(message)
+        finally:
+            db.close()
+
+    def _persist(self) -> None:
+        """Store the current summary and message window for the persona."""
+        db = self.session_factory()
+        try:
+            record = db.query(PersonaConversation).filter(
+                PersonaConversation.persona_id == self.persona_id
+            ).first()
+            if record is None:
+                record = PersonaConversation(persona_id=self.persona_id)
+                db.add(record)
+            record.summary = self.moving_summary_buffer
+            record.messages = messages_to_dict(self.chat_memory.messages)
+            db.commit()
+        finally:
+            db.close()
+
     def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Load memory variables, including persona context if available."""
+        self._ensure_loaded()
         memory_dict = super().load_memory_variables(inputs)
-        
+
         # If persona context is available, add it to the memory variables
         if self.persona_context and self.memory_key in memory_dict:
             # Add persona context as a system message or in the format expected by the agent
@@ -59,10 +131,19 @@ class PersonaConversationMemory(ConversationBufferMemory):
             else:
                 # For string-based memory
                 memory_dict["persona_context"] = self.persona_context
-        
+
         return memory_dict
-    
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        """Save a turn, summarise turns that no longer fit the budget and persist the result."""
+        self._ensure_loaded()
+        # Adds the turn and prunes the window into the rolling summary
+        super().save_context(inputs, outputs)
+        self._persist()
+
     def clear(self) -> None:
-        """Clear memory contents, but retain persona information."""
+        """Clear memory contents and the persisted history, but retain persona information."""
         super().clear()
+        self.loaded = True
+        self._persist()
         # Persona information is retained even after clearing the conversation history
@@ -6,7 +6,7 @@ This module provides clients for AI services.
 
 from typing import Optional, Dict, Any
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.core.config import settings
@@ -29,6 +29,7 @@ class OpenAIClient:
         """
         self.api_key = api_key or settings.OPENAI_API_KEY
         self.client = OpenAI(api_key=self.api_key)
+        self.async_client = AsyncOpenAI(api_key=self.api_key)
     
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def generate_text(
@@ -65,6 +66,41 @@ class OpenAIClient:
         
         return response.choices[0].message.content
     
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    async def agenerate_text(
+        self,
+        prompt: str,
+        model: str = "gpt-4o",
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Generate text using the OpenAI API without blocking the event loop.
+        
+        Args:
+            prompt: The prompt to generate text from.
+            model: The model to use.
+            max_tokens: The maximum number of tokens to generate.
+            temperature: The temperature to use for generation.
+            **kwargs: Additional arguments to pass to the API.
+            
+        Returns:
+            The generated text.
+            
+        Raises:
+            Exception: If the API call fails.
+        """
+        response = await self.async_client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **kwargs,
+        )
+        
+        return response.choices[0].message.content
+    
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def generate_chat_completion(
         self,
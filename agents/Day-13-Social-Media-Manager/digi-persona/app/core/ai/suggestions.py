@@ -0,0 +1,428 @@
+"""
+Content Suggestions Module
+
+This module generates AI-powered suggestions for content in the editor. Each
+category (improve, tone, hashtags, engagement) is generated with the async
+OpenAI client, all categories can be requested at once and run concurrently,
+and results are cached by (content hash, persona, category) so editors asking
+again for the same text get an instant answer.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from app.core.ai.client import OpenAIClient, get_openai_client
+from app.core.config import settings
+from app.schemas.content import Suggestion
+
+logger = logging.getLogger(__name__)
+
+SUGGESTION_CATEGORIES = ("improve", "tone", "hashtags", "engagement")
+
+# (content hash, persona key, category)
+SuggestionKey = Tuple[str, str, str]
+
+_INTROS = {
+    "improve": """
+    You are an expert content strategist. Review the following content and provide 3 specific suggestions
+    to improve its structure, clarity, and impact. Focus on making the content more compelling and effective.
+""",
+    "tone": """
+    You are an expert content tone analyst. Review the following content and provide 3 specific suggestions
+    to improve its tone, voice, and emotional impact. Focus on making the content more engaging and appropriate for its audience.
+""",
+    "hashtags": """
+    You are an expert social media strategist. Review the following content and suggest 3 sets of relevant hashtags
+    that would increase its visibility and engagement on social media. Each set should contain 3-5 related hashtags.
+""",
+    "engagement": """
+    You are an expert in social media engagement and audience interaction. Review the following content and provide 3 specific suggestions
+    to increase audience engagement, interaction, and response rates. Focus on making the content more likely to generate comments, shares, and actions.
+""",
+}
+
+_INSTRUCTIONS = {
+    "improve": """
+    Provide exactly 3 specific, actionable suggestions to improve this content. Each suggestion should:
+    1. Identify a specific aspect to improve
+    2. Explain why it would make the content better
+    3. Be concise and clear
+
+    Format each suggestion as a JSON object with 'text' (the suggestion) and 'description' (why it helps) fields.
+    Return only a JSON array of these 3 objects, nothing else.
+
+    IMPORTANT: In the 'text' field, do NOT wrap the suggestions in quotes. Write them as direct statements.
+    """,
+    "tone": """
+    Provide exactly 3 specific, actionable suggestions to improve the tone of this content. Each suggestion should:
+    1. Identify a specific tone aspect to improve
+    2. Explain why it would make the content more engaging or effective
+    3. Be concise and clear
+
+    Format each suggestion as a JSON object with 'text' (the suggestion) and 'description' (why it helps) fields.
+    Return only a JSON array of these 3 objects, nothing else.
+
+    IMPORTANT: In the 'text' field, do NOT wrap the suggestions in quotes. Write them as direct statements.
+    """,
+    "hashtags": """
+    Provide exactly 3 sets of hashtags. Each set should:
+    1. Be relevant to the content and audience
+    2. Include a mix of popular and niche hashtags
+    3. Be formatted as a single string with hashtags separated by spaces
+
+    Format each suggestion as a JSON object with 'text' (the hashtags) and 'description' (why these hashtags are effective) fields.
+    Return only a JSON array of these 3 objects, nothing else.
+
+    IMPORTANT: In the 'text' field, provide the hashtags directly without any surrounding quotes.
+    """,
+    "engagement": """
+    Provide exactly 3 specific, actionable suggestions to improve engagement with this content. Each suggestion should:
+    1. Identify a specific way to increase audience interaction
+    2. Explain why it would make the content more engaging
+    3. Be concise and clear
+
+    Format each suggestion as a JSON object with 'text' (the suggestion) and 'description' (why it helps) fields.
+    Return only a JSON array of these 3 objects, nothing else.
+
+    IMPORTANT: In the 'text' field, do NOT wrap the suggestions in quotes. Write them as direct statements.
+    """,
+}
+
+# Used when generation fails; never cached
+_FALLBACKS = {
+    "improve": [
+        ("Consider adding more specific examples to strengthen your point.",
+         "Adding concrete examples makes your content more relatable and convincing."),
+        ("Your introduction could be more attention-grabbing. Try starting with a question or surprising fact.",
+         "A strong hook increases engagement and readership."),
+        ("The conclusion could be stronger. Consider summarizing key points and adding a clear call-to-action.",
+         "A strong conclusion helps readers remember your message."),
+    ],
+    "tone": [
+        ("Your content could benefit from a more conversational tone to connect with readers.",
+         "A conversational tone builds rapport with your audience."),
+        ("Consider using more authoritative language to establish expertise.",
+         "Authoritative language builds credibility with your audience."),
+        ("Try using more enthusiastic language to convey excitement about the topic.",
+         "Enthusiasm is contagious and can increase reader engagement."),
+    ],
+    "hashtags": [
+        ("#AITrends #TechInnovation #FutureTech", "Popular hashtags in the tech industry"),
+        ("#MachineLearning #DataScience #ArtificialIntelligence", "Specific AI-related hashtags"),
+        ("#TechNews #Innovation #DigitalTransformation", "Trending technology hashtags"),
+    ],
+    "engagement": [
+        ("End with a question to encourage comments and discussion.",
+         "Questions prompt readers to engage with your content."),
+        ("Include a call-to-action to guide readers on what to do next.",
+         "Clear CTAs improve conversion rates."),
+        ("Add a poll or survey to encourage direct participation.",
+         "Interactive elements increase engagement significantly."),
+    ],
+}
+
+
+def _persona_section(category: str, persona: Any) -> str:
+    """Describe the persona in the way each category's prompt needs."""
+    if category == "hashtags":
+        return f"""
+        This content is written in the persona of {persona.name}, who has the following characteristics:
+        - Background: {persona.background}
+        - Interests: {', '.join(persona.interests) if persona.interests else 'None'}
+        - Expertise: {', '.join(persona.expertise) if persona.expertise else 'None'}
+        """
+    if category == "engagement":
+        return f"""
+        This content is written in the persona of {persona.name}, who has the following characteristics:
+        - Purpose: {persona.purpose}
+        - Audience: {persona.audience if hasattr(persona, 'audience') else 'General'}
+        """
+    return f"""
+        This content is written in the persona of {persona.name}, who has the following characteristics:
+        - Background: {persona.background}
+        - Tone: {persona.tone}
+        - Purpose: {persona.purpose}
+        """
+
+
+def build_prompt(
+    category: str,
+    content: str,
+    persona: Any = None,
+    content_type: Optional[str] = None,
+    platform: Optional[str] = None,
+) -> str:
+    """
+    Build the prompt for one suggestion category.
+
+    Args:
+        category: The suggestion category.
+        content: The content to review.
+        persona: Optional persona the content is written for.
+        content_type: Optional type of content.
+        platform: Optional platform the content is for.
+
+    Returns:
+        The prompt.
+    """
+    prompt = _INTROS[category] + "\n    CONTENT TO REVIEW:\n    "
+
+    if persona:
+        prompt += _persona_section(category, persona)
+
+    if content_type:
+        prompt += f"\nContent type: {content_type}"
+
+    if platform:
+        prompt += f"\nPlatform: {platform}"
+
+    prompt += f"""
+
+    {content}
+""" + _INSTRUCTIONS[category]
+    return prompt
+
+
+def parse_suggestions(response: str, category: str) -> List[Suggestion]:
+    """
+    Parse a JSON array of suggestions from a model response.
+
+    Args:
+        response: The model response.
+        category: The suggestion category.
+
+    Returns:
+        The suggestions.
+
+    Raises:
+        ValueError: If the response is not a JSON array of suggestions.
+    """
+    # Extract JSON array from response if needed
+    json_match = re.search(r'\[\s*\{.*\}\s*\]', response, re.DOTALL)
+    if json_match:
+        response = json_match.group(0)
+
+    suggestions = []
+    for item in json.loads(response):
+        text = item.get("text", "")
+        # Remove surrounding quotes if present
+        if (text.startswith('"') and text.endswith('"')) or \
+           (text.startswith('\'') and text.endswith('\'')):
+            text = text[1:-1].strip()
+
+        suggestions.append(
+            Suggestion(
+                id=str(uuid4()),
+                text=text,
+                type=category,
+                description=item.get("description", "")
+            )
+        )
+    return suggestions
+
+
+def fallback_suggestions(category: str) -> List[Suggestion]:
+    """
+    Get the static suggestions used when generation fails.
+
+    Args:
+        category: The suggestion category.
+
+    Returns:
+        The fallback suggestions.
+    """
+    return [
+        Suggestion(id=str(uuid4()), text=text, type=category, description=description)
+        for text, description in _FALLBACKS[category]
+    ]
+
+
+def content_hash(content: str, content_type: Optional[str] = None, platform: Optional[str] = None) -> str:
+    """
+    Hash the inputs that shape a suggestion prompt besides the persona.
+
+    Args:
+        content: The content.
+        content_type: Optional type of content.
+        platform: Optional platform.
+
+    Returns:
+        A hex digest.
+    """
+    payload = json.dumps([content.strip(), (content_type or "").lower(), (platform or "").lower()])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def persona_key(persona: Any) -> str:
+    """
+    Identify a persona version for the cache, so edits to a persona invalidate its entries.
+
+    Args:
+        persona: The persona, or None.
+
+    Returns:
+        A string key.
+    """
+    if persona is None:
+        return "-"
+    updated_at = getattr(persona, "updated_at", None)
+    return f"{persona.id}:{updated_at.isoformat() if updated_at else ''}"
+
+
+class SuggestionService:
+    """
+    Service generating and caching content suggestions.
+
+    Identical requests that arrive while a generation is running share it.
+    """
+
+    def __init__(
+        self,
+        openai_client: Optional[OpenAIClient] = None,
+        cache_size: int = settings.SUGGESTION_CACHE_SIZE,
+        ttl_seconds: float = settings.SUGGESTION_CACHE_TTL_SECONDS,
+    ):
+        """
+        Initialize the suggestion service.
+
+        Args:
+            openai_client: The OpenAI client. If None, uses the shared client.
+            cache_size: Maximum number of cached (content, persona, category) entries.
+            ttl_seconds: Seconds a cached entry stays valid.
+        """
+        self.openai_client = openai_client or get_openai_client()
+        self.cache_size = cache_size
+        self.ttl_seconds = ttl_seconds
+        self._cache: "OrderedDict[SuggestionKey, Tuple[float, List[Suggestion]]]" = OrderedDict()
+        self._in_flight: Dict[SuggestionKey, asyncio.Future] = {}
+
+    def _get_cached(self, key: SuggestionKey) -> Optional[List[Suggestion]]:
+        """Get unexpired cached suggestions."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, suggestions = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return suggestions
+
+    def _store(self, key: SuggestionKey, suggestions: List[Suggestion]) -> None:
+        """Cache suggestions, evicting the least recently used entries."""
+        self._cache[key] = (time.monotonic(), suggestions)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _generate(self, category: str, prompt: str) -> Optional[List[Suggestion]]:
+        """Generate suggestions for one category, or None if generation fails."""
+        try:
+            response = await self.openai_client.agenerate_text(
+                prompt=prompt,
+                temperature=0.7,
+                max_tokens=1000
+            )
+            return parse_suggestions(response, category)
+        except Exception as e:
+            logger.error(f"Error generating {category} suggestions: {str(e)}")
+            return None
+
+    async def generate(
+        self,
+        category: str,
+        content: str,
+        persona: Any = None,
+        content_type: Optional[str] = None,
+        platform: Optional[str] = None,
+    ) -> List[Suggestion]:
+        """
+        Get suggestions for one category.
+
+        Args:
+            category: The suggestion category.
+            content: The content to review.
+            persona: Optional persona the content is written for.
+            content_type: Optional type of content.
+            platform: Optional platform the content is for.
+
+        Returns:
+            The suggestions; static fallbacks if generation fails.
+
+        Raises:
+            ValueError: If the category is unknown.
+        """
+        if category not in SUGGESTION_CATEGORIES:
+            raise ValueError(f"Invalid suggestion type: {category}")
+
+        key = (content_hash(content, content_type, platform), persona_key(persona), category)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._generate(category, build_prompt(category, content, persona, content_type, platform))
+            )
+            self._in_flight[key] = future
+            try:
+                # Shielded so a disconnecting caller does not cancel it for the others
+                suggestions = await asyncio.shield(future)
+            finally:
+                self._in_flight.pop(key, None)
+            if suggestions is not None:
+                self._store(key, suggestions)
+        else:
+            suggestions = await asyncio.shield(future)
+
+        return suggestions if suggestions is not None else fallback_suggestions(category)
+
+    async def generate_all(
+        self,
+        content: str,
+        persona: Any = None,
+        content_type: Optional[str] = None,
+        platform: Optional[str] = None,
+    ) -> List[Suggestion]:
+        """
+        Get suggestions for every category, generating the missing ones concurrently.
+
+        Args:
+            content: The content to review.
+            persona: Optional persona the content is written for.
+            content_type: Optional type of content.
+            platform: Optional platform the content is for.
+
+        Returns:
+            The suggestions of all categories, in category order.
+        """
+        results = await asyncio.gather(*[
+            self.generate(category, content, persona, content_type, platform)
+            for category in SUGGESTION_CATEGORIES
+        ])
+        return [suggestion for suggestions in results for suggestion in suggestions]
+
+
+# Global suggestion service instance
+_suggestion_service: Optional[SuggestionService] = None
+
+
+def get_suggestion_service() -> SuggestionService:
+    """
+    Get the suggestion service instance.
+
+    Returns:
+        The suggestion service instance.
+    """
+    global _suggestion_service
+    if _suggestion_service is None:
+        _suggestion_service = SuggestionService()
+    return _suggestion_service
@@ -0,0 +1,11 @@
+"""
+Analytics Package
+
+This package provides functionality for analytics: daily rollups maintained on
+writes, the queries behind the dashboard and cached snapshots for websockets.
+"""
+
+from app.core.analytics.engine import AnalyticsEngine, get_analytics_engine
+from app.core.analytics.rollups import rebuild_rollups, rollup_version
+
+__all__ = ["AnalyticsEngine", "get_analytics_engine", "rebuild_rollups", "rollup_version"]
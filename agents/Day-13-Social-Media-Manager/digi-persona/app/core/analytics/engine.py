@@ -0,0 +1,326 @@
+"""
+Analytics Engine Module
+
+This module provides the analytics queries behind the dashboard. Every view
+is computed from the daily rollup table, and the full dashboard needs only
+one rollup query and one persona query regardless of how many personas,
+platforms or days are involved.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models.analytics import AnalyticsDailyRollup
+from app.db.models.persona import Persona
+from app.schemas.analytics import AnalyticsTimeRange
+
+# Number of days covered by each time range
+TIME_RANGE_DAYS = {
+    AnalyticsTimeRange.ONE_WEEK: 7,
+    AnalyticsTimeRange.TWO_WEEKS: 14,
+    AnalyticsTimeRange.ONE_MONTH: 30,
+    AnalyticsTimeRange.THREE_MONTHS: 90,
+}
+
+
+def get_day_range(time_range: AnalyticsTimeRange) -> tuple:
+    """
+    Get the first and last day covered by a time range.
+
+    Args:
+        time_range: The time range.
+
+    Returns:
+        A (start_day, end_day) tuple, both inclusive.
+    """
+    end_day = datetime.utcnow().date()
+    return end_day - timedelta(days=TIME_RANGE_DAYS.get(time_range, 14)), end_day
+
+
+class AnalyticsEngine:
+    """
+    Engine for analytics queries.
+
+    This class reads the daily rollups and shapes them into the structures
+    returned by the analytics endpoints.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize the analytics engine.
+
+        Args:
+            db: The database session.
+        """
+        self.db = db
+
+    def _rollup_rows(
+        self,
+        time_range: AnalyticsTimeRange,
+        persona_id: Optional[int] = None,
+        platform: Optional[str] = None,
+        kind: Optional[str] = None,
+    ) -> List[Any]:
+        """
+        Load the rollup rows for a time range with a single grouped query.
+
+        Args:
+            time_range: Time range for analytics.
+            persona_id: Optional persona ID to filter by.
+            platform: Optional platform to filter by.
+            kind: Optional kind ("content" or "interaction") to filter by.
+
+        Returns:
+            Rows with day, persona_id, platform, kind, type, total and published.
+        """
+        start_day, end_day = get_day_range(time_range)
+        query = self.db.query(
+            AnalyticsDailyRollup.day,
+            AnalyticsDailyRollup.persona_id,
+            AnalyticsDailyRollup.platform,
+            AnalyticsDailyRollup.kind,
+            AnalyticsDailyRollup.type,
+            func.sum(AnalyticsDailyRollup.count).label("total"),
+            func.sum(AnalyticsDailyRollup.published_count).label("published"),
+        ).filter(
+            AnalyticsDailyRollup.day >= start_day,
+            AnalyticsDailyRollup.day <= end_day,
+        )
+
+        if persona_id:
+            query = query.filter(AnalyticsDailyRollup.persona_id == persona_id)
+
+        if platform:
+            query = query.filter(AnalyticsDailyRollup.platform == platform)
+
+        if kind:
+            query = query.filter(AnalyticsDailyRollup.kind == kind)
+
+        return query.group_by(
+            AnalyticsDailyRollup.day,
+            AnalyticsDailyRollup.persona_id,
+            AnalyticsDailyRollup.platform,
+            AnalyticsDailyRollup.kind,
+            AnalyticsDailyRollup.type,
+        ).all()
+
+    @staticmethod
+    def _filter(rows: Sequence[Any], persona_id: Optional[int] = None, platform: Optional[str] = None) -> List[Any]:
+        """Filter already loaded rollup rows by persona and platform."""
+        return [
+            row for row in rows
+            if (not persona_id or row.persona_id == persona_id)
+            and (not platform or row.platform == platform)
+        ]
+
+    @staticmethod
+    def _engagement(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Shape interaction rows into per-day counts by platform."""
+        data_by_date: Dict[str, Dict[str, Any]] = {}
+        platforms = set()
+
+        for row in rows:
+            if row.kind != "interaction" or not row.total:
+                continue
+            day = row.day if isinstance(row.day, date) else date.fromisoformat(str(row.day))
+            date_str = day.strftime("%Y-%m-%d")
+            data = data_by_date.setdefault(date_str, {"date": date_str})
+            data[row.platform] = data.get(row.platform, 0) + int(row.total)
+            platforms.add(row.platform)
+
+        # Ensure all platforms have a value for each date
+        for data in data_by_date.values():
+            for platform in platforms:
+                data.setdefault(platform, 0)
+
+        # Convert to list sorted by date
+        return sorted(data_by_date.values(), key=lambda x: x["date"])
+
+    @staticmethod
+    def _type_counts(rows: Sequence[Any], kind: str) -> List[Dict[str, Any]]:
+        """Count rows of one kind by type."""
+        counts: Dict[str, int] = {}
+        for row in rows:
+            if row.kind == kind:
+                counts[row.type] = counts.get(row.type, 0) + int(row.total)
+        return [{"name": name, "value": value} for name, value in counts.items() if value]
+
+    @staticmethod
+    def _platforms(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Count published posts and interactions by platform."""
+        posts: Dict[str, int] = {}
+        engagement: Dict[str, int] = {}
+        for row in rows:
+            if row.kind == "content":
+                posts[row.platform] = posts.get(row.platform, 0) + int(row.published)
+            else:
+                engagement[row.platform] = engagement.get(row.platform, 0) + int(row.total)
+
+        platforms = {p for p, n in posts.items() if n} | {p for p, n in engagement.items() if n}
+        return [
+            {
+                "name": platform,
+                "posts": posts.get(platform, 0),
+                "engagement": engagement.get(platform, 0),
+                "followers": 0  # This would need to be fetched from platform connections
+            }
+            for platform in sorted(platforms)
+        ]
+
+    def _personas(self, rows: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Count published posts and interactions for every active persona."""
+        posts: Dict[int, int] = {}
+        engagement: Dict[int, int] = {}
+        for row in rows:
+            if row.kind == "content":
+                posts[row.persona_id] = posts.get(row.persona_id, 0) + int(row.published)
+            else:
+                engagement[row.persona_id] = engagement.get(row.persona_id, 0) + int(row.total)
+
+        personas = self.db.query(Persona.id, Persona.name, Persona.avatar_url).filter(
+            Persona.is_active == True
+        ).all()
+
+        return [
+            {
+                "id": persona.id,
+                "name": persona.name,
+                "avatar": persona.avatar_url,
+                "posts": posts.get(persona.id, 0),
+                "engagement": engagement.get(persona.id, 0),
+                "followers": 0  # This would need to be fetched from platform connections
+            }
+            for persona in personas
+        ]
+
+    def get_engagement(
+        self,
+        persona_id: Optional[int] = None,
+        platform: Optional[str] = None,
+        time_range: AnalyticsTimeRange = AnalyticsTimeRange.TWO_WEEKS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get interaction counts per day and platform.
+
+        Args:
+            persona_id: Optional persona ID to filter by.
+            platform: Optional platform to filter by.
+            time_range: Time range for analytics.
+
+        Returns:
+            One entry per day with a count for each platform.
+        """
+        return self._engagement(self._rollup_rows(time_range, persona_id, platform, kind="interaction"))
+
+    def get_content_types(
+        self,
+        persona_id: Optional[int] = None,
+        platform: Optional[str] = None,
+        time_range: AnalyticsTimeRange = AnalyticsTimeRange.TWO_WEEKS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the content distribution by type.
+
+        Args:
+            persona_id: Optional persona ID to filter by.
+            platform: Optional platform to filter by.
+            time_range: Time range for analytics.
+
+        Returns:
+            Name/value pairs per content type.
+        """
+        return self._type_counts(self._rollup_rows(time_range, persona_id, platform, kind="content"), "content")
+
+    def get_interaction_types(
+        self,
+        persona_id: Optional[int] = None,
+        platform: Optional[str] = None,
+        time_range: AnalyticsTimeRange = AnalyticsTimeRange.TWO_WEEKS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the interaction distribution by type.
+
+        Args:
+            persona_id: Optional persona ID to filter by.
+            platform: Optional platform to filter by.
+            time_range: Time range for analytics.
+
+        Returns:
+            Name/value pairs per interaction type.
+        """
+        return self._type_counts(self._rollup_rows(time_range, persona_id, platform, kind="interaction"), "interaction")
+
+    def get_platforms(
+        self,
+        persona_id: Optional[int] = None,
+        time_range: AnalyticsTimeRange = AnalyticsTimeRange.TWO_WEEKS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get published posts and interactions by platform.
+
+        Args:
+            persona_id: Optional persona ID to filter by.
+            time_range: Time range for analytics.
+
+        Returns:
+            One entry per platform.
+        """
+        return self._platforms(self._rollup_rows(time_range, persona_id))
+
+    def get_personas(self, time_range: AnalyticsTimeRange = AnalyticsTimeRange.TWO_WEEKS) -> List[Dict[str, Any]]:
+        """
+        Get published posts and interactions for every active persona.
+
+        Args:
+            time_range: Time range for analytics.
+
+        Returns:
+            One entry per active persona.
+        """
+        return self._personas(self._rollup_rows(time_range))
+
+    def get_dashboard(
+        self,
+        persona_id: Optional[int] = None,
+        platform: Optional[str] = None,
+        time_range: AnalyticsTimeRange = AnalyticsTimeRange.TWO_WEEKS,
+    ) -> Dict[str, Any]:
+        """
+        Get all dashboard views from a single pass over the rollups.
+
+        Args:
+            persona_id: Optional persona ID to filter by.
+            platform: Optional platform to filter by.
+            time_range: Time range for analytics.
+
+        Returns:
+            The dashboard data in the AnalyticsResponse shape.
+        """
+        # The persona view ignores the filters and the platform view ignores the
+        # platform filter, so load the whole range once and filter in memory
+        rows = self._rollup_rows(time_range)
+        filtered = self._filter(rows, persona_id, platform)
+
+        return {
+            "engagement": self._engagement(filtered),
+            "content_types": self._type_counts(filtered, "content"),
+            "interaction_types": self._type_counts(filtered, "interaction"),
+            "platforms": self._platforms(self._filter(rows, persona_id)),
+            "personas": self._personas(rows),
+        }
+
+
+def get_analytics_engine(db: Session) -> AnalyticsEngine:
+    """
+    Get an analytics engine instance.
+
+    Args:
+        db: The database session.
+
+    Returns:
+        An analytics engine instance.
+    """
+    return AnalyticsEngine(db)
@@ -0,0 +1,314 @@
+"""
+Analytics Rollups Module
+
+This module keeps the daily analytics rollup table in step with the content
+and interaction tables. A session listener turns every flushed insert, delete
+or relevant update of a content item or interaction into count deltas and
+upserts them into the rollup rows in the same transaction.
+
+Writes that bypass the ORM unit of work (bulk SQL updates, database-level
+cascades) are not seen by the listener; rebuild_rollups() repairs the table.
+"""
+
+import threading
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import and_, case, event, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.db.models.analytics import AnalyticsDailyRollup
+from app.db.models.content import Content
+from app.db.models.interaction import Interaction
+from app.db.models.persona import Persona
+
+# (day, persona_id, platform, kind, type)
+RollupKey = Tuple[date, int, str, str, str]
+
+# Attributes that decide which rollup row an item is counted in
+CONTENT_FIELDS = ("persona_id", "platform", "content_type", "status", "created_at")
+INTERACTION_FIELDS = ("persona_id", "platform", "type", "created_at")
+
+_version_lock = threading.Lock()
+_version = 0
+
+
+def rollup_version() -> int:
+    """
+    Get the number of committed rollup changes made by this process.
+
+    Snapshot caches compare this to decide whether they need recomputing.
+
+    Returns:
+        A counter that increases whenever rollups change.
+    """
+    return _version
+
+
+def _bump_version() -> None:
+    """Record that rollups changed."""
+    global _version
+    with _version_lock:
+        _version += 1
+
+
+def _day(value: Optional[datetime]) -> date:
+    """Get the rollup day for a creation timestamp."""
+    return (value or datetime.utcnow()).date()
+
+
+def _key_and_published(obj: Any, values: Dict[str, Any]) -> Tuple[RollupKey, int]:
+    """Get the rollup key for an item and whether it counts as published."""
+    if isinstance(obj, Content):
+        key = (_day(values["created_at"]), values["persona_id"], values["platform"], "content", values["content_type"])
+        return key, int(values["status"] == "published")
+    key = (_day(values["created_at"]), values["persona_id"], values["platform"], "interaction", values["type"])
+    return key, 0
+
+
+def _fields(obj: Any) -> Tuple[str, ...]:
+    """Get the tracked attributes for an item."""
+    return CONTENT_FIELDS if isinstance(obj, Content) else INTERACTION_FIELDS
+
+
+def _current_values(obj: Any) -> Dict[str, Any]:
+    """Get the current values of the tracked attributes."""
+    return {name: getattr(obj, name) for name in _fields(obj)}
+
+
+def _previous_values(obj: Any) -> Optional[Dict[str, Any]]:
+    """Get the values of the tracked attributes before this flush, or None if unchanged."""
+    state = inspect(obj)
+    values = {}
+    changed = False
+    for name in _fields(obj):
+        history = state.attrs[name].history
+        if history.deleted:
+            values[name] = history.deleted[0]
+            changed = True
+        else:
+            values[name] = getattr(obj, name)
+    return values if changed else None
+
+
+def collect_deltas(session: Session) -> Dict[RollupKey, Counter]:
+    """
+    Work out the rollup changes implied by the pending changes in a session.
+
+    Args:
+        session: The session being flushed.
+
+    Returns:
+        A mapping from rollup key to count and published_count deltas.
+    """
+    deltas: Dict[RollupKey, Counter] = {}
+    counted = set()
+
+    def add(obj: Any, values: Dict[str, Any], sign: int) -> None:
+        key, published = _key_and_published(obj, values)
+        delta = deltas.setdefault(key, Counter())
+        delta["count"] += sign
+        delta["published_count"] += sign * published
+
+    def remove(obj: Any) -> None:
+        if id(obj) in counted:
+            return
+        counted.add(id(obj))
+        add(obj, _previous_values(obj) or _current_values(obj), -1)
+
+    for obj in session.new:
+        if isinstance(obj, (Content, Interaction)):
+            add(obj, _current_values(obj), 1)
+
+    for obj in session.deleted:
+        # Deleting a persona or content item also deletes its children (ORM cascade)
+        if isinstance(obj, Persona):
+            for child in list(obj.content) + list(obj.interactions):
+                remove(child)
+                if isinstance(child, Content):
+                    for interaction in child.interactions:
+                        remove(interaction)
+        elif isinstance(obj, Content):
+            remove(obj)
+            for interaction in obj.interactions:
+                remove(interaction)
+        elif isinstance(obj, Interaction):
+            remove(obj)
+
+    for obj in session.dirty:
+        if isinstance(obj, (Content, Interaction)) and id(obj) not in counted:
+            previous = _previous_values(obj)
+            if previous is not None:
+                add(obj, previous, -1)
+                add(obj, _current_values(obj), 1)
+
+    # Drop keys whose changes cancel out
+    return {
+        key: delta for key, delta in deltas.items()
+        if delta["count"] or delta["published_count"]
+    }
+
+
+def apply_deltas(connection: Connection, deltas: Dict[RollupKey, Counter]) -> None:
+    """
+    Add count deltas to the rollup rows, creating rows as needed.
+
+    Args:
+        connection: The connection of the transaction being flushed.
+        deltas: The deltas returned by collect_deltas.
+    """
+    if not deltas:
+        return
+
+    table = AnalyticsDailyRollup.__table__
+    rows = [
+        {
+            "day": key[0],
+            "persona_id": key[1],
+            "platform": key[2],
+            "kind": key[3],
+            "type": key[4],
+            "count": delta["count"],
+            "published_count": delta["published_count"],
+        }
+        for key, delta in deltas.items()
+    ]
+
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=["day", "persona_id", "platform", "kind", "type"],
+            set_={
+                "count": table.c["count"] + statement.excluded["count"],
+                "published_count": table.c.published_count + statement.excluded.published_count,
+            },
+        )
+        connection.execute(statement, rows)
+        return
+
+    # Other databases: update existing rows and insert the rest
+    for row in rows:
+        match = and_(
+            table.c.day == row["day"],
+            table.c.persona_id == row["persona_id"],
+            table.c.platform == row["platform"],
+            table.c.kind == row["kind"],
+            table.c.type == row["type"],
+        )
+        result = connection.execute(
+            table.update().where(match).values(
+                count=table.c["count"] + row["count"],
+                published_count=table.c.published_count + row["published_count"],
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(**row))
+
+
+def rebuild_rollups(session: Session) -> int:
+    """
+    Recompute every rollup row from the content and interaction tables.
+
+    Used to backfill the table for existing data or to repair it after writes
+    that bypassed the ORM (e.g. bulk SQL updates).
+
+    Args:
+        session: The database session.
+
+    Returns:
+        The number of rollup rows written.
+    """
+    table = AnalyticsDailyRollup.__table__
+    content_day = func.date(Content.created_at)
+    interaction_day = func.date(Interaction.created_at)
+
+    content_rows = session.execute(
+        select(
+            content_day.label("day"),
+            Content.persona_id,
+            Content.platform,
+            Content.content_type.label("type"),
+            func.count().label("total"),
+            func.sum(case((Content.status == "published", 1), else_=0)).label("published_count"),
+        ).group_by(content_day, Content.persona_id, Content.platform, Content.content_type)
+    ).all()
+
+    interaction_rows = session.execute(
+        select(
+            interaction_day.label("day"),
+            Interaction.persona_id,
+            Interaction.platform,
+            Interaction.type.label("type"),
+            func.count().label("total"),
+        ).group_by(interaction_day, Interaction.persona_id, Interaction.platform, Interaction.type)
+    ).all()
+
+    def as_date(value: Any) -> date:
+        return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+    rows = [
+        {
+            "day": as_date(row.day),
+            "persona_id": row.persona_id,
+            "platform": row.platform,
+            "kind": "content",
+            "type": row.type,
+            "count": row.total,
+            "published_count": row.published_count or 0,
+        }
+        for row in content_rows
+    ] + [
+        {
+            "day": as_date(row.day),
+            "persona_id": row.persona_id,
+            "platform": row.platform,
+            "kind": "interaction",
+            "type": row.type,
+            "count": row.total,
+            "published_count": 0,
+        }
+        for row in interaction_rows
+    ]
+
+    session.execute(table.delete())
+    if rows:
+        session.execute(table.insert(), rows)
+    session.commit()
+    _bump_version()
+    return len(rows)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_rollup_deltas(session: Session, flush_context: Any, instances: Any) -> None:
+    """Work out the rollup deltas while the pre-flush state is still available."""
+    deltas = collect_deltas(session)
+    if deltas:
+        session.info.setdefault("analytics_rollup_deltas", []).append(deltas)
+
+
+@event.listens_for(Session, "after_flush")
+def _update_rollups(session: Session, flush_context: Any) -> None:
+    """Apply the rollup deltas for a flush inside the same transaction."""
+    for deltas in session.info.pop("analytics_rollup_deltas", []):
+        apply_deltas(session.connection(), deltas)
+        session.info["analytics_rollups_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _rollups_committed(session: Session) -> None:
+    """Let snapshot caches know the rollups changed once the transaction commits."""
+    if session.info.pop("analytics_rollups_changed", False):
+        _bump_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def _rollups_rolled_back(session: Session) -> None:
+    """Forget rollup changes that were rolled back with the transaction."""
+    session.info.pop("analytics_rollup_deltas", None)
+    session.info.pop("analytics_rollups_changed", None)
@@ -0,0 +1,193 @@
+"""
+Analytics Snapshots Module
+
+This module caches dashboard snapshots and pushes them to websocket
+subscribers. Subscribers with the same filters share one snapshot, which is
+computed at most once per push interval and only sent when it has changed.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from fastapi import WebSocket
+from sqlalchemy.orm import Session
+
+from app.core.analytics.engine import AnalyticsEngine
+from app.core.analytics.rollups import rollup_version
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.schemas.analytics import AnalyticsTimeRange
+
+logger = logging.getLogger(__name__)
+
+# (persona_id, platform, time_range)
+SnapshotKey = Tuple[Optional[int], Optional[str], AnalyticsTimeRange]
+
+
+class AnalyticsSnapshotHub:
+    """
+    Shared cache of dashboard snapshots with websocket fan-out.
+
+    A snapshot is reused until the rollups change in this process, the day
+    changes, or it is older than the maximum age (which picks up writes made by
+    other processes such as the Celery workers).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        push_interval: float = settings.ANALYTICS_PUSH_INTERVAL_SECONDS,
+        max_age: float = settings.ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS,
+    ):
+        """
+        Initialize the snapshot hub.
+
+        Args:
+            session_factory: Factory for database sessions used to compute snapshots.
+            push_interval: Seconds between checks for changed snapshots.
+            max_age: Seconds after which a snapshot is recomputed regardless.
+        """
+        self.session_factory = session_factory
+        self.push_interval = push_interval
+        self.max_age = max_age
+
+        self._snapshots: Dict[SnapshotKey, Dict[str, Any]] = {}
+        self._locks: Dict[SnapshotKey, asyncio.Lock] = {}
+        self._subscribers: Dict[SnapshotKey, Set[WebSocket]] = {}
+        self._subscriptions: Dict[WebSocket, SnapshotKey] = {}
+        self._send_locks: Dict[WebSocket, asyncio.Lock] = {}
+        self._sent: Dict[SnapshotKey, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _compute(self, key: SnapshotKey) -> Dict[str, Any]:
+        """Compute a dashboard snapshot in a worker thread with its own session."""
+        persona_id, platform, time_range = key
+        db = self.session_factory()
+        try:
+            return AnalyticsEngine(db).get_dashboard(persona_id, platform, time_range)
+        finally:
+            db.close()
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check whether a cached snapshot can still be served."""
+        return (
+            entry["version"] == rollup_version()
+            and entry["day"] == datetime.utcnow().date()
+            and time.monotonic() - entry["computed_at"] < self.max_age
+        )
+
+    async def get_snapshot(self, key: SnapshotKey) -> Dict[str, Any]:
+        """
+        Get the dashboard snapshot for a set of filters.
+
+        Concurrent callers for the same filters share one computation.
+
+        Args:
+            key: The (persona_id, platform, time_range) filters.
+
+        Returns:
+            The dashboard data.
+        """
+        entry = self._snapshots.get(key)
+        if entry is not None and self._is_fresh(entry):
+            return entry["data"]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._snapshots.get(key)
+            if entry is not None and self._is_fresh(entry):
+                return entry["data"]
+
+            version = rollup_version()
+            data = await asyncio.to_thread(self._compute, key)
+            self._snapshots[key] = {
+                "data": data,
+                "version": version,
+                "day": datetime.utcnow().date(),
+                "computed_at": time.monotonic(),
+            }
+            return data
+
+    async def _send(self, websocket: WebSocket, payload: str) -> bool:
+        """Send a payload to one subscriber. Returns False if the connection is gone."""
+        lock = self._send_locks.get(websocket)
+        if lock is None:
+            return False
+        try:
+            async with lock:
+                await websocket.send_text(payload)
+            return True
+        except Exception:
+            return False
+
+    async def subscribe(self, websocket: WebSocket, key: SnapshotKey) -> None:
+        """
+        Subscribe a websocket to the snapshot for a set of filters.
+
+        The current snapshot is sent immediately; a subscriber that changes its
+        filters is moved to the new ones.
+
+        Args:
+            websocket: The accepted websocket connection.
+            key: The (persona_id, platform, time_range) filters.
+        """
+        self.unsubscribe(websocket)
+        self._subscriptions[websocket] = key
+        self._subscribers.setdefault(key, set()).add(websocket)
+        self._send_locks[websocket] = asyncio.Lock()
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        data = await self.get_snapshot(key)
+        await self._send(websocket, json.dumps(data))
+
+    def unsubscribe(self, websocket: WebSocket) -> None:
+        """
+        Remove a websocket from its subscription.
+
+        Args:
+            websocket: The websocket connection.
+        """
+        key = self._subscriptions.pop(websocket, None)
+        self._send_locks.pop(websocket, None)
+        if key is None:
+            return
+        subscribers = self._subscribers.get(key)
+        if subscribers is not None:
+            subscribers.discard(websocket)
+            if not subscribers:
+                del self._subscribers[key]
+                self._sent.pop(key, None)
+
+    async def _push(self, key: SnapshotKey) -> None:
+        """Send the snapshot for one set of filters to its subscribers if it changed."""
+        data = await self.get_snapshot(key)
+        payload = json.dumps(data)
+        if self._sent.get(key) == payload:
+            return
+        self._sent[key] = payload
+
+        subscribers = list(self._subscribers.get(key, ()))
+        results = await asyncio.gather(*[self._send(ws, payload) for ws in subscribers])
+        for websocket, delivered in zip(subscribers, results):
+            if not delivered:
+                self.unsubscribe(websocket)
+
+    async def _run(self) -> None:
+        """Push changed snapshots to subscribers until nobody is subscribed."""
+        while self._subscribers:
+            await asyncio.sleep(self.push_interval)
+            for key in list(self._subscribers):
+                try:
+                    await self._push(key)
+                except Exception as e:
+                    logger.error(f"Error pushing analytics snapshot: {str(e)}")
+
+
+# Shared hub for the analytics endpoints
+snapshot_hub = AnalyticsSnapshotHub()
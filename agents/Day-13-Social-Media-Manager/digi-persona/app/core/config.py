@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import AnyHttpUrl, field_validator, BaseModel
 
@@ -69,6 +69,35 @@ class Settings(BaseSettings):
     ENABLE_METRICS: bool = True
     METRICS_PORT: int = 9090
 
+    # Analytics settings
+    ANALYTICS_PUSH_INTERVAL_SECONDS: float = 5.0
+    ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS: float = 30.0
+
+    # Publishing settings
+    PLATFORM_CLIENT_MAX_AGE_SECONDS: float = 3600.0
+    PUBLISH_MAX_WORKERS: int = 8
+    PUBLISH_PLATFORM_CONCURRENCY: int = 2
+    PUBLISH_MIN_INTERVAL_SECONDS: Dict[str, float] = {"twitter": 1.0, "linkedin": 1.0, "bluesky": 0.5}
+    PUBLISH_MAX_ATTEMPTS: int = 3
+    PUBLISH_RETRY_BASE_DELAY_SECONDS: float = 30.0
+    PUBLISH_CLAIM_TIMEOUT_SECONDS: float = 900.0
+
+    # Agent memory settings
+    AGENT_MEMORY_MAX_TOKENS: int = 2000
+    AGENT_MEMORY_SUMMARY_MODEL: str = "gpt-4o-mini"
+
+    # Suggestion settings
+    SUGGESTION_CACHE_SIZE: int = 512
+    SUGGESTION_CACHE_TTL_SECONDS: float = 600.0
+
+    # Platform HTTP settings
+    PLATFORM_HTTP2: bool = True
+    PLATFORM_HTTP_TIMEOUT_SECONDS: float = 30.0
+    PLATFORM_HTTP_MAX_CONNECTIONS: int = 20
+    PLATFORM_HTTP_MAX_RETRIES: int = 3
+    PLATFORM_RATE_LIMIT_MAX_WAIT_SECONDS: float = 60.0
+    INTERACTION_POLL_CONCURRENCY: int = 10
+
     model_config = {
         "env_file": ".env",
         "case_sensitive": True,
@@ -0,0 +1,321 @@
+"""
+Content Publisher Module
+
+This module publishes due content to the social media platforms. Due items are
+claimed, grouped by (persona, platform) and posted concurrently through the
+process-level client pool and rate limiter; failed posts are rescheduled with
+a backoff instead of being retried in place, and every status change of a run
+is committed in one transaction. Claims carry a timestamp, so items left in
+"publishing" by a worker that died are returned to the queue.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.platforms.manager import PlatformManager
+from app.core.platforms.pool import PlatformClientPool, PlatformRateLimiter, client_pool, rate_limiter
+from app.db.models.content import Content
+from app.db.models.platform import PlatformConnection
+
+logger = logging.getLogger(__name__)
+
+# (persona_id, platform_name)
+GroupKey = Tuple[int, str]
+
+
+class PermanentPublishError(ValueError):
+    """Raised when retrying a post cannot succeed (e.g. no platform connection)."""
+
+
+class ContentPublisher:
+    """
+    Publisher for scheduled content.
+
+    This class claims due content, posts it and records the outcome.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        pool: Optional[PlatformClientPool] = None,
+        limiter: Optional[PlatformRateLimiter] = None,
+        max_workers: int = settings.PUBLISH_MAX_WORKERS,
+        max_attempts: int = settings.PUBLISH_MAX_ATTEMPTS,
+        retry_base_delay: float = settings.PUBLISH_RETRY_BASE_DELAY_SECONDS,
+        claim_timeout: float = settings.PUBLISH_CLAIM_TIMEOUT_SECONDS,
+    ):
+        """
+        Initialize the content publisher.
+
+        Args:
+            db: The database session.
+            pool: Pool of authenticated clients. Defaults to the process-level pool.
+            limiter: Per-platform rate limiter. Defaults to the process-level limiter.
+            max_workers: Maximum number of (persona, platform) groups posted at once.
+            max_attempts: Maximum number of attempts per content item.
+            retry_base_delay: Delay before the first retry; doubled on every further attempt.
+            claim_timeout: Seconds after which a claim with no recorded outcome is stale.
+        """
+        self.db = db
+        self.pool = pool or client_pool
+        self.limiter = limiter or rate_limiter
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.claim_timeout = claim_timeout
+        self.platform_manager = PlatformManager(db, pool=self.pool)
+
+    def claim(self, content_ids: Sequence[int]) -> List[Content]:
+        """
+        Claim due content for publishing.
+
+        Each item moves from "scheduled" to "publishing" with a conditional
+        update, so an item picked up by both the periodic check and a delayed
+        retry is only posted once.
+
+        Args:
+            content_ids: IDs of the content items to claim.
+
+        Returns:
+            The claimed content items.
+        """
+        now = datetime.now(timezone.utc)
+        claimed = []
+        for content_id in content_ids:
+            # Bulk updates bypass the analytics listener, which is fine here:
+            # neither status affects the published counts
+            updated = (
+                self.db.query(Content)
+                .filter(
+                    Content.id == content_id,
+                    Content.status == "scheduled",
+                    Content.scheduled_time <= now,
+                )
+                .update({"status": "publishing", "claimed_at": now}, synchronize_session=False)
+            )
+            if updated:
+                claimed.append(content_id)
+        self.db.commit()
+
+        if not claimed:
+            return []
+        return self.db.query(Content).filter(Content.id.in_(claimed)).all()
+
+    def release_stale_claims(self, current_time: Optional[datetime] = None) -> int:
+        """
+        Return content stuck in "publishing" to the queue.
+
+        A claim whose run never recorded an outcome (e.g. the worker died) is
+        released once it is older than the claim timeout. The item keeps its
+        scheduled time, so it is due again straight away.
+
+        Args:
+            current_time: The current time. If None, uses the current UTC time.
+
+        Returns:
+            The number of released items.
+        """
+        if current_time is None:
+            current_time = datetime.now(timezone.utc)
+        stale_before = current_time - timedelta(seconds=self.claim_timeout)
+
+        released = (
+            self.db.query(Content)
+            .filter(
+                Content.status == "publishing",
+                or_(Content.claimed_at.is_(None), Content.claimed_at <= stale_before),
+            )
+            .update({"status": "scheduled", "claimed_at": None}, synchronize_session=False)
+        )
+        self.db.commit()
+        if released:
+            logger.warning(f"Released {released} stale publishing claims")
+        return released
+
+    def _release(
+        self,
+        outcomes: Sequence[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]],
+    ) -> None:
+        """
+        Release the claims of a run whose outcomes could not be recorded.
+
+        Items that were posted are marked as posted so they are not sent again;
+        every other item goes back to "scheduled" for the next run.
+        """
+        self.db.rollback()
+        now = datetime.now(timezone.utc)
+        for content_id, post_info, error in outcomes:
+            values: Dict[str, Any] = {"status": "scheduled", "claimed_at": None}
+            if error is None:
+                values.update(
+                    status="posted",
+                    published_time=now,
+                    external_id=(post_info or {}).get("id", ""),
+                )
+            (
+                self.db.query(Content)
+                .filter(Content.id == content_id, Content.status == "publishing")
+                .update(values, synchronize_session=False)
+            )
+        self.db.commit()
+
+    def _connections(self, contents: Sequence[Content]) -> Dict[GroupKey, PlatformConnection]:
+        """Load the active platform connections for all claimed items with one query."""
+        persona_ids = {content.persona_id for content in contents}
+        connections = self.db.query(PlatformConnection).filter(
+            PlatformConnection.persona_id.in_(persona_ids),
+            PlatformConnection.is_active == True
+        ).all()
+        return {(conn.persona_id, conn.platform_name.lower()): conn for conn in connections}
+
+    def _publish_group(
+        self,
+        key: GroupKey,
+        posts: List[Dict[str, Any]],
+        connection: Optional[PlatformConnection],
+    ) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Post the items of one (persona, platform) group in order.
+
+        Runs in a worker thread and does not touch the database session.
+
+        Returns:
+            (content_id, post_info, error) for every item.
+        """
+        persona_id, platform_name = key
+        if connection is None:
+            error = PermanentPublishError(f"No active connection found for platform {platform_name}")
+            return [(post["id"], None, error) for post in posts]
+
+        try:
+            client = self.pool.get(connection, self.platform_manager.get_client_class(platform_name))
+        except Exception as e:
+            return [(post["id"], None, e) for post in posts]
+
+        outcomes = []
+        for post in posts:
+            try:
+                post_info = self.limiter.call(
+                    platform_name,
+                    lambda: client.post_content(post["text"], post["media_urls"]),
+                )
+                logger.info(f"Posted content {post['id']} to {platform_name}")
+                outcomes.append((post["id"], post_info or {}, None))
+            except Exception as e:
+                logger.warning(f"Posting content {post['id']} to {platform_name} failed: {str(e)}")
+                # The session may have expired; authenticate again on the next attempt
+                self.pool.invalidate(persona_id, platform_name)
+                outcomes.append((post["id"], None, e))
+        return outcomes
+
+    def _record(
+        self,
+        contents: Sequence[Content],
+        outcomes: Sequence[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]],
+    ) -> Dict[str, Any]:
+        """Apply the outcomes of a run in a single transaction."""
+        by_id = {content.id: content for content in contents}
+        now = datetime.now(timezone.utc)
+        posted, failed, retries = [], [], []
+
+        for content_id, post_info, error in outcomes:
+            content = by_id[content_id]
+            metadata = dict(content.content_metadata or {})
+            attempts = metadata.get("publish_attempts", 0) + 1
+            metadata["publish_attempts"] = attempts
+
+            if error is None:
+                content.status = "posted"
+                content.published_time = now
+                content.external_id = post_info.get("id", "")
+                metadata["external_url"] = post_info.get("url", "")
+                metadata.pop("error", None)
+                posted.append(content_id)
+            elif isinstance(error, PermanentPublishError) or attempts >= self.max_attempts:
+                content.status = "failed"
+                metadata["error"] = str(error)
+                metadata["failed_at"] = now.isoformat()
+                failed.append(content_id)
+            else:
+                delay = self.retry_base_delay * 2 ** (attempts - 1)
+                content.status = "scheduled"
+                content.scheduled_time = now + timedelta(seconds=delay)
+                metadata["error"] = str(error)
+                retries.append((content_id, delay))
+
+            content.claimed_at = None
+            content.content_metadata = metadata
+
+        self.db.commit()
+        return {"posted": posted, "failed": failed, "retries": retries}
+
+    def publish(self, content_ids: Sequence[int]) -> Dict[str, Any]:
+        """
+        Claim and publish content items.
+
+        Args:
+            content_ids: IDs of due content items.
+
+        Returns:
+            Posted and failed content IDs, and (content_id, delay) pairs for the
+            items rescheduled for another attempt.
+        """
+        contents = self.claim(content_ids)
+        if not contents:
+            return {"posted": [], "failed": [], "retries": []}
+
+        try:
+            outcomes = self._post(contents)
+        except Exception as e:
+            self._release([(content.id, None, e) for content in contents])
+            raise
+
+        try:
+            return self._record(contents, outcomes)
+        except Exception:
+            logger.exception("Recording publish outcomes failed; releasing the claimed content")
+            self._release(outcomes)
+            raise
+
+    def _post(
+        self, contents: Sequence[Content]
+    ) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """Post the claimed items, one worker per (persona, platform) group."""
+        connections = self._connections(contents)
+        groups: Dict[GroupKey, List[Dict[str, Any]]] = {}
+        for content in sorted(contents, key=lambda c: (c.scheduled_time or datetime.min, c.id)):
+            key = (content.persona_id, content.platform.lower())
+            groups.setdefault(key, []).append({
+                "id": content.id,
+                "text": content.text,
+                "media_urls": content.media_urls or [],
+            })
+
+        outcomes = []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(groups)))) as executor:
+            futures = [
+                executor.submit(self._publish_group, key, posts, connections.get(key))
+                for key, posts in groups.items()
+            ]
+            for future in futures:
+                outcomes.extend(future.result())
+        return outcomes
+
+
+def get_content_publisher(db: Session) -> ContentPublisher:
+    """
+    Get a content publisher instance.
+
+    Args:
+        db: The database session.
+
+    Returns:
+        A content publisher instance.
+    """
+    return ContentPublisher(db)
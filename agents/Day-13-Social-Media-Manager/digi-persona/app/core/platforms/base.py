@@ -4,6 +4,7 @@ Base platform client module.
 This module provides a base class for all platform clients.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 
@@ -13,6 +14,9 @@ class BasePlatformClient(ABC):
     Base class for all social media platform clients.
     
     This abstract class defines the interface that all platform clients must implement.
+    Every method has an async variant (prefixed with "a"); by default it runs the
+    synchronous method in a worker thread, and clients with a native async
+    transport override it.
     """
     
     @abstractmethod
@@ -80,4 +84,24 @@ class BasePlatformClient(ABC):
         Returns:
             Dictionary containing information about the account.
         """
-        pass
\ No newline at end of file
+        pass
+
+    async def aauthenticate(self, credentials: Dict[str, Any]) -> bool:
+        """Async variant of authenticate()."""
+        return await asyncio.to_thread(self.authenticate, credentials)
+
+    async def apost_content(self, content: str, media_urls: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
+        """Async variant of post_content()."""
+        return await asyncio.to_thread(self.post_content, content, media_urls, **kwargs)
+
+    async def aget_interactions(self, since_id: Optional[str] = None, count: int = 100) -> List[Dict[str, Any]]:
+        """Async variant of get_interactions()."""
+        return await asyncio.to_thread(self.get_interactions, since_id, count)
+
+    async def arespond_to_interaction(self, interaction_id: str, content: str, **kwargs) -> Dict[str, Any]:
+        """Async variant of respond_to_interaction()."""
+        return await asyncio.to_thread(self.respond_to_interaction, interaction_id, content, **kwargs)
+
+    async def aget_account_info(self) -> Dict[str, Any]:
+        """Async variant of get_account_info()."""
+        return await asyncio.to_thread(self.get_account_info)
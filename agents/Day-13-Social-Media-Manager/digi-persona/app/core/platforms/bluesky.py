@@ -11,6 +11,7 @@ from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 
 from app.core.platforms.base import BasePlatformClient
+from app.core.platforms.transport import get_transport
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +20,8 @@ class BlueskyClient(BasePlatformClient):
     Client for Bluesky API integration.
 
     This class implements the BasePlatformClient interface for Bluesky using AT Protocol.
+    Requests go through the shared Bluesky transport, and every method has a
+    native async variant.
     """
 
     # Bluesky API endpoints
@@ -26,7 +29,7 @@ class BlueskyClient(BasePlatformClient):
 
     def __init__(self):
         """Initialize the Bluesky client."""
-        self.client = httpx.AsyncClient()
+        self.transport = get_transport("bluesky")
         self.authenticated = False
         self.user_info = None
         self.access_jwt = None
@@ -34,6 +37,31 @@ class BlueskyClient(BasePlatformClient):
         self.did = None
         self.handle = None
 
+    @property
+    def _bucket(self) -> str:
+        """Rate-limit bucket for this account."""
+        return self.did or "anonymous"
+
+    def _set_session(self, auth_data: Dict[str, Any]) -> None:
+        """Store the tokens and identity returned by createSession or refreshSession."""
+        self.access_jwt = auth_data.get('accessJwt')
+        self.refresh_jwt = auth_data.get('refreshJwt')
+        self.did = auth_data.get('did')
+        self.handle = auth_data.get('handle')
+        self.authenticated = True
+
+    @staticmethod
+    def _login_payload(credentials: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """Get the createSession payload, or None if credentials are missing."""
+        handle = credentials.get('handle')
+        password = credentials.get('app_password')
+
+        if not handle or not password:
+            logger.error("Bluesky handle and app_password are required")
+            return None
+
+        return {"identifier": handle, "password": password}
+
     def authenticate(self, credentials: Dict[str, Any]) -> bool:
         """
         Authenticate with Bluesky using provided credentials.
@@ -47,48 +75,73 @@ class BlueskyClient(BasePlatformClient):
             True if authentication was successful, False otherwise.
         """
         try:
-            handle = credentials.get('handle')
-            password = credentials.get('app_password')
+            payload = self._login_payload(credentials)
+            if payload is None:
+                return False
 
-            if not handle or not password:
-                logger.error("Bluesky handle and app_password are required")
+            # A repeated login only opens another session, so it is safe to retry
+            response = self.transport.post(
+                f"{self.BASE_URL}/com.atproto.server.createSession",
+                idempotent=True,
+                json=payload
+            )
+
+            if response.status_code != 200:
+                logger.error(f"Bluesky authentication failed: {response.status_code} - {response.text}")
+                self.authenticated = False
                 return False
 
-            # Create a synchronous client for authentication
-            with httpx.Client() as client:
-                # Authenticate
-                response = client.post(
-                    f"{self.BASE_URL}/com.atproto.server.createSession",
-                    json={
-                        "identifier": handle,
-                        "password": password
-                    }
-                )
+            self._set_session(response.json())
 
-                if response.status_code == 200:
-                    auth_data = response.json()
-                    self.access_jwt = auth_data.get('accessJwt')
-                    self.refresh_jwt = auth_data.get('refreshJwt')
-                    self.did = auth_data.get('did')
-                    self.handle = auth_data.get('handle')
-                    self.authenticated = True
-
-                    # Get additional user info
-                    profile_response = client.get(
-                        f"{self.BASE_URL}/com.atproto.repo.describeRepo",
-                        params={"repo": self.did},
-                        headers={"Authorization": f"Bearer {self.access_jwt}"}
-                    )
-
-                    if profile_response.status_code == 200:
-                        self.user_info = profile_response.json()
-
-                    logger.info(f"Successfully authenticated with Bluesky as {self.handle}")
-                    return True
-                else:
-                    logger.error(f"Bluesky authentication failed: {response.status_code} - {response.text}")
-                    self.authenticated = False
-                    return False
+            # Get additional user info
+            profile_response = self._call(
+                "GET",
+                "com.atproto.repo.describeRepo",
+                params={"repo": self.did}
+            )
+
+            if profile_response.status_code == 200:
+                self.user_info = profile_response.json()
+
+            logger.info(f"Successfully authenticated with Bluesky as {self.handle}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Bluesky authentication failed: {e}")
+            self.authenticated = False
+            return False
+
+    async def aauthenticate(self, credentials: Dict[str, Any]) -> bool:
+        """Async variant of authenticate()."""
+        try:
+            payload = self._login_payload(credentials)
+            if payload is None:
+                return False
+
+            response = await self.transport.apost(
+                f"{self.BASE_URL}/com.atproto.server.createSession",
+                idempotent=True,
+                json=payload
+            )
+
+            if response.status_code != 200:
+                logger.error(f"Bluesky authentication failed: {response.status_code} - {response.text}")
+                self.authenticated = False
+                return False
+
+            self._set_session(response.json())
+
+            profile_response = await self._acall(
+                "GET",
+                "com.atproto.repo.describeRepo",
+                params={"repo": self.did}
+            )
+
+            if profile_response.status_code == 200:
+                self.user_info = profile_response.json()
+
+            logger.info(f"Successfully authenticated with Bluesky as {self.handle}")
+            return True
 
         except Exception as e:
             logger.error(f"Bluesky authentication failed: {e}")
@@ -107,6 +160,126 @@ class BlueskyClient(BasePlatformClient):
             "Content-Type": "application/json",
         }
 
+    @staticmethod
+    def _is_expired(response: httpx.Response) -> bool:
+        """Check whether a response rejected an expired access token."""
+        if response.status_code not in (400, 401):
+            return False
+        try:
+            return response.json().get('error') == 'ExpiredToken'
+        except ValueError:
+            return False
+
+    def _refresh_session(self) -> bool:
+        """Exchange the refresh token for a new access token."""
+        if not self.refresh_jwt:
+            return False
+        response = self.transport.post(
+            f"{self.BASE_URL}/com.atproto.server.refreshSession",
+            bucket=self._bucket,
+            headers={"Authorization": f"Bearer {self.refresh_jwt}"}
+        )
+        if response.status_code != 200:
+            logger.error(f"Bluesky session refresh failed: {response.status_code} - {response.text}")
+            return False
+        self._set_session(response.json())
+        return True
+
+    async def _arefresh_session(self) -> bool:
+        """Async variant of _refresh_session()."""
+        if not self.refresh_jwt:
+            return False
+        response = await self.transport.apost(
+            f"{self.BASE_URL}/com.atproto.server.refreshSession",
+            bucket=self._bucket,
+            headers={"Authorization": f"Bearer {self.refresh_jwt}"}
+        )
+        if response.status_code != 200:
+            logger.error(f"Bluesky session refresh failed: {response.status_code} - {response.text}")
+            return False
+        self._set_session(response.json())
+        return True
+
+    def _call(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """Call an authenticated XRPC endpoint, refreshing an expired session once."""
+        url = f"{self.BASE_URL}/{endpoint}"
+        response = self.transport.request(method, url, bucket=self._bucket, headers=self._get_auth_headers(), **kwargs)
+        if self._is_expired(response) and self._refresh_session():
+            response = self.transport.request(method, url, bucket=self._bucket, headers=self._get_auth_headers(), **kwargs)
+        return response
+
+    async def _acall(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """Async variant of _call()."""
+        url = f"{self.BASE_URL}/{endpoint}"
+        response = await self.transport.arequest(method, url, bucket=self._bucket, headers=self._get_auth_headers(), **kwargs)
+        if self._is_expired(response) and await self._arefresh_session():
+            response = await self.transport.arequest(method, url, bucket=self._bucket, headers=self._get_auth_headers(), **kwargs)
+        return response
+
+    def _require_auth(self) -> None:
+        """Raise if the client has not authenticated."""
+        if not self.authenticated or not self.access_jwt:
+            raise ValueError("Bluesky client not authenticated")
+
+    def _build_post(self, content: str, media_urls: Optional[List[str]], **kwargs) -> Dict[str, Any]:
+        """Build the createRecord payload for a post."""
+        post_data = {
+            "repo": self.did,
+            "collection": "app.bsky.feed.post",
+            "record": {
+                "$type": "app.bsky.feed.post",
+                "text": content,
+                "createdAt": datetime.now(timezone.utc).isoformat()
+            }
+        }
+
+        # Add reply reference if provided
+        reply_to = kwargs.get('reply_to')
+        if reply_to:
+            reply_ref = json.loads(reply_to)
+            post_data["record"]["reply"] = reply_ref
+
+        # Add media if provided
+        # Note: This is a simplified version. In a real implementation,
+        # you would need to first upload the images to Bluesky's BLOB storage
+        if media_urls and len(media_urls) > 0:
+            # In a real implementation, this would involve:
+            # 1. Uploading each image using com.atproto.repo.uploadBlob
+            # 2. Getting the blob refs
+            # 3. Adding them to the post record
+            logger.warning("Media upload not implemented in this sample implementation")
+
+        return post_data
+
+    def _format_post(self, response: httpx.Response, post_data: Dict[str, Any], content: str) -> Dict[str, Any]:
+        """Format a createRecord response, raising on failure."""
+        if response.status_code not in (200, 201):
+            error_msg = f"Failed to post to Bluesky: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        post_info = response.json()
+
+        # Get the post URI
+        post_uri = post_info.get('uri', '')
+        post_cid = post_info.get('cid', '')
+
+        logger.info(f"Successfully posted to Bluesky: {post_uri}")
+
+        # Format the response
+        return {
+            'id': post_uri.split('/')[-1],
+            'uri': post_uri,
+            'cid': post_cid,
+            'text': content,
+            'created_at': post_data['record']['createdAt'],
+            'user': {
+                'did': self.did,
+                'handle': self.handle,
+            },
+            'platform': 'Bluesky'
+        }
+
     def post_content(self, content: str, media_urls: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
         """
         Post content to Bluesky.
@@ -120,94 +293,92 @@ class BlueskyClient(BasePlatformClient):
         Returns:
             Dictionary containing information about the created post.
         """
-        if not self.authenticated or not self.access_jwt:
-            raise ValueError("Bluesky client not authenticated")
+        self._require_auth()
 
         try:
-            # Prepare the post payload
-            post_data = {
-                "repo": self.did,
-                "collection": "app.bsky.feed.post",
-                "record": {
-                    "$type": "app.bsky.feed.post",
-                    "text": content,
-                    "createdAt": datetime.now(timezone.utc).isoformat()
-                }
-            }
+            post_data = self._build_post(content, media_urls, **kwargs)
+            # Not idempotent: the transport only retries failures that cannot
+            # have created the record (connection errors and 429)
+            response = self._call("POST", "com.atproto.repo.createRecord", idempotent=False, json=post_data)
+            return self._format_post(response, post_data, content)
 
-            # Add reply reference if provided
-            reply_to = kwargs.get('reply_to')
-            if reply_to:
-                reply_ref = json.loads(reply_to)
-                post_data["record"]["reply"] = reply_ref
-
-            # Add media if provided
-            # Note: This is a simplified version. In a real implementation,
-            # you would need to first upload the images to Bluesky's BLOB storage
-            if media_urls and len(media_urls) > 0:
-                # In a real implementation, this would involve:
-                # 1. Uploading each image using com.atproto.repo.uploadBlob
-                # 2. Getting the blob refs
-                # 3. Adding them to the post record
-                logger.warning("Media upload not implemented in this sample implementation")
-
-            # Post to Bluesky with retries and timeout
-            max_retries = 3
-            retry_count = 0
-
-            while retry_count < max_retries:
-                try:
-                    with httpx.Client(timeout=30.0) as client:  # Increase timeout to 30 seconds
-                        logger.info(f"Attempting to post to Bluesky (attempt {retry_count + 1}/{max_retries})")
-                        response = client.post(
-                            f"{self.BASE_URL}/com.atproto.repo.createRecord",
-                            headers=self._get_auth_headers(),
-                            json=post_data,
-                            timeout=30.0  # Explicit timeout
-                        )
-
-                        # Check response status code
-                        if response.status_code in (200, 201):
-                            post_info = response.json()
-
-                            # Get the post URI
-                            post_uri = post_info.get('uri', '')
-                            post_cid = post_info.get('cid', '')
-
-                            # Format the response
-                            result_data = {
-                                'id': post_uri.split('/')[-1],
-                                'uri': post_uri,
-                                'cid': post_cid,
-                                'text': content,
-                                'created_at': post_data['record']['createdAt'],
-                                'user': {
-                                    'did': self.did,
-                                    'handle': self.handle,
-                                },
-                                'platform': 'Bluesky'
-                            }
-
-                            logger.info(f"Successfully posted to Bluesky: {post_uri}")
-                            return result_data
-                        else:
-                            error_msg = f"Failed to post to Bluesky: {response.status_code} - {response.text}"
-                            logger.error(error_msg)
-                            raise ValueError(error_msg)
-
-                except Exception as e:
-                    retry_count += 1
-                    logger.warning(f"Bluesky post attempt {retry_count}/{max_retries} failed: {e}")
-                    if retry_count >= max_retries:
-                        raise ValueError(f"Failed to post to Bluesky after {max_retries} attempts: {str(e)}")
-                    # Add exponential backoff
-                    import time
-                    time.sleep(2 ** retry_count)  # 2, 4, 8 seconds
+        except Exception as e:
+            logger.error(f"Failed to post to Bluesky: {e}")
+            raise ValueError(f"Failed to post to Bluesky: {str(e)}")
+
+    async def apost_content(self, content: str, media_urls: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
+        """Async variant of post_content()."""
+        self._require_auth()
+
+        try:
+            post_data = self._build_post(content, media_urls, **kwargs)
+            response = await self._acall("POST", "com.atproto.repo.createRecord", idempotent=False, json=post_data)
+            return self._format_post(response, post_data, content)
 
         except Exception as e:
             logger.error(f"Failed to post to Bluesky: {e}")
             raise ValueError(f"Failed to post to Bluesky: {str(e)}")
 
+    @staticmethod
+    def _notification_params(since_id: Optional[str], count: int) -> Dict[str, Any]:
+        """Get the listNotifications query parameters."""
+        params = {"limit": min(count, 50)}  # Bluesky has lower limits
+        if since_id:
+            params["cursor"] = since_id
+        return params
+
+    @staticmethod
+    def _format_interactions(response: httpx.Response) -> List[Dict[str, Any]]:
+        """Format a listNotifications response into interactions."""
+        if response.status_code != 200:
+            logger.error(f"Failed to retrieve Bluesky notifications: {response.status_code} - {response.text}")
+            return []
+
+        notifications_data = response.json()
+        notifications = notifications_data.get('notifications', [])
+
+        # Format the interactions
+        interactions = []
+
+        for notification in notifications:
+            # Only handle certain notification types
+            reason = notification.get('reason')
+            if reason not in ('mention', 'reply', 'quote'):
+                continue
+
+            record = notification.get('record', {})
+            author = notification.get('author', {})
+
+            interaction_type = 'mention' if reason == 'mention' else 'reply' if reason == 'reply' else 'quote'
+
+            # Format the interaction
+            interaction = {
+                'id': notification.get('uri', '').split('/')[-1],
+                'uri': notification.get('uri', ''),
+                'cid': notification.get('cid', ''),
+                'text': record.get('text', ''),
+                'created_at': record.get('createdAt', ''),
+                'type': interaction_type,
+                'user': {
+                    'did': author.get('did', ''),
+                    'handle': author.get('handle', ''),
+                    'display_name': author.get('displayName', ''),
+                    'avatar': author.get('avatar', '')
+                },
+                'platform': 'Bluesky'
+            }
+
+            # Add reply context if available
+            if 'reply' in record:
+                interaction['reply_to'] = {
+                    'uri': record['reply'].get('parent', {}).get('uri', ''),
+                    'cid': record['reply'].get('parent', {}).get('cid', '')
+                }
+
+            interactions.append(interaction)
+
+        return interactions
+
     def get_interactions(self, since_id: Optional[str] = None, count: int = 100) -> List[Dict[str, Any]]:
         """
         Get recent interactions from Bluesky (mentions, replies).
@@ -219,75 +390,71 @@ class BlueskyClient(BasePlatformClient):
         Returns:
             List of interaction objects from Bluesky.
         """
-        if not self.authenticated or not self.access_jwt:
-            raise ValueError("Bluesky client not authenticated")
+        self._require_auth()
 
         try:
             # Get notifications (mentions, replies, etc.)
-            params = {"limit": min(count, 50)}  # Bluesky has lower limits
-            if since_id:
-                params["cursor"] = since_id
-
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.BASE_URL}/app.bsky.notification.listNotifications",
-                    headers=self._get_auth_headers(),
-                    params=params
-                )
+            response = self._call(
+                "GET",
+                "app.bsky.notification.listNotifications",
+                params=self._notification_params(since_id, count)
+            )
+            return self._format_interactions(response)
+
+        except Exception as e:
+            logger.error(f"Failed to retrieve Bluesky interactions: {e}")
+            raise ValueError(f"Failed to retrieve Bluesky interactions: {str(e)}")
 
-                if response.status_code != 200:
-                    logger.error(f"Failed to retrieve Bluesky notifications: {response.status_code} - {response.text}")
-                    return []
-
-                notifications_data = response.json()
-                notifications = notifications_data.get('notifications', [])
-
-                # Format the interactions
-                interactions = []
-
-                for notification in notifications:
-                    # Only handle certain notification types
-                    reason = notification.get('reason')
-                    if reason not in ('mention', 'reply', 'quote'):
-                        continue
-
-                    record = notification.get('record', {})
-                    author = notification.get('author', {})
-
-                    interaction_type = 'mention' if reason == 'mention' else 'reply' if reason == 'reply' else 'quote'
-
-                    # Format the interaction
-                    interaction = {
-                        'id': notification.get('uri', '').split('/')[-1],
-                        'uri': notification.get('uri', ''),
-                        'cid': notification.get('cid', ''),
-                        'text': record.get('text', ''),
-                        'created_at': record.get('createdAt', ''),
-                        'type': interaction_type,
-                        'user': {
-                            'did': author.get('did', ''),
-                            'handle': author.get('handle', ''),
-                            'display_name': author.get('displayName', ''),
-                            'avatar': author.get('avatar', '')
-                        },
-                        'platform': 'Bluesky'
-                    }
-
-                    # Add reply context if available
-                    if 'reply' in record:
-                        interaction['reply_to'] = {
-                            'uri': record['reply'].get('parent', {}).get('uri', ''),
-                            'cid': record['reply'].get('parent', {}).get('cid', '')
-                        }
-
-                    interactions.append(interaction)
-
-                return interactions
+    async def aget_interactions(self, since_id: Optional[str] = None, count: int = 100) -> List[Dict[str, Any]]:
+        """Async variant of get_interactions()."""
+        self._require_auth()
+
+        try:
+            response = await self._acall(
+                "GET",
+                "app.bsky.notification.listNotifications",
+                params=self._notification_params(since_id, count)
+            )
+            return self._format_interactions(response)
 
         except Exception as e:
             logger.error(f"Failed to retrieve Bluesky interactions: {e}")
             raise ValueError(f"Failed to retrieve Bluesky interactions: {str(e)}")
 
+    @staticmethod
+    def _record_params(uri: str) -> Dict[str, str]:
+        """Get the getRecord query parameters for a post URI."""
+        parts = uri.split('/')
+        # at://<did>/app.bsky.feed.post/<rkey>
+        repo = parts[2] if uri.startswith('at://') and len(parts) > 2 else parts[0]
+        return {
+            "repo": repo,
+            "collection": "app.bsky.feed.post",
+            "rkey": parts[-1]
+        }
+
+    @staticmethod
+    def _record_cid(response: httpx.Response) -> str:
+        """Get the CID from a getRecord response, raising on failure."""
+        if response.status_code != 200:
+            logger.error(f"Failed to fetch record info: {response.status_code} - {response.text}")
+            raise ValueError("Could not get record information for reply")
+        return response.json().get('cid')
+
+    @staticmethod
+    def _reply_ref(reply_uri: str, reply_cid: str) -> str:
+        """Build the reply reference for a response to a post."""
+        return json.dumps({
+            "root": {
+                "uri": reply_uri,
+                "cid": reply_cid
+            },
+            "parent": {
+                "uri": reply_uri,
+                "cid": reply_cid
+            }
+        })
+
     def respond_to_interaction(self, interaction_id: str, content: str, **kwargs) -> Dict[str, Any]:
         """
         Respond to a Bluesky interaction.
@@ -300,8 +467,7 @@ class BlueskyClient(BasePlatformClient):
         Returns:
             Dictionary containing information about the created response.
         """
-        if not self.authenticated or not self.access_jwt:
-            raise ValueError("Bluesky client not authenticated")
+        self._require_auth()
 
         try:
             # Extract record information
@@ -310,43 +476,58 @@ class BlueskyClient(BasePlatformClient):
 
             if not reply_uri or not reply_cid:
                 # If we just have the URI, we need to fetch the CID
-                with httpx.Client() as client:
-                    record_response = client.get(
-                        f"{self.BASE_URL}/com.atproto.repo.getRecord",
-                        headers=self._get_auth_headers(),
-                        params={
-                            "repo": reply_uri.split('/')[0],
-                            "collection": "app.bsky.feed.post",
-                            "rkey": reply_uri.split('/')[-1]
-                        }
-                    )
-
-                    if record_response.status_code == 200:
-                        record_data = record_response.json()
-                        reply_cid = record_data.get('cid')
-                    else:
-                        logger.error(f"Failed to fetch record info: {record_response.status_code} - {record_response.text}")
-                        raise ValueError("Could not get record information for reply")
-
-            # Prepare reply reference
-            reply_ref = {
-                "root": {
-                    "uri": reply_uri,
-                    "cid": reply_cid
-                },
-                "parent": {
-                    "uri": reply_uri,
-                    "cid": reply_cid
-                }
-            }
+                reply_cid = self._record_cid(
+                    self._call("GET", "com.atproto.repo.getRecord", params=self._record_params(reply_uri))
+                )
 
             # Use the post_content method with the reply reference
-            return self.post_content(content, reply_to=json.dumps(reply_ref))
+            return self.post_content(content, reply_to=self._reply_ref(reply_uri, reply_cid))
+
+        except Exception as e:
+            logger.error(f"Failed to respond on Bluesky: {e}")
+            raise ValueError(f"Failed to respond on Bluesky: {str(e)}")
+
+    async def arespond_to_interaction(self, interaction_id: str, content: str, **kwargs) -> Dict[str, Any]:
+        """Async variant of respond_to_interaction()."""
+        self._require_auth()
+
+        try:
+            reply_uri = kwargs.get('uri') or interaction_id
+            reply_cid = kwargs.get('cid')
+
+            if not reply_uri or not reply_cid:
+                reply_cid = self._record_cid(
+                    await self._acall("GET", "com.atproto.repo.getRecord", params=self._record_params(reply_uri))
+                )
+
+            return await self.apost_content(content, reply_to=self._reply_ref(reply_uri, reply_cid))
 
         except Exception as e:
             logger.error(f"Failed to respond on Bluesky: {e}")
             raise ValueError(f"Failed to respond on Bluesky: {str(e)}")
 
+    @staticmethod
+    def _format_account(response: httpx.Response) -> Dict[str, Any]:
+        """Format a getProfile response, raising on failure."""
+        if response.status_code != 200:
+            logger.error(f"Failed to retrieve Bluesky profile: {response.status_code} - {response.text}")
+            raise ValueError(f"Failed to retrieve Bluesky profile: {response.status_code}")
+
+        profile_data = response.json()
+
+        # Format the account info
+        return {
+            'did': profile_data.get('did'),
+            'handle': profile_data.get('handle'),
+            'display_name': profile_data.get('displayName'),
+            'description': profile_data.get('description'),
+            'following_count': profile_data.get('followsCount', 0),
+            'follower_count': profile_data.get('followersCount', 0),
+            'posts_count': profile_data.get('postsCount', 0),
+            'avatar_url': profile_data.get('avatar'),
+            'platform': 'Bluesky'
+        }
+
     def get_account_info(self) -> Dict[str, Any]:
         """
         Get information about the connected Bluesky account.
@@ -354,39 +535,25 @@ class BlueskyClient(BasePlatformClient):
         Returns:
             Dictionary containing information about the account.
         """
-        if not self.authenticated or not self.access_jwt:
-            raise ValueError("Bluesky client not authenticated")
+        self._require_auth()
 
         try:
-            with httpx.Client() as client:
-                # Get profile information
-                profile_response = client.get(
-                    f"{self.BASE_URL}/app.bsky.actor.getProfile",
-                    headers=self._get_auth_headers(),
-                    params={"actor": self.did}
-                )
+            # Get profile information
+            response = self._call("GET", "app.bsky.actor.getProfile", params={"actor": self.did})
+            return self._format_account(response)
 
-                if profile_response.status_code != 200:
-                    logger.error(f"Failed to retrieve Bluesky profile: {profile_response.status_code} - {profile_response.text}")
-                    raise ValueError(f"Failed to retrieve Bluesky profile: {profile_response.status_code}")
-
-                profile_data = profile_response.json()
-
-                # Format the account info
-                account_info = {
-                    'did': profile_data.get('did'),
-                    'handle': profile_data.get('handle'),
-                    'display_name': profile_data.get('displayName'),
-                    'description': profile_data.get('description'),
-                    'following_count': profile_data.get('followsCount', 0),
-                    'follower_count': profile_data.get('followersCount', 0),
-                    'posts_count': profile_data.get('postsCount', 0),
-                    'avatar_url': profile_data.get('avatar'),
-                    'platform': 'Bluesky'
-                }
+        except Exception as e:
+            logger.error(f"Failed to retrieve Bluesky account info: {e}")
+            raise ValueError(f"Failed to retrieve Bluesky account info: {str(e)}")
+
+    async def aget_account_info(self) -> Dict[str, Any]:
+        """Async variant of get_account_info()."""
+        self._require_auth()
 
-                return account_info
+        try:
+            response = await self._acall("GET", "app.bsky.actor.getProfile", params={"actor": self.did})
+            return self._format_account(response)
 
         except Exception as e:
             logger.error(f"Failed to retrieve Bluesky account info: {e}")
-            raise ValueError(f"Failed to retrieve Bluesky account info: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Failed to retrieve Bluesky account info: {str(e)}")
@@ -4,12 +4,13 @@ LinkedIn client module.
 This module provides integration with the LinkedIn API.
 """
 
+import asyncio
 import logging
 import json
-import requests
 from typing import Dict, Any, List, Optional
 
 from app.core.platforms.base import BasePlatformClient
+from app.core.platforms.transport import get_transport
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +26,11 @@ class LinkedInClient(BasePlatformClient):
     PROFILE_URL = f"{BASE_URL}/me"
     SHARES_URL = f"{BASE_URL}/shares"
     UGCPOSTS_URL = f"{BASE_URL}/ugcPosts"
+    COMMENTER_PROJECTION = "(id,localizedFirstName,localizedLastName,profilePicture)"
     
     def __init__(self):
         """Initialize the LinkedIn client."""
+        self.transport = get_transport("linkedin")
         self.access_token = None
         self.authenticated = False
         self.user_info = None
@@ -56,7 +59,7 @@ class LinkedInClient(BasePlatformClient):
             
             # Verify credentials by fetching profile information
             headers = self._get_auth_headers()
-            response = requests.get(
+            response = self.transport.get(
                 f"{self.PROFILE_URL}",
                 headers=headers,
                 params={"projection": "(id,localizedFirstName,localizedLastName,profilePicture,vanityName)"}
@@ -154,7 +157,7 @@ class LinkedInClient(BasePlatformClient):
             
             # Post to LinkedIn
             headers = self._get_auth_headers()
-            response = requests.post(
+            response = self.transport.post(
                 self.UGCPOSTS_URL,
                 headers=headers,
                 json=post_data
@@ -185,6 +188,35 @@ class LinkedInClient(BasePlatformClient):
             logger.error(f"Failed to post to LinkedIn: {e}")
             raise ValueError(f"Failed to post to LinkedIn: {str(e)}")
     
+    def _author_urn(self) -> str:
+        """Get the URN the client posts as."""
+        return f"urn:li:person:{self.person_id}" if not self.organization_id else f"urn:li:organization:{self.organization_id}"
+
+    @staticmethod
+    def _format_commenter(response: Any) -> Optional[Dict[str, Any]]:
+        """Format a people lookup response, or None if it failed."""
+        if response.status_code != 200:
+            return None
+        commenter_data = response.json()
+        return {
+            "id": commenter_data.get('id'),
+            "name": f"{commenter_data.get('localizedFirstName', '')} {commenter_data.get('localizedLastName', '')}",
+            "profile_image_url": commenter_data.get('profilePicture', {}).get('displayImage', '')
+        }
+
+    @staticmethod
+    def _format_comment(comment: Dict[str, Any], post_urn: str, commenter_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a comment into an interaction."""
+        return {
+            'id': comment.get('id', '').split(':')[-1],
+            'text': comment.get('message', {}).get('text', ''),
+            'created_at': comment.get('created', {}).get('time', ''),
+            'type': 'comment',
+            'user': commenter_info,
+            'parent_id': post_urn.split(':')[-1],
+            'platform': 'LinkedIn'
+        }
+    
     def get_interactions(self, since_id: Optional[str] = None, count: int = 100) -> List[Dict[str, Any]]:
         """
         Get recent interactions from LinkedIn (comments, reactions).
@@ -206,12 +238,12 @@ class LinkedInClient(BasePlatformClient):
             headers = self._get_auth_headers()
             
             # Get recent posts by the user
-            response = requests.get(
+            response = self.transport.get(
                 self.UGCPOSTS_URL,
                 headers=headers,
                 params={
                     "q": "authors",
-                    "authors": f"urn:li:person:{self.person_id}" if not self.organization_id else f"urn:li:organization:{self.organization_id}",
+                    "authors": self._author_urn(),
                     "count": min(count, 10)  # LinkedIn has lower limits
                 }
             )
@@ -232,7 +264,7 @@ class LinkedInClient(BasePlatformClient):
                     continue
                 
                 # Get comments on this post
-                comments_response = requests.get(
+                comments_response = self.transport.get(
                     f"{self.BASE_URL}/socialActions/{post_urn}/comments",
                     headers=headers,
                     params={"count": min(count, 20)}  # LinkedIn has lower limits
@@ -252,33 +284,16 @@ class LinkedInClient(BasePlatformClient):
                     
                     try:
                         if actor_urn and actor_urn.startswith('urn:li:person:'):
-                            commenter_response = requests.get(
+                            commenter_response = self.transport.get(
                                 f"{self.BASE_URL}/people/{actor_urn.split(':')[-1]}",
                                 headers=headers,
-                                params={"projection": "(id,localizedFirstName,localizedLastName,profilePicture)"}
+                                params={"projection": self.COMMENTER_PROJECTION}
                             )
-                            if commenter_response.status_code == 200:
-                                commenter_data = commenter_response.json()
-                                commenter_info = {
-                                    "id": commenter_data.get('id'),
-                                    "name": f"{commenter_data.get('localizedFirstName', '')} {commenter_data.get('localizedLastName', '')}",
-                                    "profile_image_url": commenter_data.get('profilePicture', {}).get('displayImage', '')
-                                }
+                            commenter_info = self._format_commenter(commenter_response) or commenter_info
                     except Exception as e:
                         logger.warning(f"Failed to get commenter info: {e}")
                     
-                    # Format the interaction
-                    interaction = {
-                        'id': comment.get('id', '').split(':')[-1],
-                        'text': comment.get('message', {}).get('text', ''),
-                        'created_at': comment.get('created', {}).get('time', ''),
-                        'type': 'comment',
-                        'user': commenter_info,
-                        'parent_id': post_urn.split(':')[-1],
-                        'platform': 'LinkedIn'
-                    }
-                    
-                    interactions.append(interaction)
+                    interactions.append(self._format_comment(comment, post_urn, commenter_info))
                     
                     if len(interactions) >= count:
                         break
@@ -289,6 +304,94 @@ class LinkedInClient(BasePlatformClient):
             logger.error(f"Failed to retrieve LinkedIn interactions: {e}")
             raise ValueError(f"Failed to retrieve LinkedIn interactions: {str(e)}")
     
+    async def aget_interactions(self, since_id: Optional[str] = None, count: int = 100) -> List[Dict[str, Any]]:
+        """
+        Async variant of get_interactions().
+
+        Comments on all recent posts are fetched concurrently, and each
+        commenter is looked up once however many comments they left.
+        """
+        if not self.authenticated or not self.access_token:
+            raise ValueError("LinkedIn client not authenticated")
+        
+        try:
+            headers = self._get_auth_headers()
+            
+            response = await self.transport.aget(
+                self.UGCPOSTS_URL,
+                headers=headers,
+                params={
+                    "q": "authors",
+                    "authors": self._author_urn(),
+                    "count": min(count, 10)  # LinkedIn has lower limits
+                }
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Failed to retrieve LinkedIn posts: {response.status_code} - {response.text}")
+                return []
+            
+            post_urns = [post.get('id') for post in response.json().get('elements', []) if post.get('id')]
+            comment_responses = await asyncio.gather(*[
+                self.transport.aget(
+                    f"{self.BASE_URL}/socialActions/{post_urn}/comments",
+                    headers=headers,
+                    params={"count": min(count, 20)}  # LinkedIn has lower limits
+                )
+                for post_urn in post_urns
+            ], return_exceptions=True)
+            
+            comments_by_post = []
+            for post_urn, comments_response in zip(post_urns, comment_responses):
+                if isinstance(comments_response, Exception):
+                    logger.warning(f"Failed to retrieve comments for post {post_urn}: {comments_response}")
+                    continue
+                if comments_response.status_code != 200:
+                    logger.warning(f"Failed to retrieve comments for post {post_urn}: {comments_response.status_code} - {comments_response.text}")
+                    continue
+                comments_by_post.append((post_urn, comments_response.json().get('elements', [])[:count]))
+            
+            # Look up every distinct commenter once, concurrently
+            actor_urns = sorted({
+                comment.get('actor', '')
+                for _, comments in comments_by_post
+                for comment in comments
+                if comment.get('actor', '').startswith('urn:li:person:')
+            })
+            commenter_responses = await asyncio.gather(*[
+                self.transport.aget(
+                    f"{self.BASE_URL}/people/{actor_urn.split(':')[-1]}",
+                    headers=headers,
+                    params={"projection": self.COMMENTER_PROJECTION}
+                )
+                for actor_urn in actor_urns
+            ], return_exceptions=True)
+            
+            commenters = {}
+            for actor_urn, commenter_response in zip(actor_urns, commenter_responses):
+                if isinstance(commenter_response, Exception):
+                    logger.warning(f"Failed to get commenter info: {commenter_response}")
+                    continue
+                commenter_info = self._format_commenter(commenter_response)
+                if commenter_info:
+                    commenters[actor_urn] = commenter_info
+            
+            interactions = []
+            for post_urn, comments in comments_by_post:
+                for comment in comments:
+                    actor_urn = comment.get('actor', '')
+                    commenter_info = commenters.get(actor_urn) or {
+                        "name": "Unknown User",
+                        "id": actor_urn.split(':')[-1] if actor_urn else "unknown"
+                    }
+                    interactions.append(self._format_comment(comment, post_urn, commenter_info))
+            
+            return interactions
+                
+        except Exception as e:
+            logger.error(f"Failed to retrieve LinkedIn interactions: {e}")
+            raise ValueError(f"Failed to retrieve LinkedIn interactions: {str(e)}")
+    
     def respond_to_interaction(self, interaction_id: str, content: str, **kwargs) -> Dict[str, Any]:
         """
         Respond to a LinkedIn interaction.
@@ -322,7 +425,7 @@ class LinkedInClient(BasePlatformClient):
             }
             
             headers = self._get_auth_headers()
-            response = requests.post(
+            response = self.transport.post(
                 f"{self.BASE_URL}/socialActions/{parent_urn}/comments",
                 headers=headers,
                 json=comment_data
@@ -367,7 +470,7 @@ class LinkedInClient(BasePlatformClient):
             headers = self._get_auth_headers()
             
             # Get basic profile information
-            profile_response = requests.get(
+            profile_response = self.transport.get(
                 f"{self.PROFILE_URL}",
                 headers=headers,
                 params={"projection": "(id,localizedFirstName,localizedLastName,profilePicture,vanityName)"}
@@ -385,7 +488,7 @@ class LinkedInClient(BasePlatformClient):
             connection_count = 0
             
             try:
-                network_response = requests.get(
+                network_response = self.transport.get(
                     f"{self.BASE_URL}/networkSizes/{self.person_id}?edgeType=CONNECTIONS",
                     headers=headers
                 )
@@ -396,7 +499,7 @@ class LinkedInClient(BasePlatformClient):
                 logger.warning(f"Failed to retrieve LinkedIn connection count: {e}")
             
             try:
-                follower_response = requests.get(
+                follower_response = self.transport.get(
                     f"{self.BASE_URL}/networkSizes/{self.person_id}?edgeType=FOLLOWERS",
                     headers=headers
                 )
@@ -13,6 +13,7 @@ from app.core.platforms.base import BasePlatformClient
 from app.core.platforms.twitter import TwitterClient
 from app.core.platforms.linkedin import LinkedInClient
 from app.core.platforms.bluesky import BlueskyClient
+from app.core.platforms.pool import PlatformClientPool, client_pool
 from app.db.models.platform import PlatformConnection
 from app.core.personas.context import persona_context
 
@@ -26,19 +27,17 @@ class PlatformManager:
     for working with multiple social media platforms.
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, pool: Optional[PlatformClientPool] = None):
         """
         Initialize the platform manager.
         
         Args:
             db: Database session.
+            pool: Pool of authenticated clients. Defaults to the process-level pool,
+                so clients outlive individual managers.
         """
         self.db = db
-        self.platform_clients: Dict[str, Dict[int, BasePlatformClient]] = {
-            "twitter": {},
-            "linkedin": {},
-            "bluesky": {},
-        }
+        self.pool = pool or client_pool
     
     def get_client_class(self, platform_name: str) -> Type[BasePlatformClient]:
         """
@@ -83,10 +82,6 @@ class PlatformManager:
         if persona_id is None:
             persona_id = persona_context.require_persona()
         
-        # Check if we already have an initialized client for this platform and persona
-        if platform_name_lower in self.platform_clients and persona_id in self.platform_clients[platform_name_lower]:
-            return self.platform_clients[platform_name_lower][persona_id]
-            
         # Get platform connection from database
         platform_conn = self.db.query(PlatformConnection).filter(
             PlatformConnection.persona_id == persona_id,
@@ -97,29 +92,8 @@ class PlatformManager:
         if not platform_conn:
             raise ValueError(f"No active {platform_name} connection found for persona {persona_id}")
         
-        # Create and authenticate client
-        client_class = self.get_client_class(platform_name_lower)
-        client = client_class()
-        
-        # Get credentials from platform connection
-        credentials = {
-            # Extract platform-specific credentials from the stored credentials
-            **platform_conn.credentials
-        }
-        
-        # Authenticate the client
-        success = client.authenticate(credentials)
-        
-        if not success:
-            raise ValueError(f"Failed to authenticate {platform_name} client for persona {persona_id}")
-            
-        # Store client for reuse
-        if platform_name_lower not in self.platform_clients:
-            self.platform_clients[platform_name_lower] = {}
-            
-        self.platform_clients[platform_name_lower][persona_id] = client
-        
-        return client
+        # Reuse the pooled client, authenticating only when needed
+        return self.pool.get(platform_conn, self.get_client_class(platform_name_lower))
     
     def connect_platform(self, persona_id: int, platform_name: str, credentials: Dict[str, Any], username: str) -> PlatformConnection:
         """
@@ -185,10 +159,7 @@ class PlatformManager:
             self.db.refresh(platform_conn)
         
         # Store client for reuse
-        if platform_name_lower not in self.platform_clients:
-            self.platform_clients[platform_name_lower] = {}
-            
-        self.platform_clients[platform_name_lower][persona_id] = client
+        self.pool.put(platform_conn, client)
         
         return platform_conn
     
@@ -217,9 +188,7 @@ class PlatformManager:
         self.db.commit()
         
         # Remove client if exists
-        platform_name_lower = platform_conn.platform_name.lower()
-        if platform_name_lower in self.platform_clients and persona_id in self.platform_clients[platform_name_lower]:
-            del self.platform_clients[platform_name_lower][persona_id]
+        self.pool.invalidate(persona_id, platform_conn.platform_name)
         
         return True
     
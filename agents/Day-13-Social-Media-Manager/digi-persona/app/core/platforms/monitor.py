@@ -0,0 +1,141 @@
+"""
+Interaction monitor module.
+
+This module polls every active platform connection for new interactions
+concurrently, using the pooled clients and their async variants, and stores
+the new interactions in one transaction.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.platforms.manager import PlatformManager
+from app.core.platforms.pool import PlatformClientPool, client_pool
+from app.db.models.interaction import Interaction
+from app.db.models.platform import PlatformConnection
+
+logger = logging.getLogger(__name__)
+
+
+def _since_ids(db: Session, connections: Sequence[PlatformConnection]) -> Dict[Tuple[int, str], Optional[str]]:
+    """Get the external ID of the most recent stored interaction for every connection."""
+    persona_ids = {conn.persona_id for conn in connections}
+    latest = (
+        db.query(
+            Interaction.persona_id,
+            Interaction.platform,
+            func.max(Interaction.created_at).label("latest"),
+        )
+        .filter(Interaction.persona_id.in_(persona_ids))
+        .group_by(Interaction.persona_id, Interaction.platform)
+        .subquery()
+    )
+    rows = (
+        db.query(Interaction.persona_id, Interaction.platform, Interaction.external_id)
+        .join(
+            latest,
+            (Interaction.persona_id == latest.c.persona_id)
+            & (Interaction.platform == latest.c.platform)
+            & (Interaction.created_at == latest.c.latest),
+        )
+        .all()
+    )
+    return {(row.persona_id, row.platform): row.external_id for row in rows}
+
+
+async def poll_interactions(
+    db: Session,
+    connections: Optional[List[PlatformConnection]] = None,
+    count: int = 100,
+    pool: Optional[PlatformClientPool] = None,
+    concurrency: int = settings.INTERACTION_POLL_CONCURRENCY,
+) -> Dict[str, Any]:
+    """
+    Fetch and store new interactions for many platform connections at once.
+
+    Args:
+        db: The database session.
+        connections: Connections to poll. Defaults to all active connections.
+        count: Maximum number of interactions to fetch per connection.
+        pool: Pool of authenticated clients. Defaults to the process-level pool.
+        concurrency: Maximum number of connections polled at the same time.
+
+    Returns:
+        New interaction counts per connection and any errors.
+    """
+    pool = pool or client_pool
+    if connections is None:
+        connections = db.query(PlatformConnection).filter(PlatformConnection.is_active == True).all()
+    if not connections:
+        return {"connections": [], "total_new_interactions": 0}
+
+    since_ids = _since_ids(db, connections)
+    platform_manager = PlatformManager(db, pool=pool)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(connection: PlatformConnection) -> List[Dict[str, Any]]:
+        async with semaphore:
+            client_class = platform_manager.get_client_class(connection.platform_name)
+            # Authentication is synchronous and only happens when the pooled client is stale
+            client = await asyncio.to_thread(pool.get, connection, client_class)
+            since_id = since_ids.get((connection.persona_id, connection.platform_name))
+            return await client.aget_interactions(since_id, count)
+
+    results = await asyncio.gather(*[fetch(conn) for conn in connections], return_exceptions=True)
+
+    # Skip interactions that are already stored, with one query per poll
+    fetched_ids = {
+        data.get('id')
+        for result in results if not isinstance(result, Exception)
+        for data in result
+    }
+    existing = set()
+    if fetched_ids:
+        existing = set(
+            db.query(Interaction.persona_id, Interaction.platform, Interaction.external_id)
+            .filter(Interaction.external_id.in_(fetched_ids))
+            .all()
+        )
+
+    summary = []
+    total = 0
+    for connection, result in zip(connections, results):
+        entry = {"persona_id": connection.persona_id, "platform": connection.platform_name}
+        if isinstance(result, Exception):
+            logger.error(f"Error polling {connection.platform_name} for persona {connection.persona_id}: {result}")
+            pool.invalidate(connection.persona_id, connection.platform_name)
+            entry["error"] = str(result)
+            summary.append(entry)
+            continue
+
+        new_count = 0
+        for interaction_data in result:
+            key = (connection.persona_id, connection.platform_name, interaction_data.get('id'))
+            if key in existing:
+                continue
+            existing.add(key)
+
+            db.add(Interaction(
+                persona_id=connection.persona_id,
+                platform=connection.platform_name,
+                external_id=interaction_data.get('id'),
+                type=interaction_data.get('type', 'unknown'),
+                content_text=interaction_data.get('text', ''),
+                author_data=interaction_data.get('user', {}),
+                status="pending",
+                response=None,
+                platform_data=interaction_data
+            ))
+            new_count += 1
+
+        entry["new_interactions"] = new_count
+        total += new_count
+        summary.append(entry)
+
+    db.commit()
+    return {"connections": summary, "total_new_interactions": total}
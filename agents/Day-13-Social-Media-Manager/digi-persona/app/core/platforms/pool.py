@@ -0,0 +1,212 @@
+"""
+Platform client pool module.
+
+This module provides a process-level pool of authenticated platform clients
+and per-platform rate limiting, so that workers posting many items reuse one
+authenticated client per persona and platform instead of logging in for every
+request.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from app.core.config import settings
+from app.core.platforms.base import BasePlatformClient
+from app.db.models.platform import PlatformConnection
+
+logger = logging.getLogger(__name__)
+
+# (persona_id, platform_name)
+ClientKey = Tuple[int, str]
+
+
+def credentials_fingerprint(credentials: Optional[Dict[str, Any]]) -> str:
+    """
+    Get a stable fingerprint of a set of credentials.
+
+    Args:
+        credentials: The stored platform credentials.
+
+    Returns:
+        A hex digest that changes whenever the credentials change.
+    """
+    payload = json.dumps(credentials or {}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PlatformClientPool:
+    """
+    Pool of authenticated platform clients shared by a process.
+
+    Clients are keyed by (persona_id, platform_name) and re-authenticated when
+    the stored credentials change, when they are older than the maximum age
+    (which refreshes short-lived session tokens) or after they are invalidated
+    because a request failed.
+    """
+
+    def __init__(self, max_age: float = settings.PLATFORM_CLIENT_MAX_AGE_SECONDS):
+        """
+        Initialize the client pool.
+
+        Args:
+            max_age: Seconds after which a client is re-authenticated.
+        """
+        self.max_age = max_age
+        self._clients: Dict[ClientKey, Dict[str, Any]] = {}
+        self._locks: Dict[ClientKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, key: ClientKey) -> threading.Lock:
+        """Get the lock that serialises authentication for one key."""
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _is_fresh(self, entry: Dict[str, Any], fingerprint: str) -> bool:
+        """Check whether a pooled client can still be used."""
+        return (
+            entry["fingerprint"] == fingerprint
+            and time.monotonic() - entry["authenticated_at"] < self.max_age
+        )
+
+    def get(
+        self,
+        connection: PlatformConnection,
+        client_class: Type[BasePlatformClient],
+    ) -> BasePlatformClient:
+        """
+        Get an authenticated client for a platform connection.
+
+        Args:
+            connection: The active platform connection.
+            client_class: The client class for the connection's platform.
+
+        Returns:
+            An authenticated platform client.
+
+        Raises:
+            ValueError: If authentication fails.
+        """
+        key = (connection.persona_id, connection.platform_name.lower())
+        fingerprint = credentials_fingerprint(connection.credentials)
+
+        entry = self._clients.get(key)
+        if entry is not None and self._is_fresh(entry, fingerprint):
+            return entry["client"]
+
+        with self._key_lock(key):
+            entry = self._clients.get(key)
+            if entry is not None and self._is_fresh(entry, fingerprint):
+                return entry["client"]
+
+            client = client_class()
+            if not client.authenticate({**connection.credentials}):
+                raise ValueError(
+                    f"Failed to authenticate {connection.platform_name} client for persona {connection.persona_id}"
+                )
+
+            self._clients[key] = {
+                "client": client,
+                "fingerprint": fingerprint,
+                "authenticated_at": time.monotonic(),
+            }
+            logger.info(f"Authenticated {key[1]} client for persona {key[0]}")
+            return client
+
+    def put(self, connection: PlatformConnection, client: BasePlatformClient) -> None:
+        """
+        Add an already authenticated client to the pool.
+
+        Args:
+            connection: The platform connection the client belongs to.
+            client: The authenticated client.
+        """
+        key = (connection.persona_id, connection.platform_name.lower())
+        self._clients[key] = {
+            "client": client,
+            "fingerprint": credentials_fingerprint(connection.credentials),
+            "authenticated_at": time.monotonic(),
+        }
+
+    def invalidate(self, persona_id: int, platform_name: str) -> None:
+        """
+        Drop a pooled client so the next request re-authenticates.
+
+        Args:
+            persona_id: ID of the persona.
+            platform_name: Name of the platform.
+        """
+        self._clients.pop((persona_id, platform_name.lower()), None)
+
+
+class PlatformRateLimiter:
+    """
+    Per-platform rate limiter shared by a process.
+
+    Each platform allows a limited number of requests in flight and a minimum
+    interval between the start of two requests.
+    """
+
+    def __init__(
+        self,
+        min_intervals: Optional[Dict[str, float]] = None,
+        max_concurrency: int = settings.PUBLISH_PLATFORM_CONCURRENCY,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            min_intervals: Minimum seconds between requests, per platform.
+            max_concurrency: Maximum requests in flight per platform.
+            clock: Monotonic clock, replaceable in tests.
+            sleep: Sleep function, replaceable in tests.
+        """
+        self.min_intervals = min_intervals if min_intervals is not None else settings.PUBLISH_MIN_INTERVAL_SECONDS
+        self.max_concurrency = max_concurrency
+        self.clock = clock
+        self.sleep = sleep
+        self._next_slot: Dict[str, float] = {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, platform_name: str) -> threading.BoundedSemaphore:
+        """Get the concurrency semaphore for a platform."""
+        with self._lock:
+            return self._semaphores.setdefault(platform_name, threading.BoundedSemaphore(self.max_concurrency))
+
+    def _reserve(self, platform_name: str) -> float:
+        """Reserve the next request slot for a platform and return the wait time."""
+        interval = self.min_intervals.get(platform_name, 0.0)
+        with self._lock:
+            now = self.clock()
+            slot = max(now, self._next_slot.get(platform_name, now))
+            self._next_slot[platform_name] = slot + interval
+            return slot - now
+
+    def call(self, platform_name: str, func: Callable[[], Any]) -> Any:
+        """
+        Run a platform request within the platform's limits.
+
+        Args:
+            platform_name: Name of the platform.
+            func: The request to run.
+
+        Returns:
+            The result of the request.
+        """
+        platform_name = platform_name.lower()
+        with self._semaphore(platform_name):
+            wait = self._reserve(platform_name)
+            if wait > 0:
+                self.sleep(wait)
+            return func()
+
+
+# Shared pool and rate limiter for this process
+client_pool = PlatformClientPool()
+rate_limiter = PlatformRateLimiter()
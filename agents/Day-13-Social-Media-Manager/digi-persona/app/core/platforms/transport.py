@@ -0,0 +1,368 @@
+"""
+Platform transport module.
+
+This module provides the shared HTTP transport used by the platform clients.
+Each platform gets one keep-alive connection pool (HTTP/2 where the `h2`
+package is installed) that is shared by every client instance in the process,
+so requests for different personas reuse connections instead of performing a
+new TLS handshake each time. Retryable failures are retried with exponential
+backoff, and the platforms' rate-limit headers are tracked so requests wait
+for the window to reset instead of being rejected. Non-idempotent requests
+(POST by default) are only retried when the server cannot have acted on them,
+so a post whose response was lost is not published twice.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Status codes worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Methods that can be repeated without changing the outcome
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Failures that happen before the request reaches the server, so any request
+# can be retried after them
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _header_number(headers: Mapping[str, str], *names: str) -> Optional[float]:
+    """Get the first numeric header value among several header names."""
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return None
+
+
+@dataclass
+class RateLimitState:
+    """Rate-limit window reported by a platform for one account."""
+
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: Optional[float] = None  # Unix timestamp
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """
+        Update the window from response headers.
+
+        Understands the Twitter (x-rate-limit-*) and Bluesky (ratelimit-*)
+        header families.
+
+        Args:
+            headers: The response headers.
+        """
+        limit = _header_number(headers, "x-rate-limit-limit", "ratelimit-limit")
+        remaining = _header_number(headers, "x-rate-limit-remaining", "ratelimit-remaining")
+        reset = _header_number(headers, "x-rate-limit-reset", "ratelimit-reset")
+        if limit is not None:
+            self.limit = int(limit)
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = reset
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """
+        Get how long to wait before the next request.
+
+        Args:
+            now: The current Unix time. Defaults to time.time().
+
+        Returns:
+            Seconds to wait; 0 while requests remain in the window.
+        """
+        if self.remaining is None or self.remaining > 0 or self.reset_at is None:
+            return 0.0
+        return max(0.0, self.reset_at - (now if now is not None else time.time()))
+
+
+class PlatformTransport:
+    """
+    Shared HTTP transport for one platform.
+
+    Synchronous callers share one `httpx.Client`; asynchronous callers share
+    one `httpx.AsyncClient` per event loop. Responses are returned to the
+    caller as-is once they are final (success, non-retryable error, or the
+    last retry), so the clients keep their own status handling.
+    """
+
+    def __init__(
+        self,
+        platform_name: str,
+        http2: bool = settings.PLATFORM_HTTP2,
+        timeout: float = settings.PLATFORM_HTTP_TIMEOUT_SECONDS,
+        max_connections: int = settings.PLATFORM_HTTP_MAX_CONNECTIONS,
+        max_retries: int = settings.PLATFORM_HTTP_MAX_RETRIES,
+        backoff_base: float = 1.0,
+        max_wait: float = settings.PLATFORM_RATE_LIMIT_MAX_WAIT_SECONDS,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            platform_name: Name of the platform, used in log messages.
+            http2: Whether to use HTTP/2 when the h2 package is available.
+            timeout: Request timeout in seconds.
+            max_connections: Maximum number of connections in each pool.
+            max_retries: Maximum number of retries for retryable failures.
+            backoff_base: Delay before the first retry; doubled on every further retry.
+            max_wait: Maximum seconds to wait for a rate-limit window or retry delay.
+        """
+        self.platform_name = platform_name
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_wait = max_wait
+
+        self.rate_limits: Dict[str, RateLimitState] = {}
+        self._client: Optional[httpx.Client] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        """The shared synchronous client."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(http2=self.http2, timeout=self.timeout, limits=self.limits)
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """The shared asynchronous client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(http2=self.http2, timeout=self.timeout, limits=self.limits)
+            self._async_clients[loop] = client
+        return client
+
+    def rate_limit(self, bucket: str) -> RateLimitState:
+        """
+        Get the rate-limit window for a bucket (usually one account).
+
+        Args:
+            bucket: The rate-limit bucket.
+
+        Returns:
+            The tracked rate-limit state.
+        """
+        return self.rate_limits.setdefault(bucket, RateLimitState())
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Get the delay before a retry, honouring Retry-After."""
+        delay = self.backoff_base * 2 ** attempt
+        if response is not None:
+            retry_after = _header_number(response.headers, "retry-after")
+            if retry_after is not None:
+                delay = retry_after
+            else:
+                reset = _header_number(response.headers, "x-rate-limit-reset", "ratelimit-reset")
+                if response.status_code == 429 and reset is not None:
+                    delay = reset - time.time()
+        return min(max(delay, 0.0), self.max_wait)
+
+    def _should_retry(
+        self,
+        attempt: int,
+        response: Optional[httpx.Response],
+        error: Optional[httpx.TransportError] = None,
+        idempotent: bool = True,
+    ) -> bool:
+        """
+        Check whether a failed attempt should be retried.
+
+        A non-idempotent request may have been carried out even though it
+        timed out or got a server error, so it is only retried when it never
+        reached the server or was rejected with 429.
+        """
+        if attempt >= self.max_retries:
+            return False
+        if idempotent:
+            return response is None or response.status_code in RETRY_STATUS_CODES
+        if response is None:
+            return isinstance(error, UNSENT_ERRORS)
+        return response.status_code == 429
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        bucket: str = "default",
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request with the shared synchronous client.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            bucket: Rate-limit bucket, usually the account the request acts for.
+            idempotent: Whether the request can safely be repeated. Defaults to
+                True for GET, HEAD, OPTIONS, PUT and DELETE and False otherwise.
+            **kwargs: Arguments passed to httpx (headers, params, json, ...).
+
+        Returns:
+            The final response.
+
+        Raises:
+            httpx.HTTPError: If the request still fails after all retries.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        state = self.rate_limit(bucket)
+        attempt = 0
+        while True:
+            wait = min(state.wait_time(), self.max_wait)
+            if wait > 0:
+                logger.info(f"{self.platform_name} rate limit reached, waiting {wait:.1f}s")
+                time.sleep(wait)
+
+            response = None
+            try:
+                response = self.client.request(method, url, **kwargs)
+                state.update(response.headers)
+            except httpx.TransportError as e:
+                if not self._should_retry(attempt, None, e, idempotent):
+                    raise
+                logger.warning(f"{self.platform_name} request failed ({e}), retrying")
+            else:
+                if not self._should_retry(attempt, response, idempotent=idempotent):
+                    return response
+                logger.warning(f"{self.platform_name} returned {response.status_code}, retrying")
+
+            time.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+
+    async def arequest(
+        self,
+        method: str,
+        url: str,
+        bucket: str = "default",
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request with the shared asynchronous client.
+
+        Waits for rate-limit windows and retry delays without blocking the
+        event loop.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            bucket: Rate-limit bucket, usually the account the request acts for.
+            idempotent: Whether the request can safely be repeated. Defaults to
+                True for GET, HEAD, OPTIONS, PUT and DELETE and False otherwise.
+            **kwargs: Arguments passed to httpx (headers, params, json, ...).
+
+        Returns:
+            The final response.
+
+        Raises:
+            httpx.HTTPError: If the request still fails after all retries.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        state = self.rate_limit(bucket)
+        attempt = 0
+        while True:
+            wait = min(state.wait_time(), self.max_wait)
+            if wait > 0:
+                logger.info(f"{self.platform_name} rate limit reached, waiting {wait:.1f}s")
+                await asyncio.sleep(wait)
+
+            response = None
+            try:
+                response = await self.async_client.request(method, url, **kwargs)
+                state.update(response.headers)
+            except httpx.TransportError as e:
+                if not self._should_retry(attempt, None, e, idempotent):
+                    raise
+                logger.warning(f"{self.platform_name} request failed ({e}), retrying")
+            else:
+                if not self._should_retry(attempt, response, idempotent=idempotent):
+                    return response
+                logger.warning(f"{self.platform_name} returned {response.status_code}, retrying")
+
+            await asyncio.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+
+    def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a GET request. See request()."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a POST request. See request()."""
+        return self.request("POST", url, **kwargs)
+
+    async def aget(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a GET request asynchronously. See arequest()."""
+        return await self.arequest("GET", url, **kwargs)
+
+    async def apost(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a POST request asynchronously. See arequest()."""
+        return await self.arequest("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close the asynchronous client of the running event loop."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_transports: Dict[str, PlatformTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(platform_name: str) -> PlatformTransport:
+    """
+    Get the shared transport for a platform.
+
+    Args:
+        platform_name: Name of the platform.
+
+    Returns:
+        The process-wide transport for the platform.
+    """
+    platform_name = platform_name.lower()
+    with _transports_lock:
+        transport = _transports.get(platform_name)
+        if transport is None:
+            transport = _transports[platform_name] = PlatformTransport(platform_name)
+        return transport
+
+
+async def aclose_transports() -> None:
+    """Close the asynchronous clients of all transports for the running event loop."""
+    for transport in list(_transports.values()):
+        await transport.aclose()
@@ -13,6 +13,11 @@ from app.db.models.persona import Persona
 from app.db.models.content import Content
 from app.db.models.platform import PlatformConnection
 from app.db.models.interaction import Interaction
+from app.db.models.analytics import AnalyticsDailyRollup
+from app.db.models.conversation import PersonaConversation
+
+# Keep the analytics rollups in step with content and interaction writes
+import app.core.analytics.rollups  # noqa
 
 # Import all models here to ensure they are registered with SQLAlchemy
 __all__ = [
@@ -22,4 +27,6 @@ __all__ = [
     "Content",
     "PlatformConnection",
     "Interaction",
+    "AnalyticsDailyRollup",
+    "PersonaConversation",
 ]
@@ -8,5 +8,7 @@ from app.db.models.persona import Persona
 from app.db.models.content import Content
 from app.db.models.platform import PlatformConnection
 from app.db.models.interaction import Interaction
+from app.db.models.analytics import AnalyticsDailyRollup
+from app.db.models.conversation import PersonaConversation
 
-__all__ = ["Persona", "Content", "PlatformConnection", "Interaction"]
+__all__ = ["Persona", "Content", "PlatformConnection", "Interaction", "AnalyticsDailyRollup", "PersonaConversation"]
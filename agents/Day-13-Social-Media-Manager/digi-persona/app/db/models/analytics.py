@@ -0,0 +1,37 @@
+"""Analytics Database Model
+
+This module provides the database model for pre-aggregated analytics counts.
+"""
+
+from sqlalchemy import Column, Date, Integer, String, UniqueConstraint
+
+from app.db.base_class import Base
+
+
+class AnalyticsDailyRollup(Base):
+    """
+    Database model for daily analytics rollups.
+
+    Each row holds the number of content items or interactions created on one
+    day for a (persona, platform, type) combination. Rows are kept up to date as
+    content and interactions are written, so dashboards read a few hundred
+    rollup rows instead of scanning the content and interaction tables.
+    """
+
+    __tablename__ = "analytics_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("day", "persona_id", "platform", "kind", "type", name="uq_analytics_daily_rollups_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, nullable=False, index=True)
+    persona_id = Column(Integer, nullable=False, index=True)
+    platform = Column(String, nullable=False)
+    kind = Column(String, nullable=False)  # content, interaction
+    type = Column(String, nullable=False)  # content type or interaction type
+    count = Column(Integer, nullable=False, default=0)
+    published_count = Column(Integer, nullable=False, default=0)  # published content only
+
+    def __repr__(self) -> str:
+        """String representation of the rollup row."""
+        return f"<AnalyticsDailyRollup {self.day} {self.kind}/{self.type} for persona {self.persona_id} on {self.platform}: {self.count}>"
@@ -30,6 +30,7 @@ class Content(Base):
     status = Column(String, nullable=False, default="draft", index=True)  # draft, pending_review, approved, published
     scheduled_time = Column(DateTime, nullable=True, index=True)
     published_time = Column(DateTime, nullable=True)
+    claimed_at = Column(DateTime, nullable=True)  # When a publish run claimed the item
     external_id = Column(String, nullable=True, index=True)  # ID from the platform
     media_urls = Column(JSON, nullable=True)  # URLs of attached media
     content_metadata = Column(JSON, nullable=True)  # Additional metadata
@@ -0,0 +1,33 @@
+"""Persona Conversation Database Model
+
+This module provides the database model for persisted agent conversation memory.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, Text
+from sqlalchemy.orm import relationship
+
+from app.db.base_class import Base
+
+
+class PersonaConversation(Base):
+    """
+    Database model for a persona's agent conversation memory.
+
+    Each persona has one row holding the rolling summary of older turns and
+    the recent messages that still fit in the memory's token budget, so the
+    row stays bounded however long the persona has been running.
+    """
+
+    __tablename__ = "persona_conversations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    persona_id = Column(Integer, ForeignKey("personas.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    summary = Column(Text, nullable=False, default="")
+    messages = Column(JSON, nullable=False, default=list)  # Serialized recent messages
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Relationships
+    persona = relationship("Persona", back_populates="conversation")
@@ -43,6 +43,7 @@ class Persona(Base):
     content = relationship("Content", back_populates="persona", cascade="all, delete-orphan")
     platform_connections = relationship("PlatformConnection", back_populates="persona", cascade="all, delete-orphan")
     interactions = relationship("Interaction", back_populates="persona", cascade="all, delete-orphan")
+    conversation = relationship("PersonaConversation", back_populates="persona", cascade="all, delete-orphan", uselist=False)
 
     def __repr__(self) -> str:
         """String representation of the persona."""
@@ -4,6 +4,7 @@ Celery Tasks Module
 This module provides Celery tasks for the application.
 """
 
+import asyncio
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 
@@ -13,9 +14,33 @@ from app.scheduler.worker import app
 from app.db.session import SessionLocal
 from app.core.content.scheduler import get_content_scheduler
 from app.core.content.manager import get_content_manager
-from app.core.platforms.manager import get_platform_manager
+from app.core.content.publisher import get_content_publisher
 from app.core.personas.context import persona_context
-from app.db.models.content import Content
+from app.core.platforms.monitor import poll_interactions
+from app.core.platforms.transport import aclose_transports
+
+
+def _publish(db: Session, content_ids: List[int]) -> Dict[str, Any]:
+    """
+    Publish content items and schedule delayed retries for failed posts.
+
+    Args:
+        db: The database session.
+        content_ids: IDs of the due content items.
+
+    Returns:
+        The publisher's report.
+    """
+    report = get_content_publisher(db).publish(content_ids)
+
+    # Retry as delayed tasks instead of blocking this worker
+    retries_by_delay: Dict[float, List[int]] = {}
+    for content_id, delay in report["retries"]:
+        retries_by_delay.setdefault(delay, []).append(content_id)
+    for delay, ids in retries_by_delay.items():
+        publish_content.apply_async(args=[ids], countdown=delay)
+
+    return report
 
 
 @app.task
@@ -28,102 +53,49 @@ def check_scheduled_content() -> Dict[str, Any]:
     """
     db = SessionLocal()
     try:
+        # Requeue items whose publishing run died before recording an outcome
+        released_count = get_content_publisher(db).release_stale_claims()
         scheduler = get_content_scheduler(db)
-        due_content = scheduler.get_due_content()
-
-        posted_count = 0
-        failed_count = 0
-
-        for content in due_content:
-            try:
-                # Set persona context
-                persona_context.set_persona(content.persona_id)
-
-                # Get the platform manager
-                platform_manager = get_platform_manager(db)
-
-                # Get platform connection for this persona and platform
-                connections = platform_manager.get_platform_connections(
-                    persona_id=content.persona_id,
-                    active_only=True
-                )
-
-                # Find the connection for this platform
-                platform_connection = next(
-                    (conn for conn in connections if conn.platform_name.lower() == content.platform.lower()),
-                    None
-                )
-
-                if not platform_connection:
-                    raise ValueError(f"No active connection found for platform {content.platform}")
-
-                # Post the content to the platform with retries
-                max_retries = 3
-                retry_count = 0
-                success = False
-                last_error = None
-
-                while retry_count < max_retries and not success:
-                    try:
-                        print(f"Attempting to post content {content.id} to {content.platform} (attempt {retry_count + 1}/{max_retries})")
-
-                        post_info = platform_manager.post_content(
-                            persona_id=content.persona_id,
-                            platform_name=content.platform,
-                            content=content.text,
-                            media_urls=content.media_urls or []
-                        )
-
-                        # Update the content with the post info
-                        content_manager = get_content_manager(db)
-                        content_manager.update_content(
-                            content.id,
-                            {
-                                "status": "posted",
-                                "posted_at": datetime.now(timezone.utc),
-                                "external_id": post_info.get("id", ""),
-                                "external_url": post_info.get("url", ""),
-                            },
-                        )
-
-                        print(f"Successfully posted content {content.id} to {content.platform}: {post_info}")
-                        posted_count += 1
-                        success = True
-                        break
-                    except Exception as e:
-                        last_error = e
-                        retry_count += 1
-                        print(f"Attempt {retry_count}/{max_retries} failed: {str(e)}")
-
-                        # Add a delay between retries
-                        import time
-                        time.sleep(2 * retry_count)  # Exponential backoff
-
-                if not success:
-                    # If all retries failed, update the content status to "failed"
-                    content_manager = get_content_manager(db)
-                    content_manager.update_content(
-                        content.id,
-                        {
-                            "status": "failed",
-                            "content_metadata": {
-                                **(content.content_metadata or {}),
-                                "error": str(last_error),
-                                "failed_at": datetime.now(timezone.utc).isoformat()
-                            }
-                        },
-                    )
-                    raise ValueError(f"Failed to post content after {max_retries} retries: {str(last_error)}")
-            except Exception as e:
-                # Log the error
-                print(f"Error posting content {content.id}: {str(e)}")
-                failed_count += 1
+        due_ids = [content.id for content in scheduler.get_due_content()]
+        report = _publish(db, due_ids)
 
         return {
             "task": "check_scheduled_content",
-            "due_content_count": len(due_content),
-            "posted_count": posted_count,
-            "failed_count": failed_count,
+            "due_content_count": len(due_ids),
+            "released_claim_count": released_count,
+            "posted_count": len(report["posted"]),
+            "failed_count": len(report["failed"]),
+            "retry_count": len(report["retries"]),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+    finally:
+        db.close()
+
+
+@app.task
+def publish_content(content_ids: List[int]) -> Dict[str, Any]:
+    """
+    Publish specific content items, e.g. a delayed retry of failed posts.
+
+    Items that are no longer scheduled (posted, cancelled or already claimed
+    by another run) are skipped.
+
+    Args:
+        content_ids: IDs of the content items to publish.
+
+    Returns:
+        A dictionary with the results of the operation.
+    """
+    db = SessionLocal()
+    try:
+        report = _publish(db, content_ids)
+
+        return {
+            "task": "publish_content",
+            "content_ids": content_ids,
+            "posted_count": len(report["posted"]),
+            "failed_count": len(report["failed"]),
+            "retry_count": len(report["retries"]),
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
     finally:
@@ -138,17 +110,24 @@ def monitor_interactions() -> Dict[str, Any]:
     Returns:
         A dictionary with the results of the operation.
     """
+    return asyncio.run(_monitor_interactions())
+
+
+async def _monitor_interactions() -> Dict[str, Any]:
+    """Poll all active platform connections concurrently."""
     db = SessionLocal()
     try:
-        # This would call the platform integration to check for new interactions
-        # For now, just return a placeholder
+        report = await poll_interactions(db)
         return {
             "task": "monitor_interactions",
-            "new_interactions_count": 0,
+            "new_interactions_count": report["total_new_interactions"],
+            "connections": report["connections"],
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
     finally:
         db.close()
+        # Async clients are bound to this task's event loop
+        await aclose_transports()
 
 
 @app.task
@@ -167,7 +167,7 @@ class ContentSuggestionRequest(BaseModel):
     """Schema for content suggestion request."""
 
     content: str = Field(..., description="The content to get suggestions for")
-    suggestion_type: str = Field(..., description="Type of suggestions to generate (improve, tone, hashtags, engagement)")
+    suggestion_type: str = Field(..., description="Type of suggestions to generate (improve, tone, hashtags, engagement, or all)")
     persona_id: Optional[int] = Field(None, description="ID of the persona to generate suggestions for")
     content_type: Optional[str] = Field(None, description="Type of content")
     platform: Optional[str] = Field(None, description="Platform the content is for")
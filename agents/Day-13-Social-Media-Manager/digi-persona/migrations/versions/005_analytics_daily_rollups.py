@@ -0,0 +1,55 @@
+"""Add daily analytics rollups
+
+Revision ID: 005_analytics_daily_rollups
+Revises: 38559f1f49c0
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_analytics_daily_rollups'
+down_revision = '38559f1f49c0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('analytics_daily_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('persona_id', sa.Integer(), nullable=False),
+        sa.Column('platform', sa.String(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('published_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'persona_id', 'platform', 'kind', 'type', name='uq_analytics_daily_rollups_key')
+    )
+    op.create_index(op.f('ix_analytics_daily_rollups_id'), 'analytics_daily_rollups', ['id'], unique=False)
+    op.create_index(op.f('ix_analytics_daily_rollups_day'), 'analytics_daily_rollups', ['day'], unique=False)
+    op.create_index(op.f('ix_analytics_daily_rollups_persona_id'), 'analytics_daily_rollups', ['persona_id'], unique=False)
+
+    # Backfill the rollups from existing content and interactions
+    op.execute("""
+        INSERT INTO analytics_daily_rollups (day, persona_id, platform, kind, type, count, published_count)
+        SELECT DATE(created_at), persona_id, platform, 'content', content_type, COUNT(*),
+               SUM(CASE WHEN status = 'published' THEN 1 ELSE 0 END)
+        FROM content
+        GROUP BY DATE(created_at), persona_id, platform, content_type
+    """)
+    op.execute("""
+        INSERT INTO analytics_daily_rollups (day, persona_id, platform, kind, type, count, published_count)
+        SELECT DATE(created_at), persona_id, platform, 'interaction', type, COUNT(*), 0
+        FROM interactions
+        GROUP BY DATE(created_at), persona_id, platform, type
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_analytics_daily_rollups_persona_id'), table_name='analytics_daily_rollups')
+    op.drop_index(op.f('ix_analytics_daily_rollups_day'), table_name='analytics_daily_rollups')
+    op.drop_index(op.f('ix_analytics_daily_rollups_id'), table_name='analytics_daily_rollups')
+    op.drop_table('analytics_daily_rollups')
@@ -0,0 +1,36 @@
+"""Add persona conversation memory
+
+Revision ID: 006_persona_conversations
+Revises: 005_analytics_daily_rollups
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_persona_conversations'
+down_revision = '005_analytics_daily_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('persona_conversations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('persona_id', sa.Integer(), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False, server_default=''),
+        sa.Column('messages', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['persona_id'], ['personas.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_persona_conversations_id'), 'persona_conversations', ['id'], unique=False)
+    op.create_index(op.f('ix_persona_conversations_persona_id'), 'persona_conversations', ['persona_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_persona_conversations_persona_id'), table_name='persona_conversations')
+    op.drop_index(op.f('ix_persona_conversations_id'), table_name='persona_conversations')
+    op.drop_table('persona_conversations')
@@ -0,0 +1,23 @@
+"""Add claim timestamp to content
+
+Revision ID: 007_content_claimed_at
+Revises: 006_persona_conversations
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_content_claimed_at'
+down_revision = '006_persona_conversations'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('content', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('content', 'claimed_at')
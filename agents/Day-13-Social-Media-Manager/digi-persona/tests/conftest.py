@@ -9,7 +9,8 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.core.config import settings
-from app.db.base import Base
+import app.db.base  # noqa: F401  (registers every model on Base)
+from app.db.base_class import Base
 from app.db.session import get_db
 from app.main import app
 
@@ -44,7 +45,13 @@ def db_session(test_engine, test_db):
     """Create a new database session for a test."""
     connection = test_engine.connect()
     transaction = connection.begin()
-    session = sessionmaker(autocommit=False, autoflush=False, bind=connection)()
+    # Commits inside a test only release a savepoint, so the outer rollback undoes them
+    session = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+    )()
     
     yield session
     
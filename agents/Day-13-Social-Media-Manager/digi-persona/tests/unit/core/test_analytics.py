@@ -0,0 +1,86 @@
+"""
+Tests for the analytics rollups and engine.
+"""
+from app.core.analytics.engine import AnalyticsEngine
+from app.core.analytics.rollups import rebuild_rollups
+from app.db.models.analytics import AnalyticsDailyRollup
+from app.db.models.content import Content
+from app.db.models.interaction import Interaction
+from app.db.models.persona import Persona
+
+
+def _rollups(db_session):
+    """Get the rollup rows as comparable tuples."""
+    return sorted(
+        (row.persona_id, row.platform, row.kind, row.type, row.count, row.published_count)
+        for row in db_session.query(AnalyticsDailyRollup).all()
+        if row.count or row.published_count
+    )
+
+
+def test_rollups_follow_content_changes(db_session):
+    """Inserts, status changes and deletes are reflected in the rollups."""
+    persona = Persona(name="Analytics Persona")
+    db_session.add(persona)
+    db_session.flush()
+
+    tweet = Content(persona_id=persona.id, content_type="tweet", text="Hello", platform="twitter", status="draft")
+    db_session.add(tweet)
+    db_session.add(Interaction(
+        persona_id=persona.id,
+        platform="twitter",
+        external_id="1",
+        type="mention",
+        content_text="Hi there",
+        author_data={"username": "someone"},
+    ))
+    db_session.flush()
+
+    assert _rollups(db_session) == [
+        (persona.id, "twitter", "content", "tweet", 1, 0),
+        (persona.id, "twitter", "interaction", "mention", 1, 0),
+    ]
+
+    tweet.status = "published"
+    db_session.flush()
+    assert (persona.id, "twitter", "content", "tweet", 1, 1) in _rollups(db_session)
+
+    db_session.delete(tweet)
+    db_session.flush()
+    assert _rollups(db_session) == [(persona.id, "twitter", "interaction", "mention", 1, 0)]
+
+    # A rebuild from the source tables gives the same result
+    rebuild_rollups(db_session)
+    assert _rollups(db_session) == [(persona.id, "twitter", "interaction", "mention", 1, 0)]
+
+
+def test_dashboard_from_rollups(db_session):
+    """The dashboard is shaped from the rollups in one pass."""
+    persona = Persona(name="Dashboard Persona")
+    db_session.add(persona)
+    db_session.flush()
+
+    db_session.add_all([
+        Content(persona_id=persona.id, content_type="tweet", text="One", platform="twitter", status="published"),
+        Content(persona_id=persona.id, content_type="post", text="Two", platform="linkedin", status="draft"),
+        Interaction(
+            persona_id=persona.id,
+            platform="twitter",
+            external_id="2",
+            type="reply",
+            content_text="Nice",
+            author_data={"username": "someone"},
+        ),
+    ])
+    db_session.flush()
+
+    dashboard = AnalyticsEngine(db_session).get_dashboard(persona_id=persona.id)
+
+    assert {item["name"]: item["value"] for item in dashboard["content_types"]} == {"tweet": 1, "post": 1}
+    assert dashboard["interaction_types"] == [{"name": "reply", "value": 1}]
+    assert dashboard["platforms"] == [
+        {"name": "twitter", "posts": 1, "engagement": 1, "followers": 0}
+    ]
+    assert dashboard["engagement"][0]["twitter"] == 1
+    persona_entry = next(p for p in dashboard["personas"] if p["id"] == persona.id)
+    assert persona_entry["posts"] == 1 and persona_entry["engagement"] == 1
@@ -0,0 +1,44 @@
+"""
+Tests for the persona conversation memory.
+"""
+from langchain_core.language_models.fake import FakeListLLM
+
+from app.core.agent.memory import PersonaConversationMemory
+from app.db.models.persona import Persona
+
+
+def _memory(db_session, persona_id, llm):
+    return PersonaConversationMemory(
+        persona_id=persona_id,
+        persona_name="Tester",
+        llm=llm,
+        max_token_limit=12,
+        session_factory=lambda: db_session,
+    )
+
+
+def test_window_is_bounded_and_persisted(db_session):
+    """Old turns are summarised and a new memory instance reloads the state."""
+    persona = Persona(name="Memory Persona")
+    db_session.add(persona)
+    db_session.flush()
+
+    llm = FakeListLLM(
+        responses=["The human said hello twice.", "The human said hello three times."],
+        custom_get_token_ids=lambda text: list(range(len(text.split()))),
+    )
+    memory = _memory(db_session, persona.id, llm)
+
+    for i in range(3):
+        memory.save_context({"input": f"hello number {i}"}, {"output": f"hi there friend {i}"})
+
+    assert memory.moving_summary_buffer
+    assert llm.get_num_tokens_from_messages(memory.chat_memory.messages) <= 12
+
+    reloaded = _memory(db_session, persona.id, llm)
+    history = reloaded.load_memory_variables({})["history"]
+    assert memory.moving_summary_buffer in history
+    assert "hi there friend 2" in history
+
+    reloaded.clear()
+    assert _memory(db_session, persona.id, llm).load_memory_variables({})["history"] == ""
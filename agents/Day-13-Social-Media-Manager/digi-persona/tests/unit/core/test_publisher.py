@@ -0,0 +1,151 @@
+"""
+Tests for the content publisher.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.content.publisher import ContentPublisher
+from app.core.platforms.pool import PlatformClientPool, PlatformRateLimiter
+from app.db.models.content import Content
+from app.db.models.persona import Persona
+from app.db.models.platform import PlatformConnection
+
+
+class FakeClient:
+    """Platform client that records logins and posts."""
+
+    logins = 0
+    fail_texts = set()
+
+    def authenticate(self, credentials):
+        FakeClient.logins += 1
+        return True
+
+    def post_content(self, content, media_urls=None, **kwargs):
+        if content in FakeClient.fail_texts:
+            raise RuntimeError("platform unavailable")
+        return {"id": f"ext-{content}", "url": f"https://example.com/{content}"}
+
+
+@pytest.fixture
+def publisher(db_session, monkeypatch):
+    """Create a publisher with its own pool and a fake platform client."""
+    FakeClient.logins = 0
+    FakeClient.fail_texts = set()
+    publisher = ContentPublisher(
+        db_session,
+        pool=PlatformClientPool(max_age=3600),
+        limiter=PlatformRateLimiter(min_intervals={}),
+        retry_base_delay=10,
+    )
+    monkeypatch.setattr(publisher.platform_manager, "get_client_class", lambda name: FakeClient)
+    return publisher
+
+
+def _schedule(db_session, persona_id, text, platform="twitter"):
+    content = Content(
+        persona_id=persona_id,
+        content_type="tweet",
+        text=text,
+        platform=platform,
+        status="scheduled",
+    )
+    content.scheduled_time = datetime.utcnow() - timedelta(minutes=1)
+    db_session.add(content)
+    db_session.flush()
+    return content
+
+
+def test_publish_groups_and_reuses_clients(db_session, publisher):
+    """Items for the same persona and platform share one authenticated client."""
+    persona = Persona(name="Publisher Persona")
+    db_session.add(persona)
+    db_session.flush()
+    db_session.add(PlatformConnection(
+        persona_id=persona.id,
+        platform_name="twitter",
+        platform_id="1",
+        username="publisher",
+        credentials={"token": "secret"},
+    ))
+    first = _schedule(db_session, persona.id, "first")
+    second = _schedule(db_session, persona.id, "second")
+    orphan = _schedule(db_session, persona.id, "orphan", platform="linkedin")
+
+    report = publisher.publish([first.id, second.id, orphan.id])
+
+    assert sorted(report["posted"]) == sorted([first.id, second.id])
+    assert report["failed"] == [orphan.id]
+    assert FakeClient.logins == 1
+    assert first.status == "posted" and first.external_id == "ext-first"
+    assert orphan.status == "failed"
+
+    # Posted items are no longer claimable
+    assert publisher.publish([first.id]) == {"posted": [], "failed": [], "retries": []}
+
+
+def test_failed_posts_are_rescheduled(db_session, publisher):
+    """A failed post is rescheduled with backoff instead of retried in place."""
+    persona = Persona(name="Retry Persona")
+    db_session.add(persona)
+    db_session.flush()
+    db_session.add(PlatformConnection(
+        persona_id=persona.id,
+        platform_name="twitter",
+        platform_id="2",
+        username="retry",
+        credentials={"token": "secret"},
+    ))
+    content = _schedule(db_session, persona.id, "flaky")
+    FakeClient.fail_texts = {"flaky"}
+
+    report = publisher.publish([content.id])
+
+    assert report["retries"] == [(content.id, 10)]
+    assert content.status == "scheduled"
+    assert content.content_metadata["publish_attempts"] == 1
+
+
+def test_failed_recording_releases_claims(db_session, publisher, monkeypatch):
+    """If the outcomes cannot be recorded, posted items stay posted and the rest are requeued."""
+    persona = Persona(name="Release Persona")
+    db_session.add(persona)
+    db_session.flush()
+    db_session.add(PlatformConnection(
+        persona_id=persona.id,
+        platform_name="twitter",
+        platform_id="3",
+        username="release",
+        credentials={"token": "secret"},
+    ))
+    sent = _schedule(db_session, persona.id, "sent")
+    unsent = _schedule(db_session, persona.id, "unsent")
+    FakeClient.fail_texts = {"unsent"}
+
+    def broken_record(contents, outcomes):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(publisher, "_record", broken_record)
+    with pytest.raises(RuntimeError):
+        publisher.publish([sent.id, unsent.id])
+
+    assert sent.status == "posted" and sent.external_id == "ext-sent"
+    assert unsent.status == "scheduled" and unsent.claimed_at is None
+
+
+def test_stale_claims_are_released(db_session, publisher):
+    """Items left in "publishing" past the claim timeout are scheduled again."""
+    persona = Persona(name="Stale Persona")
+    db_session.add(persona)
+    db_session.flush()
+    stale = _schedule(db_session, persona.id, "stale")
+    fresh = _schedule(db_session, persona.id, "fresh")
+    stale.status = fresh.status = "publishing"
+    stale.claimed_at = datetime.utcnow() - timedelta(seconds=publisher.claim_timeout + 60)
+    fresh.claimed_at = datetime.utcnow()
+    db_session.commit()
+
+    assert publisher.release_stale_claims() == 1
+    assert stale.status == "scheduled" and stale.claimed_at is None
+    assert fresh.status == "publishing"
@@ -0,0 +1,57 @@
+"""
+Tests for the content suggestion service.
+"""
+import asyncio
+import json
+
+from app.core.ai.suggestions import SUGGESTION_CATEGORIES, SuggestionService
+
+
+class FakeOpenAIClient:
+    """Async OpenAI client stand-in that records prompts."""
+
+    def __init__(self, fail=False):
+        self.prompts = []
+        self.fail = fail
+
+    async def agenerate_text(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("openai unavailable")
+        return json.dumps([{"text": f'"Suggestion {i}"', "description": "Why"} for i in range(3)])
+
+
+def test_all_categories_are_generated_once_and_cached():
+    """All categories run concurrently and repeated requests hit the cache."""
+    client = FakeOpenAIClient()
+    service = SuggestionService(openai_client=client)
+
+    async def run():
+        first = await service.generate_all("Hello world", platform="twitter")
+        again = await service.generate("tone", "  Hello world  ", platform="twitter")
+        return first, again
+
+    first, again = asyncio.run(run())
+
+    assert len(client.prompts) == len(SUGGESTION_CATEGORIES)
+    assert [s.type for s in first] == [c for c in SUGGESTION_CATEGORIES for _ in range(3)]
+    assert first[0].text == "Suggestion 0"
+    assert [s.id for s in again] == [s.id for s in first if s.type == "tone"]
+
+
+def test_concurrent_requests_share_generation_and_failures_are_not_cached():
+    """Identical concurrent requests share one call; fallbacks are not cached."""
+    client = FakeOpenAIClient(fail=True)
+    service = SuggestionService(openai_client=client)
+
+    async def run():
+        return await asyncio.gather(*[service.generate("improve", "Draft") for _ in range(3)])
+
+    results = asyncio.run(run())
+    assert len(client.prompts) == 1
+    assert all(len(result) == 3 for result in results)
+
+    client.fail = False
+    asyncio.run(service.generate("improve", "Draft"))
+    assert len(client.prompts) == 2
@@ -0,0 +1,102 @@
+"""
+Tests for the shared platform transport.
+"""
+import asyncio
+import time
+
+import httpx
+
+from app.core.platforms.transport import PlatformTransport, RateLimitState
+
+
+def test_rate_limit_headers_are_tracked():
+    """Both Twitter and Bluesky header families update the window."""
+    state = RateLimitState()
+    reset = time.time() + 30
+    state.update({"ratelimit-limit": "3000", "ratelimit-remaining": "0", "ratelimit-reset": str(reset)})
+
+    assert state.limit == 3000
+    assert 29 < state.wait_time() <= 30
+
+    state.update({"x-rate-limit-remaining": "5"})
+    assert state.wait_time() == 0
+
+
+def test_retryable_statuses_are_retried():
+    """Server errors are retried on the shared client; client errors are returned."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path == "/flaky" and len(calls) < 3:
+            return httpx.Response(503)
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"ok": True}, headers={"x-rate-limit-remaining": "10"})
+
+    transport = PlatformTransport("test", http2=False, max_retries=3, backoff_base=0)
+    transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    response = transport.get("https://example.com/flaky", bucket="account")
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert transport.rate_limit("account").remaining == 10
+
+    assert transport.get("https://example.com/missing").status_code == 404
+    assert len(calls) == 4
+
+
+def test_async_requests_share_one_client_per_loop():
+    """Async requests reuse one client on the running event loop."""
+    def handler(request):
+        return httpx.Response(200, json={"path": request.url.path})
+
+    transport = PlatformTransport("test", http2=False, backoff_base=0)
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        transport._async_clients[asyncio.get_running_loop()] = client
+        responses = await asyncio.gather(*[transport.aget(f"https://example.com/{i}") for i in range(5)])
+        assert transport.async_client is client
+        await transport.aclose()
+        return [response.json()["path"] for response in responses]
+
+    assert asyncio.run(run()) == [f"/{i}" for i in range(5)]
+
+
+def test_posts_are_not_retried_after_they_may_have_been_processed():
+    """A POST is only retried when the server cannot have acted on it."""
+    calls = []
+    failures = {
+        "/timeout": lambda request: httpx.ReadTimeout("timed out", request=request),
+        "/refused": lambda request: httpx.ConnectError("refused", request=request),
+    }
+
+    def handler(request):
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            failure = failures.get(request.url.path)
+            if failure:
+                raise failure(request)
+            return httpx.Response(503 if request.url.path == "/error" else 429)
+        return httpx.Response(200)
+
+    transport = PlatformTransport("test", http2=False, max_retries=3, backoff_base=0)
+    transport._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    def attempts(path, **kwargs):
+        calls.clear()
+        try:
+            transport.post(f"https://example.com{path}", **kwargs)
+        except httpx.TransportError:
+            pass
+        return len(calls)
+
+    assert attempts("/timeout") == 1
+    assert attempts("/error") == 1
+    assert attempts("/refused") == 2
+    assert attempts("/limited") == 2
+
+    # Idempotent requests are retried after any transient failure
+    assert attempts("/timeout", idempotent=True) == 2
+    assert attempts("/error", idempotent=True) == 2
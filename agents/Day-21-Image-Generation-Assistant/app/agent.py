@@ -1,5 +1,7 @@
 """Image Generation Assistant Agent using Pydantic AI."""
 
+import asyncio
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Union, Dict, Any
@@ -16,7 +18,7 @@ from models import (
 )
 from services import (
     UnifiedImageGenerationService, PromptEnhancementService,
-    ImageStorageService, ImageProcessingService
+    ImageStorageService, ImageProcessingService, ProgressCallback, get_storage_service
 )
 
 
@@ -127,6 +129,11 @@ Always respond with structured data that includes your response message and any
 @image_assistant.tool
 async def generate_image(ctx: RunContext[ImageAssistantDeps], request: GenerateImageRequest) -> AgentResponse:
     """Generate images based on user specifications."""
+    return await _generate_images(ctx.deps, request)
+
+
+async def _generate_images(deps: ImageAssistantDeps, request: GenerateImageRequest) -> AgentResponse:
+    """Enhance the prompt if requested, generate the images and save them locally."""
     try:
         # Parse and validate parameters
         params = _parse_generation_params(request)
@@ -143,12 +150,12 @@ async def generate_image(ctx: RunContext[ImageAssistantDeps], request: GenerateI
                 enhance_creativity=True,
                 target_provider=target_provider
             )
-            enhancement_result = await ctx.deps.enhancement_service.enhance_prompt(enhancement_request)
+            enhancement_result = await deps.enhancement_service.enhance_prompt(enhancement_request)
             enhanced_prompt = enhancement_result.enhanced_prompt
             params.prompt = enhanced_prompt
         
         # Generate images using unified service
-        generation_result = await ctx.deps.generation_service.generate_images(params)
+        generation_result = await deps.generation_service.generate_images(params)
         
         if not generation_result.success:
             return AgentResponse(
@@ -163,7 +170,7 @@ async def generate_image(ctx: RunContext[ImageAssistantDeps], request: GenerateI
             )
         
         # Save images locally
-        saved_result = await ctx.deps.storage_service.save_images(generation_result)
+        saved_result = await deps.storage_service.save_images(generation_result)
         
         # Prepare response
         image_paths = [img.local_path for img in saved_result.images if img.local_path]
@@ -186,7 +193,8 @@ async def generate_image(ctx: RunContext[ImageAssistantDeps], request: GenerateI
             "parameters": params.dict(),
             "generation_time": saved_result.generation_time_seconds,
             "provider": provider_name,
-            "model": params.model.value
+            "model": params.model.value,
+            "thumbnails": [str(img.thumbnail_path) for img in saved_result.images if img.thumbnail_path]
         }
         
         # Add Fal.ai specific data
@@ -555,45 +563,117 @@ def _parse_generation_params(request: GenerateImageRequest) -> ImageGenerationPa
 
 
 # Helper functions for agent interaction
-async def run_image_assistant(user_input: str) -> AgentResponse:
-    """Run the image assistant with user input."""
-    # Initialize services
-    deps = ImageAssistantDeps(
+def create_deps() -> ImageAssistantDeps:
+    """Create the services used by the assistant; the storage service (and its history index) is shared."""
+    return ImageAssistantDeps(
         generation_service=UnifiedImageGenerationService(),
         enhancement_service=PromptEnhancementService(),
-        storage_service=ImageStorageService(),
+        storage_service=get_storage_service(),
         processing_service=ImageProcessingService()
     )
+
+
+async def run_image_assistant(user_input: str) -> AgentResponse:
+    """Run the image assistant with user input."""
+    started = time.perf_counter()
+    deps = create_deps()
     
     try:
         # Run the agent
         result = await image_assistant.run(user_input, deps=deps)
-        return result.output
+        response = result.output
     except Exception as e:
-        return AgentResponse(
+        response = AgentResponse(
             success=False,
             message=f"Assistant error: {str(e)}",
             suggestions=["Try rephrasing your request", "Check your input format"]
         )
+    response.latency_seconds = time.perf_counter() - started
+    return response
 
 
 def run_image_assistant_sync(user_input: str) -> AgentResponse:
     """Run the image assistant synchronously."""
-    # Initialize services
-    deps = ImageAssistantDeps(
-        generation_service=UnifiedImageGenerationService(),
-        enhancement_service=PromptEnhancementService(),
-        storage_service=ImageStorageService(),
-        processing_service=ImageProcessingService()
-    )
+    started = time.perf_counter()
+    deps = create_deps()
     
     try:
         # Run the agent synchronously
         result = image_assistant.run_sync(user_input, deps=deps)
-        return result.output
+        response = result.output
     except Exception as e:
-        return AgentResponse(
+        response = AgentResponse(
             success=False,
             message=f"Assistant error: {str(e)}",
             suggestions=["Try rephrasing your request", "Check your input format"]
-        ) 
\ No newline at end of file
+        )
+    response.latency_seconds = time.perf_counter() - started
+    return response
+
+
+async def generate_images_direct(request: GenerateImageRequest) -> AgentResponse:
+    """Generate images from structured parameters without asking the LLM to parse them.
+    
+    Used by forms that already know every parameter; free-text requests go through
+    run_image_assistant.
+    """
+    started = time.perf_counter()
+    response = await _generate_images(create_deps(), request)
+    response.latency_seconds = time.perf_counter() - started
+    return response
+
+
+def generate_images_direct_sync(request: GenerateImageRequest) -> AgentResponse:
+    """Generate images from structured parameters synchronously."""
+    return asyncio.run(generate_images_direct(request))
+
+
+async def upscale_images_direct(requests: List[UpscaleImageRequest],
+                                progress: Optional[ProgressCallback] = None) -> AgentResponse:
+    """Upscale several images in one batch, reporting progress as each one finishes."""
+    started = time.perf_counter()
+    missing = [request.image_path for request in requests if not Path(request.image_path).exists()]
+    if missing:
+        response = AgentResponse(
+            success=False,
+            message=f"Image not found at path: {', '.join(missing)}",
+            suggestions=["Check the file path", "Use view_history to find correct paths"]
+        )
+    else:
+        upscale_requests = [
+            ImageUpscaleRequest(
+                image_path=Path(request.image_path),
+                scale_factor=request.scale_factor,
+                enhance_quality=request.enhance_quality
+            )
+            for request in requests
+        ]
+        try:
+            upscaled_paths = await create_deps().processing_service.upscale_images(upscale_requests, progress)
+            response = AgentResponse(
+                success=True,
+                message=f"Successfully upscaled {len(upscaled_paths)} image(s)",
+                data={
+                    "original_paths": [request.image_path for request in requests],
+                    "upscaled_paths": [str(path) for path in upscaled_paths]
+                },
+                images=upscaled_paths,
+                suggestions=[
+                    "Compare with the original images",
+                    "Create variations of the upscaled images"
+                ]
+            )
+        except Exception as e:
+            response = AgentResponse(
+                success=False,
+                message=f"Failed to upscale images: {str(e)}",
+                suggestions=["Check if the image files are valid", "Try a lower scale factor"]
+            )
+    response.latency_seconds = time.perf_counter() - started
+    return response
+
+
+def upscale_images_direct_sync(requests: List[UpscaleImageRequest],
+                               progress: Optional[ProgressCallback] = None) -> AgentResponse:
+    """Upscale several images in one batch synchronously."""
+    return asyncio.run(upscale_images_direct(requests, progress))
@@ -9,11 +9,14 @@ import typer
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
 from rich.markdown import Markdown
 from rich.prompt import Prompt, Confirm
 
-from agent import run_image_assistant_sync, run_image_assistant
+from agent import (
+    run_image_assistant_sync, run_image_assistant, generate_images_direct_sync, upscale_images_direct_sync,
+    GenerateImageRequest, UpscaleImageRequest
+)
 from models import AgentResponse
 
 app = typer.Typer(
@@ -48,34 +51,23 @@ def generate_image(
         
         task = progress.add_task("Generating image...", total=None)
         
-        # Build the request
-        request_parts = [f'Generate an image with prompt: "{prompt}"']
-        
-        if style:
-            request_parts.append(f"style: {style}")
-        if size:
-            request_parts.append(f"size: {size}")
-        if quality:
-            request_parts.append(f"quality: {quality}")
-        if model:
-            request_parts.append(f"model: {model}")
-        if num_images > 1:
-            request_parts.append(f"number of images: {num_images}")
-        if negative_prompt:
-            request_parts.append(f"avoid: {negative_prompt}")
-        if seed is not None:
-            request_parts.append(f"seed: {seed}")
-        if guidance_scale is not None:
-            request_parts.append(f"guidance scale: {guidance_scale}")
-        if inference_steps is not None:
-            request_parts.append(f"inference steps: {inference_steps}")
-        if no_enhance:
-            request_parts.append("do not enhance the prompt")
-        
-        user_input = ", ".join(request_parts)
+        # Options are already structured, so skip the LLM round trip that would parse them
+        request = GenerateImageRequest(
+            prompt=prompt,
+            style=style,
+            size=size,
+            quality=quality,
+            model=model,
+            num_images=num_images,
+            enhance_prompt=not no_enhance,
+            negative_prompt=negative_prompt,
+            seed=seed,
+            guidance_scale=guidance_scale,
+            num_inference_steps=inference_steps
+        )
         
         try:
-            response = run_image_assistant_sync(user_input)
+            response = generate_images_direct_sync(request)
             progress.stop()
             _display_response(response)
             
@@ -137,18 +129,30 @@ def view_history(
 
 @app.command("upscale")
 def upscale_image(
-    image_path: str = typer.Argument(..., help="Path to the image to upscale"),
+    image_paths: List[str] = typer.Argument(..., help="Paths to the images to upscale"),
     scale: int = typer.Option(2, "--scale", "-s", help="Scale factor (2, 3, or 4)"),
     enhance: bool = typer.Option(True, "--enhance/--no-enhance", help="Apply quality enhancement"),
 ):
-    """Upscale an existing image."""
+    """Upscale one or more existing images."""
     
-    user_input = f"Upscale image at {image_path} by {scale}x"
-    if not enhance:
-        user_input += " without quality enhancement"
+    requests = [
+        UpscaleImageRequest(image_path=image_path, scale_factor=scale, enhance_quality=enhance)
+        for image_path in image_paths
+    ]
     
-    with console.status(f"Upscaling image by {scale}x..."):
-        response = run_image_assistant_sync(user_input)
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task(f"Upscaling by {scale}x...", total=len(requests))
+        
+        def on_progress(completed: int, total: int, output_path: Path):
+            progress.update(task, completed=completed, description=f"Upscaled {output_path.name}")
+        
+        response = upscale_images_direct_sync(requests, on_progress)
     
     _display_response(response)
 
@@ -424,6 +428,9 @@ def _display_response(response: AgentResponse):
                     else:
                         console.print(f"  {key}: {value}")
         
+        if response.latency_seconds is not None:
+            console.print(f"\n[dim]End-to-end: {response.latency_seconds:.2f}s[/dim]")
+        
         # Show suggestions
         if response.suggestions:
             console.print(f"\n[bold yellow]Suggestions:[/bold yellow]")
@@ -23,7 +23,11 @@ class ImageGenerationConfig:
 class StorageConfig:
     """Configuration for image storage."""
     images_dir: Path = Path("generated_images")
+    thumbnails_dir: Path = Path("generated_images") / "thumbnails"
+    thumbnail_max_size: int = 512
+    download_concurrency: int = 4
     metadata_dir: Path = Path("metadata")
+    history_db_path: Path = Path("metadata") / "history.db"
     max_storage_mb: int = 1000
     cleanup_after_days: int = 30
 
@@ -50,6 +54,15 @@ class FalConfig:
     max_queue_wait_time: int = 300  # 5 minutes
     enable_streaming: bool = True
 
+@dataclass
+class ProcessingConfig:
+    """Configuration for local image processing (upscaling, variations)."""
+    max_workers: int = 2
+    max_queued_jobs: int = 8
+    queue_timeout: int = 120  # seconds to wait for a free slot
+    tile_size: int = 512  # each strip covers about tile_size * tile_size source pixels
+    tile_threshold_pixels: int = 2048 * 2048  # outputs larger than this are upscaled strip by strip
+
 @dataclass
 class AppConfig:
     """Main application configuration."""
@@ -58,11 +71,13 @@ class AppConfig:
     llm: LLMConfig
     api: APIConfig
     fal: FalConfig
+    processing: ProcessingConfig
     
     def __post_init__(self):
         """Initialize directories and validate configuration."""
         # Create directories if they don't exist
         self.storage.images_dir.mkdir(exist_ok=True)
+        self.storage.thumbnails_dir.mkdir(parents=True, exist_ok=True)
         self.storage.metadata_dir.mkdir(exist_ok=True)
         
         # Set API keys from environment
@@ -84,7 +99,8 @@ def get_config() -> AppConfig:
         storage=StorageConfig(),
         llm=LLMConfig(),
         api=APIConfig(),
-        fal=FalConfig()
+        fal=FalConfig(),
+        processing=ProcessingConfig()
     )
 
 # Supported image generation models (expanded with Fal.ai models)
@@ -8,7 +8,10 @@ from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any
 import os
 
-from agent import run_image_assistant_sync, run_image_assistant
+from agent import (
+    run_image_assistant, generate_images_direct_sync, upscale_images_direct_sync,
+    GenerateImageRequest, UpscaleImageRequest
+)
 from models import AgentResponse
 from config import SUPPORTED_MODELS, STYLE_KEYWORDS
 
@@ -107,49 +110,47 @@ def generate_image(
     if not model:
         return [], "❌ Please select a model", ""
     
-    # Build request string
-    request_parts = [f'Generate an image with prompt: "{prompt}"']
-    
-    if model:
-        request_parts.append(f"model: {model}")
-    if style and style != "auto":
-        request_parts.append(f"style: {style}")
-    if size:
-        request_parts.append(f"size: {size}")
-    if quality != "standard":
-        request_parts.append(f"quality: {quality}")
-    if num_images > 1:
-        request_parts.append(f"number of images: {num_images}")
-    if negative_prompt and negative_prompt.strip():
-        request_parts.append(f"avoid: {negative_prompt}")
-    if seed is not None:
-        request_parts.append(f"seed: {seed}")
-    if guidance_scale is not None:
-        request_parts.append(f"guidance scale: {guidance_scale}")
-    if inference_steps is not None:
-        request_parts.append(f"inference steps: {inference_steps}")
-    if not enhance_prompt:
-        request_parts.append("do not enhance the prompt")
-    
-    user_input = ", ".join(request_parts)
-    
     try:
+        # The form already holds structured values, so skip the LLM round trip that would parse them
+        config = SUPPORTED_MODELS.get(model, {})
+        is_fal = config.get("provider") == "fal"
+        request = GenerateImageRequest(
+            prompt=prompt,
+            model=model,
+            style=style if style and style != "auto" else None,
+            size=size or None,
+            quality=quality,
+            num_images=int(num_images),
+            enhance_prompt=enhance_prompt,
+            negative_prompt=negative_prompt.strip() if config.get("supports_negative_prompt") and negative_prompt and negative_prompt.strip() else None,
+            # Advanced parameters are hidden (but still set) for OpenAI models
+            seed=int(seed) if is_fal and seed is not None else None,
+            guidance_scale=guidance_scale if is_fal else None,
+            num_inference_steps=int(inference_steps) if is_fal and inference_steps is not None else None
+        )
+    
         progress(0.1, desc="Initializing...")
         
         # Run the generation
-        progress(0.3, desc="Processing request...")
-        response = run_image_assistant_sync(user_input)
+        progress(0.3, desc="Generating...")
+        response = generate_images_direct_sync(request)
         
         progress(0.8, desc="Finalizing...")
         
         if response.success:
             image_paths = response.images if response.images else []
             
-            # Convert paths to strings for Gradio
-            image_paths_str = [str(path) for path in image_paths]
+            # Show the small WebP previews in the gallery when every image has one
+            thumbnails = (response.data or {}).get("thumbnails") or []
+            if len(thumbnails) == len(image_paths):
+                gallery_items = [(thumb, Path(path).name) for thumb, path in zip(thumbnails, image_paths)]
+            else:
+                gallery_items = [str(path) for path in image_paths]
             
             # Build success message
             message = f"✅ {response.message}"
+            if response.latency_seconds is not None:
+                message += f"\n\n⏱️ {response.latency_seconds:.2f}s end-to-end"
             
             # Build details
             details = ""
@@ -172,10 +173,17 @@ def generate_image(
                 for suggestion in response.suggestions:
                     details += f"• {suggestion}\n"
             
+            if image_paths:
+                details += "\n**Full-size images:**\n"
+                for path in image_paths:
+                    details += f"• {path}\n"
+            
             progress(1.0, desc="Complete!")
-            return image_paths_str, message, details
+            return gallery_items, message, details
         else:
             error_msg = f"❌ {response.message}"
+            if response.latency_seconds is not None:
+                error_msg += f" (after {response.latency_seconds:.2f}s)"
             if response.suggestions:
                 error_msg += "\n\n**Suggestions:**\n"
                 for suggestion in response.suggestions:
@@ -199,19 +207,10 @@ def enhance_prompt_func(
     try:
         # Import required modules
         import asyncio
-        from agent import enhance_prompt, ImageAssistantDeps, EnhancePromptRequest
-        from services import (
-            UnifiedImageGenerationService, PromptEnhancementService,
-            ImageStorageService, ImageProcessingService
-        )
+        from agent import enhance_prompt, create_deps, EnhancePromptRequest
         
-        # Create dependencies
-        deps = ImageAssistantDeps(
-            generation_service=UnifiedImageGenerationService(),
-            enhancement_service=PromptEnhancementService(),
-            storage_service=ImageStorageService(),
-            processing_service=ImageProcessingService()
-        )
+        # Create dependencies (the storage service is shared, not reloaded per click)
+        deps = create_deps()
         
         # Create structured request
         enhance_request = EnhancePromptRequest(
@@ -256,19 +255,10 @@ def view_history_func(
     try:
         # Import required modules
         import asyncio
-        from agent import view_history, ImageAssistantDeps, ViewHistoryRequest
-        from services import (
-            UnifiedImageGenerationService, PromptEnhancementService,
-            ImageStorageService, ImageProcessingService
-        )
+        from agent import view_history, create_deps, ViewHistoryRequest
         
-        # Create dependencies
-        deps = ImageAssistantDeps(
-            generation_service=UnifiedImageGenerationService(),
-            enhancement_service=PromptEnhancementService(),
-            storage_service=ImageStorageService(),
-            processing_service=ImageProcessingService()
-        )
+        # Create dependencies (the storage service is shared, not reloaded per click)
+        deps = create_deps()
         
         # Create structured request
         history_request = ViewHistoryRequest(
@@ -321,6 +311,42 @@ def view_history_func(
     except Exception as e:
         return f"❌ Error: {str(e)}", ""
 
+def upscale_images_func(
+    files: Optional[List[Any]],
+    scale: str,
+    enhance_quality: bool,
+    progress=gr.Progress()
+) -> Tuple[List[str], str]:
+    """Upscale uploaded images as one batch."""
+    
+    if not files:
+        return [], "❌ Please upload at least one image"
+    
+    # Depending on the Gradio version, uploads are file paths or tempfile wrappers
+    image_paths = [getattr(f, "name", f) for f in files]
+    requests = [
+        UpscaleImageRequest(image_path=str(path), scale_factor=int(scale), enhance_quality=enhance_quality)
+        for path in image_paths
+    ]
+    
+    def on_progress(completed: int, total: int, output_path: Path):
+        progress(completed / total, desc=f"Upscaled {completed}/{total} images")
+    
+    try:
+        progress(0, desc=f"Upscaling {len(requests)} images...")
+        response = upscale_images_direct_sync(requests, on_progress)
+        
+        if not response.success:
+            return [], f"❌ {response.message}"
+        
+        message = f"✅ {response.message} by {scale}x"
+        if response.latency_seconds is not None:
+            message += f"\n\n⏱️ {response.latency_seconds:.2f}s end-to-end"
+        return [str(path) for path in response.images or []], message
+        
+    except Exception as e:
+        return [], f"❌ Error: {str(e)}"
+
 def get_setup_status():
     """Check if API keys are configured."""
     openai_key = os.getenv("OPENAI_API_KEY")
@@ -647,6 +673,45 @@ def create_ui():
                             visible=False
                         )
             
+            # Upscale Tab
+            with gr.Tab("🔍 Upscale"):
+                with gr.Row():
+                    with gr.Column():
+                        upscale_files = gr.File(
+                            label="Images to Upscale",
+                            file_count="multiple",
+                            file_types=["image"]
+                        )
+                        
+                        with gr.Row():
+                            upscale_scale_dropdown = gr.Dropdown(
+                                label="Scale Factor",
+                                choices=["2", "3", "4"],
+                                value="2"
+                            )
+                            upscale_enhance_checkbox = gr.Checkbox(
+                                label="Enhance Quality",
+                                value=True,
+                                info="Lanczos instead of bicubic resampling"
+                            )
+                        
+                        upscale_btn = gr.Button(
+                            "🔍 Upscale Images",
+                            variant="primary"
+                        )
+                    
+                    with gr.Column():
+                        upscale_output = gr.Gallery(
+                            label="Upscaled Images",
+                            columns=2,
+                            height="auto"
+                        )
+                        
+                        upscale_message = gr.Markdown(
+                            value="Upload images and click 'Upscale Images'",
+                            elem_classes=["generation-details"]
+                        )
+            
             # Help Tab
             with gr.Tab("❓ Help & Info"):
                 gr.Markdown("""
@@ -752,6 +817,12 @@ def create_ui():
             outputs=[prompt_input]
         )
         
+        upscale_btn.click(
+            fn=upscale_images_func,
+            inputs=[upscale_files, upscale_scale_dropdown, upscale_enhance_checkbox],
+            outputs=[upscale_output, upscale_message]
+        )
+        
         view_history_btn.click(
             fn=view_history_func,
             inputs=[history_limit_slider, history_search_input, history_provider_dropdown],
@@ -0,0 +1,258 @@
+"""SQLite index of generation history for the Image Generation Assistant."""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from models import ImageGenerationResult, ProviderType
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS generations (
+    id INTEGER PRIMARY KEY,
+    request_id TEXT UNIQUE NOT NULL,
+    timestamp TEXT NOT NULL,
+    provider TEXT,
+    model TEXT,
+    success INTEGER NOT NULL,
+    num_images INTEGER NOT NULL,
+    metadata_path TEXT,
+    result_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_generations_timestamp ON generations (timestamp);
+CREATE INDEX IF NOT EXISTS idx_generations_provider_timestamp ON generations (provider, timestamp);
+CREATE TABLE IF NOT EXISTS generation_files (
+    request_id TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_generation_files_request_id ON generation_files (request_id);
+CREATE INDEX IF NOT EXISTS idx_generation_files_path ON generation_files (path);
+CREATE TABLE IF NOT EXISTS image_files (
+    content_hash TEXT PRIMARY KEY,
+    path TEXT NOT NULL
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS generation_prompts USING fts5(
+    original_prompt, enhanced_prompt
+);
+"""
+
+
+def _timestamp(value: datetime) -> str:
+    """Fixed-width ISO timestamp, so string order matches time order."""
+    return value.isoformat(timespec="microseconds")
+
+
+def _result_json(result: ImageGenerationResult) -> str:
+    """Serialize a result the same way its metadata file is written."""
+    data = result.dict()
+    for image in data["images"]:
+        if image["local_path"]:
+            image["local_path"] = str(image["local_path"])
+    return json.dumps(data, default=str)
+
+
+def _load_result(result_json: str) -> ImageGenerationResult:
+    data = json.loads(result_json)
+    for image in data["images"]:
+        if image["local_path"]:
+            image["local_path"] = Path(image["local_path"])
+    return ImageGenerationResult(**data)
+
+
+def _file_paths(result: ImageGenerationResult) -> List[str]:
+    """Image and preview files a generation refers to."""
+    paths = []
+    for image in result.images:
+        paths.extend(str(path) for path in (image.local_path, image.thumbnail_path) if path)
+    return paths
+
+
+def _fts_query(search_term: str) -> str:
+    """Turn free text into an FTS5 query matching every word as a prefix."""
+    words = search_term.split()
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+
+
+class HistoryIndex:
+    """Generation history kept in SQLite, with full-text search on prompts.
+
+    Metadata JSON files stay the source of truth; the index is filled incrementally as
+    generations are saved, and `sync` picks up metadata files it has not seen yet.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+            self.fts_enabled = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: fall back to LIKE on the stored prompts
+            self.fts_enabled = False
+        self._conn.commit()
+
+    def sync(self, metadata_dir: Path) -> int:
+        """Index metadata files not yet in the index; returns how many were added."""
+        with self._lock:
+            known = {row[0] for row in self._conn.execute("SELECT request_id FROM generations")}
+
+        added = 0
+        for metadata_file in metadata_dir.glob("*.json"):
+            if metadata_file.stem in known:
+                continue
+            try:
+                result = ImageGenerationResult.load_metadata(metadata_file)
+            except Exception as e:
+                print(f"Failed to load metadata from {metadata_file}: {e}")
+                continue
+            self.add(result, metadata_file)
+            added += 1
+        return added
+
+    def add(self, result: ImageGenerationResult, metadata_path: Optional[Path] = None):
+        """Insert or replace one generation."""
+        with self._lock, self._conn:
+            # Upsert keeps the row's id, which is also the rowid of its prompts in the FTS table
+            self._conn.execute(
+                "INSERT INTO generations "
+                "(request_id, timestamp, provider, model, success, num_images, metadata_path, result_json) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (request_id) DO UPDATE SET timestamp = excluded.timestamp, "
+                "provider = excluded.provider, model = excluded.model, success = excluded.success, "
+                "num_images = excluded.num_images, metadata_path = excluded.metadata_path, "
+                "result_json = excluded.result_json",
+                (
+                    result.request_id,
+                    _timestamp(result.timestamp),
+                    result.provider.value if result.provider else None,
+                    result.parameters.model.value if result.parameters else None,
+                    int(result.success),
+                    len(result.images),
+                    str(metadata_path) if metadata_path else None,
+                    _result_json(result),
+                ),
+            )
+            # Files can be shared between generations when identical images are deduplicated
+            self._conn.execute("DELETE FROM generation_files WHERE request_id = ?", (result.request_id,))
+            self._conn.executemany(
+                "INSERT INTO generation_files (request_id, path) VALUES (?, ?)",
+                [(result.request_id, path) for path in _file_paths(result)],
+            )
+            if self.fts_enabled:
+                (generation_id,) = self._conn.execute(
+                    "SELECT id FROM generations WHERE request_id = ?", (result.request_id,)
+                ).fetchone()
+                self._conn.execute("DELETE FROM generation_prompts WHERE rowid = ?", (generation_id,))
+                self._conn.execute(
+                    "INSERT INTO generation_prompts (rowid, original_prompt, enhanced_prompt) VALUES (?, ?, ?)",
+                    (generation_id, result.original_prompt, result.enhanced_prompt or ""),
+                )
+
+    def _query(self, sql: str, params: Tuple) -> List[ImageGenerationResult]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_load_result(row[0]) for row in rows]
+
+    def recent(self, limit: int = 20, provider: Optional[ProviderType] = None) -> List[ImageGenerationResult]:
+        """Most recent generations first, optionally for one provider."""
+        if provider:
+            return self._query(
+                "SELECT result_json FROM generations WHERE provider = ? ORDER BY timestamp DESC LIMIT ?",
+                (provider.value, limit),
+            )
+        return self._query("SELECT result_json FROM generations ORDER BY timestamp DESC LIMIT ?", (limit,))
+
+    def search(self, search_term: str, provider: Optional[ProviderType] = None,
+               limit: int = 100) -> List[ImageGenerationResult]:
+        """Generations whose original or enhanced prompt matches the search term, newest first."""
+        provider_filter = " AND g.provider = ?" if provider else ""
+        provider_params = (provider.value,) if provider else ()
+
+        if self.fts_enabled:
+            query = _fts_query(search_term)
+            if not query:
+                return []
+            return self._query(
+                "SELECT g.result_json FROM generation_prompts p JOIN generations g ON g.id = p.rowid "
+                f"WHERE generation_prompts MATCH ?{provider_filter} ORDER BY g.timestamp DESC LIMIT ?",
+                (query, *provider_params, limit),
+            )
+
+        pattern = f"%{search_term.lower()}%"
+        return self._query(
+            "SELECT g.result_json FROM generations g "
+            "WHERE (lower(json_extract(g.result_json, '$.original_prompt')) LIKE ? "
+            f"OR lower(json_extract(g.result_json, '$.enhanced_prompt')) LIKE ?){provider_filter} "
+            "ORDER BY g.timestamp DESC LIMIT ?",
+            (pattern, pattern, *provider_params, limit),
+        )
+
+    def older_than(self, cutoff: datetime) -> List[Tuple[Optional[str], ImageGenerationResult]]:
+        """(metadata path, result) for every generation older than the cutoff."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT metadata_path, result_json FROM generations WHERE timestamp < ?",
+                (_timestamp(cutoff),),
+            ).fetchall()
+        return [(metadata_path, _load_result(result_json)) for metadata_path, result_json in rows]
+
+    def delete(self, request_ids: List[str]):
+        """Remove generations from the index."""
+        if not request_ids:
+            return
+        params = [(request_id,) for request_id in request_ids]
+        with self._lock, self._conn:
+            if self.fts_enabled:
+                self._conn.executemany(
+                    "DELETE FROM generation_prompts WHERE rowid = (SELECT id FROM generations WHERE request_id = ?)",
+                    params,
+                )
+            self._conn.executemany("DELETE FROM generation_files WHERE request_id = ?", params)
+            self._conn.executemany("DELETE FROM generations WHERE request_id = ?", params)
+
+    def paths_in_use(self, paths: List[str]) -> Set[str]:
+        """The given file paths that some indexed generation still refers to."""
+        if not paths:
+            return set()
+        with self._lock:
+            return {
+                row[0] for row in self._conn.execute(
+                    f"SELECT DISTINCT path FROM generation_files WHERE path IN ({', '.join('?' * len(paths))})",
+                    paths,
+                )
+            }
+
+    def path_for_hash(self, content_hash: str) -> Optional[Path]:
+        """Path of an already saved image with this content hash, if it still exists."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path FROM image_files WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+        if row and Path(row[0]).exists():
+            return Path(row[0])
+        return None
+
+    def add_file(self, content_hash: str, path: Path):
+        """Record where an image with this content hash is stored."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO image_files (content_hash, path) VALUES (?, ?)",
+                (content_hash, str(path)),
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Number of generations and images in the index."""
+        with self._lock:
+            generations, images = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(num_images), 0) FROM generations"
+            ).fetchone()
+        return {"total_generations": generations, "total_images": images}
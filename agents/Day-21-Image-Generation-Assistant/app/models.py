@@ -163,6 +163,7 @@ class GeneratedImage(BaseModel):
     """Represents a generated image."""
     url: Optional[HttpUrl] = Field(None, description="URL of the generated image")
     local_path: Optional[Path] = Field(None, description="Local file path of the saved image")
+    thumbnail_path: Optional[Path] = Field(None, description="Local file path of the small WebP preview")
     revised_prompt: Optional[str] = Field(None, description="The revised prompt used by the model")
     seed: Optional[int] = Field(None, description="Seed used for generation (if available)")
     
@@ -294,6 +295,7 @@ class AgentResponse(BaseModel):
     data: Optional[Dict[str, Any]] = Field(None, description="Additional response data")
     suggestions: Optional[List[str]] = Field(None, description="Suggested next actions")
     images: Optional[List[Path]] = Field(None, description="Paths to generated or processed images")
+    latency_seconds: Optional[float] = Field(None, description="End-to-end time taken to produce this response")
     
     class Config:
         arbitrary_types_allowed = True 
\ No newline at end of file
@@ -5,10 +5,15 @@ import hashlib
 import time
 import uuid
 import os
+import struct
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import json
+import zlib
 
 import httpx
 from PIL import Image
@@ -20,10 +25,11 @@ except ImportError:
     fal_client = None
 
 from config import get_config, STYLE_KEYWORDS
+from history_index import HistoryIndex
 from models import (
     ImageGenerationParams, ImageGenerationResult, GeneratedImage,
     PromptEnhancementRequest, PromptEnhancementResult,
-    ImageHistory, ImageUpscaleRequest, ImageVariationRequest,
+    ImageUpscaleRequest, ImageVariationRequest,
     ProviderType, FalQueueStatus
 )
 
@@ -472,41 +478,70 @@ class PromptEnhancementService:
         return suggestions if suggestions else None
 
 
+# Bytes read per chunk when streaming an image download to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Blocking file I/O runs here instead of on the event loop
+_io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="image-io")
+# Thumbnails are CPU-bound, so they are made in worker processes (started on first use)
+_preview_executor: Optional[ProcessPoolExecutor] = None
+
+
+async def _run_io(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_io_executor, func, *args)
+
+
+def _get_preview_executor() -> ProcessPoolExecutor:
+    global _preview_executor
+    if _preview_executor is None:
+        _preview_executor = ProcessPoolExecutor(max_workers=2)
+    return _preview_executor
+
+
+def _make_thumbnail(image_path: str, thumbnail_path: str, max_size: int):
+    """Write a WebP preview no larger than max_size on either side (runs in a worker process)."""
+    with Image.open(image_path) as image:
+        image.thumbnail((max_size, max_size))
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        partial_path = thumbnail_path + ".part"
+        image.save(partial_path, "WEBP", quality=80, method=4)
+    os.replace(partial_path, thumbnail_path)
+
+
 class ImageStorageService:
     """Service for managing image storage and metadata."""
     
-    def __init__(self):
+    def __init__(self, history: Optional[HistoryIndex] = None):
         self.config = get_config()
-        self.history = ImageHistory()
-        self._load_history()
+        if history is None:
+            history = HistoryIndex(self.config.storage.history_db_path)
+            # Only metadata files written outside this service need parsing
+            history.sync(self.config.storage.metadata_dir)
+        self.history = history
+        # One download client per event loop (Gradio and the CLI each run their own loops)
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
     
     async def save_images(self, result: ImageGenerationResult) -> ImageGenerationResult:
-        """Download and save generated images locally."""
+        """Download and save generated images locally, with a small WebP preview for each."""
         try:
-            async with httpx.AsyncClient() as client:
-                for i, image in enumerate(result.images):
-                    if image.url:
-                        # Download image
-                        response = await client.get(str(image.url))
-                        response.raise_for_status()
-                        
-                        # Generate filename
-                        filename = self._generate_filename(result, i)
-                        image_path = self.config.storage.images_dir / filename
-                        
-                        # Save image
-                        with open(image_path, 'wb') as f:
-                            f.write(response.content)
-                        
-                        # Update image with local path
-                        image.local_path = image_path
+            client = self._get_client()
+            semaphore = asyncio.Semaphore(self.config.storage.download_concurrency)
+            
+            async def save(index: int, image: GeneratedImage):
+                async with semaphore:
+                    image_path, content_hash = await self._download(client, str(image.url), self._generate_filename(result, index))
+                image.local_path = image_path
+                image.thumbnail_path = await self._create_thumbnail(image_path, content_hash)
+            
+            # Download all images of the generation at once
+            await asyncio.gather(*(save(i, image) for i, image in enumerate(result.images) if image.url))
             
             # Save metadata
-            result.save_metadata(self.config.storage.metadata_dir)
+            metadata_file = await _run_io(result.save_metadata, self.config.storage.metadata_dir)
             
             # Add to history
-            self.history.add_generation(result)
-            self._save_history()
+            self.history.add(result, metadata_file)
             
             return result
             
@@ -515,6 +550,66 @@ class ImageStorageService:
             result.error_message = f"Failed to save images: {str(e)}"
             return result
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the HTTP client shared by downloads on the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.config.api.request_timeout,
+                limits=httpx.Limits(max_connections=self.config.storage.download_concurrency * 2)
+            )
+            self._clients[loop] = client
+        return client
+    
+    async def _download(self, client: httpx.AsyncClient, url: str, filename: str) -> Tuple[Path, str]:
+        """Stream an image to disk; returns its path and content hash.
+        
+        An image whose content was saved before is not stored twice: the existing file is reused.
+        """
+        image_path = self.config.storage.images_dir / filename
+        partial_path = image_path.with_suffix(image_path.suffix + ".part")
+        digest = hashlib.sha256()
+        
+        file = await _run_io(open, partial_path, 'wb')
+        try:
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+                    await _run_io(file.write, chunk)
+        except BaseException:
+            await _run_io(file.close)
+            await _run_io(partial_path.unlink, True)
+            raise
+        await _run_io(file.close)
+        
+        content_hash = digest.hexdigest()
+        existing_path = self.history.path_for_hash(content_hash)
+        if existing_path:
+            await _run_io(partial_path.unlink)
+            return existing_path, content_hash
+        
+        await _run_io(partial_path.replace, image_path)
+        self.history.add_file(content_hash, image_path)
+        return image_path, content_hash
+    
+    async def _create_thumbnail(self, image_path: Path, content_hash: str) -> Optional[Path]:
+        """Create the WebP preview in the worker pool; a failure only means there is no preview."""
+        thumbnail_path = self.config.storage.thumbnails_dir / f"{content_hash[:16]}.webp"
+        if thumbnail_path.exists():
+            return thumbnail_path
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                _get_preview_executor(), _make_thumbnail,
+                str(image_path), str(thumbnail_path), self.config.storage.thumbnail_max_size
+            )
+            return thumbnail_path
+        except Exception as e:
+            print(f"Failed to create thumbnail for {image_path}: {e}")
+            return None
+    
     def _generate_filename(self, result: ImageGenerationResult, image_index: int) -> str:
         """Generate a unique filename for an image."""
         # Create hash of prompt for uniqueness
@@ -525,101 +620,206 @@ class ImageStorageService:
     
     def get_history(self, limit: int = 20, provider: Optional[ProviderType] = None) -> List[ImageGenerationResult]:
         """Get recent generation history, optionally filtered by provider."""
-        if provider:
-            filtered_generations = self.history.get_by_provider(provider)
-            return sorted(filtered_generations, key=lambda x: x.timestamp, reverse=True)[:limit]
-        else:
-            return self.history.get_recent_generations(limit)
+        return self.history.recent(limit, provider)
     
     def search_history(self, search_term: str, provider: Optional[ProviderType] = None) -> List[ImageGenerationResult]:
         """Search generation history by prompt, optionally filtered by provider."""
-        results = self.history.search_by_prompt(search_term)
-        if provider:
-            results = [r for r in results if r.provider == provider]
-        return results
-    
-    def _load_history(self):
-        """Load generation history from disk."""
-        try:
-            for metadata_file in self.config.storage.metadata_dir.glob("*.json"):
-                try:
-                    result = ImageGenerationResult.load_metadata(metadata_file)
-                    self.history.add_generation(result)
-                except Exception as e:
-                    print(f"Failed to load metadata from {metadata_file}: {e}")
-        except Exception as e:
-            print(f"Failed to load history: {e}")
-    
-    def _save_history(self):
-        """Save current history state."""
-        # History is automatically saved through individual metadata files
-        pass
+        return self.history.search(search_term, provider)
     
     async def cleanup_old_files(self):
         """Clean up old images and metadata based on configuration."""
         cutoff_date = datetime.now() - timedelta(days=self.config.storage.cleanup_after_days)
         
-        cleaned_count = 0
-        for metadata_file in self.config.storage.metadata_dir.glob("*.json"):
+        cleaned_ids = []
+        old_files = set()
+        for metadata_path, result in self.history.older_than(cutoff_date):
             try:
-                result = ImageGenerationResult.load_metadata(metadata_file)
-                if result.timestamp < cutoff_date:
-                    # Remove associated images
-                    for image in result.images:
-                        if image.local_path and image.local_path.exists():
-                            image.local_path.unlink()
-                    
-                    # Remove metadata file
-                    metadata_file.unlink()
-                    cleaned_count += 1
-                    
+                # Remove metadata file
+                if metadata_path and Path(metadata_path).exists():
+                    Path(metadata_path).unlink()
+                cleaned_ids.append(result.request_id)
+                for image in result.images:
+                    old_files.update(str(path) for path in (image.local_path, image.thumbnail_path) if path)
+                
             except Exception as e:
-                print(f"Error during cleanup of {metadata_file}: {e}")
+                print(f"Error during cleanup of {result.request_id}: {e}")
+        
+        self.history.delete(cleaned_ids)
         
-        print(f"Cleaned up {cleaned_count} old generation records")
+        # Remove associated images, except those deduplicated into a newer generation
+        old_files = list(old_files)
+        for path in set(old_files) - self.history.paths_in_use(old_files):
+            try:
+                Path(path).unlink(missing_ok=True)
+            except Exception as e:
+                print(f"Error removing {path}: {e}")
+        print(f"Cleaned up {len(cleaned_ids)} old generation records")
+
+
+_storage_service: Optional[ImageStorageService] = None
+
+
+def get_storage_service() -> ImageStorageService:
+    """Get the shared storage service, so the history index is opened and synced once."""
+    global _storage_service
+    if _storage_service is None:
+        _storage_service = ImageStorageService()
+    return _storage_service
+
+
+# Image operations run in worker processes; the semaphore bounds how many jobs may be queued
+_processing_executor: Optional[ProcessPoolExecutor] = None
+_processing_slots: Optional[threading.BoundedSemaphore] = None
+
+# Called with (completed, total, output path) as each image of a batch finishes
+ProgressCallback = Callable[[int, int, Path], None]
+
+
+# PNG colour type and bytes per pixel for the 8-bit modes written strip by strip
+_PNG_FORMATS = {"L": (0, 1), "LA": (4, 2), "RGB": (2, 3), "RGBA": (6, 4)}
+
+
+def _png_chunk(out, kind: bytes, data: bytes) -> None:
+    out.write(struct.pack(">I", len(data)) + kind + data)
+    out.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+def _write_png_strips(output_path: str, mode: str, size: Tuple[int, int], strips) -> None:
+    """Write a PNG from horizontal image strips, compressing each one as it arrives."""
+    color_type, pixel_bytes = _PNG_FORMATS[mode]
+    width, height = size
+    row_bytes = width * pixel_bytes
+    compressor = zlib.compressobj(6)
+    with open(output_path, "wb") as out:
+        out.write(b"\x89PNG\r\n\x1a\n")
+        _png_chunk(out, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+        for strip in strips:
+            raw = strip.tobytes()
+            # Each scanline starts with its filter type; 0 stores the row unfiltered
+            data = b"".join(b"\x00" + raw[i:i + row_bytes] for i in range(0, len(raw), row_bytes))
+            compressed = compressor.compress(data)
+            if compressed:
+                _png_chunk(out, b"IDAT", compressed)
+        _png_chunk(out, b"IDAT", compressor.flush())
+        _png_chunk(out, b"IEND", b"")
+
+
+def _upscale_file(image_path: str, output_path: str, scale_factor: int, enhance_quality: bool,
+                  tile_size: int, tile_threshold_pixels: int) -> str:
+    """Upscale one image file (runs in a worker process).
+    
+    Outputs above `tile_threshold_pixels` are resized in strips of about `tile_size` squared
+    source pixels. PNG outputs are written to disk strip by strip, so the full-size image is
+    never held in memory; other formats are assembled in memory before saving, because
+    Pillow cannot write them incrementally.
+    """
+    resample = Image.LANCZOS if enhance_quality else Image.BICUBIC
+    with Image.open(image_path) as img:
+        new_width = img.width * scale_factor
+        new_height = img.height * scale_factor
+        save_options = {"quality": 95} if output_path.lower().endswith(('.jpg', '.jpeg')) else {}
+        
+        if new_width * new_height <= tile_threshold_pixels:
+            img.resize((new_width, new_height), resample).save(output_path, **save_options)
+            return output_path
+        
+        img.load()
+        rows = max(1, tile_size * tile_size // img.width)
+        
+        def strips():
+            # With `box` the filter still reads the neighbouring source rows, so strips join seamlessly
+            for top in range(0, img.height, rows):
+                bottom = min(top + rows, img.height)
+                yield top, img.resize((new_width, (bottom - top) * scale_factor), resample,
+                                      box=(0, top, img.width, bottom))
+        
+        if output_path.lower().endswith('.png') and img.mode in _PNG_FORMATS:
+            _write_png_strips(output_path, img.mode, (new_width, new_height), (strip for _, strip in strips()))
+        else:
+            upscaled = Image.new(img.mode, (new_width, new_height))
+            for top, strip in strips():
+                upscaled.paste(strip, (0, top * scale_factor))
+            upscaled.save(output_path, **save_options)
+    return output_path
+
+
+def _copy_image(image_path: str, output_path: str) -> str:
+    """Re-encode an image to a new file (runs in a worker process)."""
+    with Image.open(image_path) as img:
+        img.save(output_path)
+    return output_path
 
 
 class ImageProcessingService:
-    """Service for image processing operations like upscaling and variations."""
+    """Service for image processing operations like upscaling and variations.
+    
+    Operations run in a shared process pool so they never block the event loop; at most
+    `max_queued_jobs` images are queued or in progress at a time, further jobs wait for a slot.
+    """
     
     def __init__(self):
         self.config = get_config()
     
+    def _get_executor(self) -> Tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+        global _processing_executor, _processing_slots
+        if _processing_executor is None:
+            _processing_executor = ProcessPoolExecutor(max_workers=self.config.processing.max_workers)
+            _processing_slots = threading.BoundedSemaphore(self.config.processing.max_queued_jobs)
+        return _processing_executor, _processing_slots
+    
+    async def _run(self, func, *args) -> Path:
+        """Run one image job in the worker pool once a queue slot is free."""
+        executor, slots = self._get_executor()
+        loop = asyncio.get_running_loop()
+        acquired = await loop.run_in_executor(None, slots.acquire, True, self.config.processing.queue_timeout)
+        if not acquired:
+            raise Exception("Image processing queue is full, try again later")
+        try:
+            return Path(await loop.run_in_executor(executor, func, *args))
+        finally:
+            slots.release()
+    
+    async def _run_batch(self, jobs: List[Tuple[Any, ...]], progress: Optional[ProgressCallback]) -> List[Path]:
+        """Run jobs concurrently, reporting progress as each finishes; results keep the job order."""
+        completed = 0
+        
+        async def run(job):
+            nonlocal completed
+            output_path = await self._run(*job)
+            completed += 1
+            if progress:
+                progress(completed, len(jobs), output_path)
+            return output_path
+        
+        return list(await asyncio.gather(*(run(job) for job in jobs)))
+    
     async def upscale_image(self, request: ImageUpscaleRequest) -> Path:
         """Upscale an image using PIL (basic implementation)."""
+        return (await self.upscale_images([request]))[0]
+    
+    async def upscale_images(self, requests: List[ImageUpscaleRequest],
+                             progress: Optional[ProgressCallback] = None) -> List[Path]:
+        """Upscale several images as one job, calling `progress` as each one finishes."""
+        processing = self.config.processing
+        jobs = []
+        for request in requests:
+            # Generate output filename
+            output_path = request.image_path.parent / f"{request.image_path.stem}_upscaled_{request.scale_factor}x{request.image_path.suffix}"
+            jobs.append((
+                _upscale_file, str(request.image_path), str(output_path), request.scale_factor,
+                request.enhance_quality, processing.tile_size, processing.tile_threshold_pixels
+            ))
+        
         try:
-            # Open original image
-            with Image.open(request.image_path) as img:
-                # Calculate new size
-                new_width = img.width * request.scale_factor
-                new_height = img.height * request.scale_factor
-                
-                # Choose resampling method based on enhancement setting
-                if request.enhance_quality:
-                    resample = Image.LANCZOS
-                else:
-                    resample = Image.BICUBIC
-                
-                # Resize image
-                upscaled = img.resize((new_width, new_height), resample)
-                
-                # Generate output filename
-                output_path = request.image_path.parent / f"{request.image_path.stem}_upscaled_{request.scale_factor}x{request.image_path.suffix}"
-                
-                # Save upscaled image
-                upscaled.save(output_path, quality=95 if output_path.suffix.lower() == '.jpg' else None)
-                
-                return output_path
-                
+            return await self._run_batch(jobs, progress)
         except Exception as e:
             raise Exception(f"Failed to upscale image: {str(e)}")
     
-    async def create_variations(self, request: ImageVariationRequest) -> List[Path]:
+    async def create_variations(self, request: ImageVariationRequest,
+                                progress: Optional[ProgressCallback] = None) -> List[Path]:
         """Create variations of an image (placeholder implementation)."""
         # This would integrate with OpenAI's image variation API or Fal.ai variation models
         # For now, we'll create a placeholder response
-        variations = []
-        
         try:
             # In a real implementation, this would:
             # 1. Upload the base image to the appropriate service
@@ -627,16 +827,12 @@ class ImageProcessingService:
             # 3. Download and save the variations
             
             # Placeholder: just copy the original image with different names
+            jobs = []
             for i in range(request.num_variations):
                 variation_path = request.base_image_path.parent / f"{request.base_image_path.stem}_variation_{i+1}{request.base_image_path.suffix}"
-                
-                # Copy original image (in real implementation, this would be an actual variation)
-                with Image.open(request.base_image_path) as img:
-                    img.save(variation_path)
-                
-                variations.append(variation_path)
+                jobs.append((_copy_image, str(request.base_image_path), str(variation_path)))
             
-            return variations
+            return await self._run_batch(jobs, progress)
             
         except Exception as e:
             raise Exception(f"Failed to create variations: {str(e)}")
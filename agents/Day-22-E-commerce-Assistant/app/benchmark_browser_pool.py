@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Puppeteer browser pool
+Compares a browser launched per search (the previous behaviour) with the warm, shared pool
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add src to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from shopping_assistant.browser_pool import BrowserPool
+from shopping_assistant.puppeteer_scraper import PuppeteerProductScraper
+
+QUERIES = ["wireless headphones", "usb c charger", "mechanical keyboard", "4k monitor", "running shoes"]
+
+
+def summarize(label, latencies, rss):
+    """Print latency and memory figures for one run"""
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    rss_text = f"{max(rss):.0f} MB" if rss else "N/A (install psutil)"
+    print(f"{label:>8}: mean {statistics.mean(latencies):.2f}s  p95 {p95:.2f}s  peak RSS {rss_text}")
+
+
+async def run_cold(queries):
+    """Launch and close a browser for every search"""
+    latencies, rss = [], []
+    for query in queries:
+        pool = BrowserPool()
+        scraper = PuppeteerProductScraper(pool=pool)
+        started = time.perf_counter()
+        await scraper.search_products(query)
+        latencies.append(time.perf_counter() - started)
+        if pool.rss_mb() is not None:
+            rss.append(pool.rss_mb())
+        await pool.close()
+    return latencies, rss
+
+
+async def run_warm(queries):
+    """Reuse one warm pool for every search"""
+    pool = BrowserPool()
+    scraper = PuppeteerProductScraper(pool=pool)
+    await pool.start()
+    latencies, rss = [], []
+    try:
+        for query in queries:
+            started = time.perf_counter()
+            await scraper.search_products(query)
+            latencies.append(time.perf_counter() - started)
+            if pool.rss_mb() is not None:
+                rss.append(pool.rss_mb())
+    finally:
+        await pool.close()
+    return latencies, rss
+
+
+async def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    queries = QUERIES * rounds
+    print(f"Running {len(queries)} searches per mode...")
+    summarize("cold", *await run_cold(queries))
+    summarize("warm", *await run_warm(queries))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
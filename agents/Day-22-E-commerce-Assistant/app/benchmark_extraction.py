@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark for retailer page extraction
+Times the compiled lxml extraction against a BeautifulSoup parse of the same saved pages
+
+Save search-result pages as <retailer>*.html (e.g. amazon-headphones.html, walmart-tv.html,
+retailers: amazon, ebay, bestbuy, newegg, walmart, target) in a fixtures directory and run:
+
+    python benchmark_extraction.py [fixtures_dir] [repeat]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+# Add src to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from bs4 import BeautifulSoup
+
+from shopping_assistant.extraction import RETAILER_SPECS, extract_products
+
+
+def load_fixtures(directory):
+    """Load (retailer, name, html) for every fixture named after a known retailer"""
+    fixtures = []
+    for path in sorted(Path(directory).glob("*.html")):
+        retailer = path.stem.split("-")[0].lower()
+        if retailer in RETAILER_SPECS:
+            fixtures.append((retailer, path.name, path.read_bytes()))
+    return fixtures
+
+
+def beautifulsoup_items(retailer, html):
+    """The previous approach: build a BeautifulSoup tree and select the items"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for selector in RETAILER_SPECS[retailer].item_selectors:
+        items = soup.select(selector)
+        if items:
+            return len(items)
+    return 0
+
+
+def time_per_page(func, fixtures, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for retailer, _, html in fixtures:
+            func(retailer, html)
+    return (time.perf_counter() - started) / (repeat * len(fixtures)) * 1000
+
+
+def extract(retailer, html):
+    return extract_products(retailer, html, 20)
+
+
+def time_pool(executor_class, fixtures, repeat, workers):
+    jobs = [(retailer, html) for _ in range(repeat) for retailer, _, html in fixtures]
+    with executor_class(max_workers=workers) as executor:
+        # Warm up the workers (and their compiled specs) before timing
+        list(executor.map(extract, *zip(*jobs[:workers])))
+        started = time.perf_counter()
+        list(executor.map(extract, *zip(*jobs)))
+    return len(jobs) / (time.perf_counter() - started)
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else "fixtures"
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    fixtures = load_fixtures(directory)
+    if not fixtures:
+        print(f"No fixtures found in {directory}/ (expected files like amazon-headphones.html)")
+        return
+
+    print(f"{len(fixtures)} fixtures, {repeat} rounds\n")
+    for retailer, name, html in fixtures:
+        products = extract_products(retailer, html, 20)
+        print(f"{name:<40} {len(products):>3} products (BeautifulSoup found {beautifulsoup_items(retailer, html)} items)")
+
+    print(f"\nBeautifulSoup parse + select: {time_per_page(beautifulsoup_items, fixtures, repeat):7.2f} ms/page")
+    print(f"Compiled lxml extraction:     {time_per_page(extract, fixtures, repeat):7.2f} ms/page")
+
+    workers = min(4, os.cpu_count() or 1)
+    print(f"\nThroughput with {workers} workers:")
+    print(f"  thread pool:  {time_pool(ThreadPoolExecutor, fixtures, repeat, workers):7.1f} pages/s")
+    print(f"  process pool: {time_pool(ProcessPoolExecutor, fixtures, repeat, workers):7.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,8 +11,9 @@ from .models import (
     Product, SearchQuery, SearchResult, ComparisonRequest, ComparisonResult,
     RecommendationRequest, ReviewSummary, QueryType, UserPreferences, PriceTracker
 )
-from .scrapers import ProductScraper
+from .product_cache import CachedProductScraper
 from .llm_service import LLMService
+from .review_summaries import ReviewSummarizer
 from .database import SessionLocal, UserPreferencesDB, PriceTrackerDB, SearchHistoryDB
 import os
 import logging
@@ -24,8 +25,9 @@ class ShoppingAssistant:
     """Main shopping assistant agent"""
     
     def __init__(self):
-        self.scraper = ProductScraper()
+        self.scraper = CachedProductScraper()
         self.llm = LLMService()
+        self.reviews = ReviewSummarizer(self.llm)
         
     def parse_query(self, query: str, user_id: Optional[str] = None) -> SearchQuery:
         """Parse natural language query into structured search"""
@@ -202,8 +204,13 @@ class ShoppingAssistant:
                     comparison_table[criterion][product.id or product.title] = product.features
                 # Add more criteria as needed
         
+        # Summarize every product's reviews in one batched call (the pages are already cached)
+        review_summaries = self.reviews.summarize_many(
+            {product.url: self.scraper.get_product_reviews(product.url) for product in products}
+        )
+        
         # Use LLM to determine winner and generate summary
-        winner, summary = self.llm.analyze_comparison(products, comparison_table)
+        winner, summary = self.llm.analyze_comparison(products, comparison_table, review_summaries)
         
         return ComparisonResult(
             products=products,
@@ -286,8 +293,8 @@ class ShoppingAssistant:
                 summary="No reviews available for this product."
             )
         
-        # Use LLM to summarize reviews
-        summary = self.llm.summarize_reviews(reviews)
+        # Reuse the stored summary, extending it only with reviews it has not seen
+        summary = self.reviews.summarize(product_url, reviews)
         
         return ReviewSummary(
             product_id=product.id or product_url,
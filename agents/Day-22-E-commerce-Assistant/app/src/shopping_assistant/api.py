@@ -6,7 +6,8 @@ from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+import asyncio
 import uuid
 
 from .agent import ShoppingAssistant
@@ -15,6 +16,7 @@ from .models import (
     RecommendationRequest, ReviewSummary, PriceTracker, QueryType
 )
 from .database import init_database, get_db, SessionLocal, PriceTrackerDB
+from .price_tracking import PriceRefresher
 
 app = FastAPI(
     title="Shopping Assistant API",
@@ -33,11 +35,16 @@ app.add_middleware(
 
 # Initialize the shopping assistant
 assistant = ShoppingAssistant()
+price_refresher = PriceRefresher(scraper=assistant.scraper)
+background_tasks = set()
 
-# Initialize database on startup
+# Initialize database and start the price refresh loop on startup
 @app.on_event("startup")
 async def startup_event():
     init_database()
+    task = asyncio.create_task(price_refresher.run_periodically())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -361,6 +368,15 @@ async def get_user_trackers(user_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/price-history/{product_url:path}", response_model=List[Dict[str, Any]])
+async def get_price_history(product_url: str):
+    """Get the recorded price history for a tracked product"""
+    try:
+        return price_refresher.price_history(product_url)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/reviews/{product_url:path}", response_model=ReviewSummary)
 async def get_review_summary(product_url: str):
     """Get summarized reviews for a product"""
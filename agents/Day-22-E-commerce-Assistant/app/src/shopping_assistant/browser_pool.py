@@ -0,0 +1,254 @@
+"""
+Long-lived headless browser pool with warm, isolated pages for the Puppeteer scraper
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Try to import pyppeteer, fall back gracefully if not available
+try:
+    from pyppeteer import launch
+    PYPPETEER_AVAILABLE = True
+except ImportError:
+    PYPPETEER_AVAILABLE = False
+    logger.warning("pyppeteer not available. Install with: pip install pyppeteer")
+
+# psutil is only needed to report the browser's memory use
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Number of warm pages (each in its own incognito context)
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "3"))
+# A page is replaced by a fresh one after this many uses, which keeps memory growth bounded
+BROWSER_PAGE_MAX_USES = int(os.getenv("BROWSER_PAGE_MAX_USES", "25"))
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+LAUNCH_OPTIONS = {
+    'headless': True,
+    'args': [
+        '--no-sandbox',
+        '--disable-setuid-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-gpu',
+        '--window-size=1920,1080'
+    ],
+    # The pool installs its own handlers and decides when the browser goes away
+    'handleSIGINT': False,
+    'handleSIGTERM': False,
+    'handleSIGHUP': False,
+}
+
+# Requests that are never needed to read product listings
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+BLOCKED_URL_PARTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'amazon-adsystem.com', 'facebook.net', 'connect.facebook', 'hotjar.com', 'segment.io',
+    'scorecardresearch.com', 'criteo.', 'newrelic.com', 'nr-data.net', 'optimizely.com',
+)
+
+
+class _PooledPage:
+    """A page, its incognito context and how often it has been used"""
+
+    def __init__(self, context, page, generation: int):
+        self.context = context
+        self.page = page
+        self.generation = generation
+        self.uses = 0
+
+
+def _on_request(request):
+    """Abort requests for images, fonts and trackers; let everything else through"""
+    url = request.url
+    if request.resourceType in BLOCKED_RESOURCE_TYPES or any(part in url for part in BLOCKED_URL_PARTS):
+        asyncio.ensure_future(request.abort())
+    else:
+        asyncio.ensure_future(request.continue_())
+
+
+class BrowserPool:
+    """A single Chromium process with a fixed number of warm pages that are reused across searches.
+
+    Pages are health-checked before use and replaced after BROWSER_PAGE_MAX_USES uses or
+    a failure; if the browser itself crashes it is relaunched on the next request. The pool
+    belongs to the event loop it is started in.
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, max_page_uses: int = BROWSER_PAGE_MAX_USES,
+                 launch_options: Optional[Dict[str, Any]] = None):
+        self.size = size
+        self.max_page_uses = max_page_uses
+        self.launch_options = launch_options or LAUNCH_OPTIONS
+        self.browser = None
+        self.generation = 0
+        self.restarts = 0
+        self.pages_recycled = 0
+        self._disconnected = False
+        self._idle: Optional[asyncio.Queue] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the browser process is up and connected"""
+        if self.browser is None or self._disconnected:
+            return False
+        process = getattr(self.browser, 'process', None)
+        return process is None or process.poll() is None
+
+    async def start(self):
+        """Launch the browser and warm up the pages, or relaunch them after a crash"""
+        if not PYPPETEER_AVAILABLE:
+            raise RuntimeError("pyppeteer not available. Install with: pip install pyppeteer")
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+            self._idle = asyncio.Queue()
+
+        async with self._lock:
+            if self.is_running:
+                return
+            if self.browser is not None:
+                logger.warning("Browser is not running, relaunching")
+                self.restarts += 1
+                await self._close_browser()
+
+            self._disconnected = False
+            self.browser = await launch(**self.launch_options)
+            self.browser.on('disconnected', self._on_disconnected)
+            self.generation += 1
+
+            # Pages of the previous browser are dead; waiters keep the same queue and get new ones
+            while not self._idle.empty():
+                self._idle.get_nowait()
+            for _ in range(self.size):
+                self._idle.put_nowait(await self._new_page())
+            logger.info(f"Browser pool started with {self.size} pages")
+
+    def _on_disconnected(self):
+        self._disconnected = True
+
+    async def _new_page(self) -> _PooledPage:
+        context = await self.browser.createIncognitoBrowserContext()
+        page = await context.newPage()
+        await page.setUserAgent(USER_AGENT)
+        await page.setRequestInterception(True)
+        page.on('request', _on_request)
+        return _PooledPage(context, page, self.generation)
+
+    async def _is_healthy(self, slot: _PooledPage) -> bool:
+        if slot.generation != self.generation or slot.page.isClosed():
+            return False
+        try:
+            await asyncio.wait_for(slot.page.evaluate('1'), timeout=5)
+            return True
+        except Exception:
+            return False
+
+    async def _discard(self, slot: _PooledPage):
+        try:
+            await slot.context.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser context: {e}")
+
+    async def _replace(self, slot: _PooledPage) -> _PooledPage:
+        await self._discard(slot)
+        self.pages_recycled += 1
+        return await self._new_page()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """Borrow a warm page; waits while all pages are in use"""
+        await self.start()
+        slot = await self._idle.get()
+        failed = False
+        try:
+            if not await self._is_healthy(slot):
+                if not self.is_running:
+                    await self.start()
+                    slot = await self._idle.get()
+                else:
+                    slot = await self._replace(slot)
+            yield slot.page
+        except Exception:
+            failed = True
+            raise
+        finally:
+            await self._release(slot, failed)
+
+    async def _release(self, slot: _PooledPage, failed: bool):
+        if slot.generation != self.generation:
+            # Belongs to a browser that has been relaunched; its replacement is already pooled
+            await self._discard(slot)
+            return
+
+        slot.uses += 1
+        if failed or slot.uses >= self.max_page_uses:
+            try:
+                slot = await self._replace(slot)
+            except Exception as e:
+                # Keep the slot; the health check will replace it (or relaunch the browser) on next use
+                logger.warning(f"Could not recycle browser page: {e}")
+        else:
+            try:
+                # Leave the page blank so the previous site's scripts stop running
+                await slot.page.goto('about:blank')
+            except Exception:
+                pass
+        self._idle.put_nowait(slot)
+
+    def rss_mb(self) -> Optional[float]:
+        """Resident memory of the browser and its child processes in MB (requires psutil)"""
+        process = getattr(self.browser, 'process', None)
+        if not PSUTIL_AVAILABLE or process is None or not self.is_running:
+            return None
+        try:
+            root = psutil.Process(process.pid)
+            return sum(p.memory_info().rss for p in [root, *root.children(recursive=True)]) / 1024 / 1024
+        except psutil.Error:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Current pool statistics"""
+        return {
+            "size": self.size,
+            "idle_pages": self._idle.qsize() if self._idle else 0,
+            "restarts": self.restarts,
+            "pages_recycled": self.pages_recycled,
+            "rss_mb": self.rss_mb(),
+        }
+
+    async def _close_browser(self):
+        try:
+            await self.browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser: {e}")
+        self.browser = None
+
+    async def close(self):
+        """Close the browser and all pages"""
+        if self._lock is None or self.browser is None:
+            return
+        async with self._lock:
+            await self._close_browser()
+            while not self._idle.empty():
+                self._idle.get_nowait()
+            logger.info("Browser pool closed")
+
+
+_shared_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the process-wide browser pool"""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = BrowserPool()
+    return _shared_pool
@@ -2,7 +2,7 @@
 Database configuration and ORM models
 """
 
-from sqlalchemy import create_engine, Column, String, Float, DateTime, Boolean, Integer, Text, JSON
+from sqlalchemy import create_engine, inspect, Column, String, Float, DateTime, Boolean, Integer, Text, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -46,6 +46,16 @@ class PriceTrackerDB(Base):
     is_active = Column(Boolean, default=True)
 
 
+class PriceHistoryDB(Base):
+    """Price history per product, one point per observed price change"""
+    __tablename__ = "price_history"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    product_url = Column(String, nullable=False, index=True)
+    price = Column(Float, nullable=False)
+    checked_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
 class ProductCacheDB(Base):
     """Cached product information"""
     __tablename__ = "product_cache"
@@ -64,9 +74,28 @@ class ProductCacheDB(Base):
     category = Column(String)
     availability = Column(String)
     source = Column(String, nullable=False)
+    reviews = Column(JSON)
+    price_updated_at = Column(DateTime)
+    specs_updated_at = Column(DateTime)
+    reviews_updated_at = Column(DateTime)
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class ReviewSummaryDB(Base):
+    """LLM review summaries, keyed by product and the set of reviews they cover"""
+    __tablename__ = "review_summaries"
+
+    product_url = Column(String, primary_key=True)
+    review_hash = Column(String, nullable=False)
+    review_keys = Column(JSON)
+    review_count = Column(Integer, default=0)
+    pros = Column(JSON)
+    cons = Column(JSON)
+    themes = Column(JSON)
+    summary = Column(Text)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class SearchHistoryDB(Base):
     """Search history table"""
     __tablename__ = "search_history"
@@ -80,8 +109,19 @@ class SearchHistoryDB(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
 
 
+def _drop_outdated_product_cache():
+    """Drop a product_cache table created before the freshness columns existed (it only holds cached data)"""
+    inspector = inspect(engine)
+    if not inspector.has_table(ProductCacheDB.__tablename__):
+        return
+    columns = {column["name"] for column in inspector.get_columns(ProductCacheDB.__tablename__)}
+    if not set(ProductCacheDB.__table__.columns.keys()) <= columns:
+        ProductCacheDB.__table__.drop(bind=engine)
+
+
 def create_tables():
     """Create all database tables"""
+    _drop_outdated_product_cache()
     Base.metadata.create_all(bind=engine)
 
 
@@ -0,0 +1,542 @@
+"""
+Declarative, precompiled product extraction for retailer pages
+
+Each retailer is described once by a RetailerSpec (item selectors, field selectors,
+regexes and structured-data paths). Specs are compiled to lxml XPath objects the first
+time they are used in a process, and pages are parsed with lxml. Structured data
+(JSON-LD, __NEXT_DATA__) is read first; CSS selectors are the fallback.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urljoin
+
+import lxml.html
+from cssselect import GenericTranslator
+from lxml import etree
+
+from .models import Product, Review
+
+logger = logging.getLogger(__name__)
+
+# Pool that parses pages off the fetching threads: "thread" or "process"
+PARSE_EXECUTOR = os.getenv("PARSE_EXECUTOR", "thread")
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+PRICE_PATTERN = r'\d[\d,]*\.?\d*'
+NUMBER_PATTERN = r'(\d+\.?\d*)'
+
+JsonPath = Tuple[Union[str, int], ...]
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """Where to find one product field inside an item.
+
+    Selectors are CSS unless prefixed with "xpath:" and are tried in order. The
+    first non-empty value is run through the regex (keeping group 1 if there is
+    one) and then `convert`.
+    """
+    selectors: Tuple[str, ...]
+    attr: Optional[str] = None
+    regex: Optional[str] = None
+    convert: Callable[[str], Any] = str
+    scale: float = 1.0
+
+
+@dataclass(frozen=True)
+class RetailerSpec:
+    """How to extract products from one retailer's pages"""
+    source: str
+    base_url: str
+    item_selectors: Tuple[str, ...]
+    fields: Dict[str, FieldSpec]
+    # Path to the list of items inside the page's __NEXT_DATA__ JSON, and per-field paths inside each item
+    next_data_items: Optional[JsonPath] = None
+    next_data_fields: Dict[str, Tuple[JsonPath, ...]] = field(default_factory=dict)
+    # Titles matching this pattern are ads or placeholders
+    skip_title: Optional[str] = None
+    defaults: Dict[str, Any] = field(default_factory=dict)
+    description: str = "{source} product: {title}"
+    features: Tuple[str, ...] = ()
+    availability: str = "Available at {source}"
+
+
+def _price(text: str) -> float:
+    return float(text.replace(',', ''))
+
+
+def _int(text: str) -> int:
+    return int(float(text.replace(',', '')))
+
+
+PRICE = dict(regex=PRICE_PATTERN, convert=_price)
+RATING = dict(regex=NUMBER_PATTERN, convert=float)
+COUNT = dict(regex=r'(\d[\d,]*)', convert=_int)
+
+RETAILER_SPECS: Dict[str, RetailerSpec] = {
+    "amazon": RetailerSpec(
+        source="Amazon",
+        base_url="https://www.amazon.com",
+        item_selectors=('div[data-component-type="s-search-result"]',),
+        fields={
+            "title": FieldSpec(('h2 a span', 'h2 span', 'span.a-size-medium', 'span.a-size-base-plus')),
+            "url": FieldSpec(('h2 a', 'a.a-link-normal.s-no-outline'), attr='href'),
+            "price": FieldSpec(('span.a-price > span.a-offscreen', 'span.a-price-whole', 'span.a-price'), **PRICE),
+            "rating": FieldSpec(('span.a-icon-alt',), **RATING),
+            "review_count": FieldSpec(('span.a-size-base.s-underline-text', 'a.a-link-normal span.a-size-base'), **COUNT),
+            "image_url": FieldSpec(('img.s-image',), attr='src'),
+        },
+        description="Amazon product: {title}",
+        availability="Available on Amazon",
+    ),
+    "ebay": RetailerSpec(
+        source="eBay",
+        base_url="https://www.ebay.com",
+        item_selectors=('div.s-item__wrapper', 'li.s-item'),
+        fields={
+            "title": FieldSpec(('.s-item__title', 'span[role="heading"]')),
+            "url": FieldSpec(('a.s-item__link',), attr='href'),
+            "price": FieldSpec(('span.s-item__price',), **PRICE),
+            "condition": FieldSpec(('span.SECONDARY_INFO',), regex=r'(?i)\b(new)\b', convert=lambda _: "New"),
+            "image_url": FieldSpec(('img.s-item__image-img', '.s-item__image img'), attr='src'),
+        },
+        skip_title=r'(?i)sponsored|^shop on ebay$',
+        # eBay doesn't show ratings in search
+        defaults={"rating": 4.0, "condition": "Used"},
+        description="eBay listing: {title} ({condition})",
+        features=("{condition}", "eBay Buyer Protection"),
+        availability="{condition}",
+    ),
+    "bestbuy": RetailerSpec(
+        source="Best Buy",
+        base_url="https://www.bestbuy.com",
+        item_selectors=('li.sku-item',),
+        fields={
+            "title": FieldSpec(('h4.sku-title a', 'h4.sku-header a', 'h4.sr-only a')),
+            "url": FieldSpec(('h4.sku-title a', 'h4.sku-header a', 'h4.sr-only a'), attr='href'),
+            "price": FieldSpec(('div.priceView-customer-price span[aria-hidden="true"]',
+                                '[class*="price"][class*="current"]', 'span.sr-only'), **PRICE),
+            "rating": FieldSpec(('span.c-reviews-v4', '.c-ratings-reviews [aria-label]'), attr='aria-label', **RATING),
+            "image_url": FieldSpec(('img.product-image',), attr='src'),
+        },
+        description="Best Buy product: {title}",
+        features=("Best Buy Warranty", "Store Pickup Available"),
+    ),
+    "newegg": RetailerSpec(
+        source="Newegg",
+        base_url="https://www.newegg.com",
+        item_selectors=('div.item-container',),
+        fields={
+            "title": FieldSpec(('a.item-title',)),
+            "url": FieldSpec(('a.item-title',), attr='href'),
+            "price": FieldSpec(('li.price-current', 'span.price-current-label'), **PRICE),
+            # The title reads "Rating + 4" on a five-egg scale
+            "rating": FieldSpec(('a.item-rating',), attr='title', **RATING),
+            "image_url": FieldSpec(('img.item-img', 'a.item-img img'), attr='src'),
+        },
+        description="Newegg product: {title}",
+        features=("Tech Specialist", "Fast Shipping"),
+    ),
+    "walmart": RetailerSpec(
+        source="Walmart",
+        base_url="https://www.walmart.com",
+        item_selectors=('div[data-item-id]', 'div[data-automation-id="product-tile"]', 'div[data-testid="item-tile"]'),
+        fields={
+            "title": FieldSpec(('[data-automation-id="product-title"]', 'h3', '[aria-label*="title"]')),
+            "url": FieldSpec(('a[href*="/ip/"]',), attr='href'),
+            "price": FieldSpec(('[data-automation-id="product-price"] .w_iUH7', '[itemprop="price"]',
+                                '[data-automation-id="product-price"]'), **PRICE),
+            "rating": FieldSpec(('[data-testid="product-ratings"]',), attr='data-value', **RATING),
+            "image_url": FieldSpec(('img[data-testid="productTileImage"]',), attr='src'),
+        },
+        next_data_items=("props", "pageProps", "initialData", "searchResult", "itemStacks", 0, "items"),
+        next_data_fields={
+            "title": (("name",),),
+            "price": (("priceInfo", "currentPrice", "price"), ("price",)),
+            "url": (("canonicalUrl",),),
+            "image_url": (("imageInfo", "thumbnailUrl"), ("image",)),
+            "rating": (("averageRating",),),
+            "review_count": (("numberOfReviews",),),
+        },
+        description="Walmart product: {title}",
+        features=("Walmart+", "Free Shipping Available"),
+    ),
+    "target": RetailerSpec(
+        source="Target",
+        base_url="https://www.target.com",
+        item_selectors=('[data-test="@web/site-top-of-funnel/ProductCardWrapper"]', '[data-test="product-details"]'),
+        fields={
+            "title": FieldSpec(('a[data-test="product-title"]', '[data-test="product-title"]', 'h3')),
+            "url": FieldSpec(('a[data-test="product-title"]', 'a[href*="/p/"]'), attr='href'),
+            "price": FieldSpec(('span[data-test="current-price"]', '[data-test="product-price"]', '.price'), **PRICE),
+        },
+        description="Target product: {title}",
+        features=("Target Circle", "Same Day Delivery"),
+    ),
+}
+
+# A single product page of any retailer: the whole document is the item
+PRODUCT_PAGE_SPEC = RetailerSpec(
+    source="scraped",
+    base_url="",
+    item_selectors=(),
+    fields={
+        "title": FieldSpec(('h1', '.product-title', '#product-name', '.title')),
+        "price": FieldSpec(('.price', '.cost', '.amount', '.product-price'), **PRICE),
+        "rating": FieldSpec(('.rating', '.stars', '.score'), **RATING),
+        "image_url": FieldSpec(("xpath:.//img[contains(@class, 'product') or contains(@class, 'main') "
+                                "or contains(@class, 'hero')]",), attr='src'),
+        "description": FieldSpec(('.description', '.product-desc', '.details')),
+    },
+    defaults={"title": "Unknown Product"},
+    description="",
+    availability="",
+)
+
+REVIEW_CONTAINERS = ("xpath:.//*[self::div or self::article][contains(translate(@class, 'REVIEW', 'review'), 'review')]",)
+REVIEW_FIELDS = {
+    "rating": FieldSpec(("xpath:.//*[contains(translate(@class, 'RATINGSTAR', 'ratingstar'), 'rating') "
+                         "or contains(translate(@class, 'STAR', 'star'), 'star') "
+                         "or contains(translate(@class, 'SCORE', 'score'), 'score')]",), **RATING),
+    "content": FieldSpec(("xpath:.//*[contains(translate(@class, 'CONTENTXT', 'contentxt'), 'content') "
+                          "or contains(translate(@class, 'TEXT', 'text'), 'text') "
+                          "or contains(translate(@class, 'COMMENT', 'comment'), 'comment')]",)),
+}
+
+
+# --- Compilation ---------------------------------------------------------------
+
+_translator = GenericTranslator()
+
+
+def _compile_selector(selector: str) -> etree.XPath:
+    if selector.startswith("xpath:"):
+        return etree.XPath(selector[len("xpath:"):])
+    return etree.XPath(_translator.css_to_xpath(selector, prefix='descendant-or-self::'))
+
+
+@dataclass
+class _CompiledField:
+    xpaths: List[etree.XPath]
+    spec: FieldSpec
+    regex: Optional[re.Pattern]
+
+
+def _compile_fields(fields: Dict[str, FieldSpec]) -> Dict[str, _CompiledField]:
+    return {
+        name: _CompiledField(
+            xpaths=[_compile_selector(selector) for selector in spec.selectors],
+            spec=spec,
+            regex=re.compile(spec.regex) if spec.regex else None,
+        )
+        for name, spec in fields.items()
+    }
+
+
+@lru_cache(maxsize=None)
+def _compiled(name: str) -> Tuple[RetailerSpec, List[etree.XPath], Dict[str, _CompiledField]]:
+    """Compile a spec once per process"""
+    spec = PRODUCT_PAGE_SPEC if name == "product_page" else RETAILER_SPECS[name]
+    return spec, [_compile_selector(selector) for selector in spec.item_selectors], _compile_fields(spec.fields)
+
+
+@lru_cache(maxsize=None)
+def _compiled_reviews() -> Tuple[List[etree.XPath], Dict[str, _CompiledField]]:
+    return [_compile_selector(selector) for selector in REVIEW_CONTAINERS], _compile_fields(REVIEW_FIELDS)
+
+
+_JSON_LD = etree.XPath("//script[@type='application/ld+json']/text()")
+_NEXT_DATA = etree.XPath("//script[@id='__NEXT_DATA__']/text()")
+
+
+# --- Extraction ----------------------------------------------------------------
+
+def _text(node) -> str:
+    if isinstance(node, str):
+        return node.strip()
+    return " ".join(node.text_content().split())
+
+
+def _field_value(element, compiled: _CompiledField) -> Any:
+    spec = compiled.spec
+    for xpath in compiled.xpaths:
+        for node in xpath(element):
+            raw = node.get(spec.attr) if spec.attr and not isinstance(node, str) else _text(node)
+            if not raw:
+                continue
+            if compiled.regex:
+                match = compiled.regex.search(raw)
+                if not match:
+                    continue
+                raw = match.group(1) if match.groups() else match.group()
+            try:
+                value = spec.convert(raw)
+            except (TypeError, ValueError):
+                continue
+            return value * spec.scale if spec.scale != 1.0 else value
+    return None
+
+
+def _parse(html: Union[str, bytes]):
+    return lxml.html.fromstring(html)
+
+
+def _json_scripts(xpath: etree.XPath, tree) -> Iterator[Any]:
+    for text in xpath(tree):
+        try:
+            yield json.loads(text)
+        except ValueError:
+            continue
+
+
+def _walk(data: Any, path: Sequence[Union[str, int]]) -> Any:
+    for key in path:
+        try:
+            data = data[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return data
+
+
+def _json_ld_nodes(tree) -> Iterator[Dict[str, Any]]:
+    """Every JSON-LD object on the page, with @graph and ItemList entries flattened"""
+    stack = list(_json_scripts(_JSON_LD, tree))
+    while stack:
+        node = stack.pop(0)
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            yield node
+            stack.extend(node.get('@graph', []))
+            for entry in node.get('itemListElement', []) or []:
+                stack.append(entry.get('item', entry) if isinstance(entry, dict) else entry)
+
+
+def _is_product(node: Dict[str, Any]) -> bool:
+    kind = node.get('@type')
+    return kind == 'Product' or (isinstance(kind, list) and 'Product' in kind)
+
+
+def _number(value: Any, convert: Callable = float) -> Optional[Any]:
+    if value is None:
+        return None
+    try:
+        return convert(str(value).replace(',', ''))
+    except ValueError:
+        return None
+
+
+def _json_ld_fields(node: Dict[str, Any]) -> Dict[str, Any]:
+    offers = node.get('offers') or {}
+    if isinstance(offers, list):
+        offers = offers[0] if offers else {}
+    price = offers.get('price', offers.get('lowPrice'))
+    rating = node.get('aggregateRating') or {}
+    image = node.get('image')
+    if isinstance(image, list):
+        image = image[0] if image else None
+    if isinstance(image, dict):
+        image = image.get('url')
+    brand = node.get('brand')
+    if isinstance(brand, dict):
+        brand = brand.get('name')
+    return {
+        "title": node.get('name'),
+        "price": _number(price),
+        "currency": offers.get('priceCurrency'),
+        "url": node.get('url') or offers.get('url'),
+        "image_url": image,
+        "rating": _number(rating.get('ratingValue')),
+        "review_count": _number(rating.get('reviewCount') or rating.get('ratingCount'), _int),
+        "description": node.get('description'),
+        "brand": brand,
+    }
+
+
+def _next_data_fields(spec: RetailerSpec, tree) -> List[Dict[str, Any]]:
+    if not spec.next_data_items:
+        return []
+    items = []
+    for data in _json_scripts(_NEXT_DATA, tree):
+        for item in _walk(data, spec.next_data_items) or []:
+            values = {}
+            for name, paths in spec.next_data_fields.items():
+                values[name] = next((v for v in (_walk(item, path) for path in paths) if v is not None), None)
+            values["price"] = _number(values.get("price"))
+            values["rating"] = _number(values.get("rating"))
+            values["review_count"] = _number(values.get("review_count"), _int)
+            items.append(values)
+    return items
+
+
+def _css_fields(tree, item_xpaths: List[etree.XPath], fields: Dict[str, _CompiledField], limit: int) -> List[Dict[str, Any]]:
+    containers = []
+    for xpath in item_xpaths:
+        containers = xpath(tree)
+        if containers:
+            break
+    return [
+        {name: _field_value(container, compiled) for name, compiled in fields.items()}
+        for container in containers[:limit * 2]
+    ]
+
+
+def _build_product(spec: RetailerSpec, values: Dict[str, Any], category: str) -> Optional[Product]:
+    values = {**spec.defaults, **{k: v for k, v in values.items() if v not in (None, "")}}
+    title = values.get("title")
+    if not title or values.get("price") is None:
+        return None
+    if spec.skip_title and re.search(spec.skip_title, title):
+        return None
+    context = {**values, "source": spec.source}
+    url = values.get("url") or ""
+    return Product(
+        id=str(uuid.uuid4()),
+        title=title,
+        price=values["price"],
+        currency=values.get("currency") or "USD",
+        url=urljoin(spec.base_url, url) if spec.base_url else url,
+        image_url=values.get("image_url"),
+        rating=values.get("rating"),
+        review_count=values.get("review_count") or 0,
+        description=spec.description.format(**context),
+        features=[feature.format(**context) for feature in spec.features],
+        brand=values.get("brand") or "",
+        category=category,
+        availability=spec.availability.format(**context),
+        source=spec.source,
+    )
+
+
+def extract_products(retailer: str, html: Union[str, bytes], max_results: int, category: str = "") -> List[Product]:
+    """Extract search-result products from a retailer page, structured data first"""
+    spec, item_xpaths, fields = _compiled(retailer)
+    tree = _parse(html)
+
+    structured = [_json_ld_fields(node) for node in _json_ld_nodes(tree) if _is_product(node)]
+    structured += _next_data_fields(spec, tree)
+    # Without its own URL a structured product would link to the retailer's home page
+    structured = [values for values in structured if values.get("url")]
+
+    products = []
+    seen_titles = set()
+    # The HTML items are only scanned when structured data does not fill the page
+    for candidates in (structured, lambda: _css_fields(tree, item_xpaths, fields, max_results)):
+        if len(products) >= max_results:
+            break
+        for values in candidates() if callable(candidates) else candidates:
+            product = _build_product(spec, values, category)
+            if not product or product.title in seen_titles:
+                continue
+            seen_titles.add(product.title)
+            products.append(product)
+            if len(products) >= max_results:
+                break
+    return products
+
+
+def _json_ld_reviews(node: Dict[str, Any], product_url: str) -> List[Review]:
+    reviews = []
+    raw_reviews = node.get('review') or []
+    if isinstance(raw_reviews, dict):
+        raw_reviews = [raw_reviews]
+    for raw in raw_reviews:
+        content = raw.get('reviewBody') or raw.get('description')
+        if not content:
+            continue
+        author = raw.get('author')
+        if isinstance(author, dict):
+            author = author.get('name')
+        date = None
+        if raw.get('datePublished'):
+            try:
+                date = datetime.fromisoformat(str(raw['datePublished']).replace('Z', '+00:00'))
+            except ValueError:
+                pass
+        reviews.append(Review(
+            product_id=product_url,
+            rating=_number((raw.get('reviewRating') or {}).get('ratingValue')) or 5.0,
+            title=raw.get('name'),
+            content=content,
+            author=author,
+            date=date,
+        ))
+    return reviews
+
+
+def extract_product_page(html: Union[str, bytes], url: str, max_reviews: int = 10) -> Tuple[Optional[Product], List[Review]]:
+    """Extract a product and its reviews from a product page, structured data first"""
+    spec, _, fields = _compiled("product_page")
+    tree = _parse(html)
+
+    node = next((node for node in _json_ld_nodes(tree) if _is_product(node)), None)
+    values = _json_ld_fields(node) if node else {}
+    # Fill whatever the structured data lacks from the page itself
+    for name, compiled in fields.items():
+        if values.get(name) in (None, ""):
+            values[name] = _field_value(tree, compiled)
+    title = values.get("title") or spec.defaults["title"]
+    image_url = values.get("image_url")
+
+    product = Product(
+        id=str(uuid.uuid4()),
+        title=title,
+        price=values.get("price"),
+        currency=values.get("currency") or "USD",
+        url=url,
+        image_url=urljoin(url, image_url) if image_url else None,
+        rating=values.get("rating"),
+        review_count=values.get("review_count"),
+        description=values.get("description"),
+        brand=values.get("brand"),
+        source=spec.source,
+    )
+
+    reviews = _json_ld_reviews(node, url)[:max_reviews] if node else []
+    if not reviews:
+        container_xpaths, review_fields = _compiled_reviews()
+        for container in container_xpaths[0](tree)[:max_reviews]:
+            reviews.append(Review(
+                product_id=url,
+                rating=_field_value(container, review_fields["rating"]) or 5.0,  # Default rating
+                content=_field_value(container, review_fields["content"]) or "Good product!",
+            ))
+    return product, reviews
+
+
+# --- Offloading ----------------------------------------------------------------
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def get_parse_executor() -> Executor:
+    """Get the shared parsing pool (threads by default, processes with PARSE_EXECUTOR=process)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if PARSE_EXECUTOR == "process":
+                _executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+            else:
+                _executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="page-parse")
+        return _executor
+
+
+def parse_products(retailer: str, html: Union[str, bytes], max_results: int, category: str = "") -> List[Product]:
+    """Extract products in the parsing pool, blocking the calling (fetch) thread until done"""
+    return get_parse_executor().submit(extract_products, retailer, html, max_results, category).result()
+
+
+def parse_product_page(html: Union[str, bytes], url: str) -> Tuple[Optional[Product], List[Review]]:
+    """Extract a product page in the parsing pool, blocking the calling (fetch) thread until done"""
+    return get_parse_executor().submit(extract_product_page, html, url).result()
@@ -0,0 +1,138 @@
+"""
+Concurrent fan-out search across retailers with per-host politeness and a global deadline
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+# Minimum delay between two requests to the same host, in seconds
+REQUEST_DELAY = float(os.getenv("REQUEST_DELAY", "1.0"))
+# Total time a search may take before whatever has finished is returned
+SEARCH_DEADLINE = float(os.getenv("SEARCH_DEADLINE", "12.0"))
+
+# A retailer search: (query, max_results) -> products
+SearchFunc = Callable[[str, int], List[Product]]
+
+
+class HostThrottle:
+    """Spaces out requests to the same host while letting different hosts proceed in parallel"""
+
+    def __init__(self, min_delay: float = REQUEST_DELAY, jitter: float = 1.0):
+        self.min_delay = min_delay
+        self.jitter = jitter
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> float:
+        """Block until a request to the URL's host is allowed; returns the time waited"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = start + self.min_delay + random.uniform(0, self.jitter)
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+# Shared by all scrapers so that every request to a retailer is spaced, whichever scraper sends it
+default_throttle = HostThrottle()
+
+# Retailer searches run in this pool rather than the event loop's default executor, so a
+# search that misses the deadline is abandoned instead of holding up asyncio.run() on exit
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="retailer-search")
+
+
+async def stream_search(
+    sources: Dict[str, SearchFunc],
+    query: str,
+    max_results_per_source: int,
+    deadline: float = SEARCH_DEADLINE,
+) -> AsyncIterator[Tuple[str, List[Product]]]:
+    """Run all retailer searches concurrently and yield (source, products) as each one finishes.
+
+    Sources that fail yield nothing; sources still running when the deadline
+    expires are abandoned.
+    """
+    loop = asyncio.get_running_loop()
+    started = time.monotonic()
+    tasks = {
+        asyncio.ensure_future(
+            loop.run_in_executor(_executor, search, query, max_results_per_source)
+        ): name
+        for name, search in sources.items()
+    }
+
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                name = tasks[task]
+                try:
+                    products = task.result()
+                except Exception as e:
+                    logger.warning(f"{name} search failed: {e}")
+                    continue
+                logger.info(f"{name} returned {len(products)} products after {time.monotonic() - started:.1f}s")
+                yield name, products
+    finally:
+        for task in pending:
+            logger.warning(f"{tasks[task]} search missed the {deadline:.0f}s deadline")
+            task.cancel()
+
+
+def merge_products(products: Iterable[Product], seen: Optional[set] = None) -> List[Product]:
+    """Drop products already seen, keyed by URL (or source and title when there is no URL)"""
+    seen = seen if seen is not None else set()
+    merged = []
+    for product in products:
+        key = product.url or (product.source, product.title.lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(product)
+    return merged
+
+
+async def fan_out_search(
+    sources: Dict[str, SearchFunc],
+    query: str,
+    max_results: int,
+    max_results_per_source: int,
+    deadline: float = SEARCH_DEADLINE,
+) -> List[Product]:
+    """Search all sources concurrently, merging results in arrival order until the deadline"""
+    seen: set = set()
+    products: List[Product] = []
+    async for _, source_products in stream_search(sources, query, max_results_per_source, deadline):
+        products.extend(merge_products(source_products, seen))
+    return products[:max_results]
+
+
+def run_sync(coro):
+    """Run a coroutine from synchronous code, also when called inside a running event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # A running loop cannot be re-entered, so run the coroutine on its own loop in a helper thread
+    with ThreadPoolExecutor(max_workers=1) as helper:
+        return helper.submit(asyncio.run, coro).result()
@@ -165,8 +165,12 @@ class LLMService:
             return request.description
     
     def analyze_comparison(self, products: List[Product], 
-                         comparison_table: Dict[str, Dict[str, Any]]) -> Tuple[Optional[str], str]:
-        """Analyze product comparison and determine winner"""
+                         comparison_table: Dict[str, Dict[str, Any]],
+                         review_summaries: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[Optional[str], str]:
+        """Analyze product comparison and determine winner
+        
+        review_summaries, keyed by product URL, adds what reviewers say to each product's entry.
+        """
         logger.info("Starting product comparison analysis...")
         
         if not self._is_available():
@@ -209,6 +213,13 @@ class LLMService:
                 "features": product.features,
                 "brand": product.brand
             }
+            review_summary = (review_summaries or {}).get(product.url)
+            if review_summary:
+                info["reviews"] = {
+                    "pros": review_summary.get("pros", []),
+                    "cons": review_summary.get("cons", []),
+                    "summary": review_summary.get("summary", "")
+                }
             products_info.append(info)
         
         prompt = f"""
@@ -270,38 +281,36 @@ class LLMService:
                 "summary": "No reviews available."
             }
         
-        if not self._is_available():
-            logger.warning("LLM service not available - using demo summary")
-            # Return demo summary
-            avg_rating = sum(r.rating for r in reviews) / len(reviews)
-            
-            demo_pros = ["Good quality", "Fast shipping", "Good value for money"]
-            demo_cons = ["Some quality issues", "Limited features"] if avg_rating < 4 else ["Minor issues"]
-            demo_themes = ["Quality", "Value", "Performance"]
-            
-            return {
-                "pros": demo_pros,
-                "cons": demo_cons,
-                "themes": demo_themes,
-                "summary": f"Based on {len(reviews)} reviews with an average rating of {avg_rating:.1f}/5, customers generally find this product {'excellent' if avg_rating >= 4.5 else 'good' if avg_rating >= 4 else 'decent'}."
-            }
+        from .review_summaries import cluster_reviews
+        summaries = self.summarize_review_batch({"product": cluster_reviews(reviews)})
+        return summaries.get("product", {
+            "pros": [],
+            "cons": [],
+            "themes": [],
+            "summary": "Unable to summarize reviews at this time."
+        })
+    
+    def summarize_review_batch(self, reviews_by_product: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """Summarize the reviews of several products in one call.
         
-        logger.info("LLM service available - summarizing reviews with OpenAI...")
+        Reviews are the deduplicated {"rating", "content", "mentions"} entries from
+        review_summaries.cluster_reviews. Products missing from the answer are left out.
+        """
+        logger.info(f"Starting batched review summarization for {len(reviews_by_product)} products...")
         
-        # Full LLM review analysis continues...
-        review_texts = []
-        for review in reviews[:20]:  # Limit to avoid token limits
-            review_texts.append({
-                "rating": review.rating,
-                "content": review.content[:500]  # Truncate long reviews
-            })
+        if not self._is_available():
+            logger.warning("LLM service not available - using demo summary")
+            return {key: self._demo_review_summary(entries) for key, entries in reviews_by_product.items()}
         
+        # Short product labels keep the prompt small; URLs are only mapped back afterwards
+        labels = {f"product_{i}": key for i, key in enumerate(reviews_by_product, 1)}
         prompt = f"""
-        Summarize these product reviews and extract key insights:
+        Summarize the reviews of each of these products separately and extract key insights.
+        Each review lists how many customers wrote essentially the same thing ("mentions").
         
-        Reviews: {json.dumps(review_texts, indent=2)}
+        Reviews by product: {json.dumps({label: reviews_by_product[key] for label, key in labels.items()}, indent=2)}
         
-        Provide a JSON response with:
+        Provide a JSON object with one entry per product label, each with:
         1. "pros": List of positive aspects mentioned in reviews
         2. "cons": List of negative aspects or complaints
         3. "themes": Common themes or topics discussed
@@ -309,7 +318,34 @@ class LLMService:
         
         Focus on the most frequently mentioned points and overall sentiment.
         """
+        return self._review_summary_call(prompt, labels)
+    
+    def merge_review_summaries(self, updates: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Fold new reviews into existing summaries for several products in one call.
+        
+        Each update holds the product's "existing_summary" and its "new_reviews" (deduplicated entries).
+        """
+        logger.info(f"Merging new reviews into {len(updates)} existing summaries...")
+        
+        if not self._is_available():
+            logger.warning("LLM service not available - keeping existing summaries")
+            return {key: update["existing_summary"] for key, update in updates.items()}
         
+        labels = {f"product_{i}": key for i, key in enumerate(updates, 1)}
+        prompt = f"""
+        Each product below has an existing review summary and some reviews written since.
+        Update each summary so it also reflects the new reviews, keeping points that still hold
+        and weighting new points by how many customers mention them ("mentions").
+        
+        Products: {json.dumps({label: updates[key] for label, key in labels.items()}, indent=2)}
+        
+        Provide a JSON object with one entry per product label, each with the updated
+        "pros", "cons", "themes" and "summary".
+        """
+        return self._review_summary_call(prompt, labels)
+    
+    def _review_summary_call(self, prompt: str, labels: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Send a batched review prompt and map the per-label answers back to product keys"""
         try:
             logger.debug("Making OpenAI API call for review summarization...")
             
@@ -319,42 +355,43 @@ class LLMService:
                     {"role": "system", "content": "You are a review analyst. Extract key insights from customer reviews and provide structured summaries in JSON format."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.2
+                temperature=0.2,
+                response_format={"type": "json_object"}
             )
             
-            content = response.choices[0].message.content
-            logger.info("Successfully summarized reviews with OpenAI")
-            
-            # Try to parse JSON response
-            try:
-                result = json.loads(content)
-                logger.info("Successfully parsed JSON response from review summarization")
-                return result
-            except json.JSONDecodeError:
-                logger.warning("Direct JSON parsing failed for review summary, trying code blocks")
-                # Extract JSON from code blocks if needed
-                import re
-                json_match = re.search(r'```json\n(.*?)\n```', content, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group(1))
-                    logger.info("Successfully extracted JSON from code blocks for review summary")
-                    return result
-                else:
-                    logger.error("Could not extract JSON from review summary response")
-                    return {
-                        "pros": [],
-                        "cons": [],
-                        "themes": [],
-                        "summary": content
-                    }
+            result = json.loads(response.choices[0].message.content)
+            logger.info(f"Successfully summarized reviews for {len(result)} of {len(labels)} products with OpenAI")
         except Exception as e:
             logger.error(f"Error summarizing reviews with OpenAI: {e}")
-            return {
-                "pros": [],
-                "cons": [],
-                "themes": [],
-                "summary": "Unable to summarize reviews at this time."
-            }
+            return {}
+        
+        summaries = {}
+        for label, key in labels.items():
+            summary = result.get(label)
+            if isinstance(summary, dict):
+                summaries[key] = {
+                    "pros": summary.get("pros", []),
+                    "cons": summary.get("cons", []),
+                    "themes": summary.get("themes", []),
+                    "summary": summary.get("summary", "")
+                }
+        return summaries
+    
+    def _demo_review_summary(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Rating-based summary used when no LLM is configured"""
+        total = sum(entry["mentions"] for entry in entries) or 1
+        avg_rating = sum(entry["rating"] * entry["mentions"] for entry in entries) / total
+        
+        demo_pros = ["Good quality", "Fast shipping", "Good value for money"]
+        demo_cons = ["Some quality issues", "Limited features"] if avg_rating < 4 else ["Minor issues"]
+        demo_themes = ["Quality", "Value", "Performance"]
+        
+        return {
+            "pros": demo_pros,
+            "cons": demo_cons,
+            "themes": demo_themes,
+            "summary": f"Based on {total} reviews with an average rating of {avg_rating:.1f}/5, customers generally find this product {'excellent' if avg_rating >= 4.5 else 'good' if avg_rating >= 4 else 'decent'}."
+        }
     
     def generate_product_description(self, product: Product) -> str:
         """Generate an enhanced product description"""
@@ -0,0 +1,186 @@
+"""
+Scheduled batch price refresh for tracked products
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_
+
+from .database import PriceHistoryDB, PriceTrackerDB, SessionLocal
+from .product_cache import CachedProductScraper, canonical_url
+from .scrapers import ProductScraper
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two price checks of the same product
+PRICE_CHECK_INTERVAL = float(os.getenv("PRICE_CHECK_INTERVAL", "3600"))
+# Product pages fetched at the same time during a refresh
+PRICE_REFRESH_CONCURRENCY = int(os.getenv("PRICE_REFRESH_CONCURRENCY", "4"))
+# Maximum number of products refreshed per cycle; the rest wait for the next cycle
+PRICE_REFRESH_BATCH_SIZE = int(os.getenv("PRICE_REFRESH_BATCH_SIZE", "100"))
+# An unchanged price is still recorded once this long after the last history point
+PRICE_HISTORY_HEARTBEAT = timedelta(hours=24)
+
+
+def _target_gap(current_price: Optional[float], target_price: float) -> float:
+    """How far a price is from its target, relative to the target (0 means at or below it)"""
+    if current_price is None or target_price <= 0:
+        return 0.0
+    return max(0.0, (current_price - target_price) / target_price)
+
+
+class PriceRefresher:
+    """Refreshes every tracked product once per cycle, however many users track it"""
+
+    def __init__(
+        self,
+        scraper: Optional[ProductScraper] = None,
+        session_factory=SessionLocal,
+        check_interval: float = PRICE_CHECK_INTERVAL,
+        concurrency: int = PRICE_REFRESH_CONCURRENCY,
+        batch_size: int = PRICE_REFRESH_BATCH_SIZE,
+    ):
+        self.scraper = scraper or CachedProductScraper(session_factory=session_factory)
+        self.session_factory = session_factory
+        self.check_interval = timedelta(seconds=check_interval)
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+
+    def due_products(self, now: Optional[datetime] = None) -> List[Tuple[str, List[str]]]:
+        """Get (canonical URL, tracker IDs) for products due a check, closest to a target first"""
+        now = now or datetime.utcnow()
+        with self.session_factory() as db:
+            trackers = db.query(
+                PriceTrackerDB.id, PriceTrackerDB.product_url,
+                PriceTrackerDB.current_price, PriceTrackerDB.target_price,
+            ).filter(
+                PriceTrackerDB.is_active == True,
+                or_(PriceTrackerDB.last_checked == None, PriceTrackerDB.last_checked <= now - self.check_interval),
+            ).all()
+
+        products: Dict[str, Dict[str, Any]] = {}
+        for tracker in trackers:
+            product = products.setdefault(
+                canonical_url(tracker.product_url),
+                {"url": tracker.product_url, "tracker_ids": [], "gap": float("inf")},
+            )
+            product["tracker_ids"].append(tracker.id)
+            product["gap"] = min(product["gap"], _target_gap(tracker.current_price, tracker.target_price))
+
+        ordered = sorted(products.values(), key=lambda product: product["gap"])
+        return [(product["url"], product["tracker_ids"]) for product in ordered[:self.batch_size]]
+
+    def _fetch_prices(self, urls: List[str]) -> Dict[str, float]:
+        """Fetch the current price of each URL with a bounded number of concurrent requests"""
+        prices = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {executor.submit(self.scraper.get_product_details, url): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    product = future.result()
+                except Exception as e:
+                    logger.warning(f"Price check failed for {url}: {e}")
+                    continue
+                if product and product.price is not None:
+                    prices[url] = product.price
+                else:
+                    logger.warning(f"No price found for {url}")
+        return prices
+
+    def refresh(self) -> Dict[str, Any]:
+        """Run one refresh cycle; returns counts and the trackers whose target price was reached"""
+        due = self.due_products()
+        if not due:
+            return {"products_checked": 0, "trackers_updated": 0, "targets_reached": []}
+
+        prices = self._fetch_prices([url for url, _ in due])
+        now = datetime.utcnow()
+
+        with self.session_factory() as db:
+            tracker_updates = [
+                {"id": tracker_id, "current_price": prices[url], "last_checked": now}
+                for url, tracker_ids in due if url in prices
+                for tracker_id in tracker_ids
+            ]
+            db.bulk_update_mappings(PriceTrackerDB, tracker_updates)
+            db.bulk_insert_mappings(PriceHistoryDB, self._history_points(db, prices, now))
+            db.commit()
+
+            reached = db.query(PriceTrackerDB).filter(
+                PriceTrackerDB.id.in_([update["id"] for update in tracker_updates]),
+                PriceTrackerDB.current_price <= PriceTrackerDB.target_price,
+            ).all()
+            targets_reached = [
+                {
+                    "tracker_id": tracker.id,
+                    "user_id": tracker.user_id,
+                    "product_url": tracker.product_url,
+                    "product_title": tracker.product_title,
+                    "current_price": tracker.current_price,
+                    "target_price": tracker.target_price,
+                }
+                for tracker in reached
+            ]
+
+        for target in targets_reached:
+            logger.info(
+                f"Target reached for {target['user_id']}: {target['product_title']} "
+                f"is ${target['current_price']} (target ${target['target_price']})"
+            )
+        logger.info(f"Price refresh checked {len(prices)}/{len(due)} products, updated {len(tracker_updates)} trackers")
+        return {
+            "products_checked": len(prices),
+            "trackers_updated": len(tracker_updates),
+            "targets_reached": targets_reached,
+        }
+
+    def _history_points(self, db, prices: Dict[str, float], now: datetime) -> List[Dict[str, Any]]:
+        """Build history points for prices that changed (or have not been recorded for a while)"""
+        keys = {canonical_url(url): price for url, price in prices.items()}
+        latest = db.query(
+            PriceHistoryDB.product_url, func.max(PriceHistoryDB.checked_at).label("checked_at")
+        ).filter(PriceHistoryDB.product_url.in_(keys)).group_by(PriceHistoryDB.product_url).subquery()
+        last_points = {
+            row.product_url: row
+            for row in db.query(PriceHistoryDB).join(
+                latest,
+                (PriceHistoryDB.product_url == latest.c.product_url)
+                & (PriceHistoryDB.checked_at == latest.c.checked_at),
+            )
+        }
+
+        points = []
+        for key, price in keys.items():
+            last = last_points.get(key)
+            if last is None or last.price != price or now - last.checked_at >= PRICE_HISTORY_HEARTBEAT:
+                points.append({"product_url": key, "price": price, "checked_at": now})
+        return points
+
+    def price_history(self, product_url: str, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get the recorded price series for a product, oldest first"""
+        with self.session_factory() as db:
+            query = db.query(PriceHistoryDB.checked_at, PriceHistoryDB.price).filter(
+                PriceHistoryDB.product_url == canonical_url(product_url)
+            )
+            if since:
+                query = query.filter(PriceHistoryDB.checked_at >= since)
+            return [
+                {"checked_at": checked_at, "price": price}
+                for checked_at, price in query.order_by(PriceHistoryDB.checked_at).all()
+            ]
+
+    async def run_periodically(self, interval: Optional[float] = None):
+        """Refresh prices forever, waiting `interval` seconds (default: the check interval) between cycles"""
+        interval = interval if interval is not None else self.check_interval.total_seconds()
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.error(f"Price refresh failed: {e}")
+            await asyncio.sleep(interval)
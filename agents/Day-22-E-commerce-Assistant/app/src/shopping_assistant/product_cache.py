@@ -0,0 +1,252 @@
+"""
+Read-through product and review cache backed by the product_cache table
+"""
+
+import asyncio
+import logging
+import os
+import re
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy.orm import Session
+
+from .database import ProductCacheDB, SessionLocal
+from .models import Product, Review
+from .scrapers import ProductScraper
+
+logger = logging.getLogger(__name__)
+
+# How long each kind of cached data stays fresh
+PRICE_TTL = timedelta(minutes=float(os.getenv("PRODUCT_PRICE_TTL_MINUTES", "30")))
+SPECS_TTL = timedelta(days=float(os.getenv("PRODUCT_SPECS_TTL_DAYS", "7")))
+REVIEWS_TTL = timedelta(hours=float(os.getenv("PRODUCT_REVIEWS_TTL_HOURS", "24")))
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "ref", "ref_", "tag", "psc", "th", "smid", "qid", "sr", "keywords", "crid", "sprefix",
+    "hash", "_trksid", "_trkparms", "campid", "mkcid", "mkevt", "mkrid", "toolid", "customid",
+}
+
+# Fields refreshed whenever a price is seen, e.g. in search results
+PRICE_FIELDS = ("price", "currency", "availability", "rating", "review_count")
+# Fields that describe the product itself and rarely change
+SPECS_FIELDS = ("title", "image_url", "description", "features", "brand", "category", "source")
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a product URL so the same product always maps to the same cache key"""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = parts.netloc.lower()
+    path = parts.path.rstrip("/") or "/"
+
+    # Retailer product IDs identify the product regardless of the slug or query string
+    amazon = re.search(r"/(?:dp|gp/product)/([A-Z0-9]{10})", path)
+    if "amazon." in host and amazon:
+        return urlunsplit((scheme, host, f"/dp/{amazon.group(1)}", "", ""))
+    ebay = re.search(r"/itm/(?:[^/]+/)?(\d+)$", path)
+    if "ebay." in host and ebay:
+        return urlunsplit((scheme, host, f"/itm/{ebay.group(1)}", "", ""))
+
+    params = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    return urlunsplit((scheme, host, path, urlencode(params), ""))
+
+
+def _is_fresh(timestamp: Optional[datetime], ttl: timedelta, now: datetime) -> bool:
+    return timestamp is not None and now - timestamp < ttl
+
+
+def _to_product(row: ProductCacheDB) -> Product:
+    return Product(
+        id=row.id,
+        title=row.title,
+        price=row.price,
+        currency=row.currency or "USD",
+        url=row.url,
+        image_url=row.image_url,
+        rating=row.rating,
+        review_count=row.review_count,
+        description=row.description,
+        features=row.features or [],
+        brand=row.brand,
+        category=row.category,
+        availability=row.availability,
+        source=row.source,
+    )
+
+
+class ProductCache:
+    """Serves product details and reviews from the database while fresh, scraping them otherwise"""
+
+    def __init__(self, scraper: ProductScraper, session_factory=SessionLocal):
+        self.scraper = scraper
+        self.session_factory = session_factory
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _load(self, db: Session, key: str) -> Optional[ProductCacheDB]:
+        return db.query(ProductCacheDB).filter(ProductCacheDB.url == key).first()
+
+    def get_product(self, url: str) -> Optional[Product]:
+        """Get product details, scraping the page only if the cached price or specs are stale"""
+        product, _ = self._read_through(url, need_reviews=False)
+        return product
+
+    def get_reviews(self, url: str) -> List[Review]:
+        """Get product reviews, scraping the page only if the cached reviews are stale"""
+        _, reviews = self._read_through(url, need_reviews=True)
+        return reviews
+
+    def _read_through(self, url: str, need_reviews: bool) -> Tuple[Optional[Product], List[Review]]:
+        key = canonical_url(url)
+        cached = self._cached(key, need_reviews)
+        if cached is not None:
+            return cached
+
+        # One fetch per product at a time; concurrent callers wait and then read what it stored
+        with self._lock_for(key):
+            cached = self._cached(key, need_reviews)
+            if cached is not None:
+                return cached
+
+            try:
+                product, reviews = self.scraper.fetch_product_page(url)
+            except Exception as e:
+                logger.warning(f"Error scraping product page {url}: {e}")
+                product, reviews = None, []
+
+            with self.session_factory() as db:
+                row = self._load(db, key)
+                if product is None:
+                    # Stale data beats no data when the retailer cannot be reached
+                    if row is None:
+                        return None, []
+                    return _to_product(row), [Review(**r) for r in row.reviews or []]
+
+                row = self._store_page(db, row, key, product, reviews)
+                db.commit()
+                return _to_product(row), reviews
+
+    def _cached(self, key: str, need_reviews: bool) -> Optional[Tuple[Product, List[Review]]]:
+        """Get the cached product (and reviews) if every part the caller needs is fresh"""
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            row = self._load(db, key)
+            if row is None:
+                return None
+            if not (_is_fresh(row.price_updated_at, PRICE_TTL, now) and _is_fresh(row.specs_updated_at, SPECS_TTL, now)):
+                return None
+            if need_reviews and not _is_fresh(row.reviews_updated_at, REVIEWS_TTL, now):
+                return None
+            return _to_product(row), [Review(**r) for r in row.reviews or []]
+
+    def _store_page(self, db: Session, row: Optional[ProductCacheDB], key: str,
+                    product: Product, reviews: List[Review]) -> ProductCacheDB:
+        """Store everything scraped from a product page"""
+        now = datetime.utcnow()
+        if row is None:
+            row = ProductCacheDB(id=product.id or str(uuid.uuid4()), url=key)
+            db.add(row)
+
+        for field in PRICE_FIELDS:
+            value = getattr(product, field)
+            if value is not None:
+                setattr(row, field, value)
+        for field in SPECS_FIELDS:
+            # The page parse is generic, so keep specs already known from retailer search results
+            if getattr(row, field) in (None, "", []):
+                setattr(row, field, getattr(product, field))
+        row.reviews = [review.model_dump(mode="json") for review in reviews]
+        row.price_updated_at = row.specs_updated_at = row.reviews_updated_at = now
+        return row
+
+    def store_products(self, products: Iterable[Product]) -> int:
+        """Bulk-upsert products seen in search results; returns the number of rows written.
+
+        Prices are refreshed for products already cached, while their specs are only
+        written for new products so a full page scrape is not overwritten by a search snippet.
+        """
+        now = datetime.utcnow()
+        rows: Dict[str, dict] = {}
+        for product in products:
+            if not product.url:
+                continue
+            key = canonical_url(product.url)
+            rows[key] = {
+                "id": product.id or str(uuid.uuid4()),
+                "url": key,
+                **{field: getattr(product, field) for field in PRICE_FIELDS + SPECS_FIELDS},
+                "price_updated_at": now,
+                "specs_updated_at": now,
+                "last_updated": now,
+            }
+        if not rows:
+            return 0
+
+        with self.session_factory() as db:
+            dialect = db.get_bind().dialect.name
+            if dialect in ("sqlite", "postgresql"):
+                if dialect == "sqlite":
+                    from sqlalchemy.dialects.sqlite import insert
+                else:
+                    from sqlalchemy.dialects.postgresql import insert
+                stmt = insert(ProductCacheDB).values(list(rows.values()))
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[ProductCacheDB.url],
+                    set_={
+                        **{field: stmt.excluded[field] for field in PRICE_FIELDS},
+                        "price_updated_at": stmt.excluded.price_updated_at,
+                        "last_updated": stmt.excluded.last_updated,
+                    },
+                )
+                db.execute(stmt)
+            else:
+                existing = {
+                    row.url: row for row in
+                    db.query(ProductCacheDB).filter(ProductCacheDB.url.in_(rows)).all()
+                }
+                for key, values in rows.items():
+                    row = existing.get(key)
+                    if row is None:
+                        db.add(ProductCacheDB(**values))
+                        continue
+                    for field in PRICE_FIELDS + ("price_updated_at", "last_updated"):
+                        setattr(row, field, values[field])
+            db.commit()
+        return len(rows)
+
+
+class CachedProductScraper(ProductScraper):
+    """ProductScraper that reads product pages through the cache and records search results in it"""
+
+    def __init__(self, session_factory=SessionLocal, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = ProductCache(self, session_factory)
+
+    async def asearch_products(self, query: str, max_results: int = 10, **kwargs) -> List[Product]:
+        """Search all retailers and cache every product found"""
+        products = await super().asearch_products(query, max_results, **kwargs)
+        try:
+            await asyncio.to_thread(self.cache.store_products, products)
+        except Exception as e:
+            logger.warning(f"Error caching search results: {e}")
+        return products
+
+    def get_product_details(self, url: str) -> Optional[Product]:
+        """Get product details from the cache, scraping the page when stale"""
+        return self.cache.get_product(url)
+
+    def get_product_reviews(self, url: str) -> List[Review]:
+        """Get product reviews from the cache, scraping the page when stale"""
+        return self.cache.get_reviews(url)
@@ -7,60 +7,34 @@ import json
 import re
 import logging
 import asyncio
+import time
 from typing import List, Optional, Dict, Any
 from urllib.parse import quote_plus
 from .models import Product
+from .browser_pool import PYPPETEER_AVAILABLE, BrowserPool, get_browser_pool
 
 logger = logging.getLogger(__name__)
 
-# Try to import pyppeteer, fall back gracefully if not available
-try:
-    from pyppeteer import launch
-    PYPPETEER_AVAILABLE = True
-except ImportError:
-    PYPPETEER_AVAILABLE = False
-    logger.warning("pyppeteer not available. Install with: pip install pyppeteer")
-
 
 class PuppeteerProductScraper:
     """Puppeteer-based scraper for e-commerce sites that require JavaScript"""
     
-    def __init__(self):
+    def __init__(self, pool: Optional[BrowserPool] = None):
         logger.info(f"PuppeteerProductScraper initialized (pyppeteer available: {PYPPETEER_AVAILABLE})")
-        self.browser = None
-        self.page = None
+        self.pool = pool or get_browser_pool()
+        self.search_latencies: List[float] = []
     
     async def __aenter__(self):
         if PYPPETEER_AVAILABLE:
             try:
-                self.browser = await launch(
-                    headless=True,
-                    args=[
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-gpu',
-                        '--window-size=1920,1080'
-                    ]
-                )
-                self.page = await self.browser.newPage()
-                await self.page.setUserAgent(
-                    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                )
-                logger.info("Browser launched successfully")
+                await self.pool.start()
             except Exception as e:
                 logger.warning(f"Failed to launch browser: {e}")
-                self.browser = None
-                self.page = None
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.browser:
-            try:
-                await self.browser.close()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.warning(f"Error closing browser: {e}")
+        # The browser pool is long-lived and shared; close it explicitly with self.pool.close()
+        pass
     
     async def search_products(self, query: str, max_results: int = 10) -> List[Product]:
         """Search for products using Puppeteer"""
@@ -70,31 +44,31 @@ class PuppeteerProductScraper:
             logger.warning("pyppeteer not available - returning empty results")
             return []
         
-        products = []
-        
+        started = time.perf_counter()
         async with self:
-            if not self.browser or not self.page:
+            if not self.pool.is_running:
                 logger.warning("Browser not available - returning empty results")
                 return []
             
-            # Search different e-commerce sites
-            amazon_products = await self._search_amazon_puppeteer(query, max_results // 3)
-            products.extend(amazon_products)
-            
-            # Add small delay between searches to be respectful
-            await asyncio.sleep(1)
-            
-            walmart_products = await self._search_walmart_puppeteer(query, max_results // 3)
-            products.extend(walmart_products)
-            
-            await asyncio.sleep(1)
-            
-            target_products = await self._search_target_puppeteer(query, max_results // 3)
-            products.extend(target_products)
+            # Each site gets its own pooled page, so the searches run side by side
+            per_site = max(1, max_results // 3)
+            results = await asyncio.gather(
+                self._search_amazon_puppeteer(query, per_site),
+                self._search_walmart_puppeteer(query, per_site),
+                self._search_target_puppeteer(query, per_site),
+            )
+        products = [product for site_products in results for product in site_products]
         
-        logger.info(f"Puppeteer found {len(products)} products")
+        latency = time.perf_counter() - started
+        self.search_latencies.append(latency)
+        logger.info(f"Puppeteer found {len(products)} products in {latency:.1f}s (pool: {self.pool.stats()})")
         return products[:max_results]
     
+    async def _load(self, page, url: str, ready_selector: str):
+        """Navigate and wait until the product list is in the DOM instead of for a fixed time"""
+        await page.goto(url, {'waitUntil': 'domcontentloaded', 'timeout': 30000})
+        await page.waitForSelector(ready_selector, {'timeout': 10000})
+    
     async def _search_amazon_puppeteer(self, query: str, max_results: int) -> List[Product]:
         """Search Amazon using real Puppeteer"""
         products = []
@@ -105,49 +79,46 @@ class PuppeteerProductScraper:
             
             logger.info(f"Navigating to Amazon: {url}")
             
-            # Navigate to the page
-            await self.page.goto(url, {'waitUntil': 'networkidle2', 'timeout': 30000})
-            
-            # Wait for products to load
-            await self.page.waitForSelector('[data-component-type="s-search-result"]', {'timeout': 10000})
-            
-            # Extract product data
-            products_data = await self.page.evaluate('''() => {
-                const products = [];
-                const productElements = document.querySelectorAll('[data-component-type="s-search-result"]');
+            async with self.pool.page() as page:
+                await self._load(page, url, '[data-component-type="s-search-result"]')
+                
+                # Extract product data
+                products_data = await page.evaluate('''(limit) => {
+                    const products = [];
+                    const productElements = document.querySelectorAll('[data-component-type="s-search-result"]');
                 
-                for (let i = 0; i < Math.min(productElements.length, 5); i++) {
-                    const element = productElements[i];
+                    for (let i = 0; i < Math.min(productElements.length, limit); i++) {
+                        const element = productElements[i];
                     
-                    try {
-                        const titleElement = element.querySelector('h2 a span') || element.querySelector('[data-cy="title-recipe-title"]');
-                        const priceElement = element.querySelector('.a-price-whole') || element.querySelector('.a-price-range');
-                        const ratingElement = element.querySelector('.a-icon-alt');
-                        const linkElement = element.querySelector('h2 a');
-                        const imageElement = element.querySelector('.s-image');
+                        try {
+                            const titleElement = element.querySelector('h2 a span') || element.querySelector('[data-cy="title-recipe-title"]');
+                            const priceElement = element.querySelector('.a-price-whole') || element.querySelector('.a-price-range');
+                            const ratingElement = element.querySelector('.a-icon-alt');
+                            const linkElement = element.querySelector('h2 a');
+                            const imageElement = element.querySelector('.s-image');
                         
-                        if (titleElement && priceElement) {
-                            const title = titleElement.textContent.trim();
-                            const priceText = priceElement.textContent.replace(/[^0-9.]/g, '');
-                            const price = parseFloat(priceText);
+                            if (titleElement && priceElement) {
+                                const title = titleElement.textContent.trim();
+                                const priceText = priceElement.textContent.replace(/[^0-9.]/g, '');
+                                const price = parseFloat(priceText);
                             
-                            if (title && price && price > 0) {
-                                products.push({
-                                    title: title,
-                                    price: price,
-                                    rating: ratingElement ? parseFloat(ratingElement.textContent.match(/\\d+\\.\\d+/)?.[0]) : null,
-                                    url: linkElement ? 'https://www.amazon.com' + linkElement.getAttribute('href') : '',
-                                    image: imageElement ? imageElement.getAttribute('src') : ''
-                                });
+                                if (title && price && price > 0) {
+                                    products.push({
+                                        title: title,
+                                        price: price,
+                                        rating: ratingElement ? parseFloat(ratingElement.textContent.match(/\\d+\\.\\d+/)?.[0]) : null,
+                                        url: linkElement ? 'https://www.amazon.com' + linkElement.getAttribute('href') : '',
+                                        image: imageElement ? imageElement.getAttribute('src') : ''
+                                    });
+                                }
                             }
+                        } catch (err) {
+                            console.log('Error parsing product:', err);
                         }
-                    } catch (err) {
-                        console.log('Error parsing product:', err);
                     }
-                }
                 
-                return products;
-            }''')
+                    return products;
+                }''', max_results)
             
             # Convert to Product objects
             for item in products_data:
@@ -185,50 +156,47 @@ class PuppeteerProductScraper:
             
             logger.info(f"Navigating to Walmart: {url}")
             
-            # Navigate to the page
-            await self.page.goto(url, {'waitUntil': 'networkidle2', 'timeout': 30000})
-            
-            # Wait for products to load
-            await asyncio.sleep(3)  # Walmart takes time to load
-            
-            # Extract product data
-            products_data = await self.page.evaluate('''() => {
-                const products = [];
-                const productElements = document.querySelectorAll('[data-automation-id="product-tile"], [data-testid="item-tile"]');
+            async with self.pool.page() as page:
+                await self._load(page, url, '[data-automation-id="product-tile"], [data-testid="item-tile"]')
+                
+                # Extract product data
+                products_data = await page.evaluate('''(limit) => {
+                    const products = [];
+                    const productElements = document.querySelectorAll('[data-automation-id="product-tile"], [data-testid="item-tile"]');
                 
-                for (let i = 0; i < Math.min(productElements.length, 3); i++) {
-                    const element = productElements[i];
+                    for (let i = 0; i < Math.min(productElements.length, limit); i++) {
+                        const element = productElements[i];
                     
-                    try {
-                        const titleElement = element.querySelector('[data-automation-id="product-title"]') || 
-                                           element.querySelector('h2') || 
-                                           element.querySelector('[aria-label*="title"]');
-                        const priceElement = element.querySelector('[itemprop="price"]') || 
-                                           element.querySelector('[data-automation-id="product-price"]') ||
-                                           element.querySelector('.price');
-                        const linkElement = element.querySelector('a[href*="/ip/"]');
+                        try {
+                            const titleElement = element.querySelector('[data-automation-id="product-title"]') || 
+                                               element.querySelector('h2') || 
+                                               element.querySelector('[aria-label*="title"]');
+                            const priceElement = element.querySelector('[itemprop="price"]') || 
+                                               element.querySelector('[data-automation-id="product-price"]') ||
+                                               element.querySelector('.price');
+                            const linkElement = element.querySelector('a[href*="/ip/"]');
                         
-                        if (titleElement && priceElement) {
-                            const title = titleElement.textContent.trim();
-                            const priceText = priceElement.textContent.replace(/[^0-9.]/g, '');
-                            const price = parseFloat(priceText);
+                            if (titleElement && priceElement) {
+                                const title = titleElement.textContent.trim();
+                                const priceText = priceElement.textContent.replace(/[^0-9.]/g, '');
+                                const price = parseFloat(priceText);
                             
-                            if (title && price && price > 0) {
-                                products.push({
-                                    title: title,
-                                    price: price,
-                                    url: linkElement ? 'https://www.walmart.com' + linkElement.getAttribute('href') : '',
-                                    image: ''
-                                });
+                                if (title && price && price > 0) {
+                                    products.push({
+                                        title: title,
+                                        price: price,
+                                        url: linkElement ? 'https://www.walmart.com' + linkElement.getAttribute('href') : '',
+                                        image: ''
+                                    });
+                                }
                             }
+                        } catch (err) {
+                            console.log('Error parsing Walmart product:', err);
                         }
-                    } catch (err) {
-                        console.log('Error parsing Walmart product:', err);
                     }
-                }
                 
-                return products;
-            }''')
+                    return products;
+                }''', max_results)
             
             # Convert to Product objects
             for item in products_data:
@@ -266,49 +234,46 @@ class PuppeteerProductScraper:
             
             logger.info(f"Navigating to Target: {url}")
             
-            # Navigate to the page
-            await self.page.goto(url, {'waitUntil': 'networkidle2', 'timeout': 30000})
-            
-            # Wait for products to load
-            await asyncio.sleep(3)
-            
-            # Extract product data
-            products_data = await self.page.evaluate('''() => {
-                const products = [];
-                const productElements = document.querySelectorAll('[data-test="product-details"], [data-test*="product"]');
+            async with self.pool.page() as page:
+                await self._load(page, url, '[data-test="product-details"], [data-test*="product"]')
+                
+                # Extract product data
+                products_data = await page.evaluate('''(limit) => {
+                    const products = [];
+                    const productElements = document.querySelectorAll('[data-test="product-details"], [data-test*="product"]');
                 
-                for (let i = 0; i < Math.min(productElements.length, 3); i++) {
-                    const element = productElements[i];
+                    for (let i = 0; i < Math.min(productElements.length, limit); i++) {
+                        const element = productElements[i];
                     
-                    try {
-                        const titleElement = element.querySelector('[data-test="product-title"]') || 
-                                           element.querySelector('h2') ||
-                                           element.querySelector('a[data-test="product-title"]');
-                        const priceElement = element.querySelector('[data-test="product-price"]') || 
-                                           element.querySelector('.price');
-                        const linkElement = element.querySelector('a[href*="/p/"]');
+                        try {
+                            const titleElement = element.querySelector('[data-test="product-title"]') || 
+                                               element.querySelector('h2') ||
+                                               element.querySelector('a[data-test="product-title"]');
+                            const priceElement = element.querySelector('[data-test="product-price"]') || 
+                                               element.querySelector('.price');
+                            const linkElement = element.querySelector('a[href*="/p/"]');
                         
-                        if (titleElement && priceElement) {
-                            const title = titleElement.textContent.trim();
-                            const priceText = priceElement.textContent.replace(/[^0-9.]/g, '');
-                            const price = parseFloat(priceText);
+                            if (titleElement && priceElement) {
+                                const title = titleElement.textContent.trim();
+                                const priceText = priceElement.textContent.replace(/[^0-9.]/g, '');
+                                const price = parseFloat(priceText);
                             
-                            if (title && price && price > 0) {
-                                products.push({
-                                    title: title,
-                                    price: price,
-                                    url: linkElement ? 'https://www.target.com' + linkElement.getAttribute('href') : '',
-                                    image: ''
-                                });
+                                if (title && price && price > 0) {
+                                    products.push({
+                                        title: title,
+                                        price: price,
+                                        url: linkElement ? 'https://www.target.com' + linkElement.getAttribute('href') : '',
+                                        image: ''
+                                    });
+                                }
                             }
+                        } catch (err) {
+                            console.log('Error parsing Target product:', err);
                         }
-                    } catch (err) {
-                        console.log('Error parsing Target product:', err);
                     }
-                }
                 
-                return products;
-            }''')
+                    return products;
+                }''', max_results)
             
             # Convert to Product objects
             for item in products_data:
@@ -368,7 +333,7 @@ class MCPPuppeteerScraper:
             #     const products = [];
             #     const productElements = document.querySelectorAll('[data-component-type="s-search-result"]');
             #     
-            #     for (let i = 0; i < Math.min(productElements.length, 5); i++) {
+            #     for (let i = 0; i < Math.min(productElements.length, limit); i++) {
             #         const element = productElements[i];
             #         
             #         const titleElement = element.querySelector('h2 a span');
@@ -16,6 +16,7 @@ from .models import (
     PriceTracker, UserPreferences
 )
 from .scrapers import ProductScraper
+from .product_cache import CachedProductScraper
 from .database import SessionLocal, UserPreferencesDB, PriceTrackerDB
 
 logger = logging.getLogger(__name__)
@@ -89,7 +90,7 @@ async def search_products(
     """Search for products based on a query"""
     logger.info(f"Searching for products: {query}")
     
-    products = ctx.deps.scraper.search_products(query, max_results)
+    products = await ctx.deps.scraper.asearch_products(query, max_results)
     
     # Convert to dict for JSON serialization
     product_dicts = []
@@ -249,7 +250,7 @@ class PydanticShoppingAssistant:
     """Pydantic AI-powered shopping assistant"""
     
     def __init__(self):
-        self.scraper = ProductScraper()
+        self.scraper = CachedProductScraper()
         logger.info("PydanticShoppingAssistant initialized")
     
     async def parse_search_query(self, query: str, user_id: Optional[str] = None) -> ProductSearchQuery:
@@ -316,7 +317,7 @@ class PydanticShoppingAssistant:
         
         # The agent will use tools to search, so we need to extract the actual products
         # For now, let's do a direct search
-        products = self.scraper.search_products(query, max_results)
+        products = await self.scraper.asearch_products(query, max_results)
         
         # Apply filters based on parsed query
         filtered_products = self._apply_filters(products, parsed_query)
@@ -355,7 +356,7 @@ class PydanticShoppingAssistant:
         if kwargs.get('preferred_brands'):
             enhanced_query += f" from {' or '.join(kwargs['preferred_brands'])}"
         
-        products = self.scraper.search_products(enhanced_query, 10)
+        products = await self.scraper.asearch_products(enhanced_query, 10)
         
         # Re-rank based on preferences
         ranked_products = self._rank_recommendations(products, kwargs)
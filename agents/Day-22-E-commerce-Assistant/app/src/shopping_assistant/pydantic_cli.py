@@ -130,12 +130,12 @@ class PydanticShoppingAssistantCLI:
         
         try:
             # For now, use the scraper directly
-            from .scrapers import ProductScraper
+            from .product_cache import CachedProductScraper
             from .database import SessionLocal, PriceTrackerDB
             from datetime import datetime
             import uuid
             
-            scraper = ProductScraper()
+            scraper = CachedProductScraper()
             product = scraper.get_product_details(product_url)
             
             if not product:
@@ -174,9 +174,9 @@ class PydanticShoppingAssistantCLI:
         print("─" * 50)
         
         try:
-            from .scrapers import ProductScraper
+            from .product_cache import CachedProductScraper
             
-            scraper = ProductScraper()
+            scraper = CachedProductScraper()
             product = scraper.get_product_details(product_url)
             reviews = scraper.get_product_reviews(product_url)
             
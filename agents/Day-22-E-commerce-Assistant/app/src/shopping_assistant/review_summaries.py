@@ -0,0 +1,187 @@
+"""
+Batched, incremental review summarisation with summaries persisted per review set
+"""
+
+import hashlib
+import logging
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .database import ReviewSummaryDB, SessionLocal
+from .llm_service import LLMService
+from .models import Review
+from .product_cache import canonical_url
+
+logger = logging.getLogger(__name__)
+
+# Products summarised per LLM call
+REVIEW_SUMMARY_BATCH_SIZE = int(os.getenv("REVIEW_SUMMARY_BATCH_SIZE", "5"))
+# Word-trigram overlap above which two reviews count as the same review
+REVIEW_SIMILARITY_THRESHOLD = float(os.getenv("REVIEW_SIMILARITY_THRESHOLD", "0.8"))
+# Distinct reviews sent per product, most repeated first
+MAX_REVIEWS_PER_PRODUCT = 20
+MAX_REVIEW_CHARS = 500
+
+SUMMARY_FIELDS = ("pros", "cons", "themes", "summary")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def review_key(review: Review) -> str:
+    """Stable key of a review's text, the same for copies that only differ in case or punctuation"""
+    return hashlib.sha1(_normalize(f"{review.title or ''} {review.content}").encode("utf-8")).hexdigest()
+
+
+def review_set_hash(keys: Iterable[str]) -> str:
+    """Hash of a set of review keys, independent of review order and duplicates"""
+    return hashlib.sha256("\n".join(sorted(set(keys))).encode("utf-8")).hexdigest()
+
+
+def _shingles(text: str) -> Set[str]:
+    words = text.split()
+    if len(words) < 3:
+        return {text}
+    return {" ".join(words[i:i + 3]) for i in range(len(words) - 2)}
+
+
+def cluster_reviews(reviews: List[Review], threshold: float = REVIEW_SIMILARITY_THRESHOLD,
+                    limit: int = MAX_REVIEWS_PER_PRODUCT) -> List[Dict[str, Any]]:
+    """Collapse identical and near-identical reviews into one entry each.
+
+    Returns {"rating", "content", "mentions"} entries, the most repeated first, where
+    rating is the average over the cluster and mentions the number of reviews in it.
+    """
+    clusters: List[Dict[str, Any]] = []
+    for review in reviews:
+        text = _normalize(f"{review.title or ''} {review.content}")
+        if not text:
+            continue
+        shingles = _shingles(text)
+        for cluster in clusters:
+            overlap = len(shingles & cluster["shingles"]) / len(shingles | cluster["shingles"])
+            if overlap >= threshold:
+                cluster["ratings"].append(review.rating)
+                break
+        else:
+            content = f"{review.title}: {review.content}" if review.title else review.content
+            clusters.append({"shingles": shingles, "content": content[:MAX_REVIEW_CHARS], "ratings": [review.rating]})
+
+    clusters.sort(key=lambda cluster: len(cluster["ratings"]), reverse=True)
+    return [
+        {
+            "rating": round(sum(cluster["ratings"]) / len(cluster["ratings"]), 1),
+            "content": cluster["content"],
+            "mentions": len(cluster["ratings"]),
+        }
+        for cluster in clusters[:limit]
+    ]
+
+
+def _batches(keys: List[str], size: int) -> Iterable[List[str]]:
+    for start in range(0, len(keys), size):
+        yield keys[start:start + size]
+
+
+class ReviewSummarizer:
+    """Summarises reviews for many products at once, reusing and extending stored summaries.
+
+    A product whose review set is unchanged is served from the review_summaries table.
+    When reviews were added, only the new ones are sent together with the stored
+    summary to be merged; products without a summary are summarised from scratch.
+    """
+
+    def __init__(self, llm: Optional[LLMService] = None, session_factory=SessionLocal,
+                 batch_size: int = REVIEW_SUMMARY_BATCH_SIZE):
+        self.llm = llm or LLMService()
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+    def summarize(self, product_url: str, reviews: List[Review]) -> Dict[str, Any]:
+        """Summarise one product's reviews"""
+        return self.summarize_many({product_url: reviews})[product_url]
+
+    def summarize_many(self, reviews_by_product: Dict[str, List[Review]]) -> Dict[str, Dict[str, Any]]:
+        """Summarise the reviews of several products, keyed like the input"""
+        results: Dict[str, Dict[str, Any]] = {}
+        keys = {url: canonical_url(url) for url in reviews_by_product}
+        review_keys = {url: [review_key(review) for review in reviews] for url, reviews in reviews_by_product.items()}
+
+        with self.session_factory() as db:
+            stored = {
+                row.product_url: row for row in
+                db.query(ReviewSummaryDB).filter(ReviewSummaryDB.product_url.in_(set(keys.values()))).all()
+            }
+            # Detach what is needed so the rows are not used after the session closes
+            stored = {
+                key: {
+                    "review_hash": row.review_hash,
+                    "review_keys": set(row.review_keys or []),
+                    **{field: getattr(row, field) for field in SUMMARY_FIELDS},
+                }
+                for key, row in stored.items()
+            }
+
+        new_products: Dict[str, List[Dict[str, Any]]] = {}
+        merges: Dict[str, Dict[str, Any]] = {}
+        for url, reviews in reviews_by_product.items():
+            if not reviews:
+                results[url] = {"pros": [], "cons": [], "themes": [], "summary": "No reviews available."}
+                continue
+            row = stored.get(keys[url])
+            if row is None:
+                new_products[url] = cluster_reviews(reviews)
+                continue
+            summary = {field: row[field] for field in SUMMARY_FIELDS}
+            # Reviews drop off retailer pages over time, so a set the summary already covers is unchanged
+            if row["review_hash"] == review_set_hash(row["review_keys"] | set(review_keys[url])):
+                results[url] = summary
+                continue
+            added = [review for review, key in zip(reviews, review_keys[url]) if key not in row["review_keys"]]
+            new_reviews = cluster_reviews(added)
+            if not new_reviews:
+                results[url] = summary
+                continue
+            merges[url] = {"existing_summary": summary, "new_reviews": new_reviews}
+
+        updated: Dict[str, Dict[str, Any]] = {}
+        for batch in _batches(list(new_products), self.batch_size):
+            updated.update(self.llm.summarize_review_batch({url: new_products[url] for url in batch}))
+        for batch in _batches(list(merges), self.batch_size):
+            updated.update(self.llm.merge_review_summaries({url: merges[url] for url in batch}))
+
+        for url in list(new_products) + list(merges):
+            if url in updated:
+                results[url] = updated[url]
+            elif url in merges:
+                # Keep the summary we have rather than none at all
+                results[url] = merges[url]["existing_summary"]
+            else:
+                results[url] = {"pros": [], "cons": [], "themes": [], "summary": "Unable to summarize reviews at this time."}
+
+        # Demo summaries are not worth keeping once a real model is configured
+        if updated and self.llm._is_available():
+            covered = {
+                url: set(review_keys[url]) | stored.get(keys[url], {}).get("review_keys", set())
+                for url in updated
+            }
+            self._store(updated, covered, keys)
+        return results
+
+    def _store(self, summaries: Dict[str, Dict[str, Any]], covered: Dict[str, Set[str]], keys: Dict[str, str]):
+        """Save summaries together with every review key they now cover"""
+        with self.session_factory() as db:
+            for url, summary in summaries.items():
+                row = db.get(ReviewSummaryDB, keys[url])
+                if row is None:
+                    row = ReviewSummaryDB(product_url=keys[url])
+                    db.add(row)
+                row.review_keys = sorted(covered[url])
+                row.review_hash = review_set_hash(covered[url])
+                row.review_count = len(covered[url])
+                for field in SUMMARY_FIELDS:
+                    setattr(row, field, summary.get(field))
+            db.commit()
+        logger.info(f"Stored review summaries for {len(summaries)} products")
@@ -0,0 +1,31 @@
+"""
+Tests for product extraction from retailer search pages
+"""
+
+import json
+
+from shopping_assistant.extraction import extract_products
+
+
+def test_structured_products_without_url_are_skipped():
+    """A JSON-LD or __NEXT_DATA__ product with no URL of its own is not returned"""
+    json_ld = [
+        {"@type": "Product", "name": "Linked Blender", "url": "/ip/1", "offers": {"price": "39.99"}},
+        {"@type": "Product", "name": "Unlinked Toaster", "offers": {"price": "24.99"}},
+    ]
+    next_data = {"props": {"pageProps": {"initialData": {"searchResult": {"itemStacks": [{"items": [
+        {"name": "Linked Kettle", "canonicalUrl": "/ip/2", "price": 19.99},
+        {"name": "Unlinked Mixer", "price": 59.99},
+    ]}]}}}}}
+    html = (
+        f'<html><head><script type="application/ld+json">{json.dumps(json_ld)}</script>'
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>'
+        '</head><body></body></html>'
+    )
+
+    products = extract_products("walmart", html, max_results=10)
+
+    assert [(product.title, product.url) for product in products] == [
+        ("Linked Blender", "https://www.walmart.com/ip/1"),
+        ("Linked Kettle", "https://www.walmart.com/ip/2"),
+    ]
@@ -0,0 +1,166 @@
+"""
+Tests for the concurrent retailer fan-out, run against canned search pages served locally
+"""
+
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from shopping_assistant.extraction import extract_products
+from shopping_assistant.fanout import HostThrottle, fan_out_search, stream_search
+
+
+def newegg_page(*items):
+    """A Newegg search page listing (product path, title, price) items"""
+    cards = "".join(
+        f'<div class="item-container"><a class="item-title" href="{path}">{title}</a>'
+        f'<li class="price-current">${price}</li></div>'
+        for path, title, price in items
+    )
+    return f"<html><body>{cards}</body></html>".encode()
+
+
+PAGES = {
+    "/fast": newegg_page(("/p/1", "Fast Keyboard", "49.99"), ("/p/shared", "Shared Mouse", "19.99")),
+    "/medium": newegg_page(("/p/2", "Medium Monitor", "199.99")),
+    "/slow": newegg_page(("/p/shared", "Shared Mouse", "18.99"), ("/p/3", "Slow Headset", "89.99")),
+}
+
+
+class RetailerHandler(BaseHTTPRequestHandler):
+    """Serves PAGES; ?delay= sleeps before answering and ?status= overrides the status code"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        self.server.arrivals[self.headers["Host"]].append(time.monotonic())
+        time.sleep(float(params.get("delay", ["0"])[0]))
+
+        status = int(params.get("status", ["200"])[0])
+        body = PAGES.get(url.path, b"") if status == 200 else b"error"
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def retailer():
+    """A local server reachable under two host names, so per-host behaviour can be observed"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RetailerHandler)
+    server.daemon_threads = True
+    server.arrivals = defaultdict(list)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1]
+    server.hosts = (f"127.0.0.1:{port}", f"localhost:{port}")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def source(url, throttle):
+    """A retailer search that fetches one page through the throttle and parses it"""
+    def search(query, max_results):
+        throttle.wait(url)
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+        return extract_products("newegg", response.content, max_results)
+    return search
+
+
+def test_results_merge_in_arrival_order(retailer):
+    """Sources run concurrently; products are merged as each source answers, without duplicates"""
+    throttle = HostThrottle(min_delay=0, jitter=0)
+    host = retailer.hosts[0]
+    sources = {
+        "slow": source(f"http://{host}/slow?delay=0.8", throttle),
+        "fast": source(f"http://{host}/fast", throttle),
+        "medium": source(f"http://{host}/medium?delay=0.4", throttle),
+    }
+
+    async def run():
+        return [name async for name, _ in stream_search(sources, "mouse", 5, deadline=5)]
+
+    assert asyncio.run(run()) == ["fast", "medium", "slow"]
+
+    started = time.monotonic()
+    products = asyncio.run(fan_out_search(sources, "mouse", max_results=10, max_results_per_source=5, deadline=5))
+    # Run one after the other, the three searches would take 1.2s
+    assert time.monotonic() - started < 1.1
+
+    assert [product.title for product in products] == [
+        "Fast Keyboard", "Shared Mouse", "Medium Monitor", "Slow Headset"
+    ]
+    # The first source to answer wins a duplicate
+    assert products[1].price == 19.99
+
+
+def test_host_throttle_spaces_requests_per_host(retailer):
+    """Requests to one host are spaced by the minimum delay; other hosts are not held up"""
+    throttle = HostThrottle(min_delay=0.3, jitter=0)
+    busy, idle = retailer.hosts
+    sources = {f"busy-{i}": source(f"http://{busy}/fast", throttle) for i in range(3)}
+    sources["idle"] = source(f"http://{idle}/medium", throttle)
+
+    async def run():
+        return {name async for name, _ in stream_search(sources, "keyboard", 5, deadline=5)}
+
+    assert asyncio.run(run()) == set(sources)
+
+    busy_arrivals = sorted(retailer.arrivals[busy])
+    assert len(busy_arrivals) == 3
+    gaps = [later - earlier for earlier, later in zip(busy_arrivals, busy_arrivals[1:])]
+    assert all(gap >= 0.25 for gap in gaps)
+    # The other host was served while the busy host's requests were still being spaced out
+    assert retailer.arrivals[idle][0] < busy_arrivals[1]
+
+
+def test_failed_sources_are_isolated(retailer):
+    """A source that errors yields nothing; the other sources are still merged"""
+    throttle = HostThrottle(min_delay=0, jitter=0)
+    host = retailer.hosts[0]
+
+    def broken_parser(query, max_results):
+        raise ValueError("unexpected page layout")
+
+    sources = {
+        "server-error": source(f"http://{host}/fast?status=503", throttle),
+        "broken": broken_parser,
+        "healthy": source(f"http://{host}/medium", throttle),
+    }
+
+    async def run():
+        return [name async for name, _ in stream_search(sources, "monitor", 5, deadline=5)]
+
+    assert asyncio.run(run()) == ["healthy"]
+    products = asyncio.run(fan_out_search(sources, "monitor", max_results=10, max_results_per_source=5, deadline=5))
+    assert [product.title for product in products] == ["Medium Monitor"]
+
+
+def test_deadline_cuts_off_late_sources(retailer):
+    """Sources still running at the deadline are dropped and the search returns without them"""
+    throttle = HostThrottle(min_delay=0, jitter=0)
+    host = retailer.hosts[0]
+    sources = {
+        "fast": source(f"http://{host}/fast", throttle),
+        "late": source(f"http://{host}/slow?delay=3", throttle),
+    }
+
+    started = time.monotonic()
+    products = asyncio.run(fan_out_search(sources, "mouse", max_results=10, max_results_per_source=5, deadline=0.5))
+    elapsed = time.monotonic() - started
+
+    assert [product.title for product in products] == ["Fast Keyboard", "Shared Mouse"]
+    # asyncio.run() does not wait for the abandoned search to finish
+    assert 0.5 <= elapsed < 2